@@ -1,3 +1,4 @@
+from collections.abc import Generator
 from datetime import datetime, timezone
 
 from fastapi import Depends, HTTPException, Request, status
@@ -7,15 +8,17 @@ from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.security import decode_access_token_payload
 from app.db.models import User
-from app.db.session import get_db
+from app.db.session import ReadSessionLocal, SessionLocal, get_db
 from app.services.auth_service import (
     get_active_user_session_by_id,
     get_user_by_email,
     touch_user_session,
 )
 from app.services.admin_service import has_role_at_least
+from app.services.read_routing_service import read_routing_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 
 def get_access_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
@@ -83,9 +86,22 @@ def get_current_user(
         else:
             request.state.session_id = session_id.strip()
 
+    if request.method not in SAFE_METHODS:
+        read_routing_service.mark_write(user.id)
     return user
 
 
+def get_read_db(current_user: User = Depends(get_current_user)) -> Generator[Session, None, None]:
+    """Session for read-only endpoints: the replica (or SQLite read pool) unless the user just
+    wrote something or the replica is behind, in which case the primary."""
+    factory = SessionLocal if read_routing_service.prefer_primary(current_user.id) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def require_min_role(min_role: str):
     def _require(current_user: User = Depends(get_current_user)) -> User:
         if not has_role_at_least(current_user.role, min_role):
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_min_role
-from app.db.models import User
-from app.db.session import get_db
+from app.api.deps import get_current_user, get_read_db, require_min_role
+from app.db.models import ArchiveSegment, User
+from app.db.session import ReadSessionLocal, SessionLocal, get_db
 from app.schemas.admin import (
     AdminAuditLogRead,
     AdminBalanceAdjustRequest,
     AdminRoleUpdateRequest,
     AdminUserRead,
+    ArchiveSegmentRead,
+    RetentionRunResult,
 )
 from app.services.admin_service import (
     adjust_user_balance,
@@ -19,6 +24,14 @@ from app.services.admin_service import (
     set_user_role,
     write_audit_log,
 )
+from app.services.export_service import EXPORT_DATASETS, EXPORT_MEDIA_TYPES, stream_export
+from app.services.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.services.retention_service import (
+    RETENTION_TABLES,
+    iter_archive_lines,
+    list_archive_segments,
+    run_retention,
+)
 from app.realtime.socket_server import notify_balance_updated, notify_role_updated
 
 router = APIRouter()
@@ -26,20 +39,113 @@ router = APIRouter()
 
 @router.get("/audits", response_model=list[AdminAuditLogRead])
 def get_audit_logs(
+    response: Response,
     limit: int = Query(default=100, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
     _: User = Depends(require_min_role("mod")),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[AdminAuditLogRead]:
-    entries = list_audit_logs(db, limit=limit)
+    try:
+        entries = list_audit_logs(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    following = next_cursor(entries, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return [AdminAuditLogRead.model_validate(entry) for entry in entries]
 
 
+@router.get("/exports/{dataset}")
+def export_dataset(
+    dataset: str,
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    user_id: str | None = Query(default=None, max_length=32),
+    since: datetime | None = None,
+    current_user: User = Depends(require_min_role("admin")),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown export dataset")
+
+    write_audit_log(
+        db,
+        actor_user_id=current_user.id,
+        actor_role=current_user.role,
+        command_text=f"api:export {dataset} {export_format}",
+        status="success",
+        message=f"exported {dataset}",
+        target_user_id=user_id,
+        metadata={"format": export_format, "since": since.isoformat() if since else None},
+    )
+    extension = "csv" if export_format == "csv" else "ndjson"
+    return StreamingResponse(
+        stream_export(ReadSessionLocal, dataset, export_format, user_id=user_id, since=since),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'},
+    )
+
+
+@router.get("/archives", response_model=list[ArchiveSegmentRead])
+def get_archive_segments(
+    table_name: str | None = Query(default=None, max_length=40),
+    user_id: str | None = Query(default=None, max_length=32),
+    limit: int = Query(default=100, ge=1, le=500),
+    _: User = Depends(require_min_role("admin")),
+    db: Session = Depends(get_read_db),
+) -> list[ArchiveSegmentRead]:
+    segments = list_archive_segments(db, table_name=table_name, user_id=user_id, limit=limit)
+    return [ArchiveSegmentRead.model_validate(segment) for segment in segments]
+
+
+@router.get("/archives/{segment_id}/rows")
+def get_archive_rows(
+    segment_id: str,
+    user_id: str | None = Query(default=None, max_length=32),
+    _: User = Depends(require_min_role("admin")),
+    db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    segment = db.get(ArchiveSegment, segment_id)
+    if not segment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archive segment not found")
+    return StreamingResponse(iter_archive_lines(segment, user_id=user_id), media_type=EXPORT_MEDIA_TYPES["ndjson"])
+
+
+@router.post("/retention/run", response_model=list[RetentionRunResult])
+def run_retention_now(
+    table_name: str | None = Query(default=None, max_length=40),
+    current_user: User = Depends(require_min_role("super")),
+    db: Session = Depends(get_db),
+) -> list[RetentionRunResult]:
+    if table_name is not None and table_name not in RETENTION_TABLES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown retention table")
+    results = run_retention(SessionLocal, tables=[table_name] if table_name else None)
+    archived = [result for result in results if result.rows > 0]
+    write_audit_log(
+        db,
+        actor_user_id=current_user.id,
+        actor_role=current_user.role,
+        command_text=f"api:retention_run {table_name or 'all'}",
+        status="success",
+        message=f"archived {sum(result.rows for result in archived)} rows",
+        metadata={"segments": [f"{result.table_name}:{result.month}" for result in archived]},
+    )
+    return [
+        RetentionRunResult(
+            table_name=result.table_name,
+            month=result.month,
+            rows=result.rows,
+            skipped_reason=result.skipped_reason,
+        )
+        for result in results
+    ]
+
+
 @router.get("/users", response_model=list[AdminUserRead])
 def list_users(
     search: str = Query(default="", max_length=40),
     limit: int = Query(default=50, ge=1, le=200),
     _: User = Depends(require_min_role("admin")),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[AdminUserRead]:
     query = select(User).order_by(User.created_at.desc()).limit(limit)
     normalized_search = search.strip()
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.db.models import User
 from app.db.session import get_db
 from app.schemas.game import (
+    AutoPlayRequest,
+    AutoPlayResultRead,
+    MultiHandRoundRead,
+    MultiHandStartRequest,
     RoundActionRequest,
     RoundLogRead,
     SinglePlayerRoundRead,
     SinglePlayerStartRequest,
 )
 from app.services.blackjack_service import blackjack_service
+from app.services.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter(prefix="/single-player")
 
@@ -27,6 +32,107 @@ def start_round(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
+@router.post(
+    "/multi/start",
+    response_model=MultiHandRoundRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def start_multi_hand_round(
+    payload: MultiHandStartRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> MultiHandRoundRead:
+    try:
+        return blackjack_service.start_multi_hand_round(
+            db,
+            current_user.id,
+            payload.bet,
+            payload.hands,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/multi/{round_id}", response_model=MultiHandRoundRead)
+def get_multi_hand_round(
+    round_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> MultiHandRoundRead:
+    round_view = blackjack_service.get_multi_hand_round(db, current_user.id, round_id)
+    if not round_view:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Round not found")
+    return round_view
+
+
+@router.post("/multi/{round_id}/hands/{hand_index}/hit", response_model=MultiHandRoundRead)
+def hit_hand(
+    round_id: str,
+    hand_index: int,
+    payload: RoundActionRequest | None = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> MultiHandRoundRead:
+    action_id = payload.action_id if payload else None
+    try:
+        round_view = blackjack_service.act_on_hand(
+            db,
+            current_user.id,
+            round_id,
+            hand_index,
+            "hit",
+            action_id=action_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if not round_view:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Round not found")
+    return round_view
+
+
+@router.post("/multi/{round_id}/hands/{hand_index}/stand", response_model=MultiHandRoundRead)
+def stand_hand(
+    round_id: str,
+    hand_index: int,
+    payload: RoundActionRequest | None = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> MultiHandRoundRead:
+    action_id = payload.action_id if payload else None
+    try:
+        round_view = blackjack_service.act_on_hand(
+            db,
+            current_user.id,
+            round_id,
+            hand_index,
+            "stand",
+            action_id=action_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if not round_view:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Round not found")
+    return round_view
+
+
+@router.post("/auto-play", response_model=AutoPlayResultRead)
+def auto_play(
+    payload: AutoPlayRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> AutoPlayResultRead:
+    try:
+        return blackjack_service.auto_play(
+            db,
+            current_user.id,
+            payload.bet,
+            payload.rounds,
+            hands_per_round=payload.hands,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
 @router.get("/{round_id}", response_model=SinglePlayerRoundRead)
 def get_round(
     round_id: str,
@@ -75,8 +181,17 @@ def stand(
 
 @router.get("/history/list", response_model=list[RoundLogRead])
 def history(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=200),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[RoundLogRead]:
-    return blackjack_service.history(db, current_user.id, limit=limit)
+    try:
+        items = blackjack_service.history(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    following = next_cursor(items, limit, time_attr="ended_at")
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
+    return items
@@ -1,8 +1,42 @@
-from fastapi import APIRouter
+import resource
+import sys
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_min_role
+from app.db.models import User
+from app.realtime.socket_server import get_runtime_metrics
 
 router = APIRouter()
 
 
+def _current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
 @router.get("/health")
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/runtime")
+async def runtime_health(
+    reset_peak: bool = False,
+    _: User = Depends(require_min_role("admin")),
+) -> dict:
+    return {
+        "status": "ok",
+        "rss_bytes": _current_rss_bytes(),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        **get_runtime_metrics(reset_peak=reset_peak),
+    }
@@ -1,17 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from app.api.deps import get_current_user
+from app.core.config import get_settings
 from app.db.models import User
 from app.schemas.lobby import TableCreateRequest, TableJoinByCodeRequest, TableRead
 from app.services.lobby_service import lobby_service
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
+LOBBY_VERSION_HEADER = "X-Lobby-Version"
+
+
+def _lobby_etag(version: str, *query: object) -> str:
+    return 'W/"lobby-{}-{}"'.format(version, "-".join("" if value is None else str(value) for value in query))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return any(candidate.strip() in (etag, "*") for candidate in header.split(",")) if header else False
+
 
 @router.get("/tables", response_model=list[TableRead])
-def list_tables(current_user: User = Depends(get_current_user)) -> list[TableRead]:
-    visible_tables = lobby_service.visible_tables_for_user(current_user.id)
-    return [TableRead(**table.__dict__) for table in visible_tables]
+async def list_tables(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=20),
+    stake: float | None = Query(default=None, gt=0),
+    min_open_seats: int = Query(default=0, ge=0, le=8),
+    is_private: bool | None = None,
+    since: str | None = Query(default=None, max_length=80),
+    wait: float = Query(default=0, ge=0),
+    current_user: User = Depends(get_current_user),
+) -> list[TableRead] | Response:
+    """Visible tables in creation order, keyset-paged through `X-Next-Cursor`.
+
+    The weak ETag is the user's lobby visibility version plus the query, so a matching
+    `If-None-Match` is answered with 304 before any table is serialized. With `since` (an
+    `X-Lobby-Version`) and `wait`, the request is held until that version moves or `wait`
+    seconds (at most `LOBBY_LONG_POLL_MAX_SECONDS`) pass.
+    """
+    try:
+        after = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+    if since is not None and wait > 0:
+        await lobby_service.wait_for_change(
+            current_user.id, since, min(wait, get_settings().lobby_long_poll_max_seconds)
+        )
+
+    query = (limit, cursor, stake, min_open_seats, is_private)
+    version = lobby_service.visibility_version(current_user.id)
+    etag = _lobby_etag(version, *query)
+    if _etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, LOBBY_VERSION_HEADER: version},
+        )
+
+    tables, version, following = lobby_service.list_visible_tables(
+        current_user.id,
+        stake=stake,
+        min_open_seats=min_open_seats,
+        is_private=is_private,
+        after=after,
+        limit=limit,
+    )
+    response.headers["ETag"] = _lobby_etag(version, *query)
+    response.headers[LOBBY_VERSION_HEADER] = version
+    if following is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(following)
+    return [TableRead(**table.to_dict()) for table in tables]
 
 
 @router.post("/tables", response_model=TableRead, status_code=status.HTTP_201_CREATED)
@@ -20,7 +80,7 @@ def create_table(
     current_user: User = Depends(get_current_user),
 ) -> TableRead:
     table = lobby_service.create_table(current_user.id, payload)
-    return TableRead(**table.__dict__)
+    return TableRead(**table.to_dict())
 
 
 @router.post("/tables/{table_id}/join", response_model=TableRead)
@@ -31,7 +91,7 @@ def join_table(table_id: str, current_user: User = Depends(get_current_user)) ->
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unable to join table (not found or full)",
         )
-    return TableRead(**table.__dict__)
+    return TableRead(**table.to_dict())
 
 
 @router.post("/tables/join-by-code", response_model=TableRead)
@@ -45,4 +105,4 @@ def join_table_by_code(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unable to join table with invite code",
         )
-    return TableRead(**table.__dict__)
+    return TableRead(**table.to_dict())
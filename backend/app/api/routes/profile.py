@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_session_id, get_current_user
+from app.api.deps import get_current_session_id, get_current_user, get_read_db
 from app.db.models import User
 from app.db.session import get_db
 from app.schemas.profile import (
@@ -11,6 +11,7 @@ from app.schemas.profile import (
     UserSessionRead,
 )
 from app.services.auth_service import list_security_events, list_user_sessions, revoke_user_session
+from app.services.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
 
@@ -39,7 +40,7 @@ def update_my_profile(
 def list_my_sessions(
     current_user: User = Depends(get_current_user),
     current_session_id: str | None = Depends(get_current_session_id),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[UserSessionRead]:
     sessions = list_user_sessions(db, user_id=current_user.id, limit=50)
     payload: list[UserSessionRead] = []
@@ -64,8 +65,17 @@ def revoke_my_session(
 
 @router.get("/security/events", response_model=list[SecurityEventRead])
 def list_my_security_events(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[SecurityEventRead]:
-    rows = list_security_events(db, user_id=current_user.id, limit=100)
+    try:
+        rows = list_security_events(db, user_id=current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    following = next_cursor(rows, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return [SecurityEventRead.model_validate(entry) for entry in rows]
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.db.models import User
 from app.db.session import get_db
 from app.schemas.social import (
@@ -21,7 +21,7 @@ router = APIRouter()
 @router.get("/overview", response_model=SocialOverviewRead)
 def get_social_overview(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> SocialOverviewRead:
     payload = social_service.get_overview(db, current_user)
     return SocialOverviewRead.model_validate(payload)
@@ -30,7 +30,7 @@ def get_social_overview(
 @router.get("/notifications", response_model=list[NotificationRead])
 def list_notifications(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[NotificationRead]:
     notifications = social_service.list_notifications(db, current_user)
     return [NotificationRead.model_validate(notification) for notification in notifications]
@@ -3,9 +3,8 @@ from typing import Literal
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.db.models import User
-from app.db.session import get_db
 from app.schemas.stats import LeaderboardRead, UserStatsRead
 from app.services.stats_service import build_leaderboard, get_user_stats_bundle
 
@@ -18,7 +17,7 @@ SortValue = Literal["win_rate", "balance", "games", "blackjacks"]
 @router.get("/me", response_model=UserStatsRead)
 def get_my_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> UserStatsRead:
     payload = get_user_stats_bundle(db, current_user)
     return UserStatsRead.model_validate(payload)
@@ -30,7 +29,7 @@ def get_global_leaderboard(
     sort_by: SortValue = Query(default="win_rate"),
     limit: int = Query(default=50, ge=1, le=200),
     _: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> LeaderboardRead:
     payload = build_leaderboard(
         db,
@@ -48,7 +47,7 @@ def get_friends_leaderboard(
     sort_by: SortValue = Query(default="win_rate"),
     limit: int = Query(default=50, ge=1, le=200),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> LeaderboardRead:
     payload = build_leaderboard(
         db,
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_min_role
+from app.api.deps import get_current_user, get_read_db, require_min_role
 from app.db.models import User
 from app.db.session import get_db
-from app.realtime.socket_server import notify_balance_updated
+from app.realtime.socket_server import notify_balance_updated, notify_balances_updated
 from app.schemas.wallet import (
     DepositVerifyRequest,
     DepositVerifyResultRead,
@@ -13,12 +15,16 @@ from app.schemas.wallet import (
     WalletLinkRequest,
     WalletOverviewRead,
     WalletTransactionRead,
+    WithdrawalBulkDecisionRequest,
+    WithdrawalBulkDecisionResultRead,
     WithdrawalDecisionRequest,
     WithdrawalRequest,
     WithdrawalRequestResultRead,
 )
+from app.services.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.services.wallet_service import (
     decide_withdrawal,
+    decide_withdrawals,
     get_supported_assets,
     get_wallet_overview,
     link_wallet_address,
@@ -39,7 +45,7 @@ def list_assets(_: User = Depends(get_current_user)) -> list[SupportedAssetRead]
 @router.get("/me", response_model=WalletOverviewRead)
 def get_my_wallet_overview(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> WalletOverviewRead:
     payload = get_wallet_overview(db, current_user)
     return WalletOverviewRead.model_validate(payload)
@@ -66,11 +72,19 @@ def link_wallet(
 
 @router.get("/transactions", response_model=list[WalletTransactionRead])
 def get_my_wallet_transactions(
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[WalletTransactionRead]:
-    rows = list_user_transactions(db, current_user.id, limit=limit)
+    try:
+        rows = list_user_transactions(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    following = next_cursor(rows, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return [WalletTransactionRead.model_validate(entry) for entry in rows]
 
 
@@ -81,8 +95,11 @@ async def verify_deposit(
     db: Session = Depends(get_db),
 ) -> DepositVerifyResultRead:
     try:
-        transaction, credited_tokens, verification = verify_and_credit_deposit(db, current_user, payload)
-        db.refresh(current_user)
+        # Verification waits on chain providers; keep that off the event loop.
+        transaction, credited_tokens, verification = await asyncio.to_thread(
+            verify_and_credit_deposit, db, current_user, payload
+        )
+        await asyncio.to_thread(db.refresh, current_user)
         if credited_tokens > 0:
             await notify_balance_updated(current_user.id, float(current_user.balance))
     except ValueError as exc:
@@ -120,14 +137,41 @@ def create_withdrawal_request(
 
 @router.get("/withdrawals/pending", response_model=list[WalletTransactionRead])
 def get_pending_withdrawal_requests(
+    response: Response,
     limit: int = Query(default=100, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
     _: User = Depends(require_min_role("admin")),
     db: Session = Depends(get_db),
 ) -> list[WalletTransactionRead]:
-    rows = list_pending_withdrawals(db, limit=limit)
+    try:
+        rows = list_pending_withdrawals(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    following = next_cursor(rows, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return [WalletTransactionRead.model_validate(entry) for entry in rows]
 
 
+@router.post("/withdrawals/decisions", response_model=WithdrawalBulkDecisionResultRead)
+async def decide_withdrawal_requests(
+    payload: WithdrawalBulkDecisionRequest,
+    current_user: User = Depends(require_min_role("admin")),
+    db: Session = Depends(get_db),
+) -> WithdrawalBulkDecisionResultRead:
+    # Locks, ledger writes and the commit for up to a whole page of rows; keep them off the event loop.
+    decided, skipped, balances = await asyncio.to_thread(
+        decide_withdrawals, db, actor_user=current_user, decisions=payload.decisions
+    )
+    await notify_balances_updated(balances)
+    return WithdrawalBulkDecisionResultRead.model_validate(
+        {
+            "decided": [WalletTransactionRead.model_validate(entry) for entry in decided],
+            "skipped": skipped,
+        }
+    )
+
+
 @router.post("/withdrawals/{transaction_id}/decision", response_model=WalletTransactionRead)
 async def decide_withdrawal_request(
     transaction_id: str,
@@ -136,7 +180,8 @@ async def decide_withdrawal_request(
     db: Session = Depends(get_db),
 ) -> WalletTransactionRead:
     try:
-        transaction, target_user, balance_changed = decide_withdrawal(
+        transaction, target_user, balance_changed = await asyncio.to_thread(
+            decide_withdrawal,
             db,
             actor_user=current_user,
             transaction_id=transaction_id,
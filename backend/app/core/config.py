@@ -11,6 +11,17 @@ class Settings(BaseSettings):
     cors_origins: list[str] = Field(default_factory=lambda: ["http://localhost:3000"])
 
     database_url: str = "sqlite:///./maca.db"
+    database_replica_url: str = ""
+    database_replica_max_lag_seconds: float = 5.0
+    database_replica_lag_check_seconds: float = 2.0
+    database_read_your_writes_seconds: float = 5.0
+    sqlite_wal_enabled: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+    sqlite_read_pool_size: int = 8
+    sqlite_write_queue_enabled: bool = True
+    sqlite_write_batch_size: int = 100
     redis_url: str = "redis://localhost:6379/0"
 
     secret_key: str = "change-this-secret-key"
@@ -38,9 +49,21 @@ class Settings(BaseSettings):
     two_factor_issuer: str = "Project MACA"
     two_factor_time_step_seconds: int = 30
     two_factor_allowed_drift_steps: int = 1
+    lobby_long_poll_max_seconds: float = 30.0
     multiplayer_turn_seconds: int = 8
     multiplayer_timer_tick_seconds: float = 1.0
     multiplayer_reconnect_grace_seconds: int = 30
+    multiplayer_settlement_journal_enabled: bool = True
+    multiplayer_settlement_journal_path: str = "./data/settlement_journal.jsonl"
+    multiplayer_settlement_batch_size: int = 200
+    multiplayer_settlement_group_commit_seconds: float = 0.05
+    multiplayer_snapshot_enabled: bool = True
+    multiplayer_snapshot_target: str = "file"
+    multiplayer_snapshot_path: str = "./data/realtime_snapshot.bin"
+    multiplayer_snapshot_interval_seconds: float = 5.0
+    multiplayer_snapshot_max_age_seconds: int = 300
+    retention_horizon_days: int = 90
+    retention_archive_dir: str = "./data/archive"
     referral_code_length: int = 8
     referral_referrer_bonus: float = 25.0
     referral_new_user_bonus: float = 10.0
@@ -56,6 +79,23 @@ class Settings(BaseSettings):
     wallet_verification_strict: bool = True
     wallet_real_verification_fallback_to_mock: bool = False
     wallet_http_timeout_seconds: float = 10.0
+    wallet_http_retries: int = 2
+    wallet_http_retry_backoff_seconds: float = 0.25
+    # 0 falls back to wallet_http_timeout_seconds.
+    wallet_btc_http_timeout_seconds: float = 0.0
+    wallet_eth_http_timeout_seconds: float = 0.0
+    wallet_sol_http_timeout_seconds: float = 0.0
+    wallet_btc_tip_ttl_seconds: float = 30.0
+    wallet_eth_tip_ttl_seconds: float = 6.0
+    wallet_sol_tip_ttl_seconds: float = 2.0
+    wallet_btc_max_concurrency: int = 8
+    wallet_eth_max_concurrency: int = 8
+    wallet_sol_max_concurrency: int = 8
+    wallet_overview_cache_seconds: int = 60
+    wallet_deposit_poll_enabled: bool = True
+    wallet_deposit_poll_interval_seconds: float = 15.0
+    wallet_deposit_poll_batch_size: int = 256
+    wallet_pending_confirmation_max_age_minutes: int = 1440
     wallet_btc_provider_url: str = "https://blockstream.info/api"
     wallet_eth_rpc_url: str = "https://rpc.flashbots.net"
     wallet_sol_rpc_url: str = "https://api.mainnet-beta.solana.com"
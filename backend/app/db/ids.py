@@ -0,0 +1,61 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# UUIDv7 (RFC 9562) rendered as 32 hex chars so it fits the existing String(32) keys:
+# 48-bit unix milliseconds | version 7 | 12-bit sequence | variant | 62 random bits.
+# Keys minted later sort later, so B-tree inserts land on the right edge of the index.
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def _format(unix_ms: int, sequence: int, tail: int) -> str:
+    value = (unix_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= (sequence & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= tail & 0x3FFFFFFFFFFFFFFF
+    return f"{value:032x}"
+
+
+def new_id() -> str:
+    """Time-ordered id; strictly increasing within this process, even inside one millisecond."""
+    global _last_ms, _sequence
+    tail = int.from_bytes(os.urandom(8), "big")
+    with _lock:
+        unix_ms = time.time_ns() // 1_000_000
+        if unix_ms > _last_ms:
+            _last_ms = unix_ms
+            _sequence = int.from_bytes(os.urandom(2), "big") & 0x3FF
+        else:
+            # Same (or earlier, after a clock step) millisecond: keep counting from the last key.
+            _sequence += 1
+            if _sequence > 0xFFF:
+                _last_ms += 1
+                _sequence = 0
+            unix_ms = _last_ms
+        return _format(unix_ms, _sequence, tail)
+
+
+def deterministic_id(at: datetime, key: str) -> str:
+    """Time-ordered id that is a pure function of (`at`, `key`), for idempotent replays."""
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=10).digest()
+    unix_ms = int(at.timestamp() * 1000)
+    return _format(unix_ms, int.from_bytes(digest[:2], "big"), int.from_bytes(digest[2:], "big"))
+
+
+def id_timestamp(value: str) -> datetime | None:
+    """Creation time encoded in a time-ordered id, or None for legacy uuid4 keys."""
+    if len(value) != 32 or value[12] != "7":
+        return None
+    try:
+        unix_ms = int(value[:12], 16)
+    except ValueError:
+        return None
+    return datetime.fromtimestamp(unix_ms / 1000, tz=timezone.utc)
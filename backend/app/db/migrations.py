@@ -1,9 +1,26 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
 from sqlalchemy import inspect, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant shared by every API process, so only one of them migrates at a time.
+_PG_MIGRATION_LOCK_KEY = 7_310_551
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Engine], None]
 
 
-def ensure_runtime_schema(engine: Engine) -> None:
-    # Lightweight runtime migration for local dev SQLite databases.
+def _add_runtime_columns(engine: Engine) -> None:
+    # Columns added after the first SQLite dev databases were created.
     with engine.begin() as connection:
         inspector = inspect(connection)
         tables = set(inspector.get_table_names())
@@ -64,3 +81,163 @@ def ensure_runtime_schema(engine: Engine) -> None:
         connection.execute(
             text("CREATE INDEX IF NOT EXISTS ix_users_login_locked_until ON users(login_locked_until)")
         )
+
+        if "round_logs" in tables:
+            blob_type = "BYTEA" if connection.dialect.name == "postgresql" else "BLOB"
+            round_log_columns = {column["name"] for column in inspector.get_columns("round_logs")}
+            if "round_id" not in round_log_columns:
+                connection.execute(text("ALTER TABLE round_logs ADD COLUMN round_id VARCHAR(32)"))
+            for column_name in ("player_cards", "dealer_cards", "actions"):
+                if column_name not in round_log_columns:
+                    connection.execute(text(f"ALTER TABLE round_logs ADD COLUMN {column_name} {blob_type}"))
+            connection.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_round_logs_round_id ON round_logs(round_id)")
+            )
+
+
+def compact_legacy_round_logs(engine: Engine, batch_size: int = 2000) -> int:
+    """Re-encode round logs written as JSON text into the compact blob columns.
+
+    Walks the table in primary-key order, so rows that cannot be encoded are left as JSON and
+    not revisited. Returns the number of rows converted.
+    """
+    from app.services.round_log_codec import compact_legacy_payload
+
+    converted = 0
+    last_id = ""
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text(
+                    "SELECT id, player_cards_json, dealer_cards_json, actions_json FROM round_logs "
+                    "WHERE player_cards IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if len(rows) == 0:
+                return converted
+            last_id = rows[-1][0]
+
+            updates = []
+            for row_id, player_cards_json, dealer_cards_json, actions_json in rows:
+                payload = compact_legacy_payload(player_cards_json, dealer_cards_json, actions_json)
+                if payload is not None:
+                    updates.append({"id": row_id, **payload})
+            if updates:
+                connection.execute(
+                    text(
+                        "UPDATE round_logs SET round_id = COALESCE(round_id, :round_id), "
+                        "player_cards = :player_cards, dealer_cards = :dealer_cards, actions = :actions, "
+                        "player_cards_json = '', dealer_cards_json = '', actions_json = '' WHERE id = :id"
+                    ),
+                    updates,
+                )
+                converted += len(updates)
+
+
+# (name, table, columns); mirrored by the Index() declarations in app/db/models.py.
+HOT_PATH_INDEXES: tuple[tuple[str, str, str], ...] = (
+    ("ix_round_logs_user_ended", "round_logs", "user_id, ended_at, id"),
+    ("ix_round_logs_user_created", "round_logs", "user_id, created_at"),
+    ("ix_round_logs_created_at", "round_logs", "created_at"),
+    ("ix_wallet_transactions_user_created", "wallet_transactions", "user_id, created_at, id"),
+    ("ix_wallet_transactions_type_status_created", "wallet_transactions", "tx_type, status, created_at"),
+    ("ix_friend_requests_recipient_status_created", "friend_requests", "recipient_id, status, created_at"),
+    ("ix_friend_requests_sender_status_created", "friend_requests", "sender_id, status, created_at"),
+    ("ix_table_invites_recipient_status_created", "table_invites", "recipient_id, status, created_at"),
+    ("ix_table_invites_sender_status_created", "table_invites", "sender_id, status, created_at"),
+    ("ix_security_events_user_created", "security_events", "user_id, created_at, id"),
+    ("ix_admin_audit_logs_created", "admin_audit_logs", "created_at, id"),
+    ("ix_user_sessions_user_last_seen", "user_sessions", "user_id, last_seen_at"),
+)
+
+
+def _create_hot_path_indexes(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        with engine.begin() as connection:
+            for name, table, columns in HOT_PATH_INDEXES:
+                connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block, and builds one index per statement
+    # without taking a write lock on the table.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name, table, columns in HOT_PATH_INDEXES:
+            valid = connection.execute(
+                text("SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+                {"name": name},
+            ).scalar()
+            if valid is False:
+                # Left behind by an interrupted concurrent build; IF NOT EXISTS would keep it forever.
+                connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+# Append only. Each step must be safe to re-run: the version row is written after it finishes.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "runtime_columns", _add_runtime_columns),
+    Migration(2, "compact_legacy_round_logs", compact_legacy_round_logs),
+    Migration(3, "hot_path_indexes", _create_hot_path_indexes),
+)
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def _ensure_version_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def current_version(connection: Connection) -> int:
+    return int(connection.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar() or 0)
+
+
+def _apply_pending(engine: Engine) -> list[int]:
+    # Imported via models so every table is registered on the metadata.
+    from app.db.models import Base
+
+    with engine.begin() as connection:
+        version = current_version(connection)
+    pending = [migration for migration in MIGRATIONS if migration.version > version]
+    if len(pending) == 0:
+        return []
+
+    # Tables added by newer models; a model change therefore ships with a migration bumping the version.
+    Base.metadata.create_all(bind=engine)
+    applied: list[int] = []
+    for migration in pending:
+        logger.info("applying schema migration %s (%s)", migration.version, migration.name)
+        migration.apply(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                {"version": migration.version, "name": migration.name, "applied_at": datetime.now(timezone.utc)},
+            )
+        applied.append(migration.version)
+    return applied
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Bring the schema up to LATEST_VERSION and return the versions applied.
+
+    An up-to-date database costs one CREATE TABLE IF NOT EXISTS and one SELECT; no
+    metadata reflection or create_all runs unless something is pending.
+    """
+    with engine.begin() as connection:
+        _ensure_version_table(connection)
+        if current_version(connection) >= LATEST_VERSION:
+            return []
+
+    if engine.dialect.name != "postgresql":
+        return _apply_pending(engine)
+    with engine.connect() as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _PG_MIGRATION_LOCK_KEY})
+        lock_connection.commit()
+        try:
+            return _apply_pending(engine)
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_MIGRATION_LOCK_KEY})
+            lock_connection.commit()
@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, Float, Index, Integer, LargeBinary, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.ids import new_id
 
 
 class User(Base):
@@ -39,17 +40,29 @@ class User(Base):
 
 class RoundLog(Base):
     __tablename__ = "round_logs"
+    __table_args__ = (
+        Index("ix_round_logs_user_ended", "user_id", "ended_at", "id"),
+        Index("ix_round_logs_user_created", "user_id", "created_at"),
+        Index("ix_round_logs_created_at", "created_at"),
+    )
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
     user_id: Mapped[str] = mapped_column(String(32), index=True)
     bet: Mapped[float] = mapped_column(Float)
     result: Mapped[str] = mapped_column(String(20))
     payout: Mapped[float] = mapped_column(Float)
     player_score: Mapped[int] = mapped_column(Integer)
     dealer_score: Mapped[int] = mapped_column(Integer)
-    player_cards_json: Mapped[str] = mapped_column(Text)
-    dealer_cards_json: Mapped[str] = mapped_column(Text)
-    actions_json: Mapped[str] = mapped_column(Text)
+    round_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+    # Compact encodings (see app/services/round_log_codec.py). Multiplayer rows leave
+    # `actions` empty and share one RoundActionLog per round_id.
+    player_cards: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    dealer_cards: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    actions: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Legacy JSON text, only populated on rows that could not be compacted.
+    player_cards_json: Mapped[str] = mapped_column(Text, default="")
+    dealer_cards_json: Mapped[str] = mapped_column(Text, default="")
+    actions_json: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -58,6 +71,16 @@ class RoundLog(Base):
     )
 
 
+class RoundActionLog(Base):
+    __tablename__ = "round_action_logs"
+
+    round_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    actions: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
 class Friendship(Base):
     __tablename__ = "friendships"
     __table_args__ = (UniqueConstraint("user_id", "friend_id", name="uq_friendships_pair"),)
@@ -72,6 +95,10 @@ class Friendship(Base):
 
 class FriendRequest(Base):
     __tablename__ = "friend_requests"
+    __table_args__ = (
+        Index("ix_friend_requests_recipient_status_created", "recipient_id", "status", "created_at"),
+        Index("ix_friend_requests_sender_status_created", "sender_id", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
     sender_id: Mapped[str] = mapped_column(String(32), index=True)
@@ -85,6 +112,10 @@ class FriendRequest(Base):
 
 class TableInvite(Base):
     __tablename__ = "table_invites"
+    __table_args__ = (
+        Index("ix_table_invites_recipient_status_created", "recipient_id", "status", "created_at"),
+        Index("ix_table_invites_sender_status_created", "sender_id", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
     sender_id: Mapped[str] = mapped_column(String(32), index=True)
@@ -100,8 +131,9 @@ class TableInvite(Base):
 
 class AdminAuditLog(Base):
     __tablename__ = "admin_audit_logs"
+    __table_args__ = (Index("ix_admin_audit_logs_created", "created_at", "id"),)
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
     actor_user_id: Mapped[str] = mapped_column(String(32), index=True)
     actor_role: Mapped[str] = mapped_column(String(20))
     command_text: Mapped[str] = mapped_column(String(500))
@@ -148,9 +180,13 @@ class WalletLink(Base):
 
 class WalletTransaction(Base):
     __tablename__ = "wallet_transactions"
-    __table_args__ = (UniqueConstraint("chain", "tx_hash", name="uq_wallet_transactions_chain_hash"),)
+    __table_args__ = (
+        UniqueConstraint("chain", "tx_hash", name="uq_wallet_transactions_chain_hash"),
+        Index("ix_wallet_transactions_user_created", "user_id", "created_at", "id"),
+        Index("ix_wallet_transactions_type_status_created", "tx_type", "status", "created_at"),
+    )
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
     user_id: Mapped[str] = mapped_column(String(32), index=True)
     wallet_link_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
     tx_type: Mapped[str] = mapped_column(String(20), index=True)
@@ -179,9 +215,12 @@ class WalletTransaction(Base):
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
-    __table_args__ = (UniqueConstraint("token_jti", name="uq_user_sessions_token_jti"),)
+    __table_args__ = (
+        UniqueConstraint("token_jti", name="uq_user_sessions_token_jti"),
+        Index("ix_user_sessions_user_last_seen", "user_id", "last_seen_at"),
+    )
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
     user_id: Mapped[str] = mapped_column(String(32), index=True)
     token_jti: Mapped[str] = mapped_column(String(64), index=True)
     ip_address: Mapped[str] = mapped_column(String(64), default="")
@@ -212,8 +251,9 @@ class EmailVerificationToken(Base):
 
 class SecurityEvent(Base):
     __tablename__ = "security_events"
+    __table_args__ = (Index("ix_security_events_user_created", "user_id", "created_at", "id"),)
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid4().hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
     user_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
     event_type: Mapped[str] = mapped_column(String(60), index=True)
     severity: Mapped[str] = mapped_column(String(20), default="info")
@@ -223,3 +263,66 @@ class SecurityEvent(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
+
+
+class BalanceLedgerEntry(Base):
+    __tablename__ = "balance_ledger"
+    __table_args__ = (UniqueConstraint("idempotency_key", name="uq_balance_ledger_idempotency_key"),)
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
+    user_id: Mapped[str] = mapped_column(String(32), index=True)
+    delta: Mapped[float] = mapped_column(Float)
+    balance_after: Mapped[float] = mapped_column(Float)
+    reason: Mapped[str] = mapped_column(String(40), index=True)
+    reference_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    idempotency_key: Mapped[str] = mapped_column(String(120))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+
+class RoundLogMonthlyStat(Base):
+    """Per-user, per-month round totals kept after the month's round logs are archived."""
+
+    __tablename__ = "round_log_monthly_stats"
+    __table_args__ = (UniqueConstraint("user_id", "month", name="uq_round_log_monthly_stats_user_month"),)
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
+    user_id: Mapped[str] = mapped_column(String(32), index=True)
+    month: Mapped[str] = mapped_column(String(7), index=True)
+    total_games: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+    losses: Mapped[int] = mapped_column(Integer, default=0)
+    pushes: Mapped[int] = mapped_column(Integer, default=0)
+    blackjacks: Mapped[int] = mapped_column(Integer, default=0)
+    total_bet: Mapped[float] = mapped_column(Float, default=0.0)
+    total_payout: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ArchiveSegment(Base):
+    __tablename__ = "archive_segments"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=new_id)
+    table_name: Mapped[str] = mapped_column(String(40), index=True)
+    month: Mapped[str] = mapped_column(String(7), index=True)
+    path: Mapped[str] = mapped_column(String(500))
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    min_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    max_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ArchiveSegmentUser(Base):
+    """Which archive segments hold rows for a user, so admin lookups open only those files."""
+
+    __tablename__ = "archive_segment_users"
+
+    segment_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(32), primary_key=True, index=True)
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,18 +1,72 @@
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
 
 settings = get_settings()
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+is_sqlite = settings.database_url.startswith("sqlite")
+connect_args = {"check_same_thread": False} if is_sqlite else {}
 engine = create_engine(
     settings.database_url,
     connect_args=connect_args,
     pool_pre_ping=True,
 )
+
+
+def _is_memory_database(url: str) -> bool:
+    return url in {"sqlite://", "sqlite:///:memory:"} or "mode=memory" in url
+
+
+def apply_sqlite_pragmas(dbapi_connection, *, read_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.sqlite_wal_enabled:
+            # Readers no longer block the writer (and vice versa); NORMAL only fsyncs at checkpoints.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={max(0, int(settings.sqlite_busy_timeout_ms))}")
+        cursor.execute(f"PRAGMA cache_size=-{max(0, int(settings.sqlite_cache_size_kib))}")
+        cursor.execute(f"PRAGMA mmap_size={max(0, int(settings.sqlite_mmap_size_bytes))}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+if is_sqlite and not _is_memory_database(settings.database_url):
+    event.listen(engine, "connect", lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection))
+
+# True when reads go to a separate server that may lag behind the primary.
+has_replica = bool(settings.database_replica_url)
+if has_replica:
+    read_engine = create_engine(
+        settings.database_replica_url,
+        connect_args={"check_same_thread": False} if settings.database_replica_url.startswith("sqlite") else {},
+        pool_pre_ping=True,
+    )
+elif is_sqlite and not _is_memory_database(settings.database_url):
+    # Separate pool for read-only work so list/stat queries never queue behind writers. The
+    # connections open the same file (a mode=ro URI cannot recover a WAL left by a crashed
+    # writer) and are locked down with query_only instead.
+    read_engine = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        pool_size=max(1, settings.sqlite_read_pool_size),
+        pool_pre_ping=True,
+    )
+    event.listen(
+        read_engine,
+        "connect",
+        lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, read_only=True),
+    )
+else:
+    read_engine = engine
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, class_=Session)
 
 
 def get_db() -> Generator[Session, None, None]:
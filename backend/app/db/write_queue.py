@@ -0,0 +1,156 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, is_sqlite, settings
+
+logger = logging.getLogger(__name__)
+
+WriteJob = Callable[[Session], Any]
+
+
+class WriteQueue:
+    """Single writer thread that runs small write jobs in batched transactions.
+
+    SQLite allows one writer at a time; many request threads each opening their own write
+    transaction mostly wait on (or fail with) `database is locked`. Jobs submitted here are
+    drained by one thread, each in its own SAVEPOINT so a failing job only rolls back itself,
+    and the whole batch is committed once.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_batch: int = 100) -> None:
+        self._session_factory = session_factory
+        self._max_batch = max(1, int(max_batch))
+        self._jobs: queue.Queue[tuple[WriteJob, Future] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self.stats = {"batches": 0, "jobs": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def backlog(self) -> int:
+        return self._jobs.qsize()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="db-write-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if not self.running:
+            return
+        self._jobs.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, job: WriteJob) -> Future:
+        """Queue `job(db)`; the future resolves with its return value once the batch commits.
+
+        When the queue is not running the job runs inline in a fresh session.
+        """
+        future: Future = Future()
+        if not self.running:
+            self._run_inline(job, future)
+            return future
+        self._jobs.put((job, future))
+        return future
+
+    def run(self, job: WriteJob, timeout: float | None = 10.0) -> Any:
+        return self.submit(job).result(timeout)
+
+    def _run_inline(self, job: WriteJob, future: Future) -> None:
+        db = self._session_factory()
+        try:
+            result = job(db)
+            db.commit()
+            future.set_result(result)
+        except Exception as exc:
+            db.rollback()
+            future.set_exception(exc)
+        finally:
+            db.close()
+
+    def _next_batch(self) -> tuple[list[tuple[WriteJob, Future]], bool]:
+        first = self._jobs.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        stopping = False
+        while len(batch) < self._max_batch:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        return batch, stopping
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[tuple[WriteJob, Future]]) -> None:
+        results: list[tuple[Future, Any]] = []
+        db = self._session_factory()
+        try:
+            if db.get_bind().dialect.name == "sqlite":
+                # Take the write lock up front (waiting up to busy_timeout) and keep pysqlite from
+                # committing at the first RELEASE, so the SAVEPOINTs below share one transaction.
+                db.execute(text("BEGIN IMMEDIATE"))
+            for job, future in batch:
+                try:
+                    with db.begin_nested():
+                        result = job(db)
+                except Exception as exc:
+                    # Also covers a job whose rows only fail at the flush on savepoint release.
+                    self.stats["failed"] += 1
+                    _fail(future, exc)
+                    continue
+                results.append((future, result))
+            db.commit()
+        except Exception as exc:
+            logger.exception("write batch of %s jobs failed to commit", len(batch))
+            db.rollback()
+            for future, _ in results:
+                _fail(future, exc)
+            return
+        finally:
+            db.close()
+        self.stats["batches"] += 1
+        self.stats["jobs"] += len(results)
+        for future, result in results:
+            if not future.done():
+                future.set_result(result)
+
+
+def _fail(future: Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+write_queue = WriteQueue(SessionLocal, max_batch=settings.sqlite_write_batch_size)
+
+
+def start_write_queue() -> bool:
+    """Start the shared writer on SQLite deployments; other databases keep writing inline."""
+    if not (is_sqlite and settings.sqlite_write_queue_enabled):
+        return False
+    write_queue.start()
+    return True
+
+
+def stop_write_queue(timeout: float = 5.0) -> None:
+    write_queue.stop(timeout)
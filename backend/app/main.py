@@ -4,12 +4,25 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.routes import router as api_router
+from app.api.routes.lobby import LOBBY_VERSION_HEADER
 from app.core.config import get_settings
 from app.core.request_meta import extract_client_ip
-from app.db.base import Base
-from app.db.migrations import ensure_runtime_schema
+from app.db.migrations import run_migrations
 from app.db.session import engine
-from app.realtime.socket_server import build_socket_app
+from app.db.write_queue import start_write_queue, stop_write_queue
+from app.realtime.socket_server import (
+    build_socket_app,
+    grant_restored_players_grace,
+    notify_balance_updated,
+    start_settlement_journal,
+    start_state_snapshots,
+    stop_settlement_journal,
+    stop_state_snapshots,
+)
+from app.services.chain_provider_client import provider_pool
+from app.services.deposit_confirmation_service import start_deposit_poller, stop_deposit_poller
+from app.services.lobby_service import lobby_service
+from app.services.pagination import NEXT_CURSOR_HEADER
 from app.services.rate_limit_service import rate_limit_service
 
 settings = get_settings()
@@ -22,7 +35,7 @@ class ApiRateLimitMiddleware(BaseHTTPMiddleware):
         if not settings.rate_limit_enabled:
             return await call_next(request)
 
-        if request.url.path.endswith("/health"):
+        if request.url.path.endswith(("/health", "/health/runtime")):
             return await call_next(request)
 
         client_ip = extract_client_ip(request)
@@ -71,14 +84,39 @@ api_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", LOBBY_VERSION_HEADER],
 )
 api_app.include_router(api_router, prefix=settings.api_prefix)
 
 
 @api_app.on_event("startup")
 def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    ensure_runtime_schema(engine)
+    run_migrations(engine)
+    start_write_queue()
+    start_settlement_journal()
+    lobby_service.restore()
+    lobby_service.start_persistence()
+
+
+@api_app.on_event("startup")
+async def start_background_tasks() -> None:
+    await start_state_snapshots()
+    grant_restored_players_grace()
+    start_deposit_poller(notify=notify_balance_updated)
+
+
+@api_app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    await stop_state_snapshots()
+    await stop_deposit_poller()
+
+
+@api_app.on_event("shutdown")
+def on_shutdown() -> None:
+    stop_settlement_journal()
+    stop_write_queue()
+    lobby_service.stop_persistence()
+    provider_pool.close()
 
 
 app = build_socket_app(api_app)
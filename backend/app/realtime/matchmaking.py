@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+# Upper bounds of the stake buckets; a stake falls in the first bucket whose bound covers it.
+STAKE_BUCKET_BOUNDS: tuple[float, ...] = (10.0, 50.0, 200.0, 1000.0)
+MIN_TABLE_SIZE = 2
+MAX_TABLE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class QueueKey:
+    stake_bucket: int
+    table_size: int
+
+
+@dataclass
+class QueueTicket:
+    user_id: str
+    stake: float
+    key: QueueKey
+    enqueued_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class SeatAssignment:
+    """Players to seat together: at `table_id`, or at a new table when it is None."""
+
+    key: QueueKey
+    tickets: list[QueueTicket]
+    table_id: str | None = None
+
+
+def stake_bucket(stake: float, bounds: tuple[float, ...] = STAKE_BUCKET_BOUNDS) -> int:
+    for index, bound in enumerate(bounds):
+        if stake <= bound:
+            return index
+    return len(bounds) - 1
+
+
+def stake_range(bucket: int, bounds: tuple[float, ...] = STAKE_BUCKET_BOUNDS) -> tuple[float, float]:
+    low = bounds[bucket - 1] if bucket > 0 else 0.0
+    return low, bounds[bucket]
+
+
+class MatchmakingQueue:
+    """Quick-seat queues bucketed by stake range and table size.
+
+    Each queue is an OrderedDict, so enqueue, cancel and FIFO draining are O(1) per player and
+    a tick is linear in the players it seats. `assign` fills the open seats offered for a queue
+    first, then groups the rest into new tables of up to `table_size`; a player left on their
+    own keeps waiting.
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = STAKE_BUCKET_BOUNDS) -> None:
+        self._bounds = bounds
+        self._queues: dict[QueueKey, OrderedDict[str, QueueTicket]] = {}
+        self._ticket_by_user: dict[str, QueueTicket] = {}
+
+    def __len__(self) -> int:
+        return len(self._ticket_by_user)
+
+    def key_for(self, stake: float, table_size: int) -> QueueKey:
+        size = max(MIN_TABLE_SIZE, min(MAX_TABLE_SIZE, int(table_size)))
+        return QueueKey(stake_bucket=stake_bucket(stake, self._bounds), table_size=size)
+
+    def stake_range(self, key: QueueKey) -> tuple[float, float]:
+        return stake_range(key.stake_bucket, self._bounds)
+
+    def enqueue(self, user_id: str, stake: float, table_size: int) -> QueueTicket:
+        """Queue `user_id`, replacing any ticket they already hold (which loses its place)."""
+        self.cancel(user_id)
+        ticket = QueueTicket(user_id=user_id, stake=stake, key=self.key_for(stake, table_size))
+        self._queues.setdefault(ticket.key, OrderedDict())[user_id] = ticket
+        self._ticket_by_user[user_id] = ticket
+        return ticket
+
+    def cancel(self, user_id: str) -> QueueTicket | None:
+        ticket = self._ticket_by_user.pop(user_id, None)
+        if ticket is None:
+            return None
+        queue = self._queues.get(ticket.key)
+        if queue is not None:
+            queue.pop(user_id, None)
+            if not queue:
+                self._queues.pop(ticket.key, None)
+        return ticket
+
+    def ticket(self, user_id: str) -> QueueTicket | None:
+        return self._ticket_by_user.get(user_id)
+
+    def waiting(self, key: QueueKey) -> int:
+        return len(self._queues.get(key, {}))
+
+    def assign(self, open_seats: Callable[[QueueKey], list[tuple[str, int]]]) -> list[SeatAssignment]:
+        """Dequeue every player that can be seated this tick.
+
+        `open_seats(key)` lists `(table_id, free_seats)` for tables that may take players from
+        that queue.
+        """
+        assignments: list[SeatAssignment] = []
+        for key in list(self._queues):
+            queue = self._queues[key]
+            for table_id, free_seats in open_seats(key):
+                if not queue:
+                    break
+                tickets = self._take(queue, free_seats)
+                if tickets:
+                    assignments.append(SeatAssignment(key=key, tickets=tickets, table_id=table_id))
+            while len(queue) >= MIN_TABLE_SIZE:
+                assignments.append(SeatAssignment(key=key, tickets=self._take(queue, key.table_size)))
+            if not queue:
+                self._queues.pop(key, None)
+        return assignments
+
+    def _take(self, queue: OrderedDict[str, QueueTicket], count: int) -> list[QueueTicket]:
+        tickets: list[QueueTicket] = []
+        while queue and len(tickets) < count:
+            user_id, ticket = queue.popitem(last=False)
+            self._ticket_by_user.pop(user_id, None)
+            tickets.append(ticket)
+        return tickets
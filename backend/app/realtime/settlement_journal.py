@@ -0,0 +1,347 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.db.ids import deterministic_id
+from app.db.models import RoundActionLog, RoundLog
+from app.realtime.table_engine import HandSettlement, RoundSettlement
+from app.services.ledger_service import BalanceChange, apply_balance_changes
+from app.services.round_log_codec import encode_cards, encode_round_actions
+
+logger = logging.getLogger(__name__)
+
+MAX_COMMIT_ATTEMPTS = 5
+# Rewrite the journal without its committed prefix once that prefix reaches this size.
+COMPACT_AFTER_BYTES = 1 << 20
+
+
+def round_log_id(settlement: RoundSettlement, hand_position: int) -> str:
+    # Deterministic (and still time-ordered) ids make a replayed settlement insert nothing new.
+    return deterministic_id(settlement.ended_at, f"table-round-log:{settlement.round_id}:{hand_position}")
+
+
+def settlement_to_record(settlement: RoundSettlement) -> dict:
+    record = asdict(settlement)
+    record["started_at"] = settlement.started_at.isoformat()
+    record["ended_at"] = settlement.ended_at.isoformat()
+    return record
+
+
+def settlement_from_record(record: dict) -> RoundSettlement:
+    return RoundSettlement(
+        round_id=record["round_id"],
+        table_id=record["table_id"],
+        dealer_cards=list(record["dealer_cards"]),
+        dealer_score=int(record["dealer_score"]),
+        payout_by_user={user_id: float(payout) for user_id, payout in record["payout_by_user"].items()},
+        hands=[HandSettlement(**hand) for hand in record["hands"]],
+        actions_by_user={user_id: list(actions) for user_id, actions in record["actions_by_user"].items()},
+        started_at=datetime.fromisoformat(record["started_at"]),
+        ended_at=datetime.fromisoformat(record["ended_at"]),
+    )
+
+
+def record_failed_settlement(journal_path: str, settlement: RoundSettlement) -> str:
+    """Append `settlement` to the `.failed` file next to the journal for manual replay; returns its path."""
+    failed_path = f"{journal_path}.failed"
+    directory = os.path.dirname(os.path.abspath(failed_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(failed_path, "a", encoding="utf-8") as failed:
+        failed.write(json.dumps(settlement_to_record(settlement), separators=(",", ":")) + "\n")
+    return failed_path
+
+
+def persist_settlements(db: Session, settlements: list[RoundSettlement]) -> None:
+    """Apply payouts and bulk-insert round logs for many rounds; the caller commits.
+
+    Safe to call again with settlements that were already written: payouts are keyed in
+    the balance ledger, round logs use deterministic ids and the shared action blob is keyed
+    by round id.
+    """
+    apply_balance_changes(
+        db,
+        [
+            BalanceChange(
+                user_id=user_id,
+                delta=total_payout,
+                reason="table_round",
+                idempotency_key=f"table_round:{settlement.round_id}:{user_id}",
+                reference_id=settlement.round_id,
+            )
+            for settlement in settlements
+            for user_id, total_payout in settlement.payout_by_user.items()
+        ],
+    )
+
+    rows_by_id: dict[str, dict] = {}
+    action_blobs: dict[str, bytes] = {}
+    for settlement in settlements:
+        dealer_cards = encode_cards(settlement.dealer_cards)
+        action_blobs[settlement.round_id] = encode_round_actions(settlement.actions_by_user, settlement.round_id)
+        for position, hand in enumerate(settlement.hands):
+            log_id = round_log_id(settlement, position)
+            rows_by_id[log_id] = {
+                "id": log_id,
+                "user_id": hand.user_id,
+                "bet": hand.bet,
+                "result": hand.result,
+                "payout": hand.payout,
+                "player_score": hand.player_score,
+                "dealer_score": settlement.dealer_score,
+                "round_id": settlement.round_id,
+                "player_cards": encode_cards(hand.player_cards),
+                "dealer_cards": dealer_cards,
+                "actions": None,
+                "created_at": settlement.started_at,
+                "ended_at": settlement.ended_at,
+            }
+
+    if action_blobs:
+        existing_rounds = set(
+            db.scalars(select(RoundActionLog.round_id).where(RoundActionLog.round_id.in_(list(action_blobs))))
+        )
+        action_rows = [
+            {"round_id": round_id, "actions": blob}
+            for round_id, blob in action_blobs.items()
+            if round_id not in existing_rounds
+        ]
+        if action_rows:
+            db.execute(insert(RoundActionLog), action_rows)
+
+    if len(rows_by_id) == 0:
+        return
+
+    existing_ids = set(db.scalars(select(RoundLog.id).where(RoundLog.id.in_(list(rows_by_id)))))
+    rows = [row for log_id, row in rows_by_id.items() if log_id not in existing_ids]
+    if rows:
+        db.execute(insert(RoundLog), rows)
+
+
+class SettlementJournal:
+    """Append-only file of finished table rounds, drained into the database by one writer thread.
+
+    `submit` only appends a JSON line and returns, so settlement never waits on the database.
+    The writer fsyncs the file, then commits everything queued so far in a single transaction.
+    Each queued round remembers where its line ends in the file; once the committed prefix
+    grows past `compact_after_bytes` it is cut off (or the whole file is truncated when
+    nothing is queued), so a writer that never fully catches up still keeps the file small.
+    Anything left in it on startup is replayed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        session_factory: Callable[[], Session],
+        max_batch: int = 200,
+        group_commit_seconds: float = 0.05,
+        max_retry_seconds: float = 5.0,
+        compact_after_bytes: int = COMPACT_AFTER_BYTES,
+    ) -> None:
+        self.path = path
+        self._session_factory = session_factory
+        self._max_batch = max(1, max_batch)
+        self._group_commit_seconds = max(0.0, group_commit_seconds)
+        self._max_retry_seconds = max(0.05, max_retry_seconds)
+        self._compact_after_bytes = max(0, compact_after_bytes)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # Queued rounds with the offset just past their line in the journal file.
+        self._pending: list[tuple[RoundSettlement, int]] = []
+        self._in_flight = 0
+        self._written = 0
+        self._file = None
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.stats = {
+            "appended": 0,
+            "committed": 0,
+            "batches": 0,
+            "retries": 0,
+            "replayed": 0,
+            "failed": 0,
+            "compactions": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> int:
+        """Queue rounds left over from a previous run, then start the writer. Returns the replay count."""
+        if self.running:
+            return 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        replayed, written = self._read_journal()
+        self._stopping = False
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Drop a torn final line so the next append starts on a line of its own.
+        self._file.truncate(written)
+        with self._lock:
+            self._written = written
+            self._pending[:0] = replayed
+            self.stats["replayed"] += len(replayed)
+        self._thread = threading.Thread(target=self._run, name="settlement-journal", daemon=True)
+        self._thread.start()
+        return len(replayed)
+
+    def submit(self, settlement: RoundSettlement) -> None:
+        line = json.dumps(settlement_to_record(settlement), separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._written += len(line.encode("utf-8")) + 1
+            self._pending.append((settlement, self._written))
+            self.stats["appended"] += 1
+            self._changed.notify_all()
+
+    def backlog(self) -> int:
+        with self._lock:
+            return len(self._pending) + self._in_flight
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every submitted round is committed (or `timeout` passes)."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_journal(self) -> tuple[list[RoundSettlement], int]:
+        """Queued rounds with their end offsets, and the offset just past the last whole line."""
+        if not os.path.exists(self.path):
+            return [], 0
+        settlements: list[tuple[RoundSettlement, int]] = []
+        offset = 0
+        with open(self.path, "rb") as journal:
+            for raw in journal:
+                if not raw.endswith(b"\n"):
+                    # A torn final line from a crash mid-write carries no committed state.
+                    break
+                offset += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    settlements.append((settlement_from_record(json.loads(line)), offset))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return settlements, offset
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopping:
+                    self._changed.wait()
+                if not self._pending:
+                    return
+                batch_is_full = len(self._pending) >= self._max_batch
+            if not batch_is_full and self._group_commit_seconds > 0 and not self._stopping:
+                time.sleep(self._group_commit_seconds)
+
+            with self._lock:
+                batch = self._pending[: self._max_batch]
+                del self._pending[: self._max_batch]
+                self._in_flight = len(batch)
+                self._file.flush()
+                journal_fd = self._file.fileno()
+            # One fsync covers every line in the batch; appends may continue meanwhile.
+            os.fsync(journal_fd)
+
+            committed = self._commit_with_retry([settlement for settlement, _ in batch])
+
+            with self._lock:
+                self._in_flight = 0
+                self.stats["batches"] += 1
+                if committed is not None:
+                    self.stats["committed"] += committed
+                    self._compact_locked(batch[-1][1])
+                self._changed.notify_all()
+
+    def _compact_locked(self, done_offset: int) -> None:
+        """Drop the journal up to `done_offset`, the end of the last round that needs no replay."""
+        if not self._pending:
+            self._file.truncate(0)
+            self._written = 0
+            return
+        if done_offset < self._compact_after_bytes:
+            return
+        self._file.flush()
+        scratch = f"{self.path}.tmp"
+        with open(self.path, "rb") as journal, open(scratch, "wb") as rewritten:
+            journal.seek(done_offset)
+            while chunk := journal.read(1 << 16):
+                rewritten.write(chunk)
+            rewritten.flush()
+            os.fsync(rewritten.fileno())
+        os.replace(scratch, self.path)
+        self._file.close()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._written -= done_offset
+        self._pending = [(settlement, offset - done_offset) for settlement, offset in self._pending]
+        self.stats["compactions"] += 1
+
+    def _commit_with_retry(self, batch: list[RoundSettlement]) -> int | None:
+        """Commit `batch`, returning how many rounds landed (the rest go to `.failed`).
+
+        Returns None when stopping cuts the retries short; the batch then stays in the journal
+        and the next startup replays it.
+        """
+        delay = 0.05
+        for attempt in range(MAX_COMMIT_ATTEMPTS):
+            if self._commit(batch):
+                return len(batch)
+            self.stats["retries"] += 1
+            if self._stopping or attempt == MAX_COMMIT_ATTEMPTS - 1:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, self._max_retry_seconds)
+
+        if self._stopping:
+            return None
+        committed = 0
+        for settlement in batch:
+            if self._commit([settlement]):
+                committed += 1
+            else:
+                self._reject(settlement)
+        return committed
+
+    def _commit(self, batch: list[RoundSettlement]) -> bool:
+        db = self._session_factory()
+        try:
+            persist_settlements(db, batch)
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def _reject(self, settlement: RoundSettlement) -> None:
+        self.stats["failed"] += 1
+        failed_path = record_failed_settlement(self.path, settlement)
+        logger.error("could not persist table round %s; kept in %s", settlement.round_id, failed_path)
@@ -1,7 +1,7 @@
 import asyncio
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-import json
+import logging
 import re
 import shlex
 from urllib.parse import parse_qs
@@ -12,8 +12,37 @@ from sqlalchemy import select
 
 from app.core.config import get_settings
 from app.core.security import decode_access_token_payload
-from app.db.models import RoundLog, User
+from app.db.models import User
 from app.db.session import SessionLocal
+from app.db.write_queue import write_queue
+from app.realtime.matchmaking import MatchmakingQueue, QueueKey, QueueTicket
+from app.realtime.settlement_journal import SettlementJournal, persist_settlements, record_failed_settlement
+from app.realtime.state_snapshot import (
+    SnapshotStore,
+    deadline_after,
+    decode_snapshot,
+    encode_snapshot,
+    pack_cards,
+    seconds_until,
+    turn_state_from_record,
+    turn_state_to_record,
+    unpack_cards,
+)
+from app.realtime.table_engine import (
+    RoundSettlement,
+    TableHandState,
+    TablePlayerState,
+    TableTurnState,
+    apply_action,
+    available_actions as _available_actions_for_current_turn,
+    current_turn_hand as _current_turn_hand,
+    current_turn_player_state as _current_turn_player_state,
+    current_turn_user_id as _current_turn_user_id,
+    position_to_next_playable_turn as _position_to_next_playable_turn,
+    record_turn_action as _record_turn_action,
+    settle_round,
+    start_round,
+)
 from app.schemas.lobby import TableCreateRequest
 from app.services.admin_service import (
     adjust_user_balance,
@@ -23,10 +52,15 @@ from app.services.admin_service import (
     write_audit_log,
 )
 from app.services.auth_service import get_active_user_session_by_id, get_user_by_email
-from app.services.blackjack_service import build_deck, card_value, hand_score, natural_blackjack
+from app.services.basic_strategy import RuleSet, recommend_action
+from app.services.blackjack_service import card_value, hand_score
 from app.services.lobby_service import LobbyTable, lobby_service
 from app.services.profanity_service import MAX_CHAT_MESSAGE_LENGTH, sanitize_chat_message
 from app.services.rate_limit_service import rate_limit_service
+from app.services.read_routing_service import read_routing_service
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
 
 sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
 
@@ -34,7 +68,6 @@ settings = get_settings()
 TURN_SECONDS = max(5, settings.multiplayer_turn_seconds)
 TIMER_TICK_SECONDS = max(0.5, settings.multiplayer_timer_tick_seconds)
 RECONNECT_GRACE_SECONDS = max(5, settings.multiplayer_reconnect_grace_seconds)
-MAX_ACTION_LOG_ITEMS = 80
 MAX_ACTION_IDS_PER_TABLE = 300
 MAX_CHAT_HISTORY_ITEMS = 120
 MAX_REACTION_EMOJI_LENGTH = 16
@@ -47,7 +80,8 @@ ACTION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
 DEFAULT_TABLE_BET = 10.0
 MIN_TABLE_BET = 1.0
 MAX_TABLE_BET = 1000.0
-MAX_TABLE_PLAYER_HANDS = 2
+TABLE_STRATEGY_RULES = RuleSet(double_after_split=True, late_surrender=False)
+MATCHMAKING_DEFAULT_TABLE_SIZE = 4
 
 
 @dataclass
@@ -57,55 +91,6 @@ class ConnectionIdentity:
     role: str
 
 
-@dataclass
-class TableHandState:
-    hand_id: str
-    cards: list[str]
-    bet: float
-    status: str = "active"
-    result: str | None = None
-    payout: float | None = None
-    is_split_hand: bool = False
-    doubled_down: bool = False
-
-
-@dataclass
-class TablePlayerState:
-    user_id: str
-    hands: list[TableHandState]
-    active_hand_index: int = 0
-    completed: bool = False
-    base_bet: float = 0.0
-    bankroll_at_start: float = 0.0
-    committed_bet: float = 0.0
-    total_payout: float = 0.0
-    insurance_bet: float = 0.0
-    insurance_decided: bool = False
-    insurance_payout: float = 0.0
-
-
-@dataclass
-class TableTurnState:
-    table_id: str
-    players: list[str]
-    turn_index: int
-    turn_seconds: int
-    turn_deadline: datetime
-    round_id: str = field(default_factory=lambda: uuid4().hex)
-    status: str = "active"
-    hand_number: int = 1
-    phase: str = "player_turns"
-    dealer_cards: list[str] = field(default_factory=list)
-    dealer_hidden: bool = True
-    shoe: list[str] = field(default_factory=list)
-    player_states: dict[str, TablePlayerState] = field(default_factory=dict)
-    last_action: dict | None = None
-    action_log: list[dict] = field(default_factory=list)
-    processed_action_ids: dict[str, datetime] = field(default_factory=dict)
-    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-
-
 @dataclass
 class ChatMessage:
     id: str
@@ -132,7 +117,12 @@ _table_chat_banned: dict[str, set[str]] = {}
 _sid_last_reaction_at: dict[str, datetime] = {}
 _sid_client_ip: dict[str, str] = {}
 _locked_tables: set[str] = set()
+_matchmaking = MatchmakingQueue()
+_matchmade_tables: dict[QueueKey, dict[str, None]] = {}
 _turn_timer_task: asyncio.Task | None = None
+_event_loop_lag_ms: dict[str, float] = {"last": 0.0, "max": 0.0, "samples": 0}
+_settlement_journal: SettlementJournal | None = None
+_snapshot_task: asyncio.Task | None = None
 
 
 def _utc_now() -> datetime:
@@ -143,6 +133,10 @@ def _table_room(table_id: str) -> str:
     return f"table:{table_id}"
 
 
+def _user_room(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
 def _next_deadline(seconds: int) -> datetime:
     return _utc_now() + timedelta(seconds=seconds)
 
@@ -371,16 +365,6 @@ def _normalize_table_bet(raw_value: object) -> float:
     return max(MIN_TABLE_BET, min(MAX_TABLE_BET, value))
 
 
-def _card_rank(card: str) -> str:
-    return card[:-1]
-
-
-def _draw_table_card(state: TableTurnState) -> str:
-    if len(state.shoe) == 0:
-        state.shoe = build_deck()
-    return state.shoe.pop()
-
-
 def _set_forced_shoe_draw_order(table_id: str, draw_order: list[str]) -> None:
     # Test helper: cards are consumed via pop(), so reverse the desired draw order.
     normalized_table_id = table_id.strip()
@@ -401,131 +385,6 @@ def _clear_forced_shoe(table_id: str | None = None) -> None:
     _table_forced_shoes.pop(table_id.strip(), None)
 
 
-def _current_turn_user_id(state: TableTurnState) -> str | None:
-    if state.status != "active" or state.phase != "player_turns" or len(state.players) == 0:
-        return None
-    index = state.turn_index % len(state.players)
-    return state.players[index]
-
-
-def _current_turn_player_state(state: TableTurnState) -> TablePlayerState | None:
-    user_id = _current_turn_user_id(state)
-    if not user_id:
-        return None
-    return state.player_states.get(user_id)
-
-
-def _current_turn_hand(state: TableTurnState) -> TableHandState | None:
-    player_state = _current_turn_player_state(state)
-    if not player_state:
-        return None
-    if player_state.active_hand_index < 0 or player_state.active_hand_index >= len(player_state.hands):
-        return None
-    return player_state.hands[player_state.active_hand_index]
-
-
-def _hand_is_playable(hand: TableHandState) -> bool:
-    return hand.status == "active" and hand.result is None and hand_score(hand.cards) < 21
-
-
-def _can_split_hand(player_state: TablePlayerState, hand: TableHandState) -> bool:
-    if len(player_state.hands) >= MAX_TABLE_PLAYER_HANDS:
-        return False
-    if hand.status != "active" or hand.result is not None or len(hand.cards) != 2:
-        return False
-    if _card_rank(hand.cards[0]) != _card_rank(hand.cards[1]):
-        return False
-    projected_bet = round(player_state.committed_bet + hand.bet, 2)
-    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
-
-
-def _can_double_down(player_state: TablePlayerState, hand: TableHandState) -> bool:
-    if hand.status != "active" or hand.result is not None or len(hand.cards) != 2:
-        return False
-    if hand.doubled_down:
-        return False
-    projected_bet = round(player_state.committed_bet + hand.bet, 2)
-    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
-
-
-def _insurance_bet_amount(player_state: TablePlayerState) -> float:
-    return round(max(0.0, player_state.base_bet / 2), 2)
-
-
-def _can_take_insurance(state: TableTurnState, player_state: TablePlayerState, hand: TableHandState) -> bool:
-    if len(state.dealer_cards) == 0 or _card_rank(state.dealer_cards[0]) != "A":
-        return False
-    if not state.dealer_hidden:
-        return False
-    if player_state.insurance_decided:
-        return False
-    if hand.status != "active" or hand.result is not None:
-        return False
-    if player_state.active_hand_index != 0 or len(hand.cards) != 2:
-        return False
-    insurance_bet = _insurance_bet_amount(player_state)
-    if insurance_bet <= 0:
-        return False
-    projected_bet = round(player_state.committed_bet + insurance_bet, 2)
-    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
-
-
-def _can_surrender(hand: TableHandState) -> bool:
-    if hand.status != "active" or hand.result is not None:
-        return False
-    if hand.is_split_hand or hand.doubled_down:
-        return False
-    if len(hand.cards) != 2:
-        return False
-    return hand_score(hand.cards) < 21
-
-
-def _available_actions_for_current_turn(state: TableTurnState) -> list[str]:
-    if state.status != "active" or state.phase != "player_turns":
-        return []
-    player_state = _current_turn_player_state(state)
-    hand = _current_turn_hand(state)
-    if not player_state or not hand or not _hand_is_playable(hand):
-        return []
-    actions = ["hit", "stand"]
-    if _can_double_down(player_state, hand):
-        actions.append("double_down")
-    if _can_split_hand(player_state, hand):
-        actions.append("split")
-    if _can_surrender(hand):
-        actions.append("surrender")
-    if _can_take_insurance(state, player_state, hand):
-        actions.append("insurance")
-    return actions
-
-
-def _is_soft_hand(cards: list[str]) -> bool:
-    if not any(_card_rank(card) == "A" for card in cards):
-        return False
-    low_total = sum(1 if _card_rank(card) == "A" else card_value(card) for card in cards)
-    return hand_score(cards) > low_total
-
-
-def _should_split(player_cards: list[str], dealer_upcard: str) -> bool:
-    rank = _card_rank(player_cards[0])
-    if rank in {"A", "8"}:
-        return True
-    if rank == "5":
-        return False
-    split_map = {
-        "2": {"2", "3", "4", "5", "6", "7"},
-        "3": {"2", "3", "4", "5", "6", "7"},
-        "4": {"5", "6"},
-        "6": {"2", "3", "4", "5", "6"},
-        "7": {"2", "3", "4", "5", "6", "7"},
-        "9": {"2", "3", "4", "5", "6", "8", "9"},
-    }
-    valid_dealer_ranks = split_map.get(rank)
-    if not valid_dealer_ranks:
-        return False
-    return _card_rank(dealer_upcard) in valid_dealer_ranks
-
-
 def _recommended_basic_strategy_action(state: TableTurnState) -> str | None:
     available_actions = _available_actions_for_current_turn(state)
     if len(available_actions) == 0:
@@ -534,66 +393,7 @@ def _recommended_basic_strategy_action(state: TableTurnState) -> str | None:
     hand = _current_turn_hand(state)
     if not hand or len(hand.cards) == 0 or len(state.dealer_cards) == 0:
         return None
-
-    player_cards = list(hand.cards)
-    dealer_upcard = state.dealer_cards[0]
-    player_score = hand_score(player_cards)
-    dealer_up_value = card_value(dealer_upcard)
-
-    move = "stand" if player_score >= 19 else None
-
-    can_split = (
-        len(player_cards) == 2
-        and _card_rank(player_cards[0]) == _card_rank(player_cards[1])
-        and "split" in available_actions
-    )
-    if move is None and can_split and _should_split(player_cards, dealer_upcard):
-        move = "split"
-
-    if move is None and _is_soft_hand(player_cards):
-        soft_table = {
-            13: "  hhhddhhhhh",
-            14: "  hhhddhhhhh",
-            15: "  hhdddhhhhh",
-            16: "  hhdddhhhhh",
-            17: "  hddddhhhhh",
-            18: "  sddddsshhh",
-        }
-        if player_score in soft_table and 0 <= dealer_up_value < len(soft_table[player_score]):
-            code = soft_table[player_score][dealer_up_value]
-            move = {"h": "hit", "s": "stand", "d": "double_down"}.get(code, "hit")
-        elif player_score >= 19:
-            move = "stand"
-        else:
-            move = "hit"
-    elif move is None:
-        hard_table = {
-            9: "  hdddhhhhhh",
-            10: "  ddddddddhh",
-            11: "  dddddddddh",
-            12: "  hhssshhhhh",
-            13: "  ssssshhhhh",
-            14: "  ssssshhhhh",
-            15: "  ssssshhhhh",
-            16: "  ssssshhhhh",
-        }
-        if player_score <= 8:
-            move = "hit"
-        elif player_score >= 17:
-            move = "stand"
-        elif player_score in hard_table and 0 <= dealer_up_value < len(hard_table[player_score]):
-            code = hard_table[player_score][dealer_up_value]
-            move = {"h": "hit", "s": "stand", "d": "double_down"}.get(code, "hit")
-        else:
-            move = "hit"
-
-    if move == "double_down" and "double_down" not in available_actions:
-        return "hit" if "hit" in available_actions else "stand"
-    if move == "split" and "split" not in available_actions:
-        return "hit" if "hit" in available_actions else "stand"
-    if move not in available_actions:
-        return "hit" if "hit" in available_actions else available_actions[0]
-    return move
+    return recommend_action(hand.cards, state.dealer_cards[0], available_actions, TABLE_STRATEGY_RULES)
 
 
 def _visible_dealer_cards(state: TableTurnState) -> list[str]:
@@ -636,26 +436,6 @@ def _remaining_seconds(deadline: datetime) -> int:
     return max(0, int((deadline - _utc_now()).total_seconds() + 0.999))
 
 
-def _record_turn_action(
-    state: TableTurnState,
-    action: str,
-    user_id: str | None = None,
-    metadata: dict | None = None,
-) -> None:
-    entry = {
-        "user_id": user_id,
-        "action": action,
-        "at": _utc_now().isoformat(),
-    }
-    if metadata:
-        entry["meta"] = metadata
-    state.last_action = entry
-    state.action_log.append(entry)
-    if len(state.action_log) > MAX_ACTION_LOG_ITEMS:
-        state.action_log = state.action_log[-MAX_ACTION_LOG_ITEMS:]
-    state.updated_at = _utc_now()
-
-
 def _track_turn_action_id(state: TableTurnState, action_id: str | None) -> bool:
     if action_id is None:
         return False
@@ -744,7 +524,7 @@ def _idle_turn_state_payload(table_id: str) -> dict:
 
 
 def _serialize_table(table: LobbyTable) -> dict:
-    payload = asdict(table)
+    payload = table.to_dict()
     players = payload["players"]
     ready_players = [player_id for player_id in players if player_id in _table_ready.get(table.id, set())]
     online_players = [player_id for player_id in players if player_id in _user_to_sids]
@@ -875,177 +655,236 @@ def _load_user_balances(user_ids: list[str]) -> dict[str, float]:
         db.close()
 
 
-def _position_to_next_playable_turn(state: TableTurnState) -> bool:
-    if len(state.players) == 0:
-        return False
+def start_settlement_journal() -> SettlementJournal | None:
+    global _settlement_journal
+    if not settings.multiplayer_settlement_journal_enabled:
+        return None
+    if _settlement_journal is not None and _settlement_journal.running:
+        return _settlement_journal
+    journal = SettlementJournal(
+        settings.multiplayer_settlement_journal_path,
+        session_factory=lambda: SessionLocal(),
+        max_batch=settings.multiplayer_settlement_batch_size,
+        group_commit_seconds=settings.multiplayer_settlement_group_commit_seconds,
+    )
+    journal.start()
+    _settlement_journal = journal
+    return journal
 
-    if state.turn_index < 0 or state.turn_index >= len(state.players):
-        state.turn_index = 0
 
-    examined_players = 0
-    while examined_players < len(state.players):
-        user_id = state.players[state.turn_index]
-        player_state = state.player_states.get(user_id)
-        if not player_state:
-            state.turn_index = (state.turn_index + 1) % len(state.players)
-            examined_players += 1
-            continue
+def stop_settlement_journal(timeout: float = 5.0) -> None:
+    global _settlement_journal
+    journal = _settlement_journal
+    _settlement_journal = None
+    if journal is not None:
+        journal.flush(timeout)
+        journal.stop(timeout)
 
-        while player_state.active_hand_index < len(player_state.hands):
-            hand = player_state.hands[player_state.active_hand_index]
-            if _hand_is_playable(hand):
-                player_state.completed = False
-                state.turn_deadline = _next_deadline(state.turn_seconds)
-                state.updated_at = _utc_now()
-                return True
-            player_state.active_hand_index += 1
 
-        player_state.completed = True
-        state.turn_index = (state.turn_index + 1) % len(state.players)
-        examined_players += 1
+def capture_realtime_state() -> dict:
+    """The table, round and chat state a restarted process needs; deadlines as seconds left.
 
-    return False
+    Runs on the event loop without awaiting, so the copy is consistent.
+    """
+    now = _utc_now()
+    return {
+        "taken_at": now.isoformat(),
+        "tables": [table.to_dict() for table in lobby_service.list_tables()],
+        "turn_states": {table_id: turn_state_to_record(state, now) for table_id, state in _table_turn_states.items()},
+        "ready": {table_id: sorted(user_ids) for table_id, user_ids in _table_ready.items() if user_ids},
+        "pending_bets": {table_id: dict(bets) for table_id, bets in _table_pending_bets.items() if bets},
+        "forced_shoes": {table_id: pack_cards(cards) for table_id, cards in _table_forced_shoes.items()},
+        "chat_messages": {
+            table_id: [_serialize_chat_message(entry) for entry in entries]
+            for table_id, entries in _table_chat_messages.items()
+            if entries
+        },
+        "muted_for": {
+            table_id: {user_id: seconds_until(until, now) for user_id, until in muted.items() if until > now}
+            for table_id, muted in _table_chat_muted_until.items()
+        },
+        "banned": {table_id: sorted(user_ids) for table_id, user_ids in _table_chat_banned.items() if user_ids},
+        "locked_tables": sorted(_locked_tables),
+        "reconnect_in": {user_id: seconds_until(deadline, now) for user_id, deadline in _reconnect_deadlines.items()},
+        "matchmade_tables": [
+            [key.stake_bucket, key.table_size, table_id]
+            for key, table_ids in _matchmade_tables.items()
+            for table_id in table_ids
+        ],
+    }
 
 
-def _settle_table_round(state: TableTurnState, completion_reason: str) -> None:
-    if state.phase == "settled":
-        return
+def restore_realtime_state(snapshot: dict) -> int:
+    """Load a `capture_realtime_state` copy into this process; returns the rounds resumed.
+
+    Deadlines restart from the seconds that were left, so the downtime does not count against a
+    turn or a mute. No one is connected yet, so every seated player gets the reconnect grace (or
+    what was left of it, if they were already offline) before being evicted.
+    """
+    now = _utc_now()
+    lobby_service.restore_tables([LobbyTable.from_dict(table) for table in snapshot.get("tables", [])])
+    live_tables = {table.id: table for table in lobby_service.list_tables()}
+
+    resumed = 0
+    for table_id, record in snapshot.get("turn_states", {}).items():
+        if table_id in live_tables and table_id not in _table_turn_states:
+            _table_turn_states[table_id] = turn_state_from_record(record, now)
+            resumed += 1
+    for table_id, user_ids in snapshot.get("ready", {}).items():
+        if table_id in live_tables:
+            _table_ready.setdefault(table_id, set()).update(user_ids)
+    for table_id, bets in snapshot.get("pending_bets", {}).items():
+        if table_id in live_tables:
+            _table_pending_bets.setdefault(table_id, {}).update(bets)
+    for table_id, packed in snapshot.get("forced_shoes", {}).items():
+        _table_forced_shoes.setdefault(table_id, unpack_cards(packed))
+    for table_id, entries in snapshot.get("chat_messages", {}).items():
+        if table_id in live_tables and table_id not in _table_chat_messages:
+            _table_chat_messages[table_id] = [
+                ChatMessage(**{**entry, "created_at": datetime.fromisoformat(entry["created_at"])})
+                for entry in entries
+            ]
+    for table_id, muted in snapshot.get("muted_for", {}).items():
+        if table_id in live_tables and muted:
+            table_muted = _table_chat_muted_until.setdefault(table_id, {})
+            for user_id, seconds in muted.items():
+                table_muted.setdefault(user_id, deadline_after(seconds, now))
+    for table_id, user_ids in snapshot.get("banned", {}).items():
+        if table_id in live_tables:
+            _table_chat_banned.setdefault(table_id, set()).update(user_ids)
+    _locked_tables.update(table_id for table_id in snapshot.get("locked_tables", []) if table_id in live_tables)
+    for bucket, table_size, table_id in snapshot.get("matchmade_tables", []):
+        if table_id in live_tables:
+            _matchmade_tables.setdefault(QueueKey(bucket, table_size), {})[table_id] = None
+
+    reconnect_in = snapshot.get("reconnect_in", {})
+    for table in live_tables.values():
+        for user_id in table.players:
+            if user_id not in _user_to_sids and user_id not in _reconnect_deadlines:
+                _reconnect_deadlines[user_id] = deadline_after(
+                    reconnect_in.get(user_id, RECONNECT_GRACE_SECONDS), now
+                )
+    return resumed
 
-    state.phase = "dealer_turn"
-    state.dealer_hidden = False
 
-    dealer_has_blackjack = natural_blackjack(state.dealer_cards)
-    has_live_player_hand = any(
-        hand.result not in {"bust", "surrender"}
-        for player_state in state.player_states.values()
-        for hand in player_state.hands
-    )
-    if not dealer_has_blackjack and has_live_player_hand:
-        while hand_score(state.dealer_cards) < 17:
-            state.dealer_cards.append(_draw_table_card(state))
-            _record_turn_action(
-                state,
-                action="dealer_hit",
-                metadata={"dealer_score": hand_score(state.dealer_cards)},
-            )
+def grant_restored_players_grace() -> int:
+    """Give seated players who are not connected the reconnect grace; returns how many got it.
 
-    dealer_score = hand_score(state.dealer_cards)
-    payout_by_user: dict[str, float] = {}
-    now = _utc_now()
+    Tables restored from Redis keep their players whether or not a snapshot loaded; without a
+    deadline, players who never come back would hold their seats (and the table) forever.
+    """
+    granted = 0
+    for table in lobby_service.list_tables():
+        for user_id in table.players:
+            if user_id not in _user_to_sids and user_id not in _reconnect_deadlines:
+                _set_reconnect_deadline(user_id)
+                granted += 1
+    if granted:
+        _ensure_turn_timer_task()
+    return granted
 
-    for user_id, player_state in state.player_states.items():
-        total_payout = 0.0
-        player_state.completed = True
-        if player_state.active_hand_index >= len(player_state.hands):
-            player_state.active_hand_index = max(0, len(player_state.hands) - 1)
-
-        for hand in player_state.hands:
-            if hand.result == "bust":
-                hand.status = "resolved"
-                hand.payout = round(-hand.bet, 2)
-                total_payout += hand.payout
-                continue
-            if hand.result == "surrender":
-                hand.status = "resolved"
-                hand.payout = round(-(hand.bet / 2), 2)
-                total_payout += hand.payout
-                continue
 
-            player_score = hand_score(hand.cards)
-            player_has_blackjack = natural_blackjack(hand.cards) and not hand.is_split_hand
-
-            if player_has_blackjack and dealer_has_blackjack:
-                hand.result = "push"
-                hand.payout = 0.0
-            elif player_has_blackjack:
-                hand.result = "blackjack"
-                hand.payout = round(hand.bet * 1.5, 2)
-            elif dealer_has_blackjack:
-                hand.result = "lose"
-                hand.payout = round(-hand.bet, 2)
-            elif dealer_score > 21:
-                hand.result = "win"
-                hand.payout = round(hand.bet, 2)
-            elif player_score > dealer_score:
-                hand.result = "win"
-                hand.payout = round(hand.bet, 2)
-            elif player_score < dealer_score:
-                hand.result = "lose"
-                hand.payout = round(-hand.bet, 2)
-            else:
-                hand.result = "push"
-                hand.payout = 0.0
-
-            hand.status = "resolved"
-            total_payout += hand.payout
-
-        insurance_payout = 0.0
-        if player_state.insurance_bet > 0:
-            insurance_payout = (
-                round(player_state.insurance_bet * 2, 2)
-                if dealer_has_blackjack
-                else round(-player_state.insurance_bet, 2)
-            )
-            total_payout += insurance_payout
-        player_state.insurance_payout = round(insurance_payout, 2)
-        player_state.total_payout = round(total_payout, 2)
-        payout_by_user[user_id] = player_state.total_payout
+def _snapshot_store() -> SnapshotStore:
+    use_redis = str(settings.multiplayer_snapshot_target or "").strip().lower() == "redis"
+    return SnapshotStore(settings.multiplayer_snapshot_path, redis=get_redis_client() if use_redis else None)
 
-    db = SessionLocal()
+
+def save_state_snapshot(store: SnapshotStore | None = None) -> bool:
     try:
-        users = db.scalars(select(User).where(User.id.in_(list(payout_by_user.keys())))).all()
-        user_by_id = {user.id: user for user in users}
+        (store or _snapshot_store()).save(encode_snapshot(capture_realtime_state()))
+        return True
+    except Exception:
+        logger.exception("realtime snapshot failed")
+        return False
 
-        for user_id, total_payout in payout_by_user.items():
-            user = user_by_id.get(user_id)
-            if user is not None:
-                user.balance = round(max(0.0, float(user.balance) + total_payout), 2)
-                db.add(user)
 
-            player_state = state.player_states.get(user_id)
-            if not player_state:
-                continue
+def load_state_snapshot(store: SnapshotStore | None = None) -> int | None:
+    """Restore the saved snapshot unless it is older than `MULTIPLAYER_SNAPSHOT_MAX_AGE_SECONDS`.
 
-            user_actions = [
-                entry["action"]
-                for entry in state.action_log
-                if entry.get("user_id") == user_id and isinstance(entry.get("action"), str)
-            ]
-            user_actions.append(f"table_round:{state.round_id}")
-
-            for hand in player_state.hands:
-                result = hand.result or "unknown"
-                if result in {"bust", "surrender"}:
-                    result = "lose"
-                log = RoundLog(
-                    user_id=user_id,
-                    bet=hand.bet,
-                    result=result,
-                    payout=round(hand.payout or 0.0, 2),
-                    player_score=hand_score(hand.cards),
-                    dealer_score=dealer_score,
-                    player_cards_json=json.dumps(hand.cards),
-                    dealer_cards_json=json.dumps(state.dealer_cards),
-                    actions_json=json.dumps(user_actions),
-                    created_at=state.started_at,
-                    ended_at=now,
-                )
-                db.add(log)
+    Returns the number of rounds resumed, or None when there was nothing usable to restore.
+    """
+    try:
+        blob = (store or _snapshot_store()).load()
+        snapshot = decode_snapshot(blob) if blob else None
+    except ValueError as exc:
+        logger.warning("ignoring realtime snapshot: %s", exc)
+        return None
+    except Exception:
+        logger.exception("realtime snapshot could not be read")
+        return None
+    if snapshot is None:
+        return None
+    age = (_utc_now() - datetime.fromisoformat(snapshot["taken_at"])).total_seconds()
+    if age > settings.multiplayer_snapshot_max_age_seconds:
+        return None
+    resumed = restore_realtime_state(snapshot)
+    if _reconnect_deadlines or _table_turn_states:
+        _ensure_turn_timer_task()
+    return resumed
+
+
+async def _snapshot_loop(store: SnapshotStore) -> None:
+    interval = max(0.5, float(settings.multiplayer_snapshot_interval_seconds))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            state = capture_realtime_state()
+            await asyncio.to_thread(lambda: store.save(encode_snapshot(state)))
+        except Exception:
+            logger.exception("realtime snapshot failed")
+
+
+async def start_state_snapshots() -> int | None:
+    """Resume from the last snapshot, then keep taking one every interval."""
+    global _snapshot_task
+    if not settings.multiplayer_snapshot_enabled:
+        return None
+    store = _snapshot_store()
+    resumed = load_state_snapshot(store)
+    if _snapshot_task is None or _snapshot_task.done():
+        _snapshot_task = asyncio.get_running_loop().create_task(_snapshot_loop(store))
+    return resumed
+
+
+async def stop_state_snapshots() -> None:
+    """Stop the periodic snapshots and take a final one (uvicorn runs this on SIGTERM)."""
+    global _snapshot_task
+    task, _snapshot_task = _snapshot_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    save_state_snapshot()
+
+
+def _persist_round_settlement(settlement: RoundSettlement) -> None:
+    for user_id in settlement.payout_by_user:
+        read_routing_service.mark_write(user_id)
+    journal = _settlement_journal
+    if journal is not None and journal.running:
+        journal.submit(settlement)
+        return
 
+    db = SessionLocal()
+    try:
+        persist_settlements(db, [settlement])
         db.commit()
     except Exception:
         db.rollback()
+        # Payouts are keyed in the ledger, so the kept record can be replayed safely later.
+        failed_path = record_failed_settlement(settings.multiplayer_settlement_journal_path, settlement)
+        logger.exception("could not persist table round %s; kept in %s", settlement.round_id, failed_path)
     finally:
         db.close()
 
-    state.phase = "settled"
-    state.status = "ended"
-    state.turn_deadline = _next_deadline(state.turn_seconds)
-    _record_turn_action(
-        state,
-        action="round_settled",
-        metadata={"reason": completion_reason, "dealer_score": dealer_score},
-    )
+
+def _settle_table_round(state: TableTurnState, completion_reason: str) -> None:
+    result = settle_round(state, completion_reason)
+    if result.settlement is not None:
+        _persist_round_settlement(result.settlement)
 
 
 def _apply_table_action(
@@ -1054,106 +893,10 @@ def _apply_table_action(
     action: str,
     timed_out: bool = False,
 ) -> tuple[bool, str | None]:
-    if state.status != "active" or state.phase != "player_turns":
-        return False, "no active round"
-    if user_id != _current_turn_user_id(state):
-        return False, "not your turn"
-
-    player_state = _current_turn_player_state(state)
-    hand = _current_turn_hand(state)
-    if not player_state or not hand:
-        return False, "no active hand"
-    if not _hand_is_playable(hand):
-        return False, "hand is already resolved"
-
-    allowed_actions = _available_actions_for_current_turn(state)
-    if action not in allowed_actions:
-        return False, "action not allowed"
-
-    hand_index = player_state.active_hand_index
-    metadata = {
-        "hand_index": hand_index,
-        "hand_id": hand.hand_id,
-        "timed_out": timed_out,
-    }
-
-    if action != "insurance" and _can_take_insurance(state, player_state, hand):
-        player_state.insurance_decided = True
-        metadata["insurance_auto_declined"] = True
-
-    if action == "insurance":
-        insurance_bet = _insurance_bet_amount(player_state)
-        player_state.insurance_bet = insurance_bet
-        player_state.insurance_decided = True
-        player_state.committed_bet = round(player_state.committed_bet + insurance_bet, 2)
-        metadata["insurance_bet"] = insurance_bet
-        _record_turn_action(state, action=action, user_id=user_id, metadata=metadata)
-        state.turn_deadline = _next_deadline(state.turn_seconds)
-        state.updated_at = _utc_now()
-        return False, None
-    if action == "stand":
-        hand.status = "stood"
-        player_state.active_hand_index += 1
-    elif action == "hit":
-        hand.cards.append(_draw_table_card(state))
-        score = hand_score(hand.cards)
-        metadata["score"] = score
-        if score > 21:
-            hand.status = "bust"
-            hand.result = "bust"
-            hand.payout = round(-hand.bet, 2)
-            player_state.active_hand_index += 1
-        elif score == 21:
-            hand.status = "stood"
-            player_state.active_hand_index += 1
-    elif action == "double_down":
-        extra_bet = hand.bet
-        hand.bet = round(hand.bet * 2, 2)
-        hand.doubled_down = True
-        player_state.committed_bet = round(player_state.committed_bet + extra_bet, 2)
-        hand.cards.append(_draw_table_card(state))
-        score = hand_score(hand.cards)
-        metadata["score"] = score
-        if score > 21:
-            hand.status = "bust"
-            hand.result = "bust"
-            hand.payout = round(-hand.bet, 2)
-        else:
-            hand.status = "stood"
-        player_state.active_hand_index += 1
-    elif action == "split":
-        split_bet = hand.bet
-        player_state.committed_bet = round(player_state.committed_bet + split_bet, 2)
-        left_card, right_card = hand.cards
-        hand.cards = [left_card, _draw_table_card(state)]
-        hand.is_split_hand = True
-
-        split_hand = TableHandState(
-            hand_id=uuid4().hex[:12],
-            cards=[right_card, _draw_table_card(state)],
-            bet=split_bet,
-            is_split_hand=True,
-        )
-        player_state.hands.insert(hand_index + 1, split_hand)
-        first_score = hand_score(hand.cards)
-        metadata["split_cards"] = [left_card, right_card]
-        if first_score == 21:
-            hand.status = "stood"
-            player_state.active_hand_index += 1
-    elif action == "surrender":
-        hand.status = "surrendered"
-        hand.result = "surrender"
-        hand.payout = round(-(hand.bet / 2), 2)
-        player_state.active_hand_index += 1
-
-    action_name = "turn_timeout_auto_stand" if timed_out else action
-    _record_turn_action(state, action=action_name, user_id=user_id, metadata=metadata)
-
-    if _position_to_next_playable_turn(state):
-        return False, None
-
-    _settle_table_round(state, completion_reason="all_player_hands_resolved")
-    return True, None
+    result = apply_action(state, user_id, action, timed_out=timed_out)
+    if result.settlement is not None:
+        _persist_round_settlement(result.settlement)
+    return result.round_completed, result.error
 
 
 def _start_table_game(table: LobbyTable) -> TableTurnState | None:
@@ -1162,62 +905,22 @@ def _start_table_game(table: LobbyTable) -> TableTurnState | None:
 
     players = list(table.players)
     pending_bets = _table_pending_bets.get(table.id, {})
-    user_balances = _load_user_balances(players)
     forced_shoe = _table_forced_shoes.pop(table.id, None)
-    state = TableTurnState(
+    result = start_round(
         table_id=table.id,
         players=players,
-        turn_index=0,
-        turn_seconds=TURN_SECONDS,
-        turn_deadline=_next_deadline(TURN_SECONDS),
-        hand_number=1,
-        shoe=list(forced_shoe) if forced_shoe else build_deck(),
-    )
-    for user_id in players:
-        bet = _normalize_table_bet(pending_bets.get(user_id, DEFAULT_TABLE_BET))
-        player_hand = TableHandState(
-            hand_id=uuid4().hex[:12],
-            cards=[],
-            bet=bet,
-        )
-        state.player_states[user_id] = TablePlayerState(
-            user_id=user_id,
-            hands=[player_hand],
-            base_bet=bet,
-            bankroll_at_start=max(
-                round(float(user_balances.get(user_id, bet)), 2),
-                bet,
-            ),
-            committed_bet=bet,
-        )
-
-    # Deal order: each player, dealer up, each player, dealer hole.
-    for user_id in players:
-        state.player_states[user_id].hands[0].cards.append(_draw_table_card(state))
-    state.dealer_cards.append(_draw_table_card(state))
-    for user_id in players:
-        state.player_states[user_id].hands[0].cards.append(_draw_table_card(state))
-    state.dealer_cards.append(_draw_table_card(state))
-    state.dealer_hidden = True
-
-    for player_state in state.player_states.values():
-        if natural_blackjack(player_state.hands[0].cards):
-            player_state.hands[0].status = "blackjack"
-            player_state.active_hand_index = 1
-
-    _record_turn_action(
-        state,
-        action="table_game_started",
-        metadata={
-            "players": len(players),
-            "round_id": state.round_id,
-            "dealer_upcard": state.dealer_cards[0] if state.dealer_cards else None,
+        bets={
+            user_id: _normalize_table_bet(pending_bets.get(user_id, DEFAULT_TABLE_BET))
+            for user_id in players
         },
+        balances=_load_user_balances(players),
+        turn_seconds=TURN_SECONDS,
+        shoe=forced_shoe,
     )
+    if result.settlement is not None:
+        _persist_round_settlement(result.settlement)
 
-    if not _position_to_next_playable_turn(state):
-        _settle_table_round(state, completion_reason="immediate_settle")
-
+    state = result.state
     _table_turn_states[table.id] = state
     _table_ready.pop(table.id, None)
     _table_pending_bets.pop(table.id, None)
@@ -1244,8 +947,14 @@ async def _emit_lobby_snapshot_for_sid(sid: str) -> None:
 
 
 async def _broadcast_lobby_snapshots() -> None:
-    for sid in list(_sid_to_identity):
-        await _emit_lobby_snapshot_for_sid(sid)
+    # Public tables are serialized once per broadcast; only a socket's own private table is
+    # added per recipient.
+    serialized_public = [_serialize_table(table) for table in lobby_service.public_tables()]
+    online_users = len(_user_to_sids)
+    for sid, identity in list(_sid_to_identity.items()):
+        private_table = lobby_service.private_table_for_user(identity.user_id)
+        tables = serialized_public if private_table is None else [*serialized_public, _serialize_table(private_table)]
+        await sio.emit("lobby_snapshot", {"tables": tables, "online_users": online_users}, room=sid)
 
 
 async def _emit_table_game_state(table_id: str) -> None:
@@ -1486,12 +1195,152 @@ async def _process_turn_timeouts() -> None:
             safety += 1
 
 
+def _serialize_queue_ticket(ticket: QueueTicket) -> dict:
+    low, high = _matchmaking.stake_range(ticket.key)
+    return {
+        "stake": ticket.stake,
+        "stake_range": [low, high],
+        "table_size": ticket.key.table_size,
+        "waiting": _matchmaking.waiting(ticket.key),
+        "enqueued_at": ticket.enqueued_at.isoformat(),
+    }
+
+
+def _matchmaking_open_seats(key: QueueKey) -> list[tuple[str, int]]:
+    """Quick-seat tables of this queue that can take players now, pruning closed ones."""
+    table_ids = _matchmade_tables.get(key)
+    if not table_ids:
+        return []
+    open_seats: list[tuple[str, int]] = []
+    for table_id in list(table_ids):
+        table = lobby_service.get_table(table_id)
+        if table is None:
+            table_ids.pop(table_id, None)
+            continue
+        if table_id in _table_turn_states or table_id in _locked_tables:
+            continue
+        free_seats = table.max_players - len(table.players)
+        if free_seats > 0:
+            open_seats.append((table_id, free_seats))
+    if not table_ids:
+        _matchmade_tables.pop(key, None)
+    return open_seats
+
+
+def _seat_matched_ticket(table_id: str, ticket: QueueTicket) -> bool:
+    if _is_user_banned(table_id, ticket.user_id) or lobby_service.join_table(table_id, ticket.user_id) is None:
+        # Back in the queue for the next tick, behind the players already waiting.
+        _matchmaking.enqueue(ticket.user_id, ticket.stake, ticket.key.table_size)
+        return False
+    return True
+
+
+def _previous_table_ids(tickets: list[QueueTicket]) -> dict[str, list[str]]:
+    return {ticket.user_id: lobby_service.table_ids_for_user(ticket.user_id) for ticket in tickets}
+
+
+async def _process_matchmaking() -> None:
+    """Seat the players queued for quick seat; one lobby broadcast covers the whole tick."""
+    if len(_matchmaking) == 0:
+        return
+    seated: list[tuple[str, QueueTicket]] = []
+    previous_table_ids: dict[str, list[str]] = {}
+    for assignment in _matchmaking.assign(_matchmaking_open_seats):
+        tickets = [ticket for ticket in assignment.tickets if ticket.user_id in _user_to_sids]
+        previous_table_ids.update(_previous_table_ids(tickets))
+        table_id = assignment.table_id
+        if table_id is None:
+            if len(tickets) < 2:
+                for ticket in tickets:
+                    _matchmaking.enqueue(ticket.user_id, ticket.stake, ticket.key.table_size)
+                continue
+            low, high = _matchmaking.stake_range(assignment.key)
+            owner = tickets.pop(0)
+            table = lobby_service.create_table(
+                owner.user_id,
+                TableCreateRequest(
+                    name=f"Quick Seat {low:g}-{high:g}",
+                    max_players=assignment.key.table_size,
+                    min_stake=max(MIN_TABLE_BET, low),
+                    max_stake=high,
+                ),
+            )
+            table_id = table.id
+            _matchmade_tables.setdefault(assignment.key, {})[table_id] = None
+            seated.append((table_id, owner))
+        seated.extend((table_id, ticket) for ticket in tickets if _seat_matched_ticket(table_id, ticket))
+    if not seated:
+        return
+
+    touched_table_ids: set[str] = set()
+    for table_id, ticket in seated:
+        user_id = ticket.user_id
+        touched_table_ids.add(table_id)
+        _clear_user_ready(user_id)
+        for previous_table_id in previous_table_ids.get(user_id, []):
+            if previous_table_id != table_id:
+                await _handle_player_removed_from_turn_state(previous_table_id, user_id)
+                touched_table_ids.add(previous_table_id)
+        for sid in list(_user_to_sids.get(user_id, ())):
+            previous_spectator_table_id = await _set_sid_spectator_table(sid, None)
+            if previous_spectator_table_id:
+                touched_table_ids.add(previous_spectator_table_id)
+            await _attach_sid_to_table_room(sid, table_id)
+            await _emit_table_chat_history(sid, table_id)
+        low, high = _matchmaking.stake_range(ticket.key)
+        await sio.emit(
+            "matchmaking_matched",
+            {
+                "table_id": table_id,
+                "stake": ticket.stake,
+                "stake_range": [low, high],
+                "table_size": ticket.key.table_size,
+            },
+            room=_user_room(user_id),
+        )
+        await sio.emit("table_joined", {"table_id": table_id}, room=_user_room(user_id))
+
+    for table_id in touched_table_ids:
+        await _emit_table_snapshot(table_id)
+        await _emit_table_game_state(table_id)
+    await _broadcast_lobby_snapshots()
+
+
+def _record_event_loop_lag(lag_seconds: float) -> None:
+    lag_ms = round(max(0.0, lag_seconds) * 1000.0, 2)
+    _event_loop_lag_ms["last"] = lag_ms
+    _event_loop_lag_ms["max"] = max(_event_loop_lag_ms["max"], lag_ms)
+    _event_loop_lag_ms["samples"] += 1
+
+
+def get_runtime_metrics(reset_peak: bool = False) -> dict:
+    metrics = {
+        "connections": len(_sid_to_identity),
+        "online_users": len(_user_to_sids),
+        "spectators": len(_sid_spectator_table),
+        "active_table_rounds": sum(1 for state in _table_turn_states.values() if state.status == "active"),
+        "timer_running": bool(_turn_timer_task and not _turn_timer_task.done()),
+        "event_loop_lag_ms": _event_loop_lag_ms["last"],
+        "event_loop_lag_max_ms": _event_loop_lag_ms["max"],
+        "event_loop_lag_samples": int(_event_loop_lag_ms["samples"]),
+        "settlement_backlog": _settlement_journal.backlog() if _settlement_journal is not None else 0,
+        "db_write_backlog": write_queue.backlog(),
+    }
+    if reset_peak:
+        _event_loop_lag_ms["max"] = _event_loop_lag_ms["last"]
+    return metrics
+
+
 async def _turn_timer_loop() -> None:
+    loop = asyncio.get_running_loop()
     while True:
+        expected_wake = loop.time() + TIMER_TICK_SECONDS
         await asyncio.sleep(TIMER_TICK_SECONDS)
+        _record_event_loop_lag(loop.time() - expected_wake)
         try:
             await _process_reconnect_deadlines()
             await _process_turn_timeouts()
+            await _process_matchmaking()
         except Exception:
             continue
 
@@ -1888,6 +1737,7 @@ async def connect(sid: str, environ: dict, auth: dict | None = None) -> bool:
     _ensure_turn_timer_task()
     _register_presence(sid, identity)
     _sid_client_ip[sid] = client_ip
+    await sio.enter_room(sid, _user_room(identity.user_id))
     _clear_reconnect_deadline(identity.user_id)
     await sio.save_session(
         sid,
@@ -1949,6 +1799,7 @@ async def disconnect(sid: str) -> None:
     table_ids = set(lobby_service.table_ids_for_user(identity.user_id))
     if identity.user_id not in _user_to_sids:
         _set_reconnect_deadline(identity.user_id)
+        _matchmaking.cancel(identity.user_id)
 
     if spectator_table_id:
         table_ids.add(spectator_table_id)
@@ -2001,6 +1852,7 @@ async def create_table(sid: str, data: dict) -> dict:
     previous_table_ids = set(lobby_service.table_ids_for_user(identity.user_id))
     previous_spectator_table_id = _sid_spectator_table.get(sid)
     table = lobby_service.create_table(identity.user_id, payload)
+    _matchmaking.cancel(identity.user_id)
     _clear_user_ready(identity.user_id)
     await _set_sid_spectator_table(sid, None)
     await _attach_sid_to_table_room(sid, table.id)
@@ -2062,6 +1914,7 @@ async def join_table(sid: str, data: dict) -> dict:
     if not table:
         return {"ok": False, "error": "Unable to join table"}
 
+    _matchmaking.cancel(identity.user_id)
     _clear_user_ready(identity.user_id)
     await _set_sid_spectator_table(sid, None)
     await _attach_sid_to_table_room(sid, table.id)
@@ -2108,6 +1961,35 @@ async def leave_table(sid: str, data: dict | None = None) -> dict:
     return {"ok": True}
 
 
+@sio.event
+async def join_matchmaking(sid: str, data: dict | None = None) -> dict:
+    identity = _sid_to_identity.get(sid)
+    if not identity:
+        return {"ok": False, "error": "unauthorized"}
+    if not _is_socket_event_allowed(sid, "join_matchmaking"):
+        return await _socket_rate_limited_payload(sid, "join_matchmaking")
+
+    stake = _normalize_table_bet((data or {}).get("stake", DEFAULT_TABLE_BET))
+    try:
+        table_size = int((data or {}).get("table_size", MATCHMAKING_DEFAULT_TABLE_SIZE))
+    except (TypeError, ValueError):
+        return {"ok": False, "error": "invalid table_size"}
+
+    ticket = _matchmaking.enqueue(identity.user_id, stake, table_size)
+    _ensure_turn_timer_task()
+    return {"ok": True, "queue": _serialize_queue_ticket(ticket)}
+
+
+@sio.event
+async def leave_matchmaking(sid: str, data: dict | None = None) -> dict:
+    identity = _sid_to_identity.get(sid)
+    if not identity:
+        return {"ok": False, "error": "unauthorized"}
+    if not _is_socket_event_allowed(sid, "leave_matchmaking"):
+        return await _socket_rate_limited_payload(sid, "leave_matchmaking")
+    return {"ok": True, "was_queued": _matchmaking.cancel(identity.user_id) is not None}
+
+
 @sio.event
 async def spectate_table(sid: str, data: dict | None = None) -> dict:
     identity = _sid_to_identity.get(sid)
@@ -2216,6 +2098,10 @@ async def set_ready(sid: str, data: dict | None = None) -> dict:
 
     ready = bool((data or {}).get("ready", True))
     bet = _normalize_table_bet((data or {}).get("bet", DEFAULT_TABLE_BET))
+    if ready and not table.accepts_stake(bet):
+        low = table.min_stake if table.min_stake is not None else MIN_TABLE_BET
+        high = table.max_stake if table.max_stake is not None else MAX_TABLE_BET
+        return {"ok": False, "error": f"bet must be between {low:g} and {high:g}"}
     ready_players = _table_ready.setdefault(table_id, set())
     if ready:
         ready_players.add(identity.user_id)
@@ -2612,14 +2498,24 @@ async def notify_role_updated(user_id: str, role: str) -> None:
 
 
 async def notify_balance_updated(user_id: str, balance: float) -> None:
-    for user_sid, sid_identity in list(_sid_to_identity.items()):
-        if sid_identity.user_id != user_id:
-            continue
-        await sio.emit(
+    await notify_balances_updated({user_id: balance})
+
+
+async def notify_balances_updated(balances: dict[str, float]) -> None:
+    """One pass over the connected sockets for any number of users; emits run concurrently."""
+    if not balances:
+        return
+    emits = [
+        sio.emit(
             "balance_updated",
-            {"user_id": user_id, "balance": float(balance)},
+            {"user_id": sid_identity.user_id, "balance": float(balances[sid_identity.user_id])},
             room=user_sid,
         )
+        for user_sid, sid_identity in list(_sid_to_identity.items())
+        if sid_identity.user_id in balances
+    ]
+    if emits:
+        await asyncio.gather(*emits)
 
 
 def build_socket_app(api_app) -> socketio.ASGIApp:
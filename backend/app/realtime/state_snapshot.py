@@ -0,0 +1,134 @@
+import base64
+import json
+import os
+import zlib
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from app.realtime.table_engine import TableHandState, TablePlayerState, TableTurnState
+from app.services.round_log_codec import decode_cards, encode_cards
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_REDIS_KEY = "maca:realtime:snapshot"
+
+
+def pack_cards(cards: list[str]) -> str | list[str]:
+    """One byte per card (see `round_log_codec`), base64 for JSON; unknown cards stay a list."""
+    try:
+        return base64.b64encode(encode_cards(cards)).decode("ascii")
+    except ValueError:
+        return list(cards)
+
+
+def unpack_cards(packed: str | list[str]) -> list[str]:
+    if isinstance(packed, str):
+        return decode_cards(base64.b64decode(packed))
+    return [str(card) for card in packed]
+
+
+def seconds_until(deadline: datetime, now: datetime) -> float:
+    return round(max(0.0, (deadline - now).total_seconds()), 3)
+
+
+def deadline_after(seconds: float, now: datetime) -> datetime:
+    return now + timedelta(seconds=max(0.0, float(seconds)))
+
+
+def turn_state_to_record(state: TableTurnState, now: datetime) -> dict:
+    """A JSON-safe record of `state`; the turn deadline is kept as the seconds left at `now`."""
+    record = asdict(state)
+    record["shoe"] = pack_cards(state.shoe)
+    record["turn_deadline"] = seconds_until(state.turn_deadline, now)
+    record["started_at"] = state.started_at.isoformat()
+    record["updated_at"] = state.updated_at.isoformat()
+    record["processed_action_ids"] = {
+        action_id: seen_at.isoformat() for action_id, seen_at in state.processed_action_ids.items()
+    }
+    return record
+
+
+def turn_state_from_record(record: dict, now: datetime) -> TableTurnState:
+    """Rebuild a turn state saved by `turn_state_to_record`, its deadline counted from `now`."""
+    player_states = {
+        user_id: TablePlayerState(
+            **{
+                **player_state,
+                "hands": [TableHandState(**hand) for hand in player_state["hands"]],
+            }
+        )
+        for user_id, player_state in record["player_states"].items()
+    }
+    return TableTurnState(
+        **{
+            **record,
+            "players": list(record["players"]),
+            "turn_deadline": deadline_after(record["turn_deadline"], now),
+            "shoe": unpack_cards(record["shoe"]),
+            "player_states": player_states,
+            "processed_action_ids": {
+                action_id: datetime.fromisoformat(seen_at)
+                for action_id, seen_at in record["processed_action_ids"].items()
+            },
+            "started_at": datetime.fromisoformat(record["started_at"]),
+            "updated_at": datetime.fromisoformat(record["updated_at"]),
+        }
+    )
+
+
+def encode_snapshot(payload: dict) -> bytes:
+    body = {"version": SNAPSHOT_FORMAT_VERSION, **payload}
+    return zlib.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decode_snapshot(blob: bytes) -> dict:
+    try:
+        body = json.loads(zlib.decompress(blob).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Unreadable realtime snapshot") from exc
+    if not isinstance(body, dict) or body.get("version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError("Unsupported realtime snapshot version")
+    return body
+
+
+class SnapshotStore:
+    """Keeps the latest snapshot in a file (replaced atomically) or, with `redis`, in one key.
+
+    The shared Redis client decodes responses, so the blob is stored base64-encoded there.
+    """
+
+    def __init__(self, path: str, redis=None) -> None:
+        self._path = path
+        self._redis = redis
+
+    def save(self, blob: bytes) -> None:
+        if self._redis is not None:
+            self._redis.set(SNAPSHOT_REDIS_KEY, base64.b64encode(blob).decode("ascii"))
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        scratch = f"{self._path}.tmp"
+        with open(scratch, "wb") as handle:
+            handle.write(blob)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(scratch, self._path)
+
+    def load(self) -> bytes | None:
+        if self._redis is not None:
+            stored = self._redis.get(SNAPSHOT_REDIS_KEY)
+            return base64.b64decode(stored) if stored else None
+        try:
+            with open(self._path, "rb") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def clear(self) -> None:
+        if self._redis is not None:
+            self._redis.delete(SNAPSHOT_REDIS_KEY)
+            return
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,583 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services.blackjack_service import build_deck, hand_score, natural_blackjack
+
+MAX_ACTION_LOG_ITEMS = 80
+MAX_TABLE_PLAYER_HANDS = 2
+
+
+@dataclass
+class TableHandState:
+    hand_id: str
+    cards: list[str]
+    bet: float
+    status: str = "active"
+    result: str | None = None
+    payout: float | None = None
+    is_split_hand: bool = False
+    doubled_down: bool = False
+
+
+@dataclass
+class TablePlayerState:
+    user_id: str
+    hands: list[TableHandState]
+    active_hand_index: int = 0
+    completed: bool = False
+    base_bet: float = 0.0
+    bankroll_at_start: float = 0.0
+    committed_bet: float = 0.0
+    total_payout: float = 0.0
+    insurance_bet: float = 0.0
+    insurance_decided: bool = False
+    insurance_payout: float = 0.0
+
+
+@dataclass
+class TableTurnState:
+    table_id: str
+    players: list[str]
+    turn_index: int
+    turn_seconds: int
+    turn_deadline: datetime
+    round_id: str = field(default_factory=lambda: uuid4().hex)
+    status: str = "active"
+    hand_number: int = 1
+    phase: str = "player_turns"
+    dealer_cards: list[str] = field(default_factory=list)
+    dealer_hidden: bool = True
+    shoe: list[str] = field(default_factory=list)
+    player_states: dict[str, TablePlayerState] = field(default_factory=dict)
+    last_action: dict | None = None
+    action_log: list[dict] = field(default_factory=list)
+    processed_action_ids: dict[str, datetime] = field(default_factory=dict)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class TableEvent:
+    kind: str
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass
+class HandSettlement:
+    user_id: str
+    bet: float
+    result: str
+    payout: float
+    player_score: int
+    player_cards: list[str]
+
+
+@dataclass
+class RoundSettlement:
+    round_id: str
+    table_id: str
+    dealer_cards: list[str]
+    dealer_score: int
+    payout_by_user: dict[str, float]
+    hands: list[HandSettlement]
+    actions_by_user: dict[str, list[str]]
+    started_at: datetime
+    ended_at: datetime
+
+
+@dataclass
+class EngineResult:
+    state: TableTurnState | None = None
+    round_completed: bool = False
+    error: str | None = None
+    events: list[TableEvent] = field(default_factory=list)
+    settlement: RoundSettlement | None = None
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def next_deadline(seconds: int) -> datetime:
+    return utc_now() + timedelta(seconds=seconds)
+
+
+def card_rank(card: str) -> str:
+    return card[:-1]
+
+
+def draw_card(state: TableTurnState) -> str:
+    if len(state.shoe) == 0:
+        state.shoe = build_deck()
+    return state.shoe.pop()
+
+
+def record_turn_action(
+    state: TableTurnState,
+    action: str,
+    user_id: str | None = None,
+    metadata: dict | None = None,
+    events: list[TableEvent] | None = None,
+) -> None:
+    entry = {
+        "user_id": user_id,
+        "action": action,
+        "at": utc_now().isoformat(),
+    }
+    if metadata:
+        entry["meta"] = metadata
+    state.last_action = entry
+    state.action_log.append(entry)
+    if len(state.action_log) > MAX_ACTION_LOG_ITEMS:
+        state.action_log = state.action_log[-MAX_ACTION_LOG_ITEMS:]
+    state.updated_at = utc_now()
+    if events is not None:
+        events.append(TableEvent(kind=action, payload=entry))
+
+
+def current_turn_user_id(state: TableTurnState) -> str | None:
+    if state.status != "active" or state.phase != "player_turns" or len(state.players) == 0:
+        return None
+    index = state.turn_index % len(state.players)
+    return state.players[index]
+
+
+def current_turn_player_state(state: TableTurnState) -> TablePlayerState | None:
+    user_id = current_turn_user_id(state)
+    if not user_id:
+        return None
+    return state.player_states.get(user_id)
+
+
+def current_turn_hand(state: TableTurnState) -> TableHandState | None:
+    player_state = current_turn_player_state(state)
+    if not player_state:
+        return None
+    if player_state.active_hand_index < 0 or player_state.active_hand_index >= len(player_state.hands):
+        return None
+    return player_state.hands[player_state.active_hand_index]
+
+
+def hand_is_playable(hand: TableHandState) -> bool:
+    return hand.status == "active" and hand.result is None and hand_score(hand.cards) < 21
+
+
+def can_split_hand(player_state: TablePlayerState, hand: TableHandState) -> bool:
+    if len(player_state.hands) >= MAX_TABLE_PLAYER_HANDS:
+        return False
+    if hand.status != "active" or hand.result is not None or len(hand.cards) != 2:
+        return False
+    if card_rank(hand.cards[0]) != card_rank(hand.cards[1]):
+        return False
+    projected_bet = round(player_state.committed_bet + hand.bet, 2)
+    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
+
+
+def can_double_down(player_state: TablePlayerState, hand: TableHandState) -> bool:
+    if hand.status != "active" or hand.result is not None or len(hand.cards) != 2:
+        return False
+    if hand.doubled_down:
+        return False
+    projected_bet = round(player_state.committed_bet + hand.bet, 2)
+    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
+
+
+def insurance_bet_amount(player_state: TablePlayerState) -> float:
+    return round(max(0.0, player_state.base_bet / 2), 2)
+
+
+def can_take_insurance(state: TableTurnState, player_state: TablePlayerState, hand: TableHandState) -> bool:
+    if len(state.dealer_cards) == 0 or card_rank(state.dealer_cards[0]) != "A":
+        return False
+    if not state.dealer_hidden:
+        return False
+    if player_state.insurance_decided:
+        return False
+    if hand.status != "active" or hand.result is not None:
+        return False
+    if player_state.active_hand_index != 0 or len(hand.cards) != 2:
+        return False
+    insurance_bet = insurance_bet_amount(player_state)
+    if insurance_bet <= 0:
+        return False
+    projected_bet = round(player_state.committed_bet + insurance_bet, 2)
+    return projected_bet <= round(player_state.bankroll_at_start + 1e-9, 2)
+
+
+def can_surrender(hand: TableHandState) -> bool:
+    if hand.status != "active" or hand.result is not None:
+        return False
+    if hand.is_split_hand or hand.doubled_down:
+        return False
+    if len(hand.cards) != 2:
+        return False
+    return hand_score(hand.cards) < 21
+
+
+def available_actions(state: TableTurnState) -> list[str]:
+    if state.status != "active" or state.phase != "player_turns":
+        return []
+    player_state = current_turn_player_state(state)
+    hand = current_turn_hand(state)
+    if not player_state or not hand or not hand_is_playable(hand):
+        return []
+    actions = ["hit", "stand"]
+    if can_double_down(player_state, hand):
+        actions.append("double_down")
+    if can_split_hand(player_state, hand):
+        actions.append("split")
+    if can_surrender(hand):
+        actions.append("surrender")
+    if can_take_insurance(state, player_state, hand):
+        actions.append("insurance")
+    return actions
+
+
+def position_to_next_playable_turn(state: TableTurnState) -> bool:
+    if len(state.players) == 0:
+        return False
+
+    if state.turn_index < 0 or state.turn_index >= len(state.players):
+        state.turn_index = 0
+
+    examined_players = 0
+    while examined_players < len(state.players):
+        user_id = state.players[state.turn_index]
+        player_state = state.player_states.get(user_id)
+        if not player_state:
+            state.turn_index = (state.turn_index + 1) % len(state.players)
+            examined_players += 1
+            continue
+
+        while player_state.active_hand_index < len(player_state.hands):
+            hand = player_state.hands[player_state.active_hand_index]
+            if hand_is_playable(hand):
+                player_state.completed = False
+                state.turn_deadline = next_deadline(state.turn_seconds)
+                state.updated_at = utc_now()
+                return True
+            player_state.active_hand_index += 1
+
+        player_state.completed = True
+        state.turn_index = (state.turn_index + 1) % len(state.players)
+        examined_players += 1
+
+    return False
+
+
+def start_round(
+    table_id: str,
+    players: list[str],
+    bets: dict[str, float],
+    balances: dict[str, float],
+    turn_seconds: int,
+    shoe: list[str] | None = None,
+) -> EngineResult:
+    """Deal a new round. `bets` must already be normalized; `shoe` is consumed via pop()."""
+    events: list[TableEvent] = []
+    state = TableTurnState(
+        table_id=table_id,
+        players=list(players),
+        turn_index=0,
+        turn_seconds=turn_seconds,
+        turn_deadline=next_deadline(turn_seconds),
+        hand_number=1,
+        shoe=list(shoe) if shoe else build_deck(),
+    )
+    for user_id in state.players:
+        bet = bets[user_id]
+        player_hand = TableHandState(
+            hand_id=uuid4().hex[:12],
+            cards=[],
+            bet=bet,
+        )
+        state.player_states[user_id] = TablePlayerState(
+            user_id=user_id,
+            hands=[player_hand],
+            base_bet=bet,
+            bankroll_at_start=max(
+                round(float(balances.get(user_id, bet)), 2),
+                bet,
+            ),
+            committed_bet=bet,
+        )
+
+    # Deal order: each player, dealer up, each player, dealer hole.
+    for user_id in state.players:
+        state.player_states[user_id].hands[0].cards.append(draw_card(state))
+    state.dealer_cards.append(draw_card(state))
+    for user_id in state.players:
+        state.player_states[user_id].hands[0].cards.append(draw_card(state))
+    state.dealer_cards.append(draw_card(state))
+    state.dealer_hidden = True
+
+    for player_state in state.player_states.values():
+        if natural_blackjack(player_state.hands[0].cards):
+            player_state.hands[0].status = "blackjack"
+            player_state.active_hand_index = 1
+
+    record_turn_action(
+        state,
+        action="table_game_started",
+        metadata={
+            "players": len(state.players),
+            "round_id": state.round_id,
+            "dealer_upcard": state.dealer_cards[0] if state.dealer_cards else None,
+        },
+        events=events,
+    )
+
+    result = EngineResult(state=state, events=events)
+    if not position_to_next_playable_turn(state):
+        settled = settle_round(state, completion_reason="immediate_settle")
+        result.round_completed = True
+        result.settlement = settled.settlement
+        result.events.extend(settled.events)
+    return result
+
+
+def settle_round(state: TableTurnState, completion_reason: str) -> EngineResult:
+    """Play out the dealer and resolve every hand. Balances and logs are left to the caller."""
+    events: list[TableEvent] = []
+    if state.phase == "settled":
+        return EngineResult(state=state, events=events)
+
+    state.phase = "dealer_turn"
+    state.dealer_hidden = False
+
+    dealer_has_blackjack = natural_blackjack(state.dealer_cards)
+    has_live_player_hand = any(
+        hand.result not in {"bust", "surrender"}
+        for player_state in state.player_states.values()
+        for hand in player_state.hands
+    )
+    if not dealer_has_blackjack and has_live_player_hand:
+        while hand_score(state.dealer_cards) < 17:
+            state.dealer_cards.append(draw_card(state))
+            record_turn_action(
+                state,
+                action="dealer_hit",
+                metadata={"dealer_score": hand_score(state.dealer_cards)},
+                events=events,
+            )
+
+    dealer_score = hand_score(state.dealer_cards)
+    payout_by_user: dict[str, float] = {}
+    hand_settlements: list[HandSettlement] = []
+
+    for user_id, player_state in state.player_states.items():
+        total_payout = 0.0
+        player_state.completed = True
+        if player_state.active_hand_index >= len(player_state.hands):
+            player_state.active_hand_index = max(0, len(player_state.hands) - 1)
+
+        for hand in player_state.hands:
+            if hand.result == "bust":
+                hand.status = "resolved"
+                hand.payout = round(-hand.bet, 2)
+                total_payout += hand.payout
+                continue
+            if hand.result == "surrender":
+                hand.status = "resolved"
+                hand.payout = round(-(hand.bet / 2), 2)
+                total_payout += hand.payout
+                continue
+
+            player_score = hand_score(hand.cards)
+            player_has_blackjack = natural_blackjack(hand.cards) and not hand.is_split_hand
+
+            if player_has_blackjack and dealer_has_blackjack:
+                hand.result = "push"
+                hand.payout = 0.0
+            elif player_has_blackjack:
+                hand.result = "blackjack"
+                hand.payout = round(hand.bet * 1.5, 2)
+            elif dealer_has_blackjack:
+                hand.result = "lose"
+                hand.payout = round(-hand.bet, 2)
+            elif dealer_score > 21:
+                hand.result = "win"
+                hand.payout = round(hand.bet, 2)
+            elif player_score > dealer_score:
+                hand.result = "win"
+                hand.payout = round(hand.bet, 2)
+            elif player_score < dealer_score:
+                hand.result = "lose"
+                hand.payout = round(-hand.bet, 2)
+            else:
+                hand.result = "push"
+                hand.payout = 0.0
+
+            hand.status = "resolved"
+            total_payout += hand.payout
+
+        insurance_payout = 0.0
+        if player_state.insurance_bet > 0:
+            insurance_payout = (
+                round(player_state.insurance_bet * 2, 2)
+                if dealer_has_blackjack
+                else round(-player_state.insurance_bet, 2)
+            )
+            total_payout += insurance_payout
+        player_state.insurance_payout = round(insurance_payout, 2)
+        player_state.total_payout = round(total_payout, 2)
+        payout_by_user[user_id] = player_state.total_payout
+
+        for hand in player_state.hands:
+            result = hand.result or "unknown"
+            if result in {"bust", "surrender"}:
+                result = "lose"
+            hand_settlements.append(
+                HandSettlement(
+                    user_id=user_id,
+                    bet=hand.bet,
+                    result=result,
+                    payout=round(hand.payout or 0.0, 2),
+                    player_score=hand_score(hand.cards),
+                    player_cards=list(hand.cards),
+                )
+            )
+
+    actions_by_user: dict[str, list[str]] = {}
+    for user_id in payout_by_user:
+        user_actions = [
+            entry["action"]
+            for entry in state.action_log
+            if entry.get("user_id") == user_id and isinstance(entry.get("action"), str)
+        ]
+        user_actions.append(f"table_round:{state.round_id}")
+        actions_by_user[user_id] = user_actions
+
+    settlement = RoundSettlement(
+        round_id=state.round_id,
+        table_id=state.table_id,
+        dealer_cards=list(state.dealer_cards),
+        dealer_score=dealer_score,
+        payout_by_user=payout_by_user,
+        hands=hand_settlements,
+        actions_by_user=actions_by_user,
+        started_at=state.started_at,
+        ended_at=utc_now(),
+    )
+
+    state.phase = "settled"
+    state.status = "ended"
+    state.turn_deadline = next_deadline(state.turn_seconds)
+    record_turn_action(
+        state,
+        action="round_settled",
+        metadata={"reason": completion_reason, "dealer_score": dealer_score},
+        events=events,
+    )
+    return EngineResult(state=state, round_completed=True, events=events, settlement=settlement)
+
+
+def apply_action(
+    state: TableTurnState,
+    user_id: str,
+    action: str,
+    timed_out: bool = False,
+) -> EngineResult:
+    events: list[TableEvent] = []
+    if state.status != "active" or state.phase != "player_turns":
+        return EngineResult(state=state, error="no active round")
+    if user_id != current_turn_user_id(state):
+        return EngineResult(state=state, error="not your turn")
+
+    player_state = current_turn_player_state(state)
+    hand = current_turn_hand(state)
+    if not player_state or not hand:
+        return EngineResult(state=state, error="no active hand")
+    if not hand_is_playable(hand):
+        return EngineResult(state=state, error="hand is already resolved")
+
+    allowed_actions = available_actions(state)
+    if action not in allowed_actions:
+        return EngineResult(state=state, error="action not allowed")
+
+    hand_index = player_state.active_hand_index
+    metadata = {
+        "hand_index": hand_index,
+        "hand_id": hand.hand_id,
+        "timed_out": timed_out,
+    }
+
+    if action != "insurance" and can_take_insurance(state, player_state, hand):
+        player_state.insurance_decided = True
+        metadata["insurance_auto_declined"] = True
+
+    if action == "insurance":
+        insurance_bet = insurance_bet_amount(player_state)
+        player_state.insurance_bet = insurance_bet
+        player_state.insurance_decided = True
+        player_state.committed_bet = round(player_state.committed_bet + insurance_bet, 2)
+        metadata["insurance_bet"] = insurance_bet
+        record_turn_action(state, action=action, user_id=user_id, metadata=metadata, events=events)
+        state.turn_deadline = next_deadline(state.turn_seconds)
+        state.updated_at = utc_now()
+        return EngineResult(state=state, events=events)
+    if action == "stand":
+        hand.status = "stood"
+        player_state.active_hand_index += 1
+    elif action == "hit":
+        hand.cards.append(draw_card(state))
+        score = hand_score(hand.cards)
+        metadata["score"] = score
+        if score > 21:
+            hand.status = "bust"
+            hand.result = "bust"
+            hand.payout = round(-hand.bet, 2)
+            player_state.active_hand_index += 1
+        elif score == 21:
+            hand.status = "stood"
+            player_state.active_hand_index += 1
+    elif action == "double_down":
+        extra_bet = hand.bet
+        hand.bet = round(hand.bet * 2, 2)
+        hand.doubled_down = True
+        player_state.committed_bet = round(player_state.committed_bet + extra_bet, 2)
+        hand.cards.append(draw_card(state))
+        score = hand_score(hand.cards)
+        metadata["score"] = score
+        if score > 21:
+            hand.status = "bust"
+            hand.result = "bust"
+            hand.payout = round(-hand.bet, 2)
+        else:
+            hand.status = "stood"
+        player_state.active_hand_index += 1
+    elif action == "split":
+        split_bet = hand.bet
+        player_state.committed_bet = round(player_state.committed_bet + split_bet, 2)
+        left_card, right_card = hand.cards
+        hand.cards = [left_card, draw_card(state)]
+        hand.is_split_hand = True
+
+        split_hand = TableHandState(
+            hand_id=uuid4().hex[:12],
+            cards=[right_card, draw_card(state)],
+            bet=split_bet,
+            is_split_hand=True,
+        )
+        player_state.hands.insert(hand_index + 1, split_hand)
+        first_score = hand_score(hand.cards)
+        metadata["split_cards"] = [left_card, right_card]
+        if first_score == 21:
+            hand.status = "stood"
+            player_state.active_hand_index += 1
+    elif action == "surrender":
+        hand.status = "surrendered"
+        hand.result = "surrender"
+        hand.payout = round(-(hand.bet / 2), 2)
+        player_state.active_hand_index += 1
+
+    action_name = "turn_timeout_auto_stand" if timed_out else action
+    record_turn_action(state, action=action_name, user_id=user_id, metadata=metadata, events=events)
+
+    if position_to_next_playable_turn(state):
+        return EngineResult(state=state, events=events)
+
+    settled = settle_round(state, completion_reason="all_player_hands_resolved")
+    settled.events[:0] = events
+    return settled
@@ -29,6 +29,27 @@ class AdminAuditLogRead(BaseModel):
         from_attributes = True
 
 
+class ArchiveSegmentRead(BaseModel):
+    id: str
+    table_name: str
+    month: str
+    row_count: int
+    size_bytes: int
+    min_created_at: datetime | None = None
+    max_created_at: datetime | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RetentionRunResult(BaseModel):
+    table_name: str
+    month: str
+    rows: int
+    skipped_reason: str | None = None
+
+
 class AdminUserRead(BaseModel):
     id: str
     username: str
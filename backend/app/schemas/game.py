@@ -7,6 +7,17 @@ class SinglePlayerStartRequest(BaseModel):
     bet: float = Field(gt=0, le=10000)
 
 
+class MultiHandStartRequest(BaseModel):
+    bet: float = Field(gt=0, le=10000)
+    hands: int = Field(default=2, ge=1, le=5)
+
+
+class AutoPlayRequest(BaseModel):
+    bet: float = Field(gt=0, le=10000)
+    rounds: int = Field(default=10, ge=1, le=500)
+    hands: int = Field(default=1, ge=1, le=5)
+
+
 class RoundActionRequest(BaseModel):
     action_id: str | None = Field(default=None, min_length=8, max_length=80)
 
@@ -29,6 +40,50 @@ class SinglePlayerRoundRead(BaseModel):
     ended_at: datetime | None = None
 
 
+class SinglePlayerHandRead(BaseModel):
+    hand_index: int
+    cards: list[str]
+    score: int
+    status: str
+    result: str | None = None
+    payout: float | None = None
+    can_hit: bool
+    can_stand: bool
+
+
+class MultiHandRoundRead(BaseModel):
+    round_id: str
+    status: str
+    bet_per_hand: float
+    total_bet: float
+    hands: list[SinglePlayerHandRead]
+    dealer_cards: list[str]
+    dealer_score: int | None = None
+    payout: float | None = None
+    message: str | None = None
+    actions: list[str]
+    created_at: datetime
+    ended_at: datetime | None = None
+
+
+class AutoPlayResultRead(BaseModel):
+    rounds_requested: int
+    rounds_played: int
+    hands_per_round: int
+    bet_per_hand: float
+    total_wagered: float
+    net_payout: float
+    wins: int
+    losses: int
+    pushes: int
+    blackjacks: int
+    busts: int
+    starting_balance: float
+    ending_balance: float
+    stopped_reason: str | None = None
+    round_payouts: list[float]
+
+
 class RoundLogRead(BaseModel):
     id: str
     user_id: str
@@ -37,6 +92,7 @@ class RoundLogRead(BaseModel):
     payout: float
     player_score: int
     dealer_score: int
+    round_id: str | None = None
     player_cards: list[str]
     dealer_cards: list[str]
     actions: list[str]
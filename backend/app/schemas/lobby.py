@@ -1,10 +1,18 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class TableCreateRequest(BaseModel):
     name: str = Field(min_length=3, max_length=60)
     max_players: int = Field(default=8, ge=2, le=8)
     is_private: bool = False
+    min_stake: float | None = Field(default=None, ge=1, le=1000)
+    max_stake: float | None = Field(default=None, ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def check_stake_range(self) -> "TableCreateRequest":
+        if self.min_stake is not None and self.max_stake is not None and self.min_stake > self.max_stake:
+            raise ValueError("min_stake must not exceed max_stake")
+        return self
 
 
 class TableJoinByCodeRequest(BaseModel):
@@ -19,3 +27,5 @@ class TableRead(BaseModel):
     is_private: bool
     invite_code: str | None = None
     players: list[str]
+    min_stake: float | None = None
+    max_stake: float | None = None
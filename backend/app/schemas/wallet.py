@@ -75,6 +75,11 @@ class WalletOverviewRead(BaseModel):
     linked_wallets: list[WalletLinkRead]
     recent_transactions: list[WalletTransactionRead]
     pending_withdrawals: int
+    pending_withdrawal_tokens: float = 0.0
+    pending_deposits: int = 0
+    pending_deposit_tokens: float = 0.0
+    # {tx_type: {status: count}}
+    transaction_counts: dict[str, dict[str, int]] = Field(default_factory=dict)
 
 
 class DepositVerifyRequest(BaseModel):
@@ -111,3 +116,21 @@ class WithdrawalDecisionRequest(BaseModel):
     approve: bool
     chain_tx_hash: str | None = Field(default=None, min_length=20, max_length=128)
     reason: str | None = Field(default=None, max_length=500)
+
+
+class WithdrawalBulkDecisionItem(WithdrawalDecisionRequest):
+    transaction_id: str = Field(min_length=1, max_length=64)
+
+
+class WithdrawalBulkDecisionRequest(BaseModel):
+    decisions: list[WithdrawalBulkDecisionItem] = Field(min_length=1, max_length=500)
+
+
+class WithdrawalSkippedRead(BaseModel):
+    transaction_id: str
+    reason: str
+
+
+class WithdrawalBulkDecisionResultRead(BaseModel):
+    decided: list[WalletTransactionRead]
+    skipped: list[WithdrawalSkippedRead]
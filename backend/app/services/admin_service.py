@@ -1,10 +1,13 @@
 import json
 from datetime import datetime, timezone
+from uuid import uuid4
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import AdminAuditLog, User
+from app.services.ledger_service import BalanceChange, apply_balance_change
+from app.services.pagination import keyset_page
 
 ROLE_LEVELS: dict[str, int] = {
     "player": 0,
@@ -57,15 +60,26 @@ def adjust_user_balance(
 
     normalized_mode = mode.strip().lower()
     if normalized_mode == "add":
-        user.balance = round(float(user.balance) + float(amount), 2)
+        delta = float(amount)
     elif normalized_mode == "remove":
-        user.balance = round(max(0.0, float(user.balance) - float(amount)), 2)
+        delta = -float(amount)
     elif normalized_mode == "set":
-        user.balance = round(max(0.0, float(amount)), 2)
+        current_balance = db.scalar(select(User.balance).where(User.id == user.id).with_for_update())
+        delta = round(max(0.0, float(amount)), 2) - float(current_balance or 0.0)
     else:
         raise ValueError("Unsupported balance adjustment mode")
 
-    db.add(user)
+    adjustment_id = uuid4().hex
+    apply_balance_change(
+        db,
+        BalanceChange(
+            user_id=user.id,
+            delta=delta,
+            reason=f"admin_{normalized_mode}",
+            idempotency_key=f"admin_balance:{adjustment_id}",
+            reference_id=adjustment_id,
+        ),
+    )
     db.commit()
     db.refresh(user)
     return user
@@ -99,8 +113,8 @@ def write_audit_log(
     return entry
 
 
-def list_audit_logs(db: Session, limit: int = 100) -> list[AdminAuditLog]:
+def list_audit_logs(db: Session, limit: int = 100, cursor: str | None = None) -> list[AdminAuditLog]:
     clamped_limit = max(1, min(200, int(limit)))
     return db.scalars(
-        select(AdminAuditLog).order_by(AdminAuditLog.created_at.desc()).limit(clamped_limit)
+        keyset_page(select(AdminAuditLog), AdminAuditLog.created_at, AdminAuditLog.id, clamped_limit, cursor)
     ).all()
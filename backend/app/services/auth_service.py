@@ -1,13 +1,16 @@
 from datetime import datetime, timedelta, timezone
 import json
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import desc, func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.security import generate_random_token, hash_password, hash_token, verify_password
+from app.db.ids import new_id
 from app.db.models import EmailVerificationToken, SecurityEvent, User, UserSession
+from app.db.write_queue import write_queue
 from app.schemas.auth import RegisterRequest
+from app.services.pagination import keyset_page
 from app.services.referral_service import generate_unique_referral_code
 
 
@@ -156,6 +159,16 @@ def get_active_user_session_by_jti(
 
 
 def touch_user_session(db: Session, session: UserSession) -> UserSession:
+    if write_queue.running:
+        # Fire-and-forget: a stale last_seen_at is harmless, a request blocked on the writer is not.
+        session_id = session.id
+        seen_at = _utc_now()
+        write_queue.submit(
+            lambda writer_db: writer_db.execute(
+                update(UserSession).where(UserSession.id == session_id).values(last_seen_at=seen_at)
+            )
+        )
+        return session
     session.last_seen_at = _utc_now()
     db.add(session)
     db.commit()
@@ -249,12 +262,19 @@ def verify_email_with_token(db: Session, *, token: str) -> User:
     return user
 
 
-def list_security_events(db: Session, *, user_id: str, limit: int = 50) -> list[SecurityEvent]:
-    stmt = (
-        select(SecurityEvent)
-        .where(SecurityEvent.user_id == user_id)
-        .order_by(desc(SecurityEvent.created_at))
-        .limit(max(1, limit))
+def list_security_events(
+    db: Session,
+    *,
+    user_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> list[SecurityEvent]:
+    stmt = keyset_page(
+        select(SecurityEvent).where(SecurityEvent.user_id == user_id),
+        SecurityEvent.created_at,
+        SecurityEvent.id,
+        max(1, limit),
+        cursor,
     )
     return db.scalars(stmt).all()
 
@@ -270,13 +290,25 @@ def record_security_event(
     metadata: dict | None = None,
 ) -> SecurityEvent:
     event = SecurityEvent(
+        id=new_id(),
         user_id=user_id,
         event_type=event_type[:60],
         severity=severity[:20] if severity else "info",
         ip_address=ip_address[:64],
         user_agent=user_agent[:500],
         metadata_json=json.dumps(metadata or {}),
+        created_at=_utc_now(),
     )
+    if write_queue.running:
+
+        def _insert(writer_db: Session) -> None:
+            writer_db.add(event)
+            writer_db.flush()
+            # Detach before the batch commit expires it, so callers can still read the event.
+            writer_db.expunge(event)
+
+        write_queue.run(_insert)
+        return event
     db.add(event)
     db.commit()
     db.refresh(event)
@@ -0,0 +1,206 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from app.services.blackjack_service import Card, card_value, hand_score, is_soft_hand
+
+HARD = 0
+SOFT = 1
+PAIR = 2
+HAND_CLASS_COUNT = 3
+
+TOTAL_SLOTS = 22
+UPCARD_SLOTS = 12
+
+STAND = 0
+HIT = 1
+DOUBLE_OR_HIT = 2
+SPLIT = 3
+SURRENDER_OR_HIT = 4
+# Pair slots only: do not split, play the hand by its total instead.
+NO_SPLIT = 5
+
+ACTION_NAMES = {
+    STAND: "stand",
+    HIT: "hit",
+    DOUBLE_OR_HIT: "double_down",
+    SPLIT: "split",
+    SURRENDER_OR_HIT: "surrender",
+    NO_SPLIT: "no_split",
+}
+
+_FALLBACKS = {
+    STAND: ("stand",),
+    HIT: ("hit",),
+    DOUBLE_OR_HIT: ("double_down", "hit"),
+    SPLIT: ("split",),
+    SURRENDER_OR_HIT: ("surrender", "hit"),
+    NO_SPLIT: (),
+}
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    double_after_split: bool = True
+    late_surrender: bool = False
+
+    @property
+    def index(self) -> int:
+        return int(self.double_after_split) | (int(self.late_surrender) << 1)
+
+
+RULE_SET_COUNT = 4
+DEFAULT_RULES = RuleSet()
+
+_CHART_CODES = {"h": HIT, "s": STAND, "d": DOUBLE_OR_HIT}
+
+# Chart rows are indexed by dealer upcard value (2..11, ace = 11).
+_SOFT_CHART = {
+    13: "  hhhddhhhhh",
+    14: "  hhhddhhhhh",
+    15: "  hhdddhhhhh",
+    16: "  hhdddhhhhh",
+    17: "  hddddhhhhh",
+    18: "  sddddsshhh",
+}
+_HARD_CHART = {
+    9: "  hdddhhhhhh",
+    10: "  ddddddddhh",
+    11: "  dddddddddh",
+    12: "  hhssshhhhh",
+    13: "  ssssshhhhh",
+    14: "  ssssshhhhh",
+    15: "  ssssshhhhh",
+    16: "  ssssshhhhh",
+}
+# Pair rows are keyed by the value of one card of the pair.
+_PAIR_SPLITS_DAS = {
+    2: {2, 3, 4, 5, 6, 7},
+    3: {2, 3, 4, 5, 6, 7},
+    4: {5, 6},
+    6: {2, 3, 4, 5, 6},
+    7: {2, 3, 4, 5, 6, 7},
+    8: set(range(2, 12)),
+    9: {2, 3, 4, 5, 6, 8, 9},
+    11: set(range(2, 12)),
+}
+_PAIR_SPLITS_NO_DAS = {
+    2: {4, 5, 6, 7},
+    3: {4, 5, 6, 7},
+    6: {3, 4, 5, 6},
+    7: {2, 3, 4, 5, 6, 7},
+    8: set(range(2, 12)),
+    9: {2, 3, 4, 5, 6, 8, 9},
+    11: set(range(2, 12)),
+}
+_LATE_SURRENDER = {
+    15: {10},
+    16: {9, 10, 11},
+}
+
+
+def _slot(rule_index: int, hand_class: int, total: int, upcard: int) -> int:
+    return ((rule_index * HAND_CLASS_COUNT + hand_class) * TOTAL_SLOTS + total) * UPCARD_SLOTS + upcard
+
+
+def _hard_code(total: int, upcard: int, late_surrender: bool) -> int:
+    if late_surrender and upcard in _LATE_SURRENDER.get(total, ()):
+        return SURRENDER_OR_HIT
+    if total <= 8:
+        return HIT
+    if total >= 17:
+        return STAND
+    return _CHART_CODES[_HARD_CHART[total][upcard]]
+
+
+def _soft_code(total: int, upcard: int) -> int:
+    if total >= 19:
+        return STAND
+    if total in _SOFT_CHART:
+        return _CHART_CODES[_SOFT_CHART[total][upcard]]
+    return HIT
+
+
+def _compile_table() -> bytes:
+    table = bytearray([HIT]) * (RULE_SET_COUNT * HAND_CLASS_COUNT * TOTAL_SLOTS * UPCARD_SLOTS)
+    for rule_index in range(RULE_SET_COUNT):
+        double_after_split = bool(rule_index & 1)
+        late_surrender = bool(rule_index & 2)
+        splits = _PAIR_SPLITS_DAS if double_after_split else _PAIR_SPLITS_NO_DAS
+        for upcard in range(2, UPCARD_SLOTS):
+            for total in range(TOTAL_SLOTS):
+                table[_slot(rule_index, HARD, total, upcard)] = _hard_code(total, upcard, late_surrender)
+                table[_slot(rule_index, SOFT, total, upcard)] = _soft_code(total, upcard)
+            for pair_value in range(2, 12):
+                code = SPLIT if upcard in splits.get(pair_value, ()) else NO_SPLIT
+                table[_slot(rule_index, PAIR, pair_value, upcard)] = code
+    return bytes(table)
+
+
+STRATEGY_TABLE = _compile_table()
+
+
+def table_offset(rules: RuleSet = DEFAULT_RULES) -> int:
+    return _slot(rules.index, HARD, 0, 0)
+
+
+def classify_hand(cards: Sequence[Card]) -> tuple[int, int]:
+    total = hand_score(list(cards))
+    if is_soft_hand(list(cards)):
+        return SOFT, min(total, TOTAL_SLOTS - 1)
+    return HARD, min(total, TOTAL_SLOTS - 1)
+
+
+def lookup(hand_class: int, total: int, upcard_value: int, rules: RuleSet = DEFAULT_RULES) -> int:
+    return STRATEGY_TABLE[_slot(rules.index, hand_class, total, upcard_value)]
+
+
+def decision_code(cards: Sequence[Card], dealer_upcard: Card, rules: RuleSet = DEFAULT_RULES) -> int:
+    upcard_value = card_value(dealer_upcard)
+    hand_class, total = classify_hand(cards)
+    if total < 19 and len(cards) == 2 and cards[0][:-1] == cards[1][:-1]:
+        pair_code = lookup(PAIR, card_value(cards[0]), upcard_value, rules)
+        if pair_code == SPLIT:
+            return SPLIT
+    return lookup(hand_class, total, upcard_value, rules)
+
+
+def recommend_action(
+    cards: Sequence[Card],
+    dealer_upcard: Card,
+    available_actions: Sequence[str],
+    rules: RuleSet = DEFAULT_RULES,
+) -> str | None:
+    if len(available_actions) == 0 or len(cards) == 0:
+        return None
+    code = decision_code(cards, dealer_upcard, rules)
+    if code == NO_SPLIT or (code == SPLIT and "split" not in available_actions):
+        hand_class, total = classify_hand(cards)
+        code = lookup(hand_class, total, card_value(dealer_upcard), rules)
+    for action in _FALLBACKS[code]:
+        if action in available_actions:
+            return action
+    return "hit" if "hit" in available_actions else available_actions[0]
+
+
+def evaluate_many(
+    decisions: Iterable[tuple[int, int, int]],
+    rules: RuleSet = DEFAULT_RULES,
+) -> bytes:
+    """Look up (hand_class, total, upcard_value) triples; returns one action code per triple.
+
+    PAIR triples yield SPLIT or NO_SPLIT; for NO_SPLIT the hand's HARD or SOFT slot holds the play.
+    """
+    base = table_offset(rules)
+    table = STRATEGY_TABLE
+    return bytes(
+        table[base + (hand_class * TOTAL_SLOTS + total) * UPCARD_SLOTS + upcard]
+        for hand_class, total, upcard in decisions
+    )
+
+
+def count_matching(
+    decisions: Iterable[tuple[int, int, int]],
+    chosen_codes: Iterable[int],
+    rules: RuleSet = DEFAULT_RULES,
+) -> int:
+    return sum(1 for expected, chosen in zip(evaluate_many(decisions, rules), chosen_codes) if expected == chosen)
@@ -1,4 +1,3 @@
-import json
 import secrets
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
@@ -10,12 +9,25 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import RoundLog, User
-from app.schemas.game import RoundLogRead, SinglePlayerRoundRead
+from app.schemas.game import (
+    AutoPlayResultRead,
+    MultiHandRoundRead,
+    RoundLogRead,
+    SinglePlayerHandRead,
+    SinglePlayerRoundRead,
+)
+from app.services.ledger_service import BalanceChange, apply_balance_change
+from app.services.pagination import keyset_page
+from app.services.round_log_codec import decode_round_logs, encode_actions, encode_cards
 
 Card = str
 SUITS = ("S", "H", "D", "C")
 RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
 ACTION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_SINGLE_PLAYER_HANDS = 5
+MAX_AUTO_PLAY_ROUNDS = 500
+# Auto-play hands are dealt and settled without doubles, splits or surrender.
+AUTO_PLAY_ACTIONS = ("hit", "stand")
 
 
 def build_deck() -> list[Card]:
@@ -53,6 +65,36 @@ def expose_cards(cards: list[Card], reveal_all: bool) -> list[str]:
     return [cards[0], "??"]
 
 
+def is_soft_hand(cards: list[Card]) -> bool:
+    low_total = sum(1 if card[:-1] == "A" else card_value(card) for card in cards)
+    return hand_score(cards) > low_total
+
+
+def settle_hand(
+    player_cards: list[Card],
+    dealer_cards: list[Card],
+    bet: float,
+) -> tuple[str, float]:
+    player_score = hand_score(player_cards)
+    dealer_score = hand_score(dealer_cards)
+    player_blackjack = natural_blackjack(player_cards)
+    dealer_blackjack = natural_blackjack(dealer_cards)
+
+    if player_blackjack and dealer_blackjack:
+        return "push", 0.0
+    if player_blackjack:
+        return "blackjack", round(bet * 1.5, 2)
+    if dealer_blackjack:
+        return "lose", -bet
+    if player_score > 21:
+        return "lose", -bet
+    if dealer_score > 21 or player_score > dealer_score:
+        return "win", bet
+    if player_score < dealer_score:
+        return "lose", -bet
+    return "push", 0.0
+
+
 @dataclass
 class ActiveRound:
     round_id: str
@@ -72,6 +114,33 @@ class ActiveRound:
     ended_at: datetime | None = None
 
 
+@dataclass
+class SinglePlayerHand:
+    cards: list[Card]
+    status: str = "active"
+    result: str | None = None
+    payout: float | None = None
+    actions: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MultiHandRound:
+    round_id: str
+    user_id: str
+    bet_per_hand: float
+    deck: list[Card]
+    hands: list[SinglePlayerHand]
+    dealer_cards: list[Card]
+    status: str
+    actions: list[str] = field(default_factory=list)
+    payout: float | None = None
+    message: str | None = None
+    action_deadline: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    processed_action_ids: dict[str, datetime] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    ended_at: datetime | None = None
+
+
 class BlackjackService:
     ACTION_TIMEOUT_SECONDS = 45
     COMPLETED_ROUND_RETENTION_SECONDS = 600
@@ -79,12 +148,16 @@ class BlackjackService:
 
     def __init__(self) -> None:
         self._rounds: dict[str, ActiveRound] = {}
+        self._multi_rounds: dict[str, MultiHandRound] = {}
         self._lock = Lock()
 
-    def _active_round_for_user(self, user_id: str) -> ActiveRound | None:
+    def _active_round_for_user(self, user_id: str) -> ActiveRound | MultiHandRound | None:
         for round_state in self._rounds.values():
             if round_state.user_id == user_id and round_state.status == "player_turn":
                 return round_state
+        for multi_round in self._multi_rounds.values():
+            if multi_round.user_id == user_id and multi_round.status == "player_turn":
+                return multi_round
         return None
 
     def _now(self) -> datetime:
@@ -106,7 +179,22 @@ class BlackjackService:
         for round_id in stale_rounds:
             self._rounds.pop(round_id, None)
 
-    def _track_action_id(self, round_state: ActiveRound, action_id: str | None) -> bool:
+        stale_multi_rounds: list[str] = []
+        for round_id, multi_round in self._multi_rounds.items():
+            if multi_round.status != "completed" or not multi_round.ended_at:
+                continue
+            age_seconds = (now - multi_round.ended_at).total_seconds()
+            if age_seconds > self.COMPLETED_ROUND_RETENTION_SECONDS:
+                stale_multi_rounds.append(round_id)
+
+        for round_id in stale_multi_rounds:
+            self._multi_rounds.pop(round_id, None)
+
+    def _track_action_id(
+        self,
+        round_state: ActiveRound | MultiHandRound,
+        action_id: str | None,
+    ) -> bool:
         if action_id is None:
             return False
 
@@ -143,6 +231,26 @@ class BlackjackService:
             round_state.message = "Round timed out. Dealer wins by forfeit."
             self._finalize_round(db, round_state)
 
+        for multi_round in list(self._multi_rounds.values()):
+            if user_id and multi_round.user_id != user_id:
+                continue
+            if multi_round.status != "player_turn":
+                continue
+            if now < multi_round.action_deadline:
+                continue
+
+            multi_round.actions.append("anti_cheat_timeout")
+            # Only hands still waiting on the player are forfeited; stood, doubled and natural
+            # hands settle against the dealer as usual.
+            for hand in multi_round.hands:
+                if hand.result is not None or hand.status != "active":
+                    continue
+                hand.status = "timeout"
+                hand.result = "timeout"
+                hand.payout = -multi_round.bet_per_hand
+            self._settle_multi_round(db, multi_round)
+            multi_round.message = "Round timed out. Dealer wins open hands by forfeit."
+
     def _draw(self, round_state: ActiveRound) -> Card:
         return round_state.deck.pop()
 
@@ -156,10 +264,16 @@ class BlackjackService:
         round_state.ended_at = self._now()
         round_state.payout = round(round_state.payout or 0.0, 2)
 
-        user = db.get(User, round_state.user_id)
-        if user is not None:
-            user.balance = round(max(0.0, user.balance + (round_state.payout or 0.0)), 2)
-            db.add(user)
+        apply_balance_change(
+            db,
+            BalanceChange(
+                user_id=round_state.user_id,
+                delta=round_state.payout or 0.0,
+                reason="single_player_round",
+                idempotency_key=f"single_player_round:{round_state.round_id}",
+                reference_id=round_state.round_id,
+            ),
+        )
 
         dealer_score = hand_score(round_state.dealer_cards)
         player_score = hand_score(round_state.player_cards)
@@ -171,9 +285,10 @@ class BlackjackService:
             payout=round_state.payout or 0.0,
             player_score=player_score,
             dealer_score=dealer_score,
-            player_cards_json=json.dumps(round_state.player_cards),
-            dealer_cards_json=json.dumps(round_state.dealer_cards),
-            actions_json=json.dumps(round_state.actions),
+            round_id=round_state.round_id,
+            player_cards=encode_cards(round_state.player_cards),
+            dealer_cards=encode_cards(round_state.dealer_cards),
+            actions=encode_actions(round_state.actions),
             created_at=round_state.created_at,
             ended_at=round_state.ended_at or self._now(),
         )
@@ -348,16 +463,366 @@ class BlackjackService:
             self._resolve_result(db, round_state)
             return self._to_view(round_state)
 
-    def history(self, db: Session, user_id: str, limit: int = 20) -> list[RoundLogRead]:
+    def _finalize_multi_round(self, db: Session, multi_round: MultiHandRound) -> None:
+        multi_round.status = "completed"
+        multi_round.ended_at = self._now()
+        total_payout = round(sum(hand.payout or 0.0 for hand in multi_round.hands), 2)
+        multi_round.payout = total_payout
+
+        apply_balance_change(
+            db,
+            BalanceChange(
+                user_id=multi_round.user_id,
+                delta=total_payout,
+                reason="single_player_multi_round",
+                idempotency_key=f"single_player_multi_round:{multi_round.round_id}",
+                reference_id=multi_round.round_id,
+            ),
+        )
+
+        dealer_score = hand_score(multi_round.dealer_cards)
+        dealer_cards = encode_cards(multi_round.dealer_cards)
+        for hand in multi_round.hands:
+            db.add(
+                RoundLog(
+                    user_id=multi_round.user_id,
+                    bet=multi_round.bet_per_hand,
+                    result=hand.result or "unknown",
+                    payout=round(hand.payout or 0.0, 2),
+                    player_score=hand_score(hand.cards),
+                    dealer_score=dealer_score,
+                    round_id=multi_round.round_id,
+                    player_cards=encode_cards(hand.cards),
+                    dealer_cards=dealer_cards,
+                    actions=encode_actions(hand.actions),
+                    created_at=multi_round.created_at,
+                    ended_at=multi_round.ended_at,
+                )
+            )
+        db.commit()
+
+    def _settle_multi_round(self, db: Session, multi_round: MultiHandRound) -> None:
+        needs_dealer = any(
+            hand.status not in {"bust", "blackjack", "timeout"} for hand in multi_round.hands
+        ) and not natural_blackjack(multi_round.dealer_cards)
+        if needs_dealer:
+            while hand_score(multi_round.dealer_cards) < 17:
+                multi_round.dealer_cards.append(multi_round.deck.pop())
+                multi_round.actions.append("dealer_hit")
+
+        for hand in multi_round.hands:
+            if hand.result is not None:
+                continue
+            hand.result, hand.payout = settle_hand(
+                hand.cards,
+                multi_round.dealer_cards,
+                multi_round.bet_per_hand,
+            )
+
+        wins = sum(1 for hand in multi_round.hands if hand.result in {"win", "blackjack"})
+        multi_round.message = f"Round settled. {wins} of {len(multi_round.hands)} hands won."
+        self._finalize_multi_round(db, multi_round)
+
+    def _multi_view(self, multi_round: MultiHandRound) -> MultiHandRoundRead:
+        reveal_all = multi_round.status == "completed"
+        playing = multi_round.status == "player_turn"
+        hands = [
+            SinglePlayerHandRead(
+                hand_index=index,
+                cards=hand.cards,
+                score=hand_score(hand.cards),
+                status=hand.status,
+                result=hand.result,
+                payout=hand.payout,
+                can_hit=playing and hand.status == "active",
+                can_stand=playing and hand.status == "active",
+            )
+            for index, hand in enumerate(multi_round.hands)
+        ]
+        return MultiHandRoundRead(
+            round_id=multi_round.round_id,
+            status=multi_round.status,
+            bet_per_hand=multi_round.bet_per_hand,
+            total_bet=round(multi_round.bet_per_hand * len(multi_round.hands), 2),
+            hands=hands,
+            dealer_cards=expose_cards(multi_round.dealer_cards, reveal_all),
+            dealer_score=hand_score(multi_round.dealer_cards) if reveal_all else None,
+            payout=multi_round.payout,
+            message=multi_round.message,
+            actions=multi_round.actions,
+            created_at=multi_round.created_at,
+            ended_at=multi_round.ended_at,
+        )
+
+    def start_multi_hand_round(
+        self,
+        db: Session,
+        user_id: str,
+        bet_per_hand: float,
+        hand_count: int,
+    ) -> MultiHandRoundRead:
+        with self._lock:
+            self._expire_timed_out_rounds(db, user_id=user_id)
+            self._cleanup_round_cache()
+
+            if self._active_round_for_user(user_id):
+                raise ValueError("Finish your current round before starting a new one")
+            if hand_count < 1 or hand_count > MAX_SINGLE_PLAYER_HANDS:
+                raise ValueError(f"Hands must be between 1 and {MAX_SINGLE_PLAYER_HANDS}")
+
+            user = db.get(User, user_id)
+            if user is None:
+                raise ValueError("User not found")
+
+            safe_bet = round(float(bet_per_hand), 2)
+            if safe_bet <= 0:
+                raise ValueError("Bet must be greater than 0")
+            if round(safe_bet * hand_count, 2) > user.balance:
+                raise ValueError("Insufficient balance for this bet")
+
+            deck = build_deck()
+            hands = [SinglePlayerHand(cards=[], actions=["start_multi_hand"]) for _ in range(hand_count)]
+            dealer_cards: list[Card] = []
+            for hand in hands:
+                hand.cards.append(deck.pop())
+            dealer_cards.append(deck.pop())
+            for hand in hands:
+                hand.cards.append(deck.pop())
+            dealer_cards.append(deck.pop())
+
+            multi_round = MultiHandRound(
+                round_id=uuid4().hex,
+                user_id=user_id,
+                bet_per_hand=safe_bet,
+                deck=deck,
+                hands=hands,
+                dealer_cards=dealer_cards,
+                status="player_turn",
+                actions=["start_multi_hand"],
+                action_deadline=self._new_deadline(),
+            )
+            for hand in hands:
+                if natural_blackjack(hand.cards):
+                    hand.status = "blackjack"
+
+            if natural_blackjack(dealer_cards) or all(hand.status != "active" for hand in hands):
+                self._settle_multi_round(db, multi_round)
+
+            self._multi_rounds[multi_round.round_id] = multi_round
+            return self._multi_view(multi_round)
+
+    def get_multi_hand_round(
+        self,
+        db: Session,
+        user_id: str,
+        round_id: str,
+    ) -> MultiHandRoundRead | None:
+        with self._lock:
+            self._expire_timed_out_rounds(db, user_id=user_id)
+            self._cleanup_round_cache()
+
+            multi_round = self._multi_rounds.get(round_id)
+            if not multi_round or multi_round.user_id != user_id:
+                return None
+            return self._multi_view(multi_round)
+
+    def act_on_hand(
+        self,
+        db: Session,
+        user_id: str,
+        round_id: str,
+        hand_index: int,
+        action: str,
+        action_id: str | None = None,
+    ) -> MultiHandRoundRead | None:
+        if action not in {"hit", "stand"}:
+            raise ValueError("Unsupported hand action")
+
+        with self._lock:
+            self._expire_timed_out_rounds(db, user_id=user_id)
+            self._cleanup_round_cache()
+
+            multi_round = self._multi_rounds.get(round_id)
+            if not multi_round or multi_round.user_id != user_id:
+                return None
+            if multi_round.status != "player_turn":
+                return self._multi_view(multi_round)
+            if hand_index < 0 or hand_index >= len(multi_round.hands):
+                raise ValueError("Invalid hand index")
+            hand = multi_round.hands[hand_index]
+            if hand.status != "active":
+                raise ValueError("Hand is already finished")
+            if self._track_action_id(multi_round, action_id):
+                return self._multi_view(multi_round)
+
+            if action == "hit":
+                hand.cards.append(multi_round.deck.pop())
+                hand.actions.append("player_hit")
+                score = hand_score(hand.cards)
+                if score > 21:
+                    hand.status = "bust"
+                elif score == 21:
+                    hand.status = "stood"
+                    hand.actions.append("auto_stand")
+            else:
+                hand.status = "stood"
+                hand.actions.append("player_stand")
+            multi_round.actions.append(f"hand_{hand_index}_{action}")
+
+            if all(entry.status != "active" for entry in multi_round.hands):
+                self._settle_multi_round(db, multi_round)
+            else:
+                multi_round.action_deadline = self._new_deadline()
+
+            return self._multi_view(multi_round)
+
+    def auto_play(
+        self,
+        db: Session,
+        user_id: str,
+        bet_per_hand: float,
+        rounds: int,
+        hands_per_round: int = 1,
+    ) -> AutoPlayResultRead:
+        # basic_strategy builds on this module's card helpers.
+        from app.services.basic_strategy import recommend_action
+
+        if rounds < 1 or rounds > MAX_AUTO_PLAY_ROUNDS:
+            raise ValueError(f"Rounds must be between 1 and {MAX_AUTO_PLAY_ROUNDS}")
+        if hands_per_round < 1 or hands_per_round > MAX_SINGLE_PLAYER_HANDS:
+            raise ValueError(f"Hands must be between 1 and {MAX_SINGLE_PLAYER_HANDS}")
+
+        safe_bet = round(float(bet_per_hand), 2)
+        if safe_bet <= 0:
+            raise ValueError("Bet must be greater than 0")
+        stake_per_round = round(safe_bet * hands_per_round, 2)
+
+        with self._lock:
+            user = db.get(User, user_id)
+            if user is None:
+                raise ValueError("User not found")
+            starting_balance = round(float(user.balance), 2)
+            if stake_per_round > starting_balance:
+                raise ValueError("Insufficient balance for this bet")
+
+            running_balance = starting_balance
+            counts = {"win": 0, "lose": 0, "push": 0, "blackjack": 0}
+            busts = 0
+            rounds_played = 0
+            total_wagered = 0.0
+            round_payouts: list[float] = []
+            logs: list[RoundLog] = []
+            stopped_reason: str | None = None
+
+            for _ in range(rounds):
+                if stake_per_round > running_balance + 1e-9:
+                    stopped_reason = "insufficient_balance"
+                    break
+
+                started_at = self._now()
+                deck = build_deck()
+                hands = [[deck.pop()] for _ in range(hands_per_round)]
+                dealer_cards = [deck.pop()]
+                for cards in hands:
+                    cards.append(deck.pop())
+                dealer_cards.append(deck.pop())
+                hand_actions = [["auto_play"] for _ in hands]
+
+                if not natural_blackjack(dealer_cards):
+                    for cards, actions in zip(hands, hand_actions):
+                        if natural_blackjack(cards):
+                            continue
+                        while (
+                            hand_score(cards) < 21
+                            and recommend_action(cards, dealer_cards[0], AUTO_PLAY_ACTIONS) == "hit"
+                        ):
+                            cards.append(deck.pop())
+                            actions.append("player_hit")
+                        if hand_score(cards) > 21:
+                            busts += 1
+                        else:
+                            actions.append("player_stand")
+
+                    if any(hand_score(cards) <= 21 and not natural_blackjack(cards) for cards in hands):
+                        while hand_score(dealer_cards) < 17:
+                            dealer_cards.append(deck.pop())
+
+                ended_at = self._now()
+                round_net = 0.0
+                dealer_score = hand_score(dealer_cards)
+                encoded_dealer_cards = encode_cards(dealer_cards)
+                for cards, actions in zip(hands, hand_actions):
+                    result, payout = settle_hand(cards, dealer_cards, safe_bet)
+                    counts[result] += 1
+                    round_net += payout
+                    logs.append(
+                        RoundLog(
+                            user_id=user_id,
+                            bet=safe_bet,
+                            result=result,
+                            payout=round(payout, 2),
+                            player_score=hand_score(cards),
+                            dealer_score=dealer_score,
+                            player_cards=encode_cards(cards),
+                            dealer_cards=encoded_dealer_cards,
+                            actions=encode_actions(actions),
+                            created_at=started_at,
+                            ended_at=ended_at,
+                        )
+                    )
+
+                rounds_played += 1
+                total_wagered += stake_per_round
+                round_net = round(round_net, 2)
+                round_payouts.append(round_net)
+                running_balance = round(max(0.0, running_balance + round_net), 2)
+
+            net_payout = round(sum(round_payouts), 2)
+            batch_id = uuid4().hex
+            ending_balance = apply_balance_change(
+                db,
+                BalanceChange(
+                    user_id=user_id,
+                    delta=net_payout,
+                    reason="single_player_auto_play",
+                    idempotency_key=f"single_player_auto_play:{batch_id}",
+                    reference_id=batch_id,
+                ),
+            )
+            if ending_balance is None:
+                ending_balance = starting_balance
+            db.add_all(logs)
+            db.commit()
+
+            return AutoPlayResultRead(
+                rounds_requested=rounds,
+                rounds_played=rounds_played,
+                hands_per_round=hands_per_round,
+                bet_per_hand=safe_bet,
+                total_wagered=round(total_wagered, 2),
+                net_payout=net_payout,
+                wins=counts["win"],
+                losses=counts["lose"],
+                pushes=counts["push"],
+                blackjacks=counts["blackjack"],
+                busts=busts,
+                starting_balance=starting_balance,
+                ending_balance=ending_balance,
+                stopped_reason=stopped_reason,
+                round_payouts=round_payouts,
+            )
+
+    def history(self, db: Session, user_id: str, limit: int = 20, cursor: str | None = None) -> list[RoundLogRead]:
         with self._lock:
             self._expire_timed_out_rounds(db, user_id=user_id)
             self._cleanup_round_cache()
 
-        stmt = (
-            select(RoundLog)
-            .where(RoundLog.user_id == user_id)
-            .order_by(RoundLog.ended_at.desc())
-            .limit(limit)
+        stmt = keyset_page(
+            select(RoundLog).where(RoundLog.user_id == user_id),
+            RoundLog.ended_at,
+            RoundLog.id,
+            limit,
+            cursor,
         )
         rows = db.scalars(stmt).all()
         return [
@@ -369,13 +834,14 @@ class BlackjackService:
                 payout=row.payout,
                 player_score=row.player_score,
                 dealer_score=row.dealer_score,
-                player_cards=json.loads(row.player_cards_json),
-                dealer_cards=json.loads(row.dealer_cards_json),
-                actions=json.loads(row.actions_json),
+                round_id=row.round_id,
+                player_cards=player_cards,
+                dealer_cards=dealer_cards,
+                actions=actions,
                 created_at=row.created_at,
                 ended_at=row.ended_at,
             )
-            for row in rows
+            for row, (player_cards, dealer_cards, actions) in zip(rows, decode_round_logs(db, rows))
         ]
 
 
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import random
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ProviderClient:
+    """Pooled keep-alive HTTP client for one chain provider.
+
+    At most `max_concurrency` requests are in flight at once; transport errors, timeouts and
+    429/5xx responses are retried with exponential backoff plus full jitter. Failures surface
+    as ValueError, like the rest of the wallet service.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout_seconds: float,
+        max_concurrency: int,
+        retries: int,
+        backoff_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.name = name
+        self.base_url = base_url.strip()
+        self._retries = max(0, int(retries))
+        self._backoff_seconds = max(0.0, float(backoff_seconds))
+        self._semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self._client = httpx.AsyncClient(
+            timeout=max(0.1, float(timeout_seconds)),
+            limits=httpx.Limits(
+                max_connections=max(1, int(max_concurrency)),
+                max_keepalive_connections=max(1, int(max_concurrency)),
+            ),
+            headers={"Accept": "application/json"},
+            transport=transport,
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self._retries:
+                    response.raise_for_status()
+                    return response
+            except httpx.HTTPStatusError as exc:
+                raise ValueError(f"HTTP {method} failed: {self.name} returned {exc.response.status_code}") from exc
+            except httpx.HTTPError as exc:
+                if attempt >= self._retries:
+                    raise ValueError(f"HTTP {method} failed: {exc.__class__.__name__}") from exc
+            attempt += 1
+            await asyncio.sleep(random.uniform(0, self._backoff_seconds * (2 ** (attempt - 1))))
+
+    async def get_text(self, path: str) -> str:
+        if not self.base_url:
+            raise ValueError(f"{self.name} provider URL is not configured")
+        response = await self._request("GET", f"{self.base_url.rstrip('/')}{path}")
+        return response.text
+
+    async def get_json(self, path: str) -> dict:
+        return _json_object(await self.get_text(path))
+
+    async def rpc(self, method: str, params: list) -> object:
+        if not self.base_url:
+            raise ValueError(f"{self.name} RPC URL is not configured")
+        response = await self._request(
+            "POST",
+            self.base_url,
+            json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+        )
+        payload = _json_object(response.text)
+        error = payload.get("error")
+        if error:
+            if isinstance(error, dict):
+                message = error.get("message")
+                if isinstance(message, str) and message.strip():
+                    raise ValueError(f"{self.name} RPC error: {message}")
+            raise ValueError(f"{self.name} RPC returned an error")
+        return payload.get("result")
+
+    async def rpc_batch(self, calls: list[tuple[str, list]]) -> list[object]:
+        """One JSON-RPC batch request; results come back in call order, with a ValueError in
+        place of any call the node rejected."""
+        if not calls:
+            return []
+        if not self.base_url:
+            raise ValueError(f"{self.name} RPC URL is not configured")
+        response = await self._request(
+            "POST",
+            self.base_url,
+            json=[
+                {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+                for index, (method, params) in enumerate(calls)
+            ],
+        )
+        try:
+            entries = json.loads(response.text)
+        except json.JSONDecodeError as exc:
+            raise ValueError("Invalid JSON response from provider") from exc
+        if not isinstance(entries, list):
+            raise ValueError("Unexpected provider response shape")
+
+        results: list[object] = [ValueError(f"{self.name} RPC returned no result")] * len(calls)
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+                continue
+            index = entry["id"]
+            if not 0 <= index < len(calls):
+                continue
+            if entry.get("error"):
+                results[index] = ValueError(f"{self.name} RPC returned an error")
+            else:
+                results[index] = entry.get("result")
+        return results
+
+
+def parse_hex_quantity(value: str) -> int:
+    """JSON-RPC hex quantity ("0x1a") to int."""
+    normalized = value.strip().lower()
+    if not normalized.startswith("0x"):
+        raise ValueError("Expected hex value")
+    try:
+        return int(normalized, 16)
+    except ValueError as exc:
+        raise ValueError("Invalid hex value") from exc
+
+
+def _json_object(text: str) -> dict:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError("Invalid JSON response from provider") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected provider response shape")
+    return data
+
+
+def provider_timeout_seconds(chain: str) -> float:
+    """Per-request timeout for `chain`; a per-chain setting of 0 falls back to the shared one."""
+    settings = get_settings()
+    per_chain = {
+        "BTC": settings.wallet_btc_http_timeout_seconds,
+        "ETH": settings.wallet_eth_http_timeout_seconds,
+        "SOL": settings.wallet_sol_http_timeout_seconds,
+    }.get(chain)
+    return float(per_chain or settings.wallet_http_timeout_seconds)
+
+
+class ProviderPool:
+    """Owns one event loop thread and a ProviderClient per chain.
+
+    httpx async clients are bound to the loop that created them, so every provider call runs on
+    this loop: sync request handlers block on `run()`, async code awaits `run_async()`.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._transport = transport
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._clients: dict[str, ProviderClient] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="chain-providers", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+                self._clients = {}
+            return self._loop
+
+    def client(self, chain: str) -> ProviderClient:
+        """Client for `chain`; only call from coroutines running on this pool's loop."""
+        existing = self._clients.get(chain)
+        if existing is not None:
+            return existing
+        settings = get_settings()
+        base_url, max_concurrency = {
+            "BTC": (settings.wallet_btc_provider_url, settings.wallet_btc_max_concurrency),
+            "ETH": (settings.wallet_eth_rpc_url, settings.wallet_eth_max_concurrency),
+            "SOL": (settings.wallet_sol_rpc_url, settings.wallet_sol_max_concurrency),
+        }[chain]
+        created = ProviderClient(
+            chain,
+            str(base_url or ""),
+            timeout_seconds=provider_timeout_seconds(chain),
+            max_concurrency=max_concurrency,
+            retries=settings.wallet_http_retries,
+            backoff_seconds=settings.wallet_http_retry_backoff_seconds,
+            transport=self._transport,
+        )
+        self._clients[chain] = created
+        return created
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Block until `coro` finishes on the pool's loop; on timeout it is cancelled there too."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread, clients = self._loop, self._thread, list(self._clients.values())
+            self._loop, self._thread, self._clients = None, None, {}
+        if loop is None:
+            return
+
+        async def _close_all() -> None:
+            for provider_client in clients:
+                await provider_client.close()
+
+        asyncio.run_coroutine_threadsafe(_close_all(), loop).result(5.0)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(5.0)
+        loop.close()
+
+
+provider_pool = ProviderPool()
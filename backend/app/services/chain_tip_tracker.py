@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+
+from redis import asyncio as redis_asyncio
+
+from app.core.config import get_settings
+from app.services.chain_provider_client import ProviderPool, parse_hex_quantity, provider_pool
+
+
+class ChainTipTracker:
+    """Latest block height / slot per chain, shared by every verification.
+
+    A tip is reused for `wallet_{chain}_tip_ttl_seconds`: first from this process, then from
+    Redis (so other workers reuse it too), and only then fetched from the provider. Concurrent
+    callers in this process share one in-flight fetch. All methods run on the provider pool's
+    event loop.
+    """
+
+    def __init__(self, pool: ProviderPool, redis_enabled: bool = True) -> None:
+        self._pool = pool
+        self._redis_enabled = redis_enabled
+        self._redis: redis_asyncio.Redis | None = None
+        self._local: dict[str, tuple[int, float]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.stats = {"provider_fetches": 0, "redis_hits": 0, "local_hits": 0}
+
+    def _ttl_seconds(self, chain: str) -> float:
+        settings = get_settings()
+        ttl = {
+            "BTC": settings.wallet_btc_tip_ttl_seconds,
+            "ETH": settings.wallet_eth_tip_ttl_seconds,
+            "SOL": settings.wallet_sol_tip_ttl_seconds,
+        }[chain]
+        return max(0.0, float(ttl))
+
+    def _redis_client(self) -> redis_asyncio.Redis | None:
+        if not self._redis_enabled:
+            return None
+        if self._redis is None:
+            self._redis = redis_asyncio.Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    async def tip_height(self, chain: str, at_least: int | None = None) -> int:
+        """Current tip; refetched early when a transaction is in a block beyond the cached tip."""
+        ttl = self._ttl_seconds(chain)
+        now = time.time()
+        cached = self._local.get(chain)
+        if cached is not None and now - cached[1] < ttl and (at_least is None or cached[0] >= at_least):
+            self.stats["local_hits"] += 1
+            return cached[0]
+
+        if at_least is None:
+            shared = await self._read_shared(chain)
+            if shared is not None and now - shared[1] < ttl:
+                self.stats["redis_hits"] += 1
+                self._remember(chain, *shared)
+                return shared[0]
+
+        pending = self._in_flight.get(chain)
+        if pending is None:
+            pending = asyncio.ensure_future(self._refresh(chain))
+            self._in_flight[chain] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(chain, None))
+        return await asyncio.shield(pending)
+
+    def _remember(self, chain: str, height: int, fetched_at: float) -> None:
+        current = self._local.get(chain)
+        # Never step backwards because a lagging provider node answered.
+        if current is None or height >= current[0]:
+            self._local[chain] = (height, fetched_at)
+        else:
+            self._local[chain] = (current[0], fetched_at)
+
+    async def _refresh(self, chain: str) -> int:
+        height = await self._fetch(chain)
+        self.stats["provider_fetches"] += 1
+        fetched_at = time.time()
+        self._remember(chain, height, fetched_at)
+        await self._write_shared(chain, self._local[chain][0], fetched_at)
+        return self._local[chain][0]
+
+    async def _fetch(self, chain: str) -> int:
+        client = self._pool.client(chain)
+        if chain == "BTC":
+            tip_text = await client.get_text("/blocks/tip/height")
+            try:
+                return int(tip_text.strip())
+            except ValueError as exc:
+                raise ValueError("Invalid BTC tip height response") from exc
+        if chain == "ETH":
+            latest_hex = await client.rpc("eth_blockNumber", [])
+            if not isinstance(latest_hex, str):
+                raise ValueError("Unexpected ETH latest block response")
+            return parse_hex_quantity(latest_hex)
+        if chain == "SOL":
+            latest_slot = await client.rpc("getSlot", [{"commitment": "finalized"}])
+            if not isinstance(latest_slot, int):
+                raise ValueError("Unexpected SOL slot response")
+            return latest_slot
+        raise ValueError("Unsupported chain")
+
+    async def _read_shared(self, chain: str) -> tuple[int, float] | None:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(f"maca:wallet:tip:{chain}")
+            if not raw:
+                return None
+            payload = json.loads(raw)
+            return int(payload["height"]), float(payload["at"])
+        except Exception:
+            return None
+
+    async def _write_shared(self, chain: str, height: int, fetched_at: float) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            ttl_ms = max(1, int(self._ttl_seconds(chain) * 1000))
+            await client.set(f"maca:wallet:tip:{chain}", json.dumps({"height": height, "at": fetched_at}), px=ttl_ms)
+        except Exception:
+            pass
+
+
+chain_tip_tracker = ChainTipTracker(provider_pool)
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.models import User, WalletTransaction
+from app.db.session import SessionLocal
+from app.services import wallet_service
+from app.services.chain_provider_client import ProviderPool, provider_pool
+
+logger = logging.getLogger(__name__)
+
+BalanceNotifier = Callable[[str, float], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class PendingDeposit:
+    transaction_id: str
+    chain: str
+    tx_hash: str
+    block_height: int | None
+
+
+class DepositConfirmationPoller:
+    """Credits `pending_confirmation` deposits in the background.
+
+    Every `wallet_deposit_poll_interval_seconds` the oldest pending deposits are checked with
+    one batched lookup per chain (see `wallet_service.batch_confirmation_counts_async`); the
+    ones that reached their confirmations are credited and `notify(user_id, balance)` is
+    awaited for each. Database work runs in worker threads, provider calls on the provider
+    pool's loop, so the event loop this runs on is never blocked.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        notify: BalanceNotifier | None = None,
+        pool: ProviderPool = provider_pool,
+    ) -> None:
+        self._session_factory = session_factory
+        self._notify = notify
+        self._pool = pool
+        self._task: asyncio.Task | None = None
+        self.stats = {"polls": 0, "checked": 0, "credited": 0, "failed": 0, "expired": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start polling on the running event loop."""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("deposit confirmation poll failed")
+            await asyncio.sleep(max(1.0, float(get_settings().wallet_deposit_poll_interval_seconds)))
+
+    async def poll_once(self) -> dict[str, int]:
+        """One pass over the pending deposits; returns how many ended in each outcome."""
+        pending = await asyncio.to_thread(self._load_pending)
+        by_chain: dict[str, dict[str, int | None]] = {}
+        for deposit in pending:
+            by_chain.setdefault(deposit.chain, {})[deposit.tx_hash] = deposit.block_height
+
+        results: dict[tuple[str, str], tuple[int | ValueError, int | None]] = {}
+        for chain, known_blocks in by_chain.items():
+            try:
+                chain_results = await self._pool.run_async(
+                    wallet_service.batch_confirmation_counts_async(chain, known_blocks)
+                )
+            except ValueError as exc:
+                logger.warning("%s deposit confirmation lookup failed: %s", chain, exc)
+                continue
+            for tx_hash, outcome in chain_results.items():
+                results[(chain, tx_hash)] = outcome
+
+        outcomes, credited = await asyncio.to_thread(self._settle, pending, results)
+        self.stats["polls"] += 1
+        self.stats["checked"] += len(results)
+        for key in ("credited", "failed", "expired"):
+            self.stats[key] += outcomes.get(key, 0)
+
+        if self._notify is not None:
+            for user_id, balance in credited:
+                try:
+                    await self._notify(user_id, balance)
+                except Exception:
+                    logger.exception("balance notification failed for %s", user_id)
+        return outcomes
+
+    def _load_pending(self) -> list[PendingDeposit]:
+        db = self._session_factory()
+        try:
+            rows = wallet_service.list_pending_deposits(db, get_settings().wallet_deposit_poll_batch_size)
+            pending = [
+                PendingDeposit(
+                    transaction_id=row.id,
+                    chain=row.chain,
+                    tx_hash=row.tx_hash,
+                    block_height=_known_block_height(row.metadata_json),
+                )
+                for row in rows
+                if row.tx_hash
+            ]
+            wallet_service.mark_deposits_polled(db, [row.id for row in rows])
+            return pending
+        finally:
+            db.close()
+
+    def _settle(
+        self,
+        pending: list[PendingDeposit],
+        results: dict[tuple[str, str], tuple[int | ValueError, int | None]],
+    ) -> tuple[dict[str, int], list[tuple[str, float]]]:
+        outcomes: dict[str, int] = {}
+        credited: list[tuple[str, float]] = []
+        db = self._session_factory()
+        try:
+            for deposit in pending:
+                outcome = results.get((deposit.chain, deposit.tx_hash))
+                if outcome is None:
+                    continue
+                transaction = db.get(WalletTransaction, deposit.transaction_id)
+                if transaction is None or transaction.status != wallet_service.PENDING_CONFIRMATION_STATUS:
+                    continue
+                user_id = transaction.user_id
+                result = wallet_service.settle_pending_deposit(db, transaction, *outcome)
+                outcomes[result] = outcomes.get(result, 0) + 1
+                if result == "credited":
+                    balance = db.scalar(select(User.balance).where(User.id == user_id))
+                    credited.append((user_id, float(balance or 0.0)))
+        finally:
+            db.close()
+        return outcomes, credited
+
+
+def _known_block_height(metadata_json: str | None) -> int | None:
+    try:
+        verification = json.loads(metadata_json or "{}").get("verification") or {}
+    except (json.JSONDecodeError, AttributeError):
+        return None
+    height = verification.get("block_height") if isinstance(verification, dict) else None
+    return height if isinstance(height, int) else None
+
+
+_poller: DepositConfirmationPoller | None = None
+
+
+def start_deposit_poller(notify: BalanceNotifier | None = None) -> DepositConfirmationPoller | None:
+    """Start the shared poller; deposits only wait for confirmations in real verification mode."""
+    global _poller
+    settings = get_settings()
+    if not settings.wallet_deposit_poll_enabled:
+        return None
+    if str(settings.wallet_verification_mode or "").strip().lower() == "mock":
+        return None
+    if _poller is not None and _poller.running:
+        return _poller
+    _poller = DepositConfirmationPoller(notify=notify)
+    _poller.start()
+    return _poller
+
+
+async def stop_deposit_poller() -> None:
+    global _poller
+    poller, _poller = _poller, None
+    if poller is not None:
+        await poller.stop()
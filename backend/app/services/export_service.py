@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import AdminAuditLog, BalanceLedgerEntry, RoundLog, SecurityEvent, WalletTransaction
+from app.services.round_log_codec import decode_round_logs
+
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+ROUND_LOG_EXPORT_COLUMNS = (
+    "id",
+    "user_id",
+    "round_id",
+    "bet",
+    "result",
+    "payout",
+    "player_score",
+    "dealer_score",
+    "player_cards",
+    "dealer_cards",
+    "actions",
+    "created_at",
+    "ended_at",
+)
+EXPORT_DATASETS = {
+    "round-logs": RoundLog,
+    "wallet-transactions": WalletTransaction,
+    "audit-logs": AdminAuditLog,
+    "security-events": SecurityEvent,
+    "balance-ledger": BalanceLedgerEntry,
+}
+
+
+def _export_columns(model) -> tuple[str, ...]:
+    if model is RoundLog:
+        return ROUND_LOG_EXPORT_COLUMNS
+    return tuple(column.name for column in model.__table__.columns)
+
+
+def plain_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return "" if value is None else plain_value(value)
+
+
+def round_log_records(db: Session, rows: list[RoundLog]) -> list[dict]:
+    records = []
+    for row, (player_cards, dealer_cards, actions) in zip(rows, decode_round_logs(db, rows)):
+        records.append(
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "round_id": row.round_id,
+                "bet": row.bet,
+                "result": row.result,
+                "payout": row.payout,
+                "player_score": row.player_score,
+                "dealer_score": row.dealer_score,
+                "player_cards": player_cards,
+                "dealer_cards": dealer_cards,
+                "actions": actions,
+                "created_at": row.created_at,
+                "ended_at": row.ended_at,
+            }
+        )
+    return records
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    dataset: str,
+    export_format: str = "ndjson",
+    user_id: str | None = None,
+    since: datetime | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Yield an export one chunk of rows at a time, oldest first.
+
+    The query runs on a server-side cursor (`yield_per`), so memory stays flat regardless of
+    table size. The generator owns its session because it outlives the request handler.
+    """
+    model = EXPORT_DATASETS.get(dataset)
+    if model is None:
+        raise ValueError("Unknown export dataset")
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError("Unsupported export format")
+    columns = _export_columns(model)
+
+    stmt = select(model)
+    if user_id is not None:
+        user_column = model.target_user_id if model is AdminAuditLog else model.user_id
+        stmt = stmt.where(user_column == user_id)
+    if since is not None:
+        stmt = stmt.where(model.created_at >= since)
+    stmt = stmt.order_by(model.created_at, model.id).execution_options(yield_per=max(1, chunk_rows))
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    db = session_factory()
+    try:
+        for partition in db.scalars(stmt).partitions():
+            if model is RoundLog:
+                records = round_log_records(db, partition)
+            else:
+                records = [{name: getattr(row, name) for name in columns} for row in partition]
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([_csv_cell(record[name]) for name in columns] for record in records)
+                chunk = buffer.getvalue()
+            else:
+                chunk = "".join(
+                    json.dumps({name: plain_value(value) for name, value in record.items()}, separators=(",", ":")) + "\n"
+                    for record in records
+                )
+            yield chunk
+    finally:
+        db.close()
@@ -0,0 +1,152 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import Float, Numeric, cast, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import BalanceLedgerEntry, User
+
+_users = User.__table__
+
+
+@dataclass(frozen=True)
+class BalanceChange:
+    user_id: str
+    delta: float
+    reason: str
+    idempotency_key: str
+    reference_id: str | None = None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _rounded(expression):
+    return cast(func.round(cast(expression, Numeric(18, 4)), 2), Float)
+
+
+def _sync_loaded_user(db: Session, user_id: str, balance: float) -> None:
+    loaded = db.identity_map.get(db.identity_key(User, user_id))
+    if loaded is not None:
+        set_committed_value(loaded, "balance", balance)
+
+
+def _apply_delta(
+    db: Session,
+    user_id: str,
+    delta: float,
+    floor_at_zero: bool,
+    require_sufficient: bool,
+) -> tuple[float, float] | None:
+    """Returns the new balance and the delta actually applied, or None when nothing was updated."""
+    stmt = update(_users).where(_users.c.id == user_id)
+    if delta < 0 and (require_sufficient or floor_at_zero):
+        stmt = stmt.where(_rounded(_users.c.balance + delta) >= 0)
+    row = db.execute(stmt.values(balance=_rounded(_users.c.balance + delta)).returning(_users.c.balance)).first()
+    if row is not None:
+        balance, applied = round(float(row[0]), 2), delta
+    elif delta < 0 and floor_at_zero and not require_sufficient:
+        # The debit is larger than the balance: only what was there is taken, and recorded.
+        previous = db.scalar(select(_users.c.balance).where(_users.c.id == user_id).with_for_update())
+        if previous is None:
+            return None
+        db.execute(update(_users).where(_users.c.id == user_id).values(balance=0.0))
+        balance, applied = 0.0, round(0.0 - float(previous), 2)
+    else:
+        return None
+    _sync_loaded_user(db, user_id, balance)
+    return balance, applied
+
+
+def apply_balance_changes(
+    db: Session,
+    changes: Iterable[BalanceChange],
+    floor_at_zero: bool = True,
+) -> dict[str, float]:
+    """Apply deltas with atomic SQL increments and append ledger rows; the caller commits.
+
+    Changes whose idempotency key is already in the ledger are skipped. With `floor_at_zero`
+    a debit larger than the balance empties it, and its ledger row records the amount
+    actually taken. Returns the new balance for every user that was updated.
+    """
+    pending = [change for change in changes if round(float(change.delta), 2) != 0.0]
+    if len(pending) == 0:
+        return {}
+
+    keys = [change.idempotency_key for change in pending]
+    existing_keys = set(
+        db.scalars(select(BalanceLedgerEntry.idempotency_key).where(BalanceLedgerEntry.idempotency_key.in_(keys)))
+    )
+
+    now = _utc_now()
+    balances: dict[str, float] = {}
+    entries: list[BalanceLedgerEntry] = []
+    seen_keys: set[str] = set()
+    for change in pending:
+        if change.idempotency_key in existing_keys or change.idempotency_key in seen_keys:
+            continue
+        seen_keys.add(change.idempotency_key)
+        delta = round(float(change.delta), 2)
+        applied = _apply_delta(db, change.user_id, delta, floor_at_zero=floor_at_zero, require_sufficient=False)
+        if applied is None:
+            continue
+        balance, applied_delta = applied
+        balances[change.user_id] = balance
+        entries.append(
+            BalanceLedgerEntry(
+                user_id=change.user_id,
+                delta=applied_delta,
+                balance_after=balance,
+                reason=change.reason,
+                reference_id=change.reference_id,
+                idempotency_key=change.idempotency_key,
+                created_at=now,
+            )
+        )
+    db.add_all(entries)
+    return balances
+
+
+def apply_balance_change(
+    db: Session,
+    change: BalanceChange,
+    floor_at_zero: bool = True,
+    require_sufficient: bool = False,
+) -> float | None:
+    """Single-user variant. With `require_sufficient`, a debit larger than the balance updates nothing and returns None."""
+    if require_sufficient:
+        existing = db.scalar(
+            select(BalanceLedgerEntry.balance_after).where(
+                BalanceLedgerEntry.idempotency_key == change.idempotency_key
+            )
+        )
+        if existing is not None:
+            return round(float(existing), 2)
+        delta = round(float(change.delta), 2)
+        applied = _apply_delta(db, change.user_id, delta, floor_at_zero=floor_at_zero, require_sufficient=True)
+        if applied is None:
+            return None
+        balance, applied_delta = applied
+        db.add(
+            BalanceLedgerEntry(
+                user_id=change.user_id,
+                delta=applied_delta,
+                balance_after=balance,
+                reason=change.reason,
+                reference_id=change.reference_id,
+                idempotency_key=change.idempotency_key,
+                created_at=_utc_now(),
+            )
+        )
+        return balance
+
+    balances = apply_balance_changes(db, [change], floor_at_zero=floor_at_zero)
+    return balances.get(change.user_id)
+
+
+def ledger_balance_delta(db: Session, user_id: str) -> float:
+    total = db.scalar(select(func.coalesce(func.sum(BalanceLedgerEntry.delta), 0.0)).where(BalanceLedgerEntry.user_id == user_id))
+    return round(float(total or 0.0), 2)
@@ -1,3 +1,7 @@
+import asyncio
+import json
+import logging
+import threading
 from dataclasses import asdict, dataclass, field
 from threading import Lock
 from uuid import uuid4
@@ -5,6 +9,10 @@ from uuid import uuid4
 from app.schemas.lobby import TableCreateRequest
 from app.services.redis_client import get_redis_client
 
+logger = logging.getLogger(__name__)
+
+LOBBY_TABLES_KEY = "maca:lobby:tables"
+
 
 @dataclass
 class LobbyTable:
@@ -14,79 +22,392 @@ class LobbyTable:
     max_players: int
     is_private: bool
     invite_code: str | None
-    players: list[str] = field(default_factory=list)
+    # Insertion-ordered set: seat order for the game, O(1) membership checks.
+    players: dict[str, None] = field(default_factory=dict)
+    min_stake: float | None = None
+    max_stake: float | None = None
+
+    @property
+    def open_seats(self) -> int:
+        return max(0, self.max_players - len(self.players))
+
+    def accepts_stake(self, stake: float) -> bool:
+        return (self.min_stake is None or stake >= self.min_stake) and (
+            self.max_stake is None or stake <= self.max_stake
+        )
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "players": list(self.players)}
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "LobbyTable":
+        return cls(
+            id=str(payload["id"]),
+            name=str(payload["name"]),
+            owner_id=str(payload["owner_id"]),
+            max_players=int(payload["max_players"]),
+            is_private=bool(payload["is_private"]),
+            invite_code=payload.get("invite_code") or None,
+            players=dict.fromkeys(str(player_id) for player_id in payload.get("players") or []),
+            min_stake=_optional_float(payload.get("min_stake")),
+            max_stake=_optional_float(payload.get("max_stake")),
+        )
+
+
+def _optional_float(value: object) -> float | None:
+    return None if value is None else float(value)
 
 
 class LobbyService:
+    """In-memory lobby with secondary indexes.
+
+    A user sits at no more than one table, so user -> table and invite code -> table are plain
+    maps; public tables are tracked in creation order and their list is rebuilt only when
+    `version` (bumped by every change) moves. `visibility_version(user_id)` only moves when
+    something that user can see changed (a public table or their own private one), and
+    `wait_for_change` parks long-poll clients until it does. Visibility versions carry a
+    per-instance epoch, since the counters restart at zero with the process.
+
+    Tables are persisted to the `maca:lobby:tables` Redis hash as one JSON field per table. A
+    mutation only marks its table dirty; the persistence thread writes the dirty tables (HSET,
+    or HDEL for dropped ones) in one pipeline, and `restore()` reloads them after a restart.
+    """
+
     def __init__(self) -> None:
         self._tables: dict[str, LobbyTable] = {}
+        self._table_by_user: dict[str, str] = {}
+        self._table_by_invite_code: dict[str, str] = {}
+        self._public_table_ids: dict[str, None] = {}
+        self._epoch = uuid4().hex[:8]
+        self._version = 0
+        self._public_version = 0
+        self._table_versions: dict[str, int] = {}
+        self._table_sequence: dict[str, int] = {}
+        self._next_sequence = 0
+        self._change_waiters: dict[asyncio.Future, asyncio.AbstractEventLoop] = {}
+        self._public_tables: tuple[int, list[LobbyTable]] = (-1, [])
         self._lock = Lock()
         self._redis = get_redis_client()
+        self._dirty: dict[str, None] = {}
+        self._write_lock = Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer: threading.Thread | None = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _mark_dirty_locked(self, table: LobbyTable) -> None:
+        self._dirty[table.id] = None
+        self._version += 1
+        if table.id in self._tables:
+            self._table_versions[table.id] = self._version
+        else:
+            self._table_versions.pop(table.id, None)
+        if not table.is_private:
+            self._public_version = self._version
+
+    def _take_dirty_locked(self) -> dict[str, str | None]:
+        """JSON for every dirty table, None for dropped ones; serialized under the lobby lock."""
+        dirty, self._dirty = self._dirty, {}
+        return {
+            table_id: json.dumps(self._tables[table_id].to_dict()) if table_id in self._tables else None
+            for table_id in dirty
+        }
+
+    def _write(self, changes: dict[str, str | None]) -> bool:
+        if not changes or self._redis is None:
+            return True
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for table_id, payload in changes.items():
+                if payload is None:
+                    pipeline.hdel(LOBBY_TABLES_KEY, table_id)
+                else:
+                    pipeline.hset(LOBBY_TABLES_KEY, table_id, payload)
+            pipeline.execute()
+            return True
+        except Exception:
+            return False
 
     def _persist(self) -> None:
+        """Called with the lobby lock held after a mutation."""
+        self._wake_change_waiters_locked()
         if self._redis is None:
+            self._dirty.clear()
+            return
+        if self.persistence_running:
+            self._wake.set()
             return
+        self._write(self._take_dirty_locked())
+
+    @property
+    def persistence_running(self) -> bool:
+        return self._writer is not None and self._writer.is_alive()
+
+    def flush(self) -> bool:
+        """Write every pending change now; False when Redis rejected the write."""
+        with self._write_lock:
+            with self._lock:
+                changes = self._take_dirty_locked()
+            if self._write(changes):
+                return True
+            with self._lock:
+                # Re-queue whatever a newer mutation has not already re-marked.
+                for table_id in changes:
+                    self._dirty.setdefault(table_id, None)
+            return False
+
+    def _run_writer(self) -> None:
+        failing = False
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            stopping = self._stopping
+            written = self.flush()
+            if not written and not failing:
+                logger.warning("lobby persistence to Redis failed; retrying")
+            failing = not written
+            if stopping:
+                return
+            if failing:
+                self._wake.wait(1.0)
+                self._wake.set()
+
+    def start_persistence(self) -> None:
+        if self.persistence_running or self._redis is None:
+            return
+        self._stopping = False
+        self._writer = threading.Thread(target=self._run_writer, name="lobby-persistence", daemon=True)
+        self._writer.start()
+
+    def stop_persistence(self, timeout: float = 5.0) -> None:
+        writer = self._writer
+        if writer is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        writer.join(timeout)
+        self._writer = None
+
+    def restore(self) -> int:
+        """Load the persisted tables (after a restart); returns how many were restored."""
+        if self._redis is None:
+            return 0
         try:
-            payload = {table_id: str(asdict(table)) for table_id, table in self._tables.items()}
-            self._redis.hset("maca:lobby:tables", mapping=payload)
+            stored = self._redis.hgetall(LOBBY_TABLES_KEY)
         except Exception:
-            return
+            return 0
+        unreadable: list[str] = []
+        tables: list[LobbyTable] = []
+        for table_id, raw in stored.items():
+            try:
+                tables.append(LobbyTable.from_dict(json.loads(raw)))
+            except (ValueError, KeyError, TypeError):
+                unreadable.append(table_id)
+        with self._lock:
+            restored = self._restore_tables_locked(tables)
+            # Already stored as they are.
+            self._dirty.clear()
+        if unreadable:
+            # Entries written by older releases as Python reprs.
+            try:
+                self._redis.hdel(LOBBY_TABLES_KEY, *unreadable)
+            except Exception:
+                pass
+        return restored
+
+    def restore_tables(self, tables: list[LobbyTable]) -> int:
+        """Add saved tables that are not in the lobby yet (and persist them); returns the count."""
+        with self._lock:
+            restored = self._restore_tables_locked(tables)
+            self._persist()
+            return restored
+
+    def _restore_tables_locked(self, tables: list[LobbyTable]) -> int:
+        restored = 0
+        for table in tables:
+            if table.id in self._tables or len(table.players) == 0:
+                continue
+            self._add_table_locked(table)
+            restored += 1
+        return restored
+
+    def _table_for_user_locked(self, user_id: str) -> LobbyTable | None:
+        table_id = self._table_by_user.get(user_id)
+        table = self._tables.get(table_id) if table_id else None
+        if table is None or user_id not in table.players:
+            self._table_by_user.pop(user_id, None)
+            return None
+        return table
+
+    def _add_table_locked(self, table: LobbyTable) -> None:
+        self._tables[table.id] = table
+        self._next_sequence += 1
+        self._table_sequence[table.id] = self._next_sequence
+        if table.invite_code:
+            self._table_by_invite_code[table.invite_code.upper()] = table.id
+        if not table.is_private:
+            self._public_table_ids[table.id] = None
+        for player_id in table.players:
+            self._table_by_user[player_id] = table.id
+        self._mark_dirty_locked(table)
+
+    def _drop_table_locked(self, table_id: str) -> LobbyTable | None:
+        table = self._tables.pop(table_id, None)
+        if table is None:
+            return None
+        if table.invite_code:
+            self._table_by_invite_code.pop(table.invite_code.upper(), None)
+        self._public_table_ids.pop(table_id, None)
+        self._table_sequence.pop(table_id, None)
+        for player_id in table.players:
+            if self._table_by_user.get(player_id) == table_id:
+                self._table_by_user.pop(player_id, None)
+        self._mark_dirty_locked(table)
+        return table
+
+    def _seat_player_locked(self, table: LobbyTable, user_id: str) -> None:
+        table.players[user_id] = None
+        self._table_by_user[user_id] = table.id
+        self._mark_dirty_locked(table)
+
+    def _unseat_player_locked(self, table: LobbyTable, user_id: str) -> bool:
+        """Remove `user_id` from `table`; True when that emptied (and dropped) the table."""
+        table.players.pop(user_id, None)
+        if self._table_by_user.get(user_id) == table.id:
+            self._table_by_user.pop(user_id, None)
+        self._mark_dirty_locked(table)
+        if len(table.players) == 0:
+            self._drop_table_locked(table.id)
+            return True
+        return False
 
     def _remove_user_from_all_tables_locked(
         self,
         user_id: str,
         keep_table_id: str | None = None,
     ) -> list[str]:
-        touched_table_ids: list[str] = []
-        empty_table_ids: list[str] = []
+        table = self._table_for_user_locked(user_id)
+        if table is None or table.id == keep_table_id:
+            return []
+        self._unseat_player_locked(table, user_id)
+        return [table.id]
 
-        for table in self._tables.values():
-            if keep_table_id and table.id == keep_table_id:
-                continue
-            if user_id not in table.players:
-                continue
-            table.players = [player_id for player_id in table.players if player_id != user_id]
-            touched_table_ids.append(table.id)
-            if len(table.players) == 0:
-                empty_table_ids.append(table.id)
+    def list_tables(self) -> list[LobbyTable]:
+        with self._lock:
+            return list(self._tables.values())
+
+    def public_tables(self) -> list[LobbyTable]:
+        with self._lock:
+            return list(self._public_tables_locked())
 
-        for table_id in empty_table_ids:
-            self._tables.pop(table_id, None)
-            touched_table_ids.append(table_id)
+    def _public_tables_locked(self) -> list[LobbyTable]:
+        version, tables = self._public_tables
+        if version != self._version:
+            tables = [self._tables[table_id] for table_id in self._public_table_ids if table_id in self._tables]
+            self._public_tables = (self._version, tables)
+        return tables
 
-        return touched_table_ids
+    def _visibility_version_locked(self, user_id: str) -> str:
+        table = self._table_for_user_locked(user_id)
+        if table is None or not table.is_private:
+            return f"{self._epoch}.{self._public_version}"
+        return f"{self._epoch}.{self._public_version}.{table.id}.{self._table_versions.get(table.id, 0)}"
 
-    def list_tables(self) -> list[LobbyTable]:
+    def visibility_version(self, user_id: str) -> str:
+        """Changes exactly when the tables `user_id` can see (or their contents) change."""
         with self._lock:
-            return list(self._tables.values())
+            return self._visibility_version_locked(user_id)
+
+    def list_visible_tables(
+        self,
+        user_id: str,
+        *,
+        stake: float | None = None,
+        min_open_seats: int = 0,
+        is_private: bool | None = None,
+        after: int | None = None,
+        limit: int = 100,
+    ) -> tuple[list[LobbyTable], str, int | None]:
+        """One filtered page of the visible tables in creation order.
+
+        Returns the page, the visibility version it reflects and the cursor (a creation
+        sequence number) for the next page, or None on the last one.
+        """
+        with self._lock:
+            version = self._visibility_version_locked(user_id)
+            visible = self._public_tables_locked() if is_private is not True else []
+            own_table = self._table_for_user_locked(user_id) if is_private is not False else None
+            if own_table is not None and own_table.is_private:
+                visible = sorted([*visible, own_table], key=lambda table: self._table_sequence[table.id])
+            page: list[LobbyTable] = []
+            following: int | None = None
+            for table in visible:
+                sequence = self._table_sequence[table.id]
+                if after is not None and sequence <= after:
+                    continue
+                if table.open_seats < min_open_seats or (stake is not None and not table.accepts_stake(stake)):
+                    continue
+                if len(page) == limit:
+                    following = self._table_sequence[page[-1].id]
+                    break
+                page.append(table)
+            return page, version, following
+
+    def _wake_change_waiters_locked(self) -> None:
+        waiters, self._change_waiters = self._change_waiters, {}
+        for future, loop in waiters.items():
+            loop.call_soon_threadsafe(_resolve_waiter, future)
+
+    async def wait_for_change(self, user_id: str, since: str, timeout: float) -> str:
+        """Wait up to `timeout` seconds for `visibility_version(user_id)` to move off `since`."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, timeout)
+        while True:
+            with self._lock:
+                current = self._visibility_version_locked(user_id)
+                remaining = deadline - loop.time()
+                if current != since or remaining <= 0:
+                    return current
+                future = loop.create_future()
+                self._change_waiters[future] = loop
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._change_waiters.pop(future, None)
+
+    def private_table_for_user(self, user_id: str) -> LobbyTable | None:
+        with self._lock:
+            table = self._table_for_user_locked(user_id)
+            return table if table is not None and table.is_private else None
 
     def visible_tables_for_user(self, user_id: str) -> list[LobbyTable]:
         with self._lock:
-            return [
-                table
-                for table in self._tables.values()
-                if not table.is_private or user_id in table.players
-            ]
+            visible = list(self._public_tables_locked())
+            own_table = self._table_for_user_locked(user_id)
+            if own_table is not None and own_table.is_private:
+                visible.append(own_table)
+            return visible
 
     def table_ids_for_user(self, user_id: str) -> list[str]:
         with self._lock:
-            return [table.id for table in self._tables.values() if user_id in table.players]
+            table = self._table_for_user_locked(user_id)
+            return [table.id] if table is not None else []
 
     def get_table(self, table_id: str) -> LobbyTable | None:
         with self._lock:
             return self._tables.get(table_id)
 
+    def _table_by_invite_code_locked(self, invite_code: str) -> LobbyTable | None:
+        table_id = self._table_by_invite_code.get(invite_code.strip().upper())
+        return self._tables.get(table_id) if table_id else None
+
     def get_table_by_invite_code(self, invite_code: str) -> LobbyTable | None:
-        normalized = invite_code.strip().upper()
-        with self._lock:
-            return next(
-                (
-                    table
-                    for table in self._tables.values()
-                    if table.invite_code and table.invite_code.upper() == normalized
-                ),
-                None,
-            )
+        with self._lock:
+            return self._table_by_invite_code_locked(invite_code)
 
     def create_table(self, owner_id: str, payload: TableCreateRequest) -> LobbyTable:
         with self._lock:
@@ -100,9 +421,11 @@ class LobbyService:
                 max_players=payload.max_players,
                 is_private=payload.is_private,
                 invite_code=invite_code,
-                players=[owner_id],
+                players={owner_id: None},
+                min_stake=payload.min_stake,
+                max_stake=payload.max_stake,
             )
-            self._tables[table.id] = table
+            self._add_table_locked(table)
             self._persist()
             return table
 
@@ -116,21 +439,13 @@ class LobbyService:
             if len(table.players) >= table.max_players:
                 return None
             self._remove_user_from_all_tables_locked(user_id, keep_table_id=table_id)
-            table.players.append(user_id)
+            self._seat_player_locked(table, user_id)
             self._persist()
             return table
 
     def join_table_by_invite_code(self, invite_code: str, user_id: str) -> LobbyTable | None:
-        normalized = invite_code.strip().upper()
-        with self._lock:
-            table = next(
-                (
-                    entry
-                    for entry in self._tables.values()
-                    if entry.invite_code and entry.invite_code.upper() == normalized
-                ),
-                None,
-            )
+        with self._lock:
+            table = self._table_by_invite_code_locked(invite_code)
             if not table:
                 return None
             if user_id in table.players:
@@ -138,7 +453,7 @@ class LobbyService:
             if len(table.players) >= table.max_players:
                 return None
             self._remove_user_from_all_tables_locked(user_id, keep_table_id=table.id)
-            table.players.append(user_id)
+            self._seat_player_locked(table, user_id)
             self._persist()
             return table
 
@@ -150,24 +465,27 @@ class LobbyService:
             if user_id not in table.players:
                 return table
 
-            table.players = [player_id for player_id in table.players if player_id != user_id]
-            if len(table.players) == 0:
-                self._tables.pop(table_id, None)
+            if self._unseat_player_locked(table, user_id):
                 self._persist()
                 return None
 
             if table.owner_id == user_id:
-                table.owner_id = table.players[0]
+                table.owner_id = next(iter(table.players))
+                self._mark_dirty_locked(table)
             self._persist()
             return table
 
     def close_table(self, table_id: str) -> bool:
         with self._lock:
-            if table_id not in self._tables:
+            if self._drop_table_locked(table_id) is None:
                 return False
-            self._tables.pop(table_id, None)
             self._persist()
             return True
 
 
+def _resolve_waiter(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
 lobby_service = LobbyService()
@@ -0,0 +1,36 @@
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import Select, and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor") from None
+
+
+def keyset_page(stmt: Select, time_column, id_column, limit: int, cursor: str | None = None) -> Select:
+    """Newest-first page of `stmt` ordered by (time, id), starting strictly after `cursor`."""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(time_column < timestamp, and_(time_column == timestamp, id_column < row_id)))
+    return stmt.order_by(time_column.desc(), id_column.desc()).limit(limit)
+
+
+def next_cursor(items: Sequence, limit: int, time_attr: str = "created_at") -> str | None:
+    if len(items) < limit or len(items) == 0:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, time_attr), last.id)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.db.session import has_replica, read_engine
+from app.services.redis_client import get_redis_client
+
+# Streaming replicas report replay lag; when receive and replay positions match the replica
+# is caught up, even if the last replayed transaction is old (idle primary).
+_PG_REPLICA_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReadRoutingService:
+    """Decides whether a read may use the replica.
+
+    Reads go to the primary for `database_read_your_writes_seconds` after the user's last
+    write, and for everyone while the replica is unreachable or lags more than
+    `database_replica_max_lag_seconds`.
+    """
+
+    def __init__(self, replica_engine: Engine | None = None) -> None:
+        self._redis = get_redis_client()
+        self._replica_engine = replica_engine
+        self._recent_writes: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._lag_checked_at = 0.0
+        self._lag_seconds: float | None = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._replica_engine is not None
+
+    def mark_write(self, user_id: str) -> None:
+        if not self.enabled or not user_id:
+            return
+        window = max(0.0, float(get_settings().database_read_your_writes_seconds))
+        if window <= 0:
+            return
+        if self._redis is not None:
+            try:
+                self._redis.set(f"maca:ryw:{user_id}", "1", px=int(window * 1000))
+                return
+            except Exception:
+                pass
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent_writes) > 4096:
+                self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+            self._recent_writes[user_id] = now + window
+
+    def recently_wrote(self, user_id: str) -> bool:
+        if self._redis is not None:
+            try:
+                if self._redis.exists(f"maca:ryw:{user_id}"):
+                    return True
+            except Exception:
+                pass
+        with self._lock:
+            return self._recent_writes.get(user_id, 0.0) > time.monotonic()
+
+    def replica_lag_seconds(self) -> float | None:
+        """Cached replica lag in seconds; None when the replica could not be reached."""
+        if self._replica_engine is None:
+            return 0.0
+        now = time.monotonic()
+        interval = max(0.1, float(get_settings().database_replica_lag_check_seconds))
+        with self._lock:
+            if now - self._lag_checked_at < interval:
+                return self._lag_seconds
+            # Claim the probe so concurrent requests keep using the cached value meanwhile.
+            self._lag_checked_at = now
+        lag = self._probe_lag()
+        with self._lock:
+            self._lag_seconds = lag
+        return lag
+
+    def _probe_lag(self) -> float | None:
+        try:
+            with self._replica_engine.connect() as connection:
+                if connection.dialect.name != "postgresql":
+                    connection.execute(text("SELECT 1"))
+                    return 0.0
+                return float(connection.execute(text(_PG_REPLICA_LAG_SQL)).scalar() or 0.0)
+        except Exception:
+            return None
+
+    def prefer_primary(self, user_id: str | None) -> bool:
+        if not self.enabled:
+            return False
+        if user_id and self.recently_wrote(user_id):
+            return True
+        lag = self.replica_lag_seconds()
+        return lag is None or lag > float(get_settings().database_replica_max_lag_seconds)
+
+
+read_routing_service = ReadRoutingService(read_engine if has_replica else None)
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.db.models import ReferralReward, User
+from app.services.ledger_service import BalanceChange, apply_balance_changes
 
 REFERRAL_CODE_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
 MAX_CODE_GENERATION_ATTEMPTS = 40
@@ -69,8 +70,25 @@ def apply_referral_signup_bonus(
     referrer_bonus = round(max(0.0, float(settings.referral_referrer_bonus)), 2)
     new_user_bonus = round(max(0.0, float(settings.referral_new_user_bonus)), 2)
 
-    referrer.balance = round(float(referrer.balance) + referrer_bonus, 2)
-    new_user.balance = round(float(new_user.balance) + new_user_bonus, 2)
+    apply_balance_changes(
+        db,
+        [
+            BalanceChange(
+                user_id=referrer.id,
+                delta=referrer_bonus,
+                reason="referral_referrer_bonus",
+                idempotency_key=f"referral_bonus:{new_user.id}:referrer",
+                reference_id=new_user.id,
+            ),
+            BalanceChange(
+                user_id=new_user.id,
+                delta=new_user_bonus,
+                reason="referral_signup_bonus",
+                idempotency_key=f"referral_bonus:{new_user.id}:new_user",
+                reference_id=referrer.id,
+            ),
+        ],
+    )
     referrer.referral_bonus_earned = round(float(referrer.referral_bonus_earned) + referrer_bonus, 2)
     new_user.referred_by_user_id = referrer.id
 
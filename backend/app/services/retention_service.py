@@ -0,0 +1,317 @@
+import argparse
+import gzip
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.ids import new_id
+from app.db.models import (
+    AdminAuditLog,
+    ArchiveSegment,
+    ArchiveSegmentUser,
+    RoundActionLog,
+    RoundLog,
+    RoundLogMonthlyStat,
+    SecurityEvent,
+)
+from app.services.export_service import plain_value, round_log_records
+
+MIN_HORIZON_DAYS = 45
+ARCHIVE_CHUNK_ROWS = 2000
+
+
+@dataclass(frozen=True)
+class RetentionTable:
+    name: str
+    model: type
+    owner_column: str
+
+
+RETENTION_TABLES: dict[str, RetentionTable] = {
+    "round_logs": RetentionTable("round_logs", RoundLog, "user_id"),
+    "security_events": RetentionTable("security_events", SecurityEvent, "user_id"),
+    "admin_audit_logs": RetentionTable("admin_audit_logs", AdminAuditLog, "actor_user_id"),
+}
+
+
+@dataclass
+class ArchiveResult:
+    table_name: str
+    month: str
+    rows: int
+    path: str | None
+    skipped_reason: str | None = None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def archive_cutoff(horizon_days: int, now: datetime | None = None) -> datetime:
+    """Start of the oldest month that is kept hot; whole months before it are archived."""
+    horizon = max(MIN_HORIZON_DAYS, int(horizon_days))
+    return _month_start((now or _utc_now()) - timedelta(days=horizon))
+
+
+def _records(db: Session, table: RetentionTable, rows: list) -> list[dict]:
+    if table.model is RoundLog:
+        return round_log_records(db, rows)
+    columns = [column.name for column in table.model.__table__.columns]
+    return [{name: getattr(row, name) for name in columns} for row in rows]
+
+
+def _fold_round_stats(stats: dict[str, dict], rows: list[RoundLog]) -> None:
+    for row in rows:
+        entry = stats.setdefault(
+            row.user_id,
+            {"total_games": 0, "wins": 0, "losses": 0, "pushes": 0, "blackjacks": 0, "total_bet": 0.0, "total_payout": 0.0},
+        )
+        result = (row.result or "").strip().lower()
+        entry["total_games"] += 1
+        entry["wins"] += int(result in {"win", "blackjack"})
+        entry["losses"] += int(result == "lose")
+        entry["pushes"] += int(result == "push")
+        entry["blackjacks"] += int(result == "blackjack")
+        entry["total_bet"] += float(row.bet or 0.0)
+        entry["total_payout"] += float(row.payout or 0.0)
+
+
+def _merge_monthly_stats(db: Session, month: str, stats: dict[str, dict]) -> None:
+    if len(stats) == 0:
+        return
+    existing = {
+        row.user_id: row
+        for row in db.scalars(
+            select(RoundLogMonthlyStat).where(
+                RoundLogMonthlyStat.month == month,
+                RoundLogMonthlyStat.user_id.in_(list(stats)),
+            )
+        )
+    }
+    now = _utc_now()
+    for user_id, totals in stats.items():
+        row = existing.get(user_id)
+        if row is None:
+            row = RoundLogMonthlyStat(user_id=user_id, month=month, **{key: 0 for key in totals})
+            db.add(row)
+        for key, value in totals.items():
+            current = getattr(row, key) or 0
+            setattr(row, key, round(current + value, 2) if isinstance(value, float) else current + value)
+        row.updated_at = now
+
+
+def archive_month(
+    db: Session,
+    table_name: str,
+    month_start: datetime,
+    archive_dir: str,
+    chunk_rows: int = ARCHIVE_CHUNK_ROWS,
+) -> ArchiveResult:
+    """Move one calendar month of `table_name` into a gzip NDJSON segment and commit.
+
+    The file is written and fsynced first. Rows are deleted by time range in the same
+    transaction that records the segment (and, for round logs, the monthly aggregates). If the
+    delete removes a different number of rows than were written, something was inserted
+    meanwhile and the transaction is rolled back; the next run retries the month.
+    """
+    table = RETENTION_TABLES[table_name]
+    model = table.model
+    month_end = _next_month(month_start)
+    month = month_start.strftime("%Y-%m")
+    in_month = (model.created_at >= month_start, model.created_at < month_end)
+
+    segment_id = new_id()
+    directory = os.path.join(archive_dir, table.name, month)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{segment_id}.ndjson.gz")
+    partial_path = f"{path}.partial"
+
+    row_count = 0
+    per_user: dict[str, int] = {}
+    round_stats: dict[str, dict] = {}
+    min_created_at: datetime | None = None
+    max_created_at: datetime | None = None
+    stmt = (
+        select(model)
+        .where(*in_month)
+        .order_by(model.created_at, model.id)
+        .execution_options(yield_per=max(1, chunk_rows))
+    )
+    with open(partial_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for partition in db.scalars(stmt).partitions():
+                for record in _records(db, table, partition):
+                    line = json.dumps({key: plain_value(value) for key, value in record.items()}, separators=(",", ":"))
+                    archive.write(f"{line}\n".encode("utf-8"))
+                for row in partition:
+                    owner = getattr(row, table.owner_column) or ""
+                    per_user[owner] = per_user.get(owner, 0) + 1
+                    min_created_at = row.created_at if min_created_at is None else min(min_created_at, row.created_at)
+                    max_created_at = row.created_at if max_created_at is None else max(max_created_at, row.created_at)
+                if model is RoundLog:
+                    _fold_round_stats(round_stats, partition)
+                row_count += len(partition)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    if row_count == 0:
+        os.remove(partial_path)
+        return ArchiveResult(table.name, month, 0, None, skipped_reason="empty")
+    os.replace(partial_path, path)
+
+    try:
+        # The archived rows are still in the identity map; skip ORM-side sync and drop them below.
+        deleted = db.execute(delete(model).where(*in_month).execution_options(synchronize_session=False)).rowcount
+        if deleted != row_count:
+            db.rollback()
+            os.remove(path)
+            return ArchiveResult(table.name, month, 0, None, skipped_reason="rows changed while archiving")
+        if model is RoundLog:
+            _merge_monthly_stats(db, month, round_stats)
+            db.execute(
+                delete(RoundActionLog).where(
+                    RoundActionLog.created_at < month_end,
+                    RoundActionLog.round_id.not_in(
+                        select(RoundLog.round_id).where(RoundLog.round_id.is_not(None)).scalar_subquery()
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        db.add(
+            ArchiveSegment(
+                id=segment_id,
+                table_name=table.name,
+                month=month,
+                path=path,
+                row_count=row_count,
+                size_bytes=os.path.getsize(path),
+                min_created_at=min_created_at,
+                max_created_at=max_created_at,
+            )
+        )
+        db.add_all(
+            ArchiveSegmentUser(segment_id=segment_id, user_id=user_id, row_count=count)
+            for user_id, count in per_user.items()
+            if user_id
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        os.remove(path)
+        raise
+    db.expunge_all()
+    return ArchiveResult(table.name, month, row_count, path)
+
+
+def run_retention(
+    session_factory: Callable[[], Session],
+    horizon_days: int | None = None,
+    archive_dir: str | None = None,
+    tables: list[str] | None = None,
+    now: datetime | None = None,
+) -> list[ArchiveResult]:
+    settings = get_settings()
+    cutoff = archive_cutoff(settings.retention_horizon_days if horizon_days is None else horizon_days, now)
+    target_dir = archive_dir or settings.retention_archive_dir
+    results: list[ArchiveResult] = []
+    for table_name in tables or list(RETENTION_TABLES):
+        model = RETENTION_TABLES[table_name].model
+        db = session_factory()
+        try:
+            oldest = db.scalar(select(func.min(model.created_at)))
+            month_start = _month_start(oldest) if oldest is not None else cutoff
+            while month_start < cutoff:
+                results.append(archive_month(db, table_name, month_start, target_dir))
+                month_start = _next_month(month_start)
+        finally:
+            db.close()
+    return results
+
+
+def archived_month_stats(db: Session, user_ids: list[str]) -> dict[str, dict]:
+    """All-time totals from archived months, keyed by user id."""
+    if len(user_ids) == 0:
+        return {}
+    rows = db.execute(
+        select(
+            RoundLogMonthlyStat.user_id,
+            func.sum(RoundLogMonthlyStat.total_games),
+            func.sum(RoundLogMonthlyStat.wins),
+            func.sum(RoundLogMonthlyStat.losses),
+            func.sum(RoundLogMonthlyStat.pushes),
+            func.sum(RoundLogMonthlyStat.blackjacks),
+        )
+        .where(RoundLogMonthlyStat.user_id.in_(user_ids))
+        .group_by(RoundLogMonthlyStat.user_id)
+    ).all()
+    return {
+        user_id: {
+            "total_games": int(total_games or 0),
+            "wins": int(wins or 0),
+            "losses": int(losses or 0),
+            "pushes": int(pushes or 0),
+            "blackjacks": int(blackjacks or 0),
+        }
+        for user_id, total_games, wins, losses, pushes, blackjacks in rows
+    }
+
+
+def list_archive_segments(
+    db: Session,
+    table_name: str | None = None,
+    user_id: str | None = None,
+    limit: int = 100,
+) -> list[ArchiveSegment]:
+    stmt = select(ArchiveSegment)
+    if table_name:
+        stmt = stmt.where(ArchiveSegment.table_name == table_name)
+    if user_id:
+        stmt = stmt.where(
+            ArchiveSegment.id.in_(select(ArchiveSegmentUser.segment_id).where(ArchiveSegmentUser.user_id == user_id))
+        )
+    clamped_limit = max(1, min(500, int(limit)))
+    return db.scalars(stmt.order_by(ArchiveSegment.month.desc(), ArchiveSegment.id.desc()).limit(clamped_limit)).all()
+
+
+def iter_archive_lines(segment: ArchiveSegment, user_id: str | None = None) -> Iterator[str]:
+    """NDJSON lines of one segment, optionally only those owned by `user_id`."""
+    owner_column = RETENTION_TABLES[segment.table_name].owner_column
+    with gzip.open(segment.path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            if user_id is None or json.loads(line).get(owner_column) == user_id:
+                yield line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive whole months of old log rows into compressed files")
+    parser.add_argument("--horizon-days", type=int, default=None)
+    parser.add_argument("--archive-dir", default=None)
+    parser.add_argument("--table", action="append", choices=sorted(RETENTION_TABLES), default=None)
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+
+    results = run_retention(SessionLocal, horizon_days=args.horizon_days, archive_dir=args.archive_dir, tables=args.table)
+    print("Retention Run")
+    for result in results:
+        print(f"table={result.table_name} month={result.month} rows={result.rows} path={result.path or '-'} skipped={result.skipped_reason or '-'}")
+
+
+if __name__ == "__main__":
+    main()
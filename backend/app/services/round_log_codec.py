@@ -0,0 +1,174 @@
+import json
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import RoundActionLog, RoundLog
+
+# One byte per card: rank index * 4 + suit index.
+CARD_RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+CARD_SUITS = ("S", "H", "D", "C")
+CARD_NAMES: tuple[str, ...] = tuple(f"{rank}{suit}" for rank in CARD_RANKS for suit in CARD_SUITS)
+_CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
+
+# One byte per action. Codes are stored, so only ever append to this tuple.
+ACTION_NAMES: tuple[str, ...] = (
+    "start_round",
+    "player_hit",
+    "player_stand",
+    "auto_stand",
+    "dealer_hit",
+    "anti_cheat_timeout",
+    "start_multi_hand",
+    "auto_play",
+    "hit",
+    "stand",
+    "double_down",
+    "split",
+    "surrender",
+    "insurance",
+    "turn_timeout_auto_stand",
+)
+ACTION_LITERAL = 0
+ACTION_ROUND_MARKER = 255
+_ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES, start=1)}
+_ACTION_LOOKUP: tuple[str | None, ...] = (None, *ACTION_NAMES) + (None,) * (255 - len(ACTION_NAMES))
+
+
+def round_marker(round_id: str) -> str:
+    return f"table_round:{round_id}"
+
+
+def encode_cards(cards: Iterable[str]) -> bytes:
+    try:
+        return bytes(_CARD_CODES[card] for card in cards)
+    except KeyError as exc:
+        raise ValueError(f"Unknown card {exc.args[0]!r}") from None
+
+
+def decode_cards(blob: bytes) -> list[str]:
+    return [CARD_NAMES[code] for code in blob]
+
+
+def decode_cards_many(blobs: Sequence[bytes]) -> list[list[str]]:
+    """Decode many card blobs with one table lookup pass over their concatenation."""
+    names = list(map(CARD_NAMES.__getitem__, b"".join(blobs)))
+    decoded: list[list[str]] = []
+    offset = 0
+    for blob in blobs:
+        decoded.append(names[offset : offset + len(blob)])
+        offset += len(blob)
+    return decoded
+
+
+def encode_actions(actions: Iterable[str], round_id: str | None = None) -> bytes:
+    marker = round_marker(round_id) if round_id else None
+    encoded = bytearray()
+    for action in actions:
+        code = _ACTION_CODES.get(action)
+        if code is not None:
+            encoded.append(code)
+        elif action == marker:
+            encoded.append(ACTION_ROUND_MARKER)
+        else:
+            # Cap at the one-byte length prefix, dropping any character the cut splits.
+            raw = action.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+            encoded.append(ACTION_LITERAL)
+            encoded.append(len(raw))
+            encoded += raw
+    return bytes(encoded)
+
+
+def decode_actions(blob: bytes, round_id: str | None = None) -> list[str]:
+    if ACTION_LITERAL not in blob and ACTION_ROUND_MARKER not in blob:
+        return list(map(_ACTION_LOOKUP.__getitem__, blob))
+
+    actions: list[str] = []
+    index = 0
+    while index < len(blob):
+        code = blob[index]
+        index += 1
+        if code == ACTION_LITERAL:
+            length = blob[index]
+            actions.append(blob[index + 1 : index + 1 + length].decode("utf-8"))
+            index += 1 + length
+        elif code == ACTION_ROUND_MARKER:
+            actions.append(round_marker(round_id or ""))
+        else:
+            actions.append(_ACTION_LOOKUP[code] or "unknown")
+    return actions
+
+
+def encode_round_actions(actions_by_user: dict[str, list[str]], round_id: str) -> bytes:
+    """Pack every player's actions for one table round: [uid len][uid][actions len u16][actions]..."""
+    encoded = bytearray()
+    for user_id, actions in actions_by_user.items():
+        raw_user_id = user_id.encode("ascii")
+        raw_actions = encode_actions(actions, round_id)
+        encoded.append(len(raw_user_id))
+        encoded += raw_user_id
+        encoded += len(raw_actions).to_bytes(2, "big")
+        encoded += raw_actions
+    return bytes(encoded)
+
+
+def decode_round_actions(blob: bytes, round_id: str) -> dict[str, list[str]]:
+    actions_by_user: dict[str, list[str]] = {}
+    index = 0
+    while index < len(blob):
+        user_id_length = blob[index]
+        user_id = blob[index + 1 : index + 1 + user_id_length].decode("ascii")
+        index += 1 + user_id_length
+        actions_length = int.from_bytes(blob[index : index + 2], "big")
+        index += 2
+        actions_by_user[user_id] = decode_actions(blob[index : index + actions_length], round_id)
+        index += actions_length
+    return actions_by_user
+
+
+def compact_legacy_payload(player_cards_json: str, dealer_cards_json: str, actions_json: str) -> dict | None:
+    """Blob columns for a row written before compact storage, or None if it cannot be encoded."""
+    try:
+        player_cards = json.loads(player_cards_json)
+        dealer_cards = json.loads(dealer_cards_json)
+        actions = json.loads(actions_json)
+        round_id = next(
+            (action.split(":", 1)[1] for action in actions if isinstance(action, str) and action.startswith("table_round:")),
+            None,
+        )
+        return {
+            "round_id": round_id[:32] if round_id else None,
+            "player_cards": encode_cards(player_cards),
+            "dealer_cards": encode_cards(dealer_cards),
+            "actions": encode_actions([str(action) for action in actions], round_id),
+        }
+    except (ValueError, TypeError):
+        return None
+
+
+def decode_round_logs(db: Session, rows: Sequence[RoundLog]) -> list[tuple[list[str], list[str], list[str]]]:
+    """(player_cards, dealer_cards, actions) per row, resolving shared table-round action blobs in one query."""
+    shared_round_ids = {row.round_id for row in rows if row.actions is None and row.round_id}
+    shared_actions: dict[str, dict[str, list[str]]] = {}
+    if shared_round_ids:
+        for action_log in db.scalars(select(RoundActionLog).where(RoundActionLog.round_id.in_(shared_round_ids))):
+            shared_actions[action_log.round_id] = decode_round_actions(action_log.actions, action_log.round_id)
+
+    compact_rows = [row for row in rows if row.player_cards is not None]
+    player_cards = iter(decode_cards_many([row.player_cards for row in compact_rows]))
+    dealer_cards = iter(decode_cards_many([row.dealer_cards or b"" for row in compact_rows]))
+
+    decoded: list[tuple[list[str], list[str], list[str]]] = []
+    for row in rows:
+        if row.player_cards is None:
+            decoded.append(
+                (json.loads(row.player_cards_json), json.loads(row.dealer_cards_json), json.loads(row.actions_json))
+            )
+            continue
+        if row.actions is not None:
+            actions = decode_actions(row.actions, row.round_id)
+        else:
+            actions = shared_actions.get(row.round_id or "", {}).get(row.user_id, [])
+        decoded.append((next(player_cards), next(dealer_cards), actions))
+    return decoded
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import Friendship, RoundLog, User
+from app.services.retention_service import archived_month_stats
 
 PERIOD_VALUES = {"all", "weekly", "monthly"}
 SORT_VALUES = {"win_rate", "balance", "games", "blackjacks"}
@@ -43,8 +44,12 @@ def _empty_aggregate() -> dict:
     }
 
 
-def _compute_aggregates(rows: list[RoundLog]) -> dict[str, dict]:
+def _compute_aggregates(rows: list[RoundLog], archived: dict[str, dict] | None = None) -> dict[str, dict]:
     by_user: dict[str, dict] = {}
+    for user_id, totals in (archived or {}).items():
+        agg = by_user.setdefault(user_id, _empty_aggregate())
+        for key, value in totals.items():
+            agg[key] += value
     for row in rows:
         agg = by_user.setdefault(row.user_id, _empty_aggregate())
         agg["total_games"] += 1
@@ -90,7 +95,8 @@ def _query_round_logs(
 def _user_stats_period(db: Session, user: User, period: str) -> dict:
     normalized_period = _normalize_period(period)
     rows = _query_round_logs(db, user_ids=[user.id], period=normalized_period)
-    aggregate = _compute_aggregates(rows).get(user.id, _empty_aggregate())
+    archived = archived_month_stats(db, [user.id]) if normalized_period == "all" else None
+    aggregate = _compute_aggregates(rows, archived).get(user.id, _empty_aggregate())
     return {
         "period": normalized_period,
         "total_games": int(aggregate["total_games"]),
@@ -199,7 +205,8 @@ def build_leaderboard(
 
     user_ids = [user.id for user in users]
     rows = _query_round_logs(db, user_ids=user_ids, period=normalized_period)
-    aggregates = _compute_aggregates(rows)
+    archived = archived_month_stats(db, user_ids) if normalized_period == "all" else None
+    aggregates = _compute_aggregates(rows, archived)
 
     entries: list[dict] = []
     for user in users:
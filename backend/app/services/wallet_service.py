@@ -1,17 +1,30 @@
+import asyncio
 import json
 import re
-from datetime import datetime, timezone
-from urllib import error as urllib_error
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
 
 import redis
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.db.models import User, WalletLink, WalletTransaction
-from app.schemas.wallet import DepositVerifyRequest, WithdrawalRequest
+from app.schemas.wallet import (
+    DepositVerifyRequest,
+    WalletLinkRead,
+    WalletTransactionRead,
+    WithdrawalBulkDecisionItem,
+    WithdrawalRequest,
+)
+from app.services.chain_provider_client import parse_hex_quantity, provider_pool, provider_timeout_seconds
+from app.services.chain_tip_tracker import chain_tip_tracker
+from app.services.ledger_service import BalanceChange, apply_balance_change
+from app.services.pagination import keyset_page
+from app.services.read_routing_service import read_routing_service
 from app.services.redis_client import get_redis_client
 
 settings = get_settings()
@@ -27,6 +40,13 @@ BTC_TX_HASH_PATTERN = re.compile(r"^[a-fA-F0-9]{64}$")
 ETH_TX_HASH_PATTERN = re.compile(r"^0x[a-fA-F0-9]{64}$")
 SOL_TX_HASH_PATTERN = re.compile(r"^[1-9A-HJ-NP-Za-km-z]{43,88}$")
 
+# Deposit seen on chain but still short of the required confirmations; the deposit poller
+# credits it once the threshold is reached.
+PENDING_CONFIRMATION_STATUS = "pending_confirmation"
+# getSignatureStatuses accepts at most 256 signatures per call.
+SOL_SIGNATURE_STATUS_LIMIT = 256
+ETH_RECEIPT_BATCH_LIMIT = 100
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -131,111 +151,23 @@ def _get_verification_mode() -> str:
     return mode if mode in {"real", "mock", "auto"} else "real"
 
 
-def _http_timeout() -> float:
-    return max(1.0, float(settings.wallet_http_timeout_seconds))
-
-
-def _http_get_text(url: str) -> str:
-    req = urllib_request.Request(url=url, method="GET")
-    try:
-        with urllib_request.urlopen(req, timeout=_http_timeout()) as response:
-            return response.read().decode("utf-8")
-    except urllib_error.URLError as exc:
-        raise ValueError(f"HTTP GET failed: {exc.reason}") from exc
-
-
-def _http_get_json(url: str) -> dict:
-    payload = _http_get_text(url)
-    try:
-        data = json.loads(payload)
-    except json.JSONDecodeError as exc:
-        raise ValueError("Invalid JSON response from provider") from exc
-    if not isinstance(data, dict):
-        raise ValueError("Unexpected provider response shape")
-    return data
-
-
-def _http_post_json(url: str, payload: dict) -> dict:
-    data = json.dumps(payload, ensure_ascii=True).encode("utf-8")
-    req = urllib_request.Request(
-        url=url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    try:
-        with urllib_request.urlopen(req, timeout=_http_timeout()) as response:
-            text = response.read().decode("utf-8")
-    except urllib_error.URLError as exc:
-        raise ValueError(f"HTTP POST failed: {exc.reason}") from exc
-
-    try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError as exc:
-        raise ValueError("Invalid JSON response from provider") from exc
-    if not isinstance(parsed, dict):
-        raise ValueError("Unexpected provider response shape")
-    return parsed
-
-
-def _parse_hex_to_int(value: str) -> int:
-    normalized = value.strip().lower()
-    if not normalized.startswith("0x"):
-        raise ValueError("Expected hex value")
-    try:
-        return int(normalized, 16)
-    except ValueError as exc:
-        raise ValueError("Invalid hex value") from exc
-
-
-def _btc_real_confirmation_count(tx_hash: str) -> int:
-    base_url = str(settings.wallet_btc_provider_url or "").strip().rstrip("/")
-    if not base_url:
-        raise ValueError("BTC provider URL is not configured")
-    escaped_hash = urllib_parse.quote(tx_hash, safe="")
-    status = _http_get_json(f"{base_url}/tx/{escaped_hash}/status")
-    confirmed = bool(status.get("confirmed"))
-    if not confirmed:
+async def _btc_status_confirmations(status: dict) -> int:
+    if not bool(status.get("confirmed")):
         return 0
-
     block_height = status.get("block_height")
     if not isinstance(block_height, int) or block_height <= 0:
         return 0
+    tip_height = await chain_tip_tracker.tip_height("BTC", at_least=block_height)
+    return max(0, tip_height - block_height + 1)
 
-    tip_text = _http_get_text(f"{base_url}/blocks/tip/height").strip()
-    try:
-        tip_height = int(tip_text)
-    except ValueError as exc:
-        raise ValueError("Invalid BTC tip height response") from exc
 
-    return max(0, tip_height - block_height + 1)
+async def _btc_real_confirmation_count(tx_hash: str) -> int:
+    escaped_hash = urllib_parse.quote(tx_hash, safe="")
+    status = await provider_pool.client("BTC").get_json(f"/tx/{escaped_hash}/status")
+    return await _btc_status_confirmations(status)
 
 
-def _eth_rpc_call(method: str, params: list) -> object:
-    rpc_url = str(settings.wallet_eth_rpc_url or "").strip()
-    if not rpc_url:
-        raise ValueError("ETH RPC URL is not configured")
-    response = _http_post_json(
-        rpc_url,
-        {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params,
-        },
-    )
-    if response.get("error"):
-        error = response.get("error")
-        if isinstance(error, dict):
-            message = error.get("message")
-            if isinstance(message, str) and message.strip():
-                raise ValueError(f"ETH RPC error: {message}")
-        raise ValueError("ETH RPC returned an error")
-    return response.get("result")
-
-
-def _eth_real_confirmation_count(tx_hash: str) -> int:
-    receipt = _eth_rpc_call("eth_getTransactionReceipt", [tx_hash])
+async def _eth_receipt_confirmations(receipt: object) -> int:
     if receipt is None:
         return 0
     if not isinstance(receipt, dict):
@@ -248,52 +180,18 @@ def _eth_real_confirmation_count(tx_hash: str) -> int:
     block_hex = receipt.get("blockNumber")
     if not isinstance(block_hex, str):
         return 0
-    tx_block = _parse_hex_to_int(block_hex)
-
-    latest_hex = _eth_rpc_call("eth_blockNumber", [])
-    if not isinstance(latest_hex, str):
-        raise ValueError("Unexpected ETH latest block response")
-    latest_block = _parse_hex_to_int(latest_hex)
+    tx_block = parse_hex_quantity(block_hex)
 
+    latest_block = await chain_tip_tracker.tip_height("ETH", at_least=tx_block)
     return max(0, latest_block - tx_block + 1)
 
 
-def _sol_rpc_call(method: str, params: list) -> object:
-    rpc_url = str(settings.wallet_sol_rpc_url or "").strip()
-    if not rpc_url:
-        raise ValueError("SOL RPC URL is not configured")
-    response = _http_post_json(
-        rpc_url,
-        {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params,
-        },
-    )
-    if response.get("error"):
-        error = response.get("error")
-        if isinstance(error, dict):
-            message = error.get("message")
-            if isinstance(message, str) and message.strip():
-                raise ValueError(f"SOL RPC error: {message}")
-        raise ValueError("SOL RPC returned an error")
-    return response.get("result")
-
-
-def _sol_real_confirmation_count(tx_hash: str) -> int:
-    status_result = _sol_rpc_call(
-        "getSignatureStatuses",
-        [[tx_hash], {"searchTransactionHistory": True}],
-    )
-    if not isinstance(status_result, dict):
-        raise ValueError("Unexpected SOL status response")
+async def _eth_real_confirmation_count(tx_hash: str) -> int:
+    receipt = await provider_pool.client("ETH").rpc("eth_getTransactionReceipt", [tx_hash])
+    return await _eth_receipt_confirmations(receipt)
 
-    values = status_result.get("value")
-    if not isinstance(values, list) or len(values) == 0:
-        return 0
 
-    status = values[0]
+async def _sol_status_confirmations(status: object) -> int:
     if status is None:
         return 0
     if not isinstance(status, dict):
@@ -308,9 +206,8 @@ def _sol_real_confirmation_count(tx_hash: str) -> int:
 
     slot = status.get("slot")
     if isinstance(slot, int):
-        latest_slot = _sol_rpc_call("getSlot", [{"commitment": "finalized"}])
-        if isinstance(latest_slot, int):
-            return max(0, latest_slot - slot + 1)
+        latest_slot = await chain_tip_tracker.tip_height("SOL", at_least=slot)
+        return max(0, latest_slot - slot + 1)
 
     confirmation_status = str(status.get("confirmationStatus") or "").lower()
     if confirmation_status == "finalized":
@@ -320,16 +217,142 @@ def _sol_real_confirmation_count(tx_hash: str) -> int:
     return 0
 
 
-def _real_confirmation_count(chain: str, tx_hash: str) -> tuple[int, str]:
+def _sol_status_values(status_result: object) -> list:
+    if not isinstance(status_result, dict):
+        raise ValueError("Unexpected SOL status response")
+    values = status_result.get("value")
+    return values if isinstance(values, list) else []
+
+
+async def _sol_real_confirmation_count(tx_hash: str) -> int:
+    status_result = await provider_pool.client("SOL").rpc(
+        "getSignatureStatuses",
+        [[tx_hash], {"searchTransactionHistory": True}],
+    )
+    values = _sol_status_values(status_result)
+    return await _sol_status_confirmations(values[0] if values else None)
+
+
+async def real_confirmation_count_async(chain: str, tx_hash: str) -> tuple[int, str]:
+    """Must run on the provider pool's loop (see `provider_pool.run_async`)."""
     if chain == "BTC":
-        return _btc_real_confirmation_count(tx_hash), "blockstream"
+        return await _btc_real_confirmation_count(tx_hash), "blockstream"
     if chain == "ETH":
-        return _eth_real_confirmation_count(tx_hash), "ethereum-jsonrpc"
+        return await _eth_real_confirmation_count(tx_hash), "ethereum-jsonrpc"
     if chain == "SOL":
-        return _sol_real_confirmation_count(tx_hash), "solana-jsonrpc"
+        return await _sol_real_confirmation_count(tx_hash), "solana-jsonrpc"
     raise ValueError("Unsupported chain")
 
 
+def is_permanent_chain_failure(error: Exception | str) -> bool:
+    """True for a transaction the chain rejected, as opposed to a provider hiccup."""
+    lowered_error = str(error).lower()
+    return "reverted" in lowered_error or "transaction failed" in lowered_error
+
+
+def _chunks(values: list, size: int) -> list[list]:
+    return [values[index : index + size] for index in range(0, len(values), size)]
+
+
+async def _btc_batch_confirmations(
+    pending: dict[str, int | None],
+) -> dict[str, tuple[int | ValueError, int | None]]:
+    # Esplora has no batch status endpoint. Once a deposit's block height is known its
+    # confirmations follow from the shared tip, so the status is only fetched for deposits still
+    # in the mempool and re-checked (reorg guard) for those about to be credited.
+    required = _min_confirmations_for_chain("BTC")
+    known_blocks = [height for height in pending.values() if height]
+    tip_height = await chain_tip_tracker.tip_height("BTC") if known_blocks else 0
+
+    async def one(tx_hash: str, block_height: int | None) -> tuple[int | ValueError, int | None]:
+        if block_height and tip_height - block_height + 1 < required:
+            return max(0, tip_height - block_height + 1), block_height
+        try:
+            escaped_hash = urllib_parse.quote(tx_hash, safe="")
+            status = await provider_pool.client("BTC").get_json(f"/tx/{escaped_hash}/status")
+            confirmations = await _btc_status_confirmations(status)
+        except ValueError as exc:
+            return exc, block_height
+        refreshed_height = status.get("block_height") if status.get("confirmed") else None
+        return confirmations, refreshed_height if isinstance(refreshed_height, int) else None
+
+    results = await asyncio.gather(*(one(tx_hash, block_height) for tx_hash, block_height in pending.items()))
+    return dict(zip(pending, results))
+
+
+async def _eth_batch_confirmations(
+    pending: dict[str, int | None],
+) -> dict[str, tuple[int | ValueError, int | None]]:
+    results: dict[str, tuple[int | ValueError, int | None]] = {}
+    for chunk in _chunks(list(pending), ETH_RECEIPT_BATCH_LIMIT):
+        receipts = await provider_pool.client("ETH").rpc_batch(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk]
+        )
+        for tx_hash, receipt in zip(chunk, receipts):
+            if isinstance(receipt, ValueError):
+                results[tx_hash] = (receipt, pending[tx_hash])
+                continue
+            try:
+                block_hex = receipt.get("blockNumber") if isinstance(receipt, dict) else None
+                block_height = parse_hex_quantity(block_hex) if isinstance(block_hex, str) else None
+                results[tx_hash] = (await _eth_receipt_confirmations(receipt), block_height)
+            except ValueError as exc:
+                results[tx_hash] = (exc, pending[tx_hash])
+    return results
+
+
+async def _sol_batch_confirmations(
+    pending: dict[str, int | None],
+) -> dict[str, tuple[int | ValueError, int | None]]:
+    results: dict[str, tuple[int | ValueError, int | None]] = {}
+    for chunk in _chunks(list(pending), SOL_SIGNATURE_STATUS_LIMIT):
+        status_result = await provider_pool.client("SOL").rpc(
+            "getSignatureStatuses",
+            [chunk, {"searchTransactionHistory": True}],
+        )
+        values = _sol_status_values(status_result)
+        for index, signature in enumerate(chunk):
+            status = values[index] if index < len(values) else None
+            slot = status.get("slot") if isinstance(status, dict) else None
+            try:
+                results[signature] = (await _sol_status_confirmations(status), slot if isinstance(slot, int) else None)
+            except ValueError as exc:
+                results[signature] = (exc, pending[signature])
+    return results
+
+
+async def batch_confirmation_counts_async(
+    chain: str,
+    pending: dict[str, int | None],
+) -> dict[str, tuple[int | ValueError, int | None]]:
+    """Confirmations for many transactions of one chain with as few provider calls as possible.
+
+    `pending` maps each hash to its last known block height (or slot). Each result is
+    `(confirmations, block_height)`, with a ValueError in place of the count when that
+    transaction failed on chain or could not be checked. Must run on the provider pool's loop.
+    """
+    if not pending:
+        return {}
+    if chain == "BTC":
+        return await _btc_batch_confirmations(pending)
+    if chain == "ETH":
+        return await _eth_batch_confirmations(pending)
+    if chain == "SOL":
+        return await _sol_batch_confirmations(pending)
+    raise ValueError("Unsupported chain")
+
+
+def _real_confirmation_count(chain: str, tx_hash: str) -> tuple[int, str]:
+    if chain not in {"BTC", "ETH", "SOL"}:
+        raise ValueError("Unsupported chain")
+    # Upper bound covering every retry; the per-request timeouts normally fire first.
+    deadline = max(1.0, provider_timeout_seconds(chain)) * (max(0, settings.wallet_http_retries) + 1) * 2
+    try:
+        return provider_pool.run(real_confirmation_count_async(chain, tx_hash), timeout=deadline)
+    except FutureTimeoutError as exc:
+        raise ValueError("Provider request timed out") from exc
+
+
 def _mock_confirmation_count(chain: str, tx_hash: str) -> int:
     required = _min_confirmations_for_chain(chain)
     cache_key = f"maca:wallet:confirmations:{chain}:{tx_hash}"
@@ -351,7 +374,7 @@ def _mock_confirmation_count(chain: str, tx_hash: str) -> int:
     return required + 1
 
 
-def verify_on_chain_transaction(chain: str, tx_hash: str) -> dict:
+def verify_on_chain_transaction(chain: str, tx_hash: str, require_verified: bool = True) -> dict:
     normalized_hash = normalize_tx_hash(chain, tx_hash)
     required = _min_confirmations_for_chain(chain)
     mode = _get_verification_mode()
@@ -366,8 +389,7 @@ def verify_on_chain_transaction(chain: str, tx_hash: str) -> dict:
             verification_mode = "real"
         except ValueError as exc:
             real_error = str(exc)
-            lowered_error = real_error.lower()
-            if "reverted" in lowered_error or "transaction failed" in lowered_error:
+            if is_permanent_chain_failure(real_error):
                 raise ValueError(f"Real on-chain verification failed: {real_error}") from exc
             should_fallback = mode == "auto" or bool(settings.wallet_real_verification_fallback_to_mock)
             if not should_fallback:
@@ -387,7 +409,7 @@ def verify_on_chain_transaction(chain: str, tx_hash: str) -> dict:
             if real_error:
                 raise ValueError(f"Strict verification requires real provider success: {real_error}")
             raise ValueError("Strict verification requires real provider mode")
-        if not verified:
+        if require_verified and not verified:
             raise ValueError("On-chain verification failed. Not enough confirmations")
 
     return {
@@ -445,6 +467,7 @@ def link_wallet_address(
     db.add(entry)
     db.commit()
     db.refresh(entry)
+    _wallet_changed(user.id)
     return entry
 
 
@@ -457,38 +480,154 @@ def _get_user_wallet_for_chain(db: Session, user_id: str, chain: str) -> WalletL
     )
 
 
-def list_user_transactions(db: Session, user_id: str, limit: int = 50) -> list[WalletTransaction]:
+def list_user_transactions(
+    db: Session,
+    user_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> list[WalletTransaction]:
     clamped_limit = max(1, min(200, int(limit)))
     return db.scalars(
-        select(WalletTransaction)
+        keyset_page(
+            select(WalletTransaction).where(WalletTransaction.user_id == user_id),
+            WalletTransaction.created_at,
+            WalletTransaction.id,
+            clamped_limit,
+            cursor,
+        )
+    ).all()
+
+
+def _wallet_summary(db: Session, user_id: str) -> dict:
+    """Counts by type/status and pending totals from one grouped aggregate query."""
+    rows = db.execute(
+        select(
+            WalletTransaction.tx_type,
+            WalletTransaction.status,
+            func.count(WalletTransaction.id),
+            func.coalesce(func.sum(WalletTransaction.token_amount), 0.0),
+        )
         .where(WalletTransaction.user_id == user_id)
-        .order_by(WalletTransaction.created_at.desc())
-        .limit(clamped_limit)
+        .group_by(WalletTransaction.tx_type, WalletTransaction.status)
     ).all()
+    counts: dict[str, dict[str, int]] = {}
+    totals: dict[tuple[str, str], float] = {}
+    for tx_type, status, count, token_total in rows:
+        counts.setdefault(tx_type, {})[status] = int(count)
+        totals[(tx_type, status)] = float(token_total)
+
+    pending_withdrawal = ("withdrawal", "pending_approval")
+    pending_deposit = ("deposit", PENDING_CONFIRMATION_STATUS)
+    return {
+        "transaction_counts": counts,
+        "pending_withdrawals": counts.get("withdrawal", {}).get("pending_approval", 0),
+        "pending_withdrawal_tokens": round(totals.get(pending_withdrawal, 0.0), 2),
+        "pending_deposits": counts.get("deposit", {}).get(PENDING_CONFIRMATION_STATUS, 0),
+        "pending_deposit_tokens": round(totals.get(pending_deposit, 0.0), 2),
+    }
+
+
+class WalletOverviewCache:
+    """Per-user cache of the wallet overview (everything except the live balance).
+
+    Entries are tagged with a per-user version that every wallet write bumps, so a read that
+    raced a write can never put stale data back: its entry carries the old version and is
+    ignored. A hit costs one MGET. Redis when available, otherwise this process only.
+    """
+
+    def __init__(self, redis_enabled: bool = True) -> None:
+        self._redis = get_redis_client() if redis_enabled else None
+        self._entries: dict[str, tuple[int, float, dict]] = {}
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(user_id: str) -> tuple[str, str]:
+        return f"maca:wallet:overview:{user_id}", f"maca:wallet:overview:ver:{user_id}"
+
+    def get(self, user_id: str) -> tuple[dict | None, int]:
+        """Cached overview (None on a miss) and the version a fresh one must be stored under."""
+        if self._redis is not None:
+            try:
+                raw_entry, raw_version = self._redis.mget(self._keys(user_id))
+                version = int(raw_version or 0)
+                if raw_entry:
+                    entry = json.loads(raw_entry)
+                    if entry.get("version") == version:
+                        return entry["overview"], version
+                return None, version
+            except (redis.RedisError, ValueError):
+                pass
+        with self._lock:
+            version = self._versions.get(user_id, 0)
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[0] == version and cached[1] > time.monotonic():
+                return cached[2], version
+            return None, version
+
+    def put(self, user_id: str, version: int, overview: dict) -> None:
+        ttl_seconds = max(0, int(settings.wallet_overview_cache_seconds))
+        if ttl_seconds <= 0:
+            return
+        if self._redis is not None:
+            try:
+                payload = json.dumps({"version": version, "overview": overview}, ensure_ascii=True)
+                self._redis.setex(self._keys(user_id)[0], ttl_seconds, payload)
+                return
+            except redis.RedisError:
+                pass
+        with self._lock:
+            if len(self._entries) > 4096:
+                now = time.monotonic()
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[1] > now}
+            self._entries[user_id] = (version, time.monotonic() + ttl_seconds, overview)
+
+    def invalidate(self, user_id: str) -> None:
+        if self._redis is not None:
+            try:
+                entry_key, version_key = self._keys(user_id)
+                pipeline = self._redis.pipeline()
+                pipeline.incr(version_key)
+                pipeline.delete(entry_key)
+                pipeline.execute()
+            except redis.RedisError:
+                pass
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+
+
+wallet_overview_cache = WalletOverviewCache()
+
+
+def _wallet_changed(user_id: str) -> None:
+    wallet_overview_cache.invalidate(user_id)
+    # Keep the user's next reads on the primary so the cache is not refilled from a lagging replica.
+    read_routing_service.mark_write(user_id)
 
 
 def get_wallet_overview(db: Session, user: User) -> dict:
-    linked_wallets = list_user_wallet_links(db, user.id)
-    recent_transactions = list_user_transactions(db, user.id, limit=30)
-    pending_withdrawals = (
-        db.scalar(
-            select(func.count(WalletTransaction.id)).where(
-                WalletTransaction.user_id == user.id,
-                WalletTransaction.tx_type == "withdrawal",
-                WalletTransaction.status == "pending_approval",
-            )
-        )
-        or 0
-    )
+    overview, version = wallet_overview_cache.get(user.id)
+    if overview is None:
+        overview = {
+            **_wallet_summary(db, user.id),
+            "linked_wallets": [
+                WalletLinkRead.model_validate(link).model_dump(mode="json")
+                for link in list_user_wallet_links(db, user.id)
+            ],
+            "recent_transactions": [
+                WalletTransactionRead.model_validate(transaction).model_dump(mode="json")
+                for transaction in list_user_transactions(db, user.id, limit=30)
+            ],
+        }
+        wallet_overview_cache.put(user.id, version, overview)
 
     return {
+        **overview,
         "token_balance": round(float(user.balance), 2),
         "token_symbol": "MCT",
         "usd_per_token": round(_safe_token_usd_rate(), 4),
         "supported_assets": get_supported_assets(),
-        "linked_wallets": linked_wallets,
-        "recent_transactions": recent_transactions,
-        "pending_withdrawals": int(pending_withdrawals),
     }
 
 
@@ -537,6 +676,13 @@ def verify_and_credit_deposit(
     if existing:
         if existing.user_id != user.id:
             raise ValueError("Transaction hash already used by a different account")
+        if existing.status == PENDING_CONFIRMATION_STATUS:
+            # Re-check now rather than leave the user waiting for the poller to come round.
+            verification = verify_on_chain_transaction(chain, tx_hash, require_verified=False)
+            if verification["verified"]:
+                credited = credit_confirmed_deposit(db, existing, verification)
+                db.refresh(existing)
+                return existing, credited, verification
         verification = _extract_verification_metadata(existing.metadata_json, chain, tx_hash)
         return existing, 0.0, verification
 
@@ -557,8 +703,10 @@ def verify_and_credit_deposit(
     if usd_rate <= 0:
         raise ValueError("USD rate must be positive")
 
-    verification = verify_on_chain_transaction(chain, tx_hash)
-    if not verification["verified"]:
+    verification = verify_on_chain_transaction(chain, tx_hash, require_verified=False)
+    # Only a real provider answer can be trusted to confirm later; anything else must verify now.
+    pending = not verification["verified"] and verification["verification_mode"] == "real"
+    if not verification["verified"] and not pending:
         raise ValueError("On-chain verification failed")
 
     usd_amount = round(float(payload.crypto_amount) * usd_rate, 2)
@@ -571,7 +719,7 @@ def verify_and_credit_deposit(
         user_id=user.id,
         wallet_link_id=linked_wallet.id if linked_wallet else None,
         tx_type="deposit",
-        status="completed",
+        status=PENDING_CONFIRMATION_STATUS if pending else "completed",
         chain=chain,
         asset=asset,
         wallet_address=wallet_address,
@@ -587,18 +735,171 @@ def verify_and_credit_deposit(
         metadata_json=json.dumps({"verification": verification}, ensure_ascii=True),
         created_at=now,
         updated_at=now,
-        processed_at=now,
+        processed_at=None if pending else now,
     )
 
-    user.balance = round(float(user.balance) + token_amount, 2)
     db.add(transaction)
-    db.add(user)
+    if pending:
+        db.commit()
+        db.refresh(transaction)
+        _wallet_changed(user.id)
+        return transaction, 0.0, verification
+    apply_balance_change(
+        db,
+        BalanceChange(
+            user_id=user.id,
+            delta=token_amount,
+            reason="deposit",
+            idempotency_key=f"deposit:{chain}:{tx_hash}",
+            reference_id=tx_hash[:64],
+        ),
+    )
     db.commit()
     db.refresh(transaction)
     db.refresh(user)
+    _wallet_changed(user.id)
     return transaction, token_amount, verification
 
 
+def list_pending_deposits(db: Session, limit: int = 256) -> list[WalletTransaction]:
+    """The pending deposits checked longest ago; see `mark_deposits_polled`."""
+    return db.scalars(
+        select(WalletTransaction)
+        .where(
+            WalletTransaction.tx_type == "deposit",
+            WalletTransaction.status == PENDING_CONFIRMATION_STATUS,
+        )
+        .order_by(WalletTransaction.updated_at.asc(), WalletTransaction.id.asc())
+        .limit(max(1, int(limit)))
+    ).all()
+
+
+def mark_deposits_polled(db: Session, transaction_ids: list[str]) -> None:
+    """Move polled deposits to the back of the queue, whatever their lookup returns.
+
+    Otherwise a backlog larger than one batch would keep re-polling the same rows.
+    """
+    if len(transaction_ids) == 0:
+        return
+    db.execute(
+        update(WalletTransaction)
+        .where(
+            WalletTransaction.id.in_(transaction_ids),
+            WalletTransaction.status == PENDING_CONFIRMATION_STATUS,
+        )
+        .values(updated_at=_utc_now())
+    )
+    db.commit()
+
+
+def _claim_pending_deposit(
+    db: Session,
+    transaction: WalletTransaction,
+    status: str,
+    verification: dict,
+    failure_reason: str | None = None,
+) -> bool:
+    """Move a pending deposit to `status`; False when another worker already settled it."""
+    now = _utc_now()
+    claimed = db.execute(
+        update(WalletTransaction)
+        .where(
+            WalletTransaction.id == transaction.id,
+            WalletTransaction.status == PENDING_CONFIRMATION_STATUS,
+        )
+        .values(
+            status=status,
+            failure_reason=failure_reason,
+            metadata_json=json.dumps({"verification": verification}, ensure_ascii=True),
+            updated_at=now,
+            processed_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return claimed.rowcount == 1
+
+
+def credit_confirmed_deposit(db: Session, transaction: WalletTransaction, verification: dict) -> float:
+    """Credit a pending deposit that reached its confirmations; returns the tokens credited."""
+    if not _claim_pending_deposit(db, transaction, "completed", verification):
+        db.rollback()
+        return 0.0
+    user_id, token_amount = transaction.user_id, float(transaction.token_amount)
+    apply_balance_change(
+        db,
+        BalanceChange(
+            user_id=user_id,
+            delta=token_amount,
+            reason="deposit",
+            idempotency_key=f"deposit:{transaction.chain}:{transaction.tx_hash}",
+            reference_id=str(transaction.tx_hash)[:64],
+        ),
+    )
+    db.commit()
+    _wallet_changed(user_id)
+    return token_amount
+
+
+def settle_pending_deposit(
+    db: Session,
+    transaction: WalletTransaction,
+    confirmations: int | ValueError,
+    block_height: int | None = None,
+) -> str:
+    """Apply one poll result to a pending deposit.
+
+    Returns "credited", "failed", "expired" or "pending" (still waiting, or settled elsewhere).
+    """
+    chain = transaction.chain
+    verification = _extract_verification_metadata(transaction.metadata_json, chain, transaction.tx_hash)
+    if isinstance(confirmations, ValueError):
+        if not is_permanent_chain_failure(confirmations):
+            return "pending"
+        verification["real_error"] = str(confirmations)
+        reason = f"Real on-chain verification failed: {confirmations}"
+        return "failed" if _fail_pending_deposit(db, transaction, reason, verification) else "pending"
+
+    required = _min_confirmations_for_chain(chain)
+    verified = confirmations >= required
+    verification.update(
+        {
+            "verification_mode": "real",
+            "confirmations": int(confirmations),
+            "required_confirmations": int(required),
+            "verified": bool(verified),
+            "block_height": block_height,
+        }
+    )
+    if verified:
+        return "credited" if credit_confirmed_deposit(db, transaction, verification) > 0 else "pending"
+
+    created_at = transaction.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    max_age = timedelta(minutes=max(1, int(settings.wallet_pending_confirmation_max_age_minutes)))
+    if _utc_now() - created_at > max_age:
+        reason = "On-chain verification failed. Not enough confirmations before expiry"
+        return "expired" if _fail_pending_deposit(db, transaction, reason, verification) else "pending"
+
+    user_id = transaction.user_id
+    transaction.metadata_json = json.dumps({"verification": verification}, ensure_ascii=True)
+    transaction.updated_at = _utc_now()
+    db.add(transaction)
+    db.commit()
+    _wallet_changed(user_id)
+    return "pending"
+
+
+def _fail_pending_deposit(db: Session, transaction: WalletTransaction, reason: str, verification: dict) -> bool:
+    user_id = transaction.user_id
+    if not _claim_pending_deposit(db, transaction, "failed", verification, failure_reason=reason[:500]):
+        db.rollback()
+        return False
+    db.commit()
+    _wallet_changed(user_id)
+    return True
+
+
 def request_withdrawal(
     db: Session,
     user: User,
@@ -650,19 +951,23 @@ def request_withdrawal(
     db.add(transaction)
     db.commit()
     db.refresh(transaction)
+    _wallet_changed(user.id)
     return transaction
 
 
-def list_pending_withdrawals(db: Session, limit: int = 100) -> list[WalletTransaction]:
+def list_pending_withdrawals(db: Session, limit: int = 100, cursor: str | None = None) -> list[WalletTransaction]:
     clamped_limit = max(1, min(200, int(limit)))
     return db.scalars(
-        select(WalletTransaction)
-        .where(
-            WalletTransaction.tx_type == "withdrawal",
-            WalletTransaction.status == "pending_approval",
+        keyset_page(
+            select(WalletTransaction).where(
+                WalletTransaction.tx_type == "withdrawal",
+                WalletTransaction.status == "pending_approval",
+            ),
+            WalletTransaction.created_at,
+            WalletTransaction.id,
+            clamped_limit,
+            cursor,
         )
-        .order_by(WalletTransaction.created_at.desc())
-        .limit(clamped_limit)
     ).all()
 
 
@@ -701,6 +1006,7 @@ def decide_withdrawal(
             db.add(transaction)
             db.commit()
             db.refresh(transaction)
+            _wallet_changed(transaction.user_id)
             return transaction, user, False
 
         normalized_chain_hash = None
@@ -716,15 +1022,34 @@ def decide_withdrawal(
             if existing_hash:
                 raise ValueError("Payout transaction hash already exists")
 
-        user.balance = round(float(user.balance) - float(transaction.token_amount), 2)
+        debited_balance = apply_balance_change(
+            db,
+            BalanceChange(
+                user_id=user.id,
+                delta=-float(transaction.token_amount),
+                reason="withdrawal",
+                idempotency_key=f"withdrawal:{transaction.id}",
+                reference_id=transaction.id,
+            ),
+            floor_at_zero=False,
+            require_sufficient=True,
+        )
+        if debited_balance is None:
+            transaction.status = "rejected"
+            transaction.failure_reason = "Insufficient balance at approval time"
+            db.add(transaction)
+            db.commit()
+            db.refresh(transaction)
+            _wallet_changed(transaction.user_id)
+            return transaction, user, False
         transaction.status = "completed"
         transaction.tx_hash = normalized_chain_hash or transaction.tx_hash
         transaction.failure_reason = None
-        db.add(user)
         db.add(transaction)
         db.commit()
         db.refresh(user)
         db.refresh(transaction)
+        _wallet_changed(transaction.user_id)
         return transaction, user, True
 
     transaction.status = "rejected"
@@ -732,4 +1057,117 @@ def decide_withdrawal(
     db.add(transaction)
     db.commit()
     db.refresh(transaction)
+    _wallet_changed(transaction.user_id)
     return transaction, user, False
+
+
+def decide_withdrawals(
+    db: Session,
+    actor_user: User,
+    decisions: list[WithdrawalBulkDecisionItem],
+) -> tuple[list[WalletTransaction], list[dict], dict[str, float]]:
+    """Approve/reject many pending withdrawals in one transaction.
+
+    The selected rows are locked with `FOR UPDATE SKIP LOCKED` (PostgreSQL; SQLite already has
+    a single writer), so two admins working the same backlog never block on or double-decide a
+    row: rows another admin holds, already decided or unknown are reported as skipped. Returns
+    (decided transactions, skipped entries, new balance per debited user).
+    """
+    skipped: list[dict] = []
+    by_id: dict[str, WithdrawalBulkDecisionItem] = {}
+    for decision in decisions:
+        if decision.transaction_id in by_id:
+            skipped.append({"transaction_id": decision.transaction_id, "reason": "Duplicate decision"})
+            continue
+        by_id[decision.transaction_id] = decision
+
+    # Lock in (user, created_at, id) order so concurrent batches take user rows in the same order.
+    transactions = db.scalars(
+        select(WalletTransaction)
+        .where(
+            WalletTransaction.id.in_(list(by_id)),
+            WalletTransaction.tx_type == "withdrawal",
+            WalletTransaction.status == "pending_approval",
+        )
+        .order_by(WalletTransaction.user_id, WalletTransaction.created_at, WalletTransaction.id)
+        .with_for_update(skip_locked=True)
+    ).all()
+    locked_ids = {transaction.id for transaction in transactions}
+    skipped.extend(
+        {"transaction_id": transaction_id, "reason": "Not pending, not found or being decided elsewhere"}
+        for transaction_id in by_id
+        if transaction_id not in locked_ids
+    )
+
+    payout_hashes: dict[str, str] = {}
+    for transaction in transactions:
+        decision = by_id[transaction.id]
+        if decision.approve and decision.chain_tx_hash:
+            try:
+                payout_hashes[transaction.id] = normalize_tx_hash(transaction.chain, decision.chain_tx_hash)
+            except ValueError as exc:
+                payout_hashes[transaction.id] = ""
+                skipped.append({"transaction_id": transaction.id, "reason": str(exc)})
+    taken_hashes: set[tuple[str, str]] = set()
+    if any(payout_hashes.values()):
+        taken_hashes = set(
+            db.execute(
+                select(WalletTransaction.chain, WalletTransaction.tx_hash).where(
+                    WalletTransaction.tx_hash.in_([value for value in payout_hashes.values() if value])
+                )
+            ).all()
+        )
+
+    now = _utc_now()
+    decided: list[WalletTransaction] = []
+    balances: dict[str, float] = {}
+    for transaction in transactions:
+        decision = by_id[transaction.id]
+        payout_hash = payout_hashes.get(transaction.id)
+        if payout_hash == "":
+            continue
+        if payout_hash:
+            if (transaction.chain, payout_hash) in taken_hashes:
+                skipped.append({"transaction_id": transaction.id, "reason": "Payout transaction hash already exists"})
+                continue
+            taken_hashes.add((transaction.chain, payout_hash))
+
+        transaction.approved_by_user_id = actor_user.id
+        transaction.updated_at = now
+        transaction.processed_at = now
+        if not decision.approve:
+            transaction.status = "rejected"
+            transaction.failure_reason = (decision.reason or "").strip() or "Rejected by admin"
+        else:
+            debited_balance = apply_balance_change(
+                db,
+                BalanceChange(
+                    user_id=transaction.user_id,
+                    delta=-float(transaction.token_amount),
+                    reason="withdrawal",
+                    idempotency_key=f"withdrawal:{transaction.id}",
+                    reference_id=transaction.id,
+                ),
+                floor_at_zero=False,
+                require_sufficient=True,
+            )
+            if debited_balance is None:
+                transaction.status = "rejected"
+                transaction.failure_reason = "Insufficient balance at approval time"
+            else:
+                transaction.status = "completed"
+                transaction.tx_hash = payout_hash or transaction.tx_hash
+                transaction.failure_reason = None
+                balances[transaction.user_id] = debited_balance
+        db.add(transaction)
+        decided.append(transaction)
+
+    decided_ids = [transaction.id for transaction in decided]
+    changed_user_ids = {transaction.user_id for transaction in decided}
+    db.commit()
+    for user_id in changed_user_ids:
+        _wallet_changed(user_id)
+    if decided_ids:
+        # Reload the committed rows in one query instead of one refresh per row.
+        db.scalars(select(WalletTransaction).where(WalletTransaction.id.in_(decided_ids))).all()
+    return decided, skipped, balances
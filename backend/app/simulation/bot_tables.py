@@ -0,0 +1,160 @@
+import argparse
+from dataclasses import asdict, dataclass
+import json
+import multiprocessing
+import random
+import time
+
+from app.realtime.table_engine import apply_action, available_actions, current_turn_hand, current_turn_user_id, start_round
+from app.services.basic_strategy import RuleSet, recommend_action
+from app.services.blackjack_service import RANKS, SUITS
+
+BOT_STRATEGY_RULES = RuleSet(double_after_split=True, late_surrender=True)
+MAX_ACTIONS_PER_ROUND = 200
+RESHUFFLE_PENETRATION = 0.75
+
+
+@dataclass
+class BotTableStats:
+    tables: int = 0
+    rounds: int = 0
+    hands: int = 0
+    actions: int = 0
+    wagered: float = 0.0
+    net_payout: float = 0.0
+    engine_seconds: float = 0.0
+
+    def add(self, other: "BotTableStats") -> None:
+        self.tables += other.tables
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.actions += other.actions
+        self.wagered += other.wagered
+        self.net_payout += other.net_payout
+        self.engine_seconds += other.engine_seconds
+
+
+def _shoe(rng: random.Random, decks: int) -> list[str]:
+    cards = [f"{rank}{suit}" for _ in range(decks) for suit in SUITS for rank in RANKS]
+    rng.shuffle(cards)
+    return cards
+
+
+def run_table(table_index: int, seed: int, players: int, rounds: int, bet: float, decks: int) -> BotTableStats:
+    rng = random.Random(seed * 1_000_003 + table_index)
+    table_id = f"bot-table-{table_index}"
+    user_ids = [f"bot-{table_index}-{seat}" for seat in range(players)]
+    balances = {user_id: bet * 1000 for user_id in user_ids}
+    stats = BotTableStats(tables=1)
+    shoe_size = 52 * decks
+    shoe = _shoe(rng, decks)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if len(shoe) < shoe_size * (1 - RESHUFFLE_PENETRATION):
+            shoe = _shoe(rng, decks)
+        result = start_round(
+            table_id=table_id,
+            players=user_ids,
+            bets={user_id: bet for user_id in user_ids},
+            balances=balances,
+            turn_seconds=8,
+            shoe=shoe,
+        )
+        state = result.state
+        for _ in range(MAX_ACTIONS_PER_ROUND):
+            if result.round_completed:
+                break
+            user_id = current_turn_user_id(state)
+            hand = current_turn_hand(state)
+            actions = available_actions(state)
+            if user_id is None or hand is None or not actions:
+                break
+            action = recommend_action(hand.cards, state.dealer_cards[0], actions, BOT_STRATEGY_RULES)
+            result = apply_action(state, user_id, action)
+            if result.error:
+                raise RuntimeError(f"bot action rejected: {result.error}")
+            stats.actions += 1
+
+        shoe = state.shoe
+        settlement = result.settlement
+        if settlement is None:
+            raise RuntimeError("round did not settle")
+        stats.rounds += 1
+        stats.hands += len(settlement.hands)
+        stats.wagered += sum(hand.bet for hand in settlement.hands)
+        for user_id, payout in settlement.payout_by_user.items():
+            balances[user_id] = round(max(0.0, balances[user_id] + payout), 2)
+            stats.net_payout += payout
+    stats.engine_seconds = time.perf_counter() - started
+    return stats
+
+
+def _run_table_task(task: tuple[int, int, int, int, float, int]) -> BotTableStats:
+    return run_table(*task)
+
+
+def simulate(
+    tables: int,
+    players: int,
+    rounds: int,
+    seed: int,
+    workers: int = 1,
+    bet: float = 10.0,
+    decks: int = 6,
+) -> BotTableStats:
+    tasks = [(index, seed, players, rounds, bet, decks) for index in range(tables)]
+    totals = BotTableStats()
+    if workers <= 1:
+        for stats in map(_run_table_task, tasks):
+            totals.add(stats)
+        return totals
+    with multiprocessing.Pool(processes=workers) as pool:
+        for stats in pool.imap(_run_table_task, tasks):
+            totals.add(stats)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bot-driven table engine benchmark for Project MACA")
+    parser.add_argument("--tables", type=int, default=64)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=20240101)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--bet", type=float, default=10.0)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    totals = simulate(
+        tables=max(1, args.tables),
+        players=max(1, min(8, args.players)),
+        rounds=max(1, args.rounds),
+        seed=args.seed,
+        workers=max(1, args.workers),
+        bet=args.bet,
+        decks=max(1, args.decks),
+    )
+    elapsed = max(1e-9, time.perf_counter() - started)
+    summary = {
+        **asdict(totals),
+        "engine_seconds": round(totals.engine_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "rounds_per_second": round(totals.rounds / elapsed, 1),
+        "actions_per_second": round(totals.actions / elapsed, 1),
+        "player_ev_per_wager": round(totals.net_payout / max(1e-9, totals.wagered), 6),
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("Bot Table Benchmark")
+    for key, value in summary.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+
+CHAINS = ("btc", "eth", "sol")
+CHAIN_START_HEIGHTS = {"btc": 850_000, "eth": 20_000_000, "sol": 280_000_000}
+# Real-world block rates; `time_scale` speeds them up for benchmarks.
+DEFAULT_BLOCKS_PER_SECOND = {"btc": 1 / 600, "eth": 1 / 12, "sol": 2.5}
+# Solana reports `confirmations: null` once a slot is rooted.
+SOL_ROOTED_DEPTH = 32
+
+Reply = tuple[int, str, str]
+
+
+@dataclass
+class StandInConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Share of HTTP requests answered with 503 / 429 before any parsing.
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # Share of transactions that reverted (ETH) or failed (SOL).
+    failed_tx_rate: float = 0.0
+    # At start a transaction is buried up to `max_depth` blocks deep, or still lands up to
+    # `mempool_blocks` blocks in the future.
+    max_depth: int = 30
+    mempool_blocks: int = 5
+    blocks_per_second: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_BLOCKS_PER_SECOND))
+    time_scale: float = 1.0
+    seed: int = 20240101
+
+
+class Cassette:
+    """Recorded provider answers keyed by chain + request, stored as one JSON file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self.entries = json.load(handle)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self.entries[key] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            snapshot = dict(self.entries)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, indent=1, sort_keys=True)
+
+
+def _rpc_key(chain: str, method: str, params: object) -> str:
+    return f"{chain} {method} {json.dumps(params, sort_keys=True)}"
+
+
+class ChainProviderStandIn:
+    """Local stand-in for the BTC (Esplora REST) and ETH/SOL JSON-RPC providers.
+
+    Requests are routed by their first path segment (`/btc/...`, `/eth`, `/sol`), so one
+    instance backs all three `WALLET_*_URL` settings. Modes:
+
+    - `simulate`: answers from a synthetic chain whose tip advances over time; every
+      transaction hash deterministically maps to an inclusion block and a failed flag.
+    - `record`: forwards to the real `upstreams` and stores every answer in the cassette.
+    - `replay`: answers only from the cassette.
+    """
+
+    def __init__(
+        self,
+        config: StandInConfig | None = None,
+        mode: str = "simulate",
+        cassette: Cassette | None = None,
+        upstreams: dict[str, str] | None = None,
+        upstream_transport: httpx.BaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if mode not in {"simulate", "record", "replay"}:
+            raise ValueError("mode must be simulate, record or replay")
+        if mode != "simulate" and cassette is None:
+            raise ValueError(f"{mode} mode needs a cassette")
+        self.config = config or StandInConfig()
+        self.mode = mode
+        self.cassette = cassette
+        self._upstreams = {chain: url.rstrip("/") for chain, url in (upstreams or {}).items()}
+        self._upstream_transport = upstream_transport
+        self._clock = clock
+        self._started_at = clock()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rpc_calls": 0, "injected_errors": 0, "replay_misses": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def delay_seconds(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        return max(0.0, self.config.latency_ms + jitter) / 1000.0
+
+    def tip(self, chain: str) -> int:
+        elapsed = max(0.0, self._clock() - self._started_at)
+        rate = self.config.blocks_per_second.get(chain, 0.0) * max(0.0, self.config.time_scale)
+        return CHAIN_START_HEIGHTS[chain] + int(elapsed * rate)
+
+    def _transaction(self, chain: str, tx_hash: str) -> tuple[int, bool]:
+        rng = random.Random(f"{self.config.seed}:{chain}:{tx_hash.lower()}")
+        offset = rng.randint(-max(0, self.config.mempool_blocks), max(0, self.config.max_depth))
+        return CHAIN_START_HEIGHTS[chain] - offset, rng.random() < self.config.failed_tx_rate
+
+    def handle(self, method: str, path: str, body: bytes = b"") -> Reply:
+        """Answer one HTTP request; returns (status, content type, body)."""
+        chain, _, rest = path.lstrip("/").partition("/")
+        chain = chain.lower()
+        if chain not in CHAINS:
+            return 404, "text/plain", "unknown chain"
+        self._count("requests")
+
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.config.error_rate + self.config.throttle_rate:
+            self._count("injected_errors")
+            if roll < self.config.error_rate:
+                return 503, "text/plain", "injected failure"
+            return 429, "text/plain", "injected throttle"
+
+        try:
+            if method == "GET":
+                return self._get(chain, f"/{rest}")
+            if method == "POST":
+                return self._post(chain, body)
+        except (httpx.HTTPError, ValueError) as exc:
+            # Upstream trouble while recording.
+            return 502, "text/plain", f"upstream failed: {exc.__class__.__name__}"
+        return 405, "text/plain", "method not allowed"
+
+    def _post(self, chain: str, body: bytes) -> Reply:
+        try:
+            payload = json.loads(body or b"null")
+        except json.JSONDecodeError:
+            return 400, "text/plain", "invalid JSON"
+        calls = payload if isinstance(payload, list) else [payload]
+        if not calls or not all(isinstance(call, dict) for call in calls):
+            return 400, "text/plain", "invalid JSON-RPC request"
+        self._count("rpc_calls", len(calls))
+        answers = self._rpc(chain, calls)
+        return 200, "application/json", json.dumps(answers if isinstance(payload, list) else answers[0])
+
+    # --- GET (BTC Esplora) ---
+
+    def _get(self, chain: str, suffix: str) -> Reply:
+        key = f"{chain} GET {suffix}"
+        if self.mode == "replay":
+            entry = self.cassette.get(key)
+            if entry is None:
+                self._count("replay_misses")
+                return 404, "text/plain", "not recorded"
+            return int(entry["status"]), str(entry.get("content_type") or "text/plain"), str(entry["body"])
+        if self.mode == "record":
+            with self._upstream_client() as client:
+                response = client.get(f"{self._upstream(chain)}{suffix}")
+            content_type = response.headers.get("Content-Type", "text/plain")
+            self.cassette.put(key, {"status": response.status_code, "content_type": content_type, "body": response.text})
+            return response.status_code, content_type, response.text
+        return self._simulate_get(chain, suffix)
+
+    def _simulate_get(self, chain: str, suffix: str) -> Reply:
+        if chain != "btc":
+            return 404, "text/plain", "not found"
+        if suffix == "/blocks/tip/height":
+            return 200, "text/plain", str(self.tip(chain))
+        parts = suffix.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "tx" and parts[2] == "status":
+            block, _ = self._transaction(chain, parts[1])
+            if block > self.tip(chain):
+                return 200, "application/json", json.dumps({"confirmed": False})
+            status = {
+                "confirmed": True,
+                "block_height": block,
+                "block_hash": hashlib.sha256(f"{chain}:{block}".encode()).hexdigest(),
+            }
+            return 200, "application/json", json.dumps(status)
+        return 404, "text/plain", "not found"
+
+    # --- JSON-RPC (ETH, SOL) ---
+
+    def _rpc(self, chain: str, calls: list[dict]) -> list[dict]:
+        if self.mode == "record":
+            return self._record_rpc(chain, calls)
+        answers = []
+        for call in calls:
+            method, params = str(call.get("method") or ""), call.get("params") or []
+            if self.mode == "replay":
+                entry = self.cassette.get(_rpc_key(chain, method, params))
+                if entry is None:
+                    self._count("replay_misses")
+                    entry = {"error": {"code": -32000, "message": "not recorded"}}
+            else:
+                entry = self._simulate_rpc(chain, method, params)
+            answers.append({"jsonrpc": "2.0", "id": call.get("id"), **entry})
+        return answers
+
+    def _record_rpc(self, chain: str, calls: list[dict]) -> list[dict]:
+        with self._upstream_client() as client:
+            response = client.post(self._upstream(chain), json=calls if len(calls) > 1 else calls[0])
+        response.raise_for_status()
+        payload = response.json()
+        answers = payload if isinstance(payload, list) else [payload]
+        by_id = {answer.get("id"): answer for answer in answers if isinstance(answer, dict)}
+        for call in calls:
+            answer = by_id.get(call.get("id"))
+            if answer is None:
+                continue
+            entry = {"error": answer["error"]} if answer.get("error") else {"result": answer.get("result")}
+            self.cassette.put(_rpc_key(chain, str(call.get("method") or ""), call.get("params") or []), entry)
+        return answers
+
+    def _simulate_rpc(self, chain: str, method: str, params: list) -> dict:
+        tip = self.tip(chain)
+        if chain == "eth" and method == "eth_blockNumber":
+            return {"result": hex(tip)}
+        if chain == "eth" and method == "eth_getTransactionReceipt" and params:
+            block, failed = self._transaction(chain, str(params[0]))
+            if block > tip:
+                return {"result": None}
+            receipt = {"transactionHash": params[0], "blockNumber": hex(block), "status": "0x0" if failed else "0x1"}
+            return {"result": receipt}
+        if chain == "sol" and method == "getSlot":
+            return {"result": tip}
+        if chain == "sol" and method == "getSignatureStatuses" and params and isinstance(params[0], list):
+            values = []
+            for signature in params[0]:
+                slot, failed = self._transaction(chain, str(signature))
+                if slot > tip:
+                    values.append(None)
+                    continue
+                depth = tip - slot
+                values.append(
+                    {
+                        "slot": slot,
+                        "confirmations": depth if depth < SOL_ROOTED_DEPTH else None,
+                        "err": {"InstructionError": [0, "Custom"]} if failed else None,
+                        "confirmationStatus": "finalized" if depth >= SOL_ROOTED_DEPTH else "confirmed",
+                    }
+                )
+            return {"result": {"context": {"slot": tip}, "value": values}}
+        return {"error": {"code": -32601, "message": "Method not found"}}
+
+    def _upstream(self, chain: str) -> str:
+        url = self._upstreams.get(chain)
+        if not url:
+            raise ValueError(f"no upstream configured for {chain}")
+        return url
+
+    def _upstream_client(self) -> httpx.Client:
+        return httpx.Client(timeout=get_settings().wallet_http_timeout_seconds, transport=self._upstream_transport)
+
+    # --- adapters ---
+
+    def transport(self) -> "StandInTransport":
+        return StandInTransport(self)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Bind a keep-alive HTTP server (port 0 picks a free one); call serve_forever() on it."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                delay = standin.delay_seconds()
+                if delay:
+                    time.sleep(delay)
+                status, content_type, text = standin.handle(self.command, urlsplit(self.path).path, body)
+                encoded = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            do_GET = _reply
+            do_POST = _reply
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
+
+
+class StandInTransport(httpx.AsyncBaseTransport):
+    """In-process httpx transport onto a stand-in; latency is an asyncio sleep, no sockets."""
+
+    def __init__(self, standin: ChainProviderStandIn) -> None:
+        self._standin = standin
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        delay = self._standin.delay_seconds()
+        if delay:
+            await asyncio.sleep(delay)
+        if self._standin.mode == "record":
+            reply = await asyncio.to_thread(self._standin.handle, request.method, request.url.path, body)
+        else:
+            reply = self._standin.handle(request.method, request.url.path, body)
+        status, content_type, text = reply
+        return httpx.Response(status, headers={"Content-Type": content_type}, text=text, request=request)
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Local stand-in for the BTC/ETH/SOL wallet providers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--mode", choices=["simulate", "record", "replay"], default="simulate")
+    parser.add_argument("--cassette", default="", help="JSON file recorded to / replayed from")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--failed-tx-rate", type=float, default=0.01)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="speed up block production")
+    parser.add_argument("--seed", type=int, default=20240101)
+    parser.add_argument("--btc-upstream", default=settings.wallet_btc_provider_url)
+    parser.add_argument("--eth-upstream", default=settings.wallet_eth_rpc_url)
+    parser.add_argument("--sol-upstream", default=settings.wallet_sol_rpc_url)
+    args = parser.parse_args()
+
+    if args.mode != "simulate" and not args.cassette:
+        parser.error(f"--mode {args.mode} needs --cassette")
+    standin = ChainProviderStandIn(
+        StandInConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            failed_tx_rate=args.failed_tx_rate,
+            time_scale=args.time_scale,
+            seed=args.seed,
+        ),
+        mode=args.mode,
+        cassette=Cassette(args.cassette) if args.cassette else None,
+        upstreams={"btc": args.btc_upstream, "eth": args.eth_upstream, "sol": args.sol_upstream},
+    )
+    server = standin.serve(args.host, args.port)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Chain provider stand-in ({args.mode}) on {base_url}")
+    print(f"WALLET_BTC_PROVIDER_URL={base_url}/btc")
+    print(f"WALLET_ETH_RPC_URL={base_url}/eth")
+    print(f"WALLET_SOL_RPC_URL={base_url}/sol")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.mode == "record":
+            standin.cassette.save()
+        print(" ".join(f"{key}={value}" for key, value in standin.stats.items()))
+
+
+if __name__ == "__main__":
+    main()
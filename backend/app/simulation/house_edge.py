@@ -0,0 +1,376 @@
+import argparse
+from dataclasses import asdict, dataclass, replace
+import json
+import multiprocessing
+import time
+
+import numpy as np
+
+from app.realtime.table_engine import MAX_TABLE_PLAYER_HANDS
+from app.services.basic_strategy import (
+    DOUBLE_OR_HIT,
+    HARD,
+    HIT,
+    PAIR,
+    SOFT,
+    SPLIT,
+    STAND,
+    STRATEGY_TABLE,
+    SURRENDER_OR_HIT,
+    TOTAL_SLOTS,
+    UPCARD_SLOTS,
+    RuleSet,
+    table_offset,
+)
+
+# Card ranks are encoded 0..12 (2..10, J, Q, K, A) so split eligibility can compare ranks like the table does.
+RANK_COUNT = 13
+ACE_RANK = 12
+LOW_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1], dtype=np.int16)
+UPCARD_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11], dtype=np.int16)
+
+ACTIVE = 1
+STOOD = 2
+BUST = 3
+SURRENDERED = 4
+
+DEFAULT_CHUNK_HANDS = 200_000
+DEFAULT_BATCH_HANDS = 50_000
+
+_STRATEGY = np.frombuffer(STRATEGY_TABLE, dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class TableRules:
+    """Rules mirrored from `table_engine.apply_action`/`table_engine.settle_round`."""
+
+    name: str = "table"
+    decks: int = 1
+    blackjack_payout: float = 1.5
+    max_hands: int = MAX_TABLE_PLAYER_HANDS
+    double_after_split: bool = True
+    surrender: bool = True
+    take_insurance: bool = False
+    dealer_hits_soft_17: bool = False
+
+    @property
+    def strategy_rules(self) -> RuleSet:
+        return RuleSet(double_after_split=self.double_after_split, late_surrender=self.surrender)
+
+
+BASE_RULES = TableRules()
+RULE_VARIANTS = (
+    replace(BASE_RULES, name="blackjack_pays_6_5", blackjack_payout=1.2),
+    replace(BASE_RULES, name="no_split", max_hands=1),
+    replace(BASE_RULES, name="max_hands_4", max_hands=4),
+    replace(BASE_RULES, name="no_double_after_split", double_after_split=False),
+    replace(BASE_RULES, name="no_surrender", surrender=False),
+    replace(BASE_RULES, name="always_insurance", take_insurance=True),
+    replace(BASE_RULES, name="dealer_hits_soft_17", dealer_hits_soft_17=True),
+    replace(BASE_RULES, name="six_decks", decks=6),
+)
+
+
+@dataclass
+class Accumulator:
+    hands: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    delta_total: float = 0.0
+    delta_total_sq: float = 0.0
+
+    def add(self, other: "Accumulator") -> None:
+        self.hands += other.hands
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.delta_total += other.delta_total
+        self.delta_total_sq += other.delta_total_sq
+
+
+class _Shoes:
+    def __init__(self, ranks: np.ndarray) -> None:
+        self.ranks = ranks
+        self.size = ranks.shape[1]
+        self.pos = np.zeros(ranks.shape[0], dtype=np.int32)
+
+    def draw(self, rows: np.ndarray) -> np.ndarray:
+        cards = self.ranks[rows, self.pos[rows] % self.size]
+        self.pos[rows] += 1
+        return cards
+
+
+def _shuffled_shoes(rng: np.random.Generator, rows: int, decks: int) -> np.ndarray:
+    base = np.tile(np.repeat(np.arange(RANK_COUNT, dtype=np.int8), 4), decks)
+    return rng.permuted(np.broadcast_to(base, (rows, base.size)), axis=1)
+
+
+def _scores(low: np.ndarray, aces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    soft = (aces > 0) & (low + 10 <= 21)
+    return np.where(soft, low + 10, low), soft
+
+
+def play_batch(ranks: np.ndarray, rules: TableRules) -> np.ndarray:
+    """Play one round per shoe row with basic strategy; returns net payout per round in base-bet units."""
+    rows = ranks.shape[0]
+    slots = max(1, rules.max_hands)
+    shoes = _Shoes(ranks)
+    all_rows = np.arange(rows)
+    offset = table_offset(rules.strategy_rules)
+
+    first_rank = np.zeros((rows, slots), dtype=np.int8)
+    second_rank = np.zeros((rows, slots), dtype=np.int8)
+    low = np.zeros((rows, slots), dtype=np.int16)
+    aces = np.zeros((rows, slots), dtype=np.int16)
+    ncards = np.zeros((rows, slots), dtype=np.int16)
+    bet = np.zeros((rows, slots), dtype=np.float64)
+    status = np.zeros((rows, slots), dtype=np.int8)
+    is_split = np.zeros((rows, slots), dtype=bool)
+    doubled = np.zeros((rows, slots), dtype=bool)
+    hand_count = np.ones(rows, dtype=np.int16)
+
+    def add_card(target_rows: np.ndarray, slot: np.ndarray | int, cards: np.ndarray) -> None:
+        low[target_rows, slot] += LOW_VALUES[cards]
+        aces[target_rows, slot] += cards == ACE_RANK
+        ncards[target_rows, slot] += 1
+
+    # Deal order matches the table: player, dealer up, player, dealer hole.
+    first_rank[:, 0] = shoes.draw(all_rows)
+    add_card(all_rows, 0, first_rank[:, 0])
+    dealer_up = shoes.draw(all_rows)
+    second_rank[:, 0] = shoes.draw(all_rows)
+    add_card(all_rows, 0, second_rank[:, 0])
+    dealer_hole = shoes.draw(all_rows)
+    bet[:, 0] = 1.0
+    status[:, 0] = ACTIVE
+
+    player_natural = _scores(low[:, 0], aces[:, 0])[0] == 21
+    status[player_natural, 0] = STOOD
+    dealer_low = LOW_VALUES[dealer_up] + LOW_VALUES[dealer_hole]
+    dealer_aces = (dealer_up == ACE_RANK).astype(np.int16) + (dealer_hole == ACE_RANK)
+    dealer_natural = _scores(dealer_low, dealer_aces)[0] == 21
+    upcard_value = UPCARD_VALUES[dealer_up]
+
+    insurance = np.zeros(rows, dtype=np.float64)
+    if rules.take_insurance:
+        insured = (dealer_up == ACE_RANK) & ~player_natural
+        insurance[insured] = np.where(dealer_natural[insured], 1.0, -0.5)
+
+    for slot in range(slots):
+        while True:
+            score, soft = _scores(low[:, slot], aces[:, slot])
+            playing = (status[:, slot] == ACTIVE) & (score < 21)
+            status[(status[:, slot] == ACTIVE) & (score >= 21), slot] = STOOD
+            active_rows = np.nonzero(playing)[0]
+            if active_rows.size == 0:
+                break
+
+            score = score[active_rows]
+            soft = soft[active_rows]
+            two_cards = ncards[active_rows, slot] == 2
+            pair = two_cards & (first_rank[active_rows, slot] == second_rank[active_rows, slot])
+            up = upcard_value[active_rows]
+
+            hand_class = np.where(soft, SOFT, HARD)
+            code = _STRATEGY[offset + (hand_class * TOTAL_SLOTS + score) * UPCARD_SLOTS + up]
+            pair_value = UPCARD_VALUES[first_rank[active_rows, slot]]
+            pair_code = _STRATEGY[offset + (PAIR * TOTAL_SLOTS + pair_value) * UPCARD_SLOTS + up]
+            can_split = pair & (hand_count[active_rows] < slots)
+            code = np.where(pair & (score < 19) & (pair_code == SPLIT) & can_split, SPLIT, code)
+
+            can_double = two_cards & ~doubled[active_rows, slot]
+            if not rules.double_after_split:
+                can_double &= ~is_split[active_rows, slot]
+            can_surrender = two_cards & ~is_split[active_rows, slot] & rules.surrender
+
+            stand = code == STAND
+            hit = (code == HIT) | ((code == DOUBLE_OR_HIT) & ~can_double) | ((code == SURRENDER_OR_HIT) & ~can_surrender)
+            double = (code == DOUBLE_OR_HIT) & can_double
+            surrender = (code == SURRENDER_OR_HIT) & can_surrender
+            split = code == SPLIT
+
+            status[active_rows[stand], slot] = STOOD
+            status[active_rows[surrender], slot] = SURRENDERED
+
+            draw_rows = active_rows[hit | double]
+            if draw_rows.size:
+                add_card(draw_rows, slot, shoes.draw(draw_rows))
+                doubled_rows = active_rows[double]
+                bet[doubled_rows, slot] *= 2
+                doubled[doubled_rows, slot] = True
+                status[doubled_rows, slot] = STOOD
+                drawn_score = _scores(low[draw_rows, slot], aces[draw_rows, slot])[0]
+                status[draw_rows[drawn_score > 21], slot] = BUST
+
+            split_rows = active_rows[split]
+            if split_rows.size:
+                new_slot = hand_count[split_rows].astype(np.intp)
+                rank = first_rank[split_rows, slot]
+                for target_slot in (np.full(split_rows.size, slot, dtype=np.intp), new_slot):
+                    first_rank[split_rows, target_slot] = rank
+                    low[split_rows, target_slot] = LOW_VALUES[rank]
+                    aces[split_rows, target_slot] = rank == ACE_RANK
+                    ncards[split_rows, target_slot] = 1
+                    bet[split_rows, target_slot] = bet[split_rows, slot]
+                    status[split_rows, target_slot] = ACTIVE
+                    is_split[split_rows, target_slot] = True
+                for target_slot in (np.full(split_rows.size, slot, dtype=np.intp), new_slot):
+                    card = shoes.draw(split_rows)
+                    second_rank[split_rows, target_slot] = card
+                    add_card(split_rows, target_slot, card)
+                hand_count[split_rows] += 1
+
+    live = ((status == STOOD) & (np.arange(slots) < hand_count[:, None])).any(axis=1)
+    dealer_rows = np.nonzero(live & ~dealer_natural)[0]
+    while dealer_rows.size:
+        score, soft = _scores(dealer_low[dealer_rows], dealer_aces[dealer_rows])
+        needs_card = score < 17
+        if rules.dealer_hits_soft_17:
+            needs_card |= (score == 17) & soft
+        dealer_rows = dealer_rows[needs_card]
+        if dealer_rows.size == 0:
+            break
+        card = shoes.draw(dealer_rows)
+        dealer_low[dealer_rows] += LOW_VALUES[card]
+        dealer_aces[dealer_rows] += card == ACE_RANK
+    dealer_score = _scores(dealer_low, dealer_aces)[0][:, None]
+    dealer_bj = dealer_natural[:, None]
+
+    player_score = _scores(low, aces)[0]
+    player_bj = (player_score == 21) & (ncards == 2) & ~is_split
+    used = np.arange(slots) < hand_count[:, None]
+    outcome = np.select(
+        [
+            status == BUST,
+            status == SURRENDERED,
+            player_bj & dealer_bj,
+            player_bj,
+            dealer_bj,
+            dealer_score > 21,
+            player_score > dealer_score,
+            player_score < dealer_score,
+        ],
+        [-bet, -bet / 2, 0.0, bet * rules.blackjack_payout, -bet, bet, bet, -bet],
+        default=0.0,
+    )
+    return np.where(used, outcome, 0.0).sum(axis=1) + insurance
+
+
+def _simulate_chunk(task: tuple[int, np.random.SeedSequence, int, tuple[TableRules, ...]]) -> list[Accumulator]:
+    hands, seed_sequence, batch_hands, configs = task
+    rng = np.random.default_rng(seed_sequence)
+    totals = [Accumulator() for _ in configs]
+    remaining = hands
+    while remaining > 0:
+        rows = min(batch_hands, remaining)
+        remaining -= rows
+        # Each deck count gets its own shoes; configs sharing a deck count share shoes (common random numbers).
+        shoes_by_decks = {decks: _shuffled_shoes(rng, rows, decks) for decks in sorted({c.decks for c in configs})}
+        baseline = None
+        for index, config in enumerate(configs):
+            net = play_batch(shoes_by_decks[config.decks], config)
+            if baseline is None:
+                baseline = net
+            delta = net - baseline
+            acc = totals[index]
+            acc.hands += rows
+            acc.total += float(net.sum())
+            acc.total_sq += float(np.square(net).sum())
+            acc.delta_total += float(delta.sum())
+            acc.delta_total_sq += float(np.square(delta).sum())
+    return totals
+
+
+def simulate(
+    hands: int,
+    seed: int,
+    configs: tuple[TableRules, ...] = (BASE_RULES,),
+    workers: int = 1,
+    chunk_hands: int = DEFAULT_CHUNK_HANDS,
+    batch_hands: int = DEFAULT_BATCH_HANDS,
+) -> list[dict]:
+    """Results depend only on (hands, seed, configs, chunk_hands), never on the worker count."""
+    chunk_hands = max(1, chunk_hands)
+    chunk_sizes = [chunk_hands] * (hands // chunk_hands)
+    if hands % chunk_hands:
+        chunk_sizes.append(hands % chunk_hands)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(size, child, max(1, batch_hands), configs) for size, child in zip(chunk_sizes, seeds)]
+
+    totals = [Accumulator() for _ in configs]
+    if workers <= 1:
+        chunk_results = map(_simulate_chunk, tasks)
+        for result in chunk_results:
+            for acc, part in zip(totals, result):
+                acc.add(part)
+    else:
+        with multiprocessing.Pool(processes=workers) as pool:
+            for result in pool.imap(_simulate_chunk, tasks):
+                for acc, part in zip(totals, result):
+                    acc.add(part)
+    return [_summarize(config, acc) for config, acc in zip(configs, totals)]
+
+
+def _summarize(config: TableRules, acc: Accumulator) -> dict:
+    count = max(1, acc.hands)
+    ev = acc.total / count
+    variance = max(0.0, acc.total_sq / count - ev * ev)
+    delta = acc.delta_total / count
+    delta_variance = max(0.0, acc.delta_total_sq / count - delta * delta)
+    return {
+        "rules": asdict(config),
+        "hands": acc.hands,
+        "ev": round(ev, 6),
+        "house_edge": round(-ev, 6),
+        "variance": round(variance, 6),
+        "std_dev": round(variance**0.5, 6),
+        "std_error": round((variance / count) ** 0.5, 6),
+        "delta_ev": round(delta, 6),
+        "delta_std_error": round((delta_variance / count) ** 0.5, 6),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Monte Carlo house edge simulation for Project MACA table rules")
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=20240101)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-hands", type=int, default=DEFAULT_CHUNK_HANDS)
+    parser.add_argument("--batch-hands", type=int, default=DEFAULT_BATCH_HANDS)
+    parser.add_argument("--variant", action="append", default=None, help="Limit to named rule variants")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    variants = RULE_VARIANTS
+    if args.variant:
+        variants = tuple(variant for variant in RULE_VARIANTS if variant.name in set(args.variant))
+    configs = (BASE_RULES, *variants)
+
+    started = time.perf_counter()
+    results = simulate(
+        hands=max(1, args.hands),
+        seed=args.seed,
+        configs=configs,
+        workers=max(1, args.workers),
+        chunk_hands=args.chunk_hands,
+        batch_hands=args.batch_hands,
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"seed": args.seed, "elapsed_seconds": round(elapsed, 2), "results": results}, indent=2))
+        return
+
+    print("House Edge Simulation")
+    print(f"hands_per_rule_set={args.hands}")
+    print(f"seed={args.seed}")
+    print(f"elapsed_seconds={elapsed:.2f}")
+    for result in results:
+        print(
+            f"{result['rules']['name']}: ev={result['ev']:+.5f} house_edge={result['house_edge'] * 100:.3f}% "
+            f"std_dev={result['std_dev']:.4f} std_error={result['std_error']:.5f} "
+            f"delta_ev={result['delta_ev']:+.5f} (+/-{result['delta_std_error']:.5f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import statistics
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
+
+from app.core.config import get_settings
+from app.services import wallet_service
+from app.services.chain_provider_client import ProviderPool
+from app.services.chain_tip_tracker import ChainTipTracker
+from app.simulation.chain_provider_standin import Cassette, ChainProviderStandIn, StandInConfig
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+STANDIN_BASE_URL = "http://standin.local"
+
+
+def _base58(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + encoded
+
+
+def sample_tx_hashes(chain: str, count: int, seed: int = 0) -> list[str]:
+    """Deterministic, well-formed transaction hashes for `chain`."""
+    hashes = []
+    for index in range(count):
+        digest = hashlib.sha512(f"{seed}:{chain}:{index}".encode()).digest()
+        if chain == "BTC":
+            hashes.append(digest[:32].hex())
+        elif chain == "ETH":
+            hashes.append("0x" + digest[:32].hex())
+        else:
+            hashes.append(_base58(digest))
+    return hashes
+
+
+@contextmanager
+def standin_providers(transport: httpx.AsyncBaseTransport | None, base_url: str) -> Iterator[ProviderPool]:
+    """Point the wallet service at a stand-in for the duration of the block."""
+    settings = get_settings()
+    overrides = {
+        "wallet_verification_mode": "real",
+        "wallet_verification_strict": False,
+        "wallet_real_verification_fallback_to_mock": False,
+        "wallet_btc_provider_url": f"{base_url}/btc",
+        "wallet_eth_rpc_url": f"{base_url}/eth",
+        "wallet_sol_rpc_url": f"{base_url}/sol",
+    }
+    saved_settings = {name: getattr(settings, name) for name in overrides}
+    saved_clients = (wallet_service.provider_pool, wallet_service.chain_tip_tracker)
+    pool = ProviderPool(transport=transport)
+    try:
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        wallet_service.provider_pool = pool
+        wallet_service.chain_tip_tracker = ChainTipTracker(pool, redis_enabled=False)
+        yield pool
+    finally:
+        wallet_service.provider_pool, wallet_service.chain_tip_tracker = saved_clients
+        for name, value in saved_settings.items():
+            setattr(settings, name, value)
+        pool.close()
+
+
+def _latency_summary(latencies: list[float]) -> dict:
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(latencies)
+
+    def percentile(share: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * share))] * 1000.0, 2)
+
+    return {"p50_ms": percentile(0.5), "p95_ms": percentile(0.95), "p99_ms": percentile(0.99)}
+
+
+def run_verifications(chain: str, tx_hashes: list[str], concurrency: int) -> dict:
+    """Per-request path: `verify_on_chain_transaction` from `concurrency` request threads."""
+    latencies: list[float] = []
+    outcomes = {"verified": 0, "unconfirmed": 0, "errors": 0}
+
+    def verify(tx_hash: str) -> tuple[str, float]:
+        started = time.perf_counter()
+        try:
+            result = wallet_service.verify_on_chain_transaction(chain, tx_hash, require_verified=False)
+            outcome = "verified" if result["verified"] else "unconfirmed"
+        except ValueError:
+            outcome = "errors"
+        return outcome, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for outcome, latency in executor.map(verify, tx_hashes):
+            outcomes[outcome] += 1
+            latencies.append(latency)
+    elapsed = max(1e-9, time.perf_counter() - started)
+    return {
+        "path": "per_request",
+        "chain": chain,
+        "transactions": len(tx_hashes),
+        **outcomes,
+        "elapsed_seconds": round(elapsed, 3),
+        "verifications_per_second": round(len(tx_hashes) / elapsed, 1),
+        **_latency_summary(latencies),
+    }
+
+
+def run_batched(pool: ProviderPool, chain: str, tx_hashes: list[str], batch_size: int) -> dict:
+    """Poller path: `batch_confirmation_counts_async` over chunks of `batch_size` hashes."""
+    outcomes = {"verified": 0, "unconfirmed": 0, "errors": 0}
+    latencies: list[float] = []
+    required = wallet_service._min_confirmations_for_chain(chain)
+    started = time.perf_counter()
+    for index in range(0, len(tx_hashes), max(1, batch_size)):
+        chunk = tx_hashes[index : index + max(1, batch_size)]
+        chunk_started = time.perf_counter()
+        try:
+            results = pool.run(wallet_service.batch_confirmation_counts_async(chain, dict.fromkeys(chunk)))
+        except ValueError:
+            outcomes["errors"] += len(chunk)
+            continue
+        finally:
+            latencies.append(time.perf_counter() - chunk_started)
+        for confirmations, _ in results.values():
+            if isinstance(confirmations, ValueError):
+                outcomes["errors"] += 1
+            else:
+                outcomes["verified" if confirmations >= required else "unconfirmed"] += 1
+    elapsed = max(1e-9, time.perf_counter() - started)
+    return {
+        "path": "batched",
+        "chain": chain,
+        "transactions": len(tx_hashes),
+        **outcomes,
+        "elapsed_seconds": round(elapsed, 3),
+        "verifications_per_second": round(len(tx_hashes) / elapsed, 1),
+        **_latency_summary(latencies),
+    }
+
+
+def run_benchmark(
+    standin: ChainProviderStandIn | None,
+    chains: list[str],
+    transactions: int,
+    concurrency: int,
+    batch_size: int,
+    base_url: str = STANDIN_BASE_URL,
+    seed: int = 0,
+) -> list[dict]:
+    """Both verification paths per chain. Without `standin`, `base_url` must be a running one."""
+    rows: list[dict] = []
+    transport = standin.transport() if standin is not None else None
+    for chain in chains:
+        tx_hashes = sample_tx_hashes(chain, transactions, seed)
+        for path in ("per_request", "batched"):
+            requests_before = standin.stats["requests"] if standin is not None else 0
+            # A fresh pool and tip cache per run, so the second run does not reuse the first's tips.
+            with standin_providers(transport, base_url) as pool:
+                if path == "per_request":
+                    row = run_verifications(chain, tx_hashes, concurrency)
+                else:
+                    row = run_batched(pool, chain, tx_hashes, batch_size)
+                row["tip_fetches"] = wallet_service.chain_tip_tracker.stats["provider_fetches"]
+            if standin is not None:
+                row["provider_requests"] = standin.stats["requests"] - requests_before
+            rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wallet verification benchmark against a chain provider stand-in")
+    parser.add_argument("--chains", default="BTC,ETH,SOL")
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--failed-tx-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=20240101)
+    parser.add_argument("--cassette", default="", help="replay recorded provider answers instead of simulating")
+    parser.add_argument("--base-url", default="", help="use a running stand-in (python -m app.simulation.chain_provider_standin)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    chains = [chain.strip().upper() for chain in args.chains.split(",") if chain.strip()]
+    standin = None
+    if not args.base_url:
+        standin = ChainProviderStandIn(
+            StandInConfig(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                error_rate=args.error_rate,
+                throttle_rate=args.throttle_rate,
+                failed_tx_rate=args.failed_tx_rate,
+                seed=args.seed,
+            ),
+            mode="replay" if args.cassette else "simulate",
+            cassette=Cassette(args.cassette) if args.cassette else None,
+        )
+    rows = run_benchmark(
+        standin,
+        chains,
+        transactions=max(1, args.transactions),
+        concurrency=max(1, args.concurrency),
+        batch_size=max(1, args.batch_size),
+        base_url=args.base_url.rstrip("/") or STANDIN_BASE_URL,
+        seed=args.seed,
+    )
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print("Wallet Verification Benchmark")
+    for row in rows:
+        print(" ".join(f"{key}={value}" for key, value in row.items()))
+    per_request = [row["verifications_per_second"] for row in rows if row["path"] == "per_request"]
+    batched = [row["verifications_per_second"] for row in rows if row["path"] == "batched"]
+    if per_request and batched:
+        print(f"batched_speedup={round(statistics.mean(batched) / max(1e-9, statistics.mean(per_request)), 2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import User
+
+
+def memory_engine(create_schema: bool = True) -> Engine:
+    """A private in-memory SQLite database shared by every session bound to it."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    if create_schema:
+        Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def memory_session_factory(balances: dict[str, float] | None = None, engine: Engine | None = None) -> sessionmaker:
+    """Sessions on `engine` (a fresh in-memory database by default), seeded with one user per balance."""
+    factory = sessionmaker(bind=engine or memory_engine(), autocommit=False, autoflush=False)
+    if balances:
+        with factory() as db:
+            for user_id, balance in balances.items():
+                db.add(User(id=user_id, email=f"{user_id}@example.com", username=user_id, hashed_password="x", balance=balance))
+            db.commit()
+    return factory
+
+
+def user_balance(factory: sessionmaker, user_id: str) -> float:
+    with factory() as db:
+        return db.get(User, user_id).balance
@@ -0,0 +1,100 @@
+import unittest
+
+from sqlalchemy import select
+
+from app.db.models import BalanceLedgerEntry, User
+from app.services.ledger_service import (
+    BalanceChange,
+    apply_balance_change,
+    apply_balance_changes,
+    ledger_balance_delta,
+)
+
+from tests.helpers import memory_session_factory
+
+
+class BalanceLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = memory_session_factory({"u1": 100.0, "u2": 50.0})()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _balance(self, user_id: str) -> float:
+        return self.db.scalar(select(User.balance).where(User.id == user_id))
+
+    def test_batch_applies_each_delta_and_records_balance_after(self) -> None:
+        balances = apply_balance_changes(
+            self.db,
+            [
+                BalanceChange("u1", 12.5, "table_round", "round:r1:u1"),
+                BalanceChange("u2", -20.0, "table_round", "round:r1:u2"),
+                BalanceChange("u2", 0.0, "table_round", "round:r1:u2:push"),
+            ],
+        )
+        self.db.commit()
+
+        self.assertEqual(balances, {"u1": 112.5, "u2": 30.0})
+        self.assertEqual(self._balance("u1"), 112.5)
+        entries = self.db.scalars(select(BalanceLedgerEntry).order_by(BalanceLedgerEntry.user_id)).all()
+        self.assertEqual([(entry.user_id, entry.delta, entry.balance_after) for entry in entries], [
+            ("u1", 12.5, 112.5),
+            ("u2", -20.0, 30.0),
+        ])
+
+    def test_replayed_idempotency_key_is_applied_once(self) -> None:
+        change = BalanceChange("u1", -30.0, "single_player_round", "single_player_round:r9")
+        apply_balance_change(self.db, change)
+        self.db.commit()
+        self.assertIsNone(apply_balance_change(self.db, change))
+        apply_balance_changes(self.db, [change, change])
+        self.db.commit()
+
+        self.assertEqual(self._balance("u1"), 70.0)
+        self.assertEqual(ledger_balance_delta(self.db, "u1"), -30.0)
+
+    def test_loaded_user_sees_new_balance_and_floor_applies(self) -> None:
+        user = self.db.get(User, "u2")
+        balance = apply_balance_change(self.db, BalanceChange("u2", -80.0, "table_round", "round:r2:u2"))
+        self.assertEqual(balance, 0.0)
+        self.assertEqual(user.balance, 0.0)
+
+    def test_floored_debit_records_only_the_amount_taken(self) -> None:
+        apply_balance_changes(
+            self.db,
+            [
+                BalanceChange("u1", -30.0, "table_round", "round:r3:u1"),
+                BalanceChange("u2", -80.0, "table_round", "round:r3:u2"),
+            ],
+        )
+        self.db.commit()
+
+        deltas = dict(self.db.execute(select(BalanceLedgerEntry.user_id, BalanceLedgerEntry.delta)).all())
+        self.assertEqual(deltas, {"u1": -30.0, "u2": -50.0})
+        # The ledger still sums to the balance change.
+        self.assertEqual(self._balance("u2"), 0.0)
+        self.assertEqual(ledger_balance_delta(self.db, "u2"), -50.0)
+
+    def test_require_sufficient_refuses_overdraw(self) -> None:
+        refused = apply_balance_change(
+            self.db,
+            BalanceChange("u2", -60.0, "withdrawal", "withdrawal:w1"),
+            floor_at_zero=False,
+            require_sufficient=True,
+        )
+        self.assertIsNone(refused)
+        self.assertEqual(self._balance("u2"), 50.0)
+
+        approved = apply_balance_change(
+            self.db,
+            BalanceChange("u2", -50.0, "withdrawal", "withdrawal:w2"),
+            floor_at_zero=False,
+            require_sufficient=True,
+        )
+        self.db.commit()
+        self.assertEqual(approved, 0.0)
+        self.assertEqual(ledger_balance_delta(self.db, "u2"), -50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
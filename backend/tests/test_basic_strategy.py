@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+
+from app.services.basic_strategy import (
+    ACTION_NAMES,
+    DOUBLE_OR_HIT,
+    HARD,
+    HIT,
+    NO_SPLIT,
+    PAIR,
+    SOFT,
+    SPLIT,
+    STAND,
+    RuleSet,
+    count_matching,
+    evaluate_many,
+    recommend_action,
+)
+
+ALL_ACTIONS = ["hit", "stand", "double_down", "split", "surrender"]
+SURRENDER_RULES = RuleSet(double_after_split=True, late_surrender=True)
+NO_DAS_RULES = RuleSet(double_after_split=False, late_surrender=False)
+
+
+class BasicStrategyTests(unittest.TestCase):
+    def test_late_surrender_only_applies_when_rule_set_allows_it(self) -> None:
+        self.assertEqual(recommend_action(["10H", "6D"], "KS", ALL_ACTIONS, SURRENDER_RULES), "surrender")
+        self.assertEqual(recommend_action(["10H", "6D"], "KS", ALL_ACTIONS), "hit")
+        self.assertEqual(recommend_action(["10H", "5D"], "9S", ALL_ACTIONS, SURRENDER_RULES), "hit")
+
+    def test_surrender_falls_back_to_hit_after_first_decision(self) -> None:
+        self.assertEqual(recommend_action(["5H", "5D", "6C"], "AS", ["hit", "stand"], SURRENDER_RULES), "hit")
+
+    def test_pair_splits_depend_on_double_after_split(self) -> None:
+        self.assertEqual(recommend_action(["2H", "2D"], "2S", ALL_ACTIONS), "split")
+        self.assertEqual(recommend_action(["2H", "2D"], "2S", ALL_ACTIONS, NO_DAS_RULES), "hit")
+        self.assertEqual(recommend_action(["4H", "4D"], "5S", ALL_ACTIONS, NO_DAS_RULES), "hit")
+
+    def test_unavailable_split_uses_the_hand_total(self) -> None:
+        self.assertEqual(recommend_action(["8H", "8D"], "10S", ["hit", "stand"]), "hit")
+        self.assertEqual(recommend_action(["5H", "5D"], "6S", ALL_ACTIONS), "double_down")
+
+    def test_pairs_that_should_not_be_split_play_their_hard_total(self) -> None:
+        decisions = [(PAIR, 5, 6), (PAIR, 10, 6), (PAIR, 8, 6)]
+        self.assertEqual(list(evaluate_many(decisions)), [NO_SPLIT, NO_SPLIT, SPLIT])
+        self.assertEqual(ACTION_NAMES[NO_SPLIT], "no_split")
+        self.assertEqual(list(evaluate_many([(HARD, 10, 6), (HARD, 20, 6)])), [DOUBLE_OR_HIT, STAND])
+        self.assertEqual(recommend_action(["5H", "5D"], "6S", ALL_ACTIONS), "double_down")
+        self.assertEqual(recommend_action(["KH", "QD"], "6S", ALL_ACTIONS), "stand")
+
+        with patch("app.services.basic_strategy.decision_code", return_value=NO_SPLIT):
+            self.assertEqual(recommend_action(["5H", "5D"], "6S", ["hit", "stand"]), "hit")
+
+    def test_evaluate_many_returns_one_code_per_decision(self) -> None:
+        decisions = [(HARD, 16, 10), (SOFT, 18, 6), (PAIR, 8, 10), (HARD, 12, 4), (HARD, 7, 11)]
+        self.assertEqual(list(evaluate_many(decisions)), [HIT, DOUBLE_OR_HIT, SPLIT, STAND, HIT])
+        self.assertEqual(count_matching(decisions, [HIT, STAND, SPLIT, STAND, HIT]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
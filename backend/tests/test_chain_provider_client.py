@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import patch
+
+import httpx
+
+from app.core.config import get_settings
+from app.services import wallet_service
+from app.services.chain_provider_client import ProviderClient, ProviderPool
+from app.services.chain_tip_tracker import ChainTipTracker
+
+
+class ProviderClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.responses: dict[str, list[httpx.Response]] = {}
+
+    def _transport(self) -> httpx.MockTransport:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            if request.method == "POST":
+                key = json.loads(request.content)["method"]
+            else:
+                key = request.url.path
+            queued = self.responses[key]
+            return queued.pop(0) if len(queued) > 1 else queued[0]
+
+        return httpx.MockTransport(handler)
+
+    def _verify(self, chain: str, *tx_hashes: str) -> list[dict]:
+        pool = ProviderPool(transport=self._transport())
+        self.tracker = ChainTipTracker(pool, redis_enabled=False)
+        settings = get_settings()
+        try:
+            with (
+                patch.object(wallet_service, "provider_pool", pool),
+                patch.object(wallet_service, "chain_tip_tracker", self.tracker),
+                patch.object(settings, "wallet_verification_mode", "real"),
+                patch.object(settings, "wallet_verification_strict", False),
+                patch.object(settings, "wallet_http_retry_backoff_seconds", 0.0),
+            ):
+                return [wallet_service.verify_on_chain_transaction(chain, tx_hash) for tx_hash in tx_hashes]
+        finally:
+            pool.close()
+
+    def test_eth_tip_is_fetched_once_across_verifications(self) -> None:
+        self.responses = {
+            "eth_getTransactionReceipt": [httpx.Response(200, json={"result": {"status": "0x1", "blockNumber": "0x10"}})],
+            "eth_blockNumber": [httpx.Response(200, json={"result": "0x1f"})],
+        }
+        results = self._verify("ETH", *("0x" + digit * 64 for digit in "abcde"))
+        self.assertEqual([result["confirmations"] for result in results], [16] * 5)
+        self.assertEqual(len(self.requests), 6)
+        self.assertEqual(self.tracker.stats["provider_fetches"], 1)
+
+    def test_concurrent_tip_requests_share_one_fetch(self) -> None:
+        self.responses = {"eth_blockNumber": [httpx.Response(200, json={"result": "0x1f"})]}
+        pool = ProviderPool(transport=self._transport())
+        tracker = ChainTipTracker(pool, redis_enabled=False)
+
+        async def scenario() -> list[int]:
+            return await asyncio.gather(*(tracker.tip_height("ETH") for _ in range(10)))
+
+        try:
+            self.assertEqual(pool.run(scenario(), timeout=5.0), [31] * 10)
+        finally:
+            pool.close()
+        self.assertEqual(len(self.requests), 1)
+
+    def test_transaction_beyond_cached_tip_forces_a_refresh(self) -> None:
+        self.responses = {
+            "eth_getTransactionReceipt": [
+                httpx.Response(200, json={"result": {"status": "0x1", "blockNumber": "0x10"}}),
+                httpx.Response(200, json={"result": {"status": "0x1", "blockNumber": "0x30"}}),
+            ],
+            "eth_blockNumber": [
+                httpx.Response(200, json={"result": "0x1f"}),
+                httpx.Response(200, json={"result": "0x31"}),
+            ],
+        }
+        first, second = self._verify("ETH", "0x" + "a" * 64, "0x" + "b" * 64)
+        self.assertEqual((first["confirmations"], second["confirmations"]), (16, 2))
+        self.assertEqual(self.tracker.stats["provider_fetches"], 2)
+
+    def test_retryable_errors_are_retried(self) -> None:
+        tx_hash = "b" * 64
+        self.responses = {
+            f"/api/tx/{tx_hash}/status": [
+                httpx.Response(503),
+                httpx.Response(200, json={"confirmed": True, "block_height": 100}),
+            ],
+            "/api/blocks/tip/height": [httpx.Response(200, text="104")],
+        }
+        (result,) = self._verify("BTC", tx_hash)
+        self.assertEqual(result["verification_mode"], "real")
+        self.assertEqual(result["confirmations"], 5)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_unconfirmed_transaction_skips_the_tip(self) -> None:
+        tx_hash = "c" * 64
+        self.responses = {f"/api/tx/{tx_hash}/status": [httpx.Response(200, json={"confirmed": False})]}
+        (result,) = self._verify("BTC", tx_hash)
+        self.assertEqual((result["verification_mode"], result["confirmations"]), ("real", 0))
+        self.assertEqual(len(self.requests), 1)
+
+    def test_concurrency_cap_limits_in_flight_requests(self) -> None:
+        in_flight = {"now": 0, "max": 0}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, text="1")
+
+        async def scenario() -> None:
+            client = ProviderClient(
+                "BTC",
+                "http://provider",
+                timeout_seconds=1.0,
+                max_concurrency=2,
+                retries=0,
+                backoff_seconds=0.0,
+                transport=httpx.MockTransport(handler),
+            )
+            try:
+                await asyncio.gather(*(client.get_text("/blocks/tip/height") for _ in range(10)))
+            finally:
+                await client.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(in_flight["max"], 2)
+
+    def test_run_cancels_the_call_when_it_times_out(self) -> None:
+        cancelled = threading.Event()
+
+        async def stuck() -> None:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        pool = ProviderPool()
+        try:
+            with self.assertRaises(FutureTimeoutError):
+                pool.run(stuck(), timeout=0.05)
+            self.assertTrue(cancelled.wait(1.0))
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
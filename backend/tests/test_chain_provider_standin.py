@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from app.services import wallet_service
+from app.simulation.chain_provider_standin import Cassette, ChainProviderStandIn, StandInConfig
+from app.simulation.wallet_verification_bench import run_benchmark, sample_tx_hashes, standin_providers
+
+ETH_HASH = "0x" + "ab" * 32
+BTC_HASH = "cd" * 32
+
+
+def _rpc(standin: ChainProviderStandIn, path: str, method: str, params: list) -> dict:
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode()
+    return json.loads(standin.handle("POST", path, body)[2])
+
+
+class ChainProviderStandInTests(unittest.TestCase):
+    def test_simulated_eth_receipt_parses_through_the_real_path(self) -> None:
+        standin = ChainProviderStandIn(StandInConfig(mempool_blocks=0), clock=lambda: 0.0)
+        with standin_providers(standin.transport(), "http://standin.local"):
+            result = wallet_service.verify_on_chain_transaction("ETH", ETH_HASH, require_verified=False)
+
+        receipt = _rpc(standin, "/eth", "eth_getTransactionReceipt", [ETH_HASH])["result"]
+        block = int(receipt["blockNumber"], 16)
+        self.assertEqual(result["verification_mode"], "real")
+        self.assertEqual(result["confirmations"], standin.tip("eth") - block + 1)
+
+    def test_failed_transactions_and_injected_errors_surface_as_errors(self) -> None:
+        standin = ChainProviderStandIn(StandInConfig(failed_tx_rate=1.0, mempool_blocks=0))
+        with standin_providers(standin.transport(), "http://standin.local"):
+            with self.assertRaisesRegex(ValueError, "reverted"):
+                wallet_service.verify_on_chain_transaction("ETH", ETH_HASH)
+
+        flaky = ChainProviderStandIn(StandInConfig(error_rate=1.0))
+        self.assertEqual(flaky.handle("GET", "/btc/blocks/tip/height")[0], 503)
+
+    def test_recorded_answers_replay_offline(self) -> None:
+        def upstream(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, json={"confirmed": True, "block_height": 840000})
+            calls = json.loads(request.content)
+            return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": call["id"], "result": "0x10"} for call in calls])
+
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, "cassette.json")
+            recorder = ChainProviderStandIn(
+                mode="record",
+                cassette=Cassette(path),
+                upstreams={"btc": "https://btc.example/api", "eth": "https://eth.example"},
+                upstream_transport=httpx.MockTransport(upstream),
+            )
+            batch = json.dumps(
+                [{"jsonrpc": "2.0", "id": index, "method": "eth_blockNumber", "params": []} for index in range(2)]
+            ).encode()
+            recorded_status = recorder.handle("GET", f"/btc/tx/{BTC_HASH}/status")
+            recorder.handle("POST", "/eth", batch)
+            recorder.cassette.save()
+
+            replayer = ChainProviderStandIn(mode="replay", cassette=Cassette(path))
+            self.assertEqual(replayer.handle("GET", f"/btc/tx/{BTC_HASH}/status"), recorded_status)
+            self.assertEqual(_rpc(replayer, "/eth", "eth_blockNumber", [])["result"], "0x10")
+            self.assertEqual(replayer.handle("GET", "/btc/blocks/tip/height")[0], 404)
+            self.assertEqual(replayer.stats["replay_misses"], 1)
+
+    def test_benchmark_compares_per_request_and_batched_paths(self) -> None:
+        standin = ChainProviderStandIn(StandInConfig(max_depth=20))
+        rows = run_benchmark(standin, ["SOL"], transactions=20, concurrency=4, batch_size=8)
+
+        by_path = {row["path"]: row for row in rows}
+        self.assertEqual(by_path["per_request"]["provider_requests"], 20)
+        self.assertEqual(by_path["batched"]["provider_requests"], 3)
+        self.assertEqual(by_path["batched"]["errors"], 0)
+        self.assertEqual(len(set(sample_tx_hashes("SOL", 20))), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
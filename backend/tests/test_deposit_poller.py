@@ -0,0 +1,187 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+
+from app.core.config import get_settings
+from app.db.models import User, WalletLink, WalletTransaction
+from app.schemas.wallet import DepositVerifyRequest
+from app.services import wallet_service
+from app.services.chain_provider_client import ProviderPool
+from app.services.chain_tip_tracker import ChainTipTracker
+from app.services.deposit_confirmation_service import DepositConfirmationPoller
+
+from tests.helpers import memory_session_factory
+
+SOL_SIGNATURES = ["5" * 87 + digit for digit in "ABC"]
+ETH_HASHES = ["0x" + digit * 64 for digit in "ab"]
+BTC_HASH = "c" * 64
+
+
+class DepositPollerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session_factory = memory_session_factory({"u1": 0.0})
+
+        self.requests: list[httpx.Request] = []
+        self.responses: dict[str, httpx.Response] = {}
+        self.pool = ProviderPool(transport=httpx.MockTransport(self._handle))
+        settings = get_settings()
+        self.patches = [
+            patch.object(wallet_service, "provider_pool", self.pool),
+            patch.object(wallet_service, "chain_tip_tracker", ChainTipTracker(self.pool, redis_enabled=False)),
+            patch.object(settings, "wallet_verification_mode", "real"),
+            patch.object(settings, "wallet_verification_strict", True),
+            patch.object(settings, "wallet_http_retry_backoff_seconds", 0.0),
+        ]
+        for active in self.patches:
+            active.start()
+        self.notified: list[tuple[str, float]] = []
+
+    def tearDown(self) -> None:
+        for active in reversed(self.patches):
+            active.stop()
+        self.pool.close()
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            body = json.loads(request.content)
+            key = f"batch:{body[0]['method']}" if isinstance(body, list) else body["method"]
+        else:
+            key = request.url.path
+        return self.responses[key]
+
+    def _pending(self, chain: str, tx_hash: str, age: timedelta = timedelta(), **verification) -> str:
+        created_at = datetime.now(timezone.utc) - age
+        with self.session_factory() as db:
+            transaction = WalletTransaction(
+                user_id="u1",
+                tx_type="deposit",
+                status=wallet_service.PENDING_CONFIRMATION_STATUS,
+                chain=chain,
+                asset=chain,
+                wallet_address="addr",
+                tx_hash=tx_hash,
+                crypto_amount=1.0,
+                usd_rate=1.0,
+                usd_amount=10.0,
+                token_amount=100.0,
+                metadata_json=json.dumps({"verification": {"provider": "test", **verification}}),
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            db.add(transaction)
+            db.commit()
+            return transaction.id
+
+    def _poll(self) -> dict[str, int]:
+        async def notify(user_id: str, balance: float) -> None:
+            self.notified.append((user_id, balance))
+
+        poller = DepositConfirmationPoller(self.session_factory, notify=notify, pool=self.pool)
+        return asyncio.run(poller.poll_once())
+
+    def _status(self, transaction_id: str) -> str:
+        with self.session_factory() as db:
+            return db.get(WalletTransaction, transaction_id).status
+
+    def test_sol_signatures_are_checked_in_one_call(self) -> None:
+        ids = [self._pending("SOL", signature) for signature in SOL_SIGNATURES]
+        statuses = [
+            {"confirmations": 25, "err": None},
+            {"confirmations": 3, "err": None},
+            {"confirmations": None, "err": {"InstructionError": [0, "Custom"]}},
+        ]
+        self.responses = {"getSignatureStatuses": httpx.Response(200, json={"result": {"value": statuses}})}
+
+        outcomes = self._poll()
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(json.loads(self.requests[0].content)["params"][0], SOL_SIGNATURES)
+        self.assertEqual(outcomes, {"credited": 1, "pending": 1, "failed": 1})
+        self.assertEqual([self._status(tx_id) for tx_id in ids], ["completed", "pending_confirmation", "failed"])
+        self.assertEqual(self.notified, [("u1", 100.0)])
+
+    def test_eth_receipts_are_fetched_as_one_batch(self) -> None:
+        ids = [self._pending("ETH", tx_hash) for tx_hash in ETH_HASHES]
+        self.responses = {
+            "batch:eth_getTransactionReceipt": httpx.Response(
+                200,
+                json=[
+                    {"id": 1, "result": None},
+                    {"id": 0, "result": {"status": "0x1", "blockNumber": "0x10"}},
+                ],
+            ),
+            "eth_blockNumber": httpx.Response(200, json={"result": "0x20"}),
+        }
+
+        self.assertEqual(self._poll(), {"credited": 1, "pending": 1})
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual([self._status(tx_id) for tx_id in ids], ["completed", "pending_confirmation"])
+        with self.session_factory() as db:
+            self.assertEqual(db.get(User, "u1").balance, 100.0)
+
+    def test_btc_known_block_only_needs_the_tip(self) -> None:
+        tx_id = self._pending("BTC", BTC_HASH, block_height=100)
+        self.responses = {"/api/blocks/tip/height": httpx.Response(200, text="100")}
+
+        self.assertEqual(self._poll(), {"pending": 1})
+        self.assertEqual([request.url.path for request in self.requests], ["/api/blocks/tip/height"])
+        self.assertEqual(self._status(tx_id), "pending_confirmation")
+
+    def test_stale_pending_deposit_expires(self) -> None:
+        tx_id = self._pending("SOL", SOL_SIGNATURES[0], age=timedelta(days=2))
+        self.responses = {"getSignatureStatuses": httpx.Response(200, json={"result": {"value": [None]}})}
+
+        self.assertEqual(self._poll(), {"expired": 1})
+        self.assertEqual(self._status(tx_id), "failed")
+
+    def test_backlog_larger_than_a_batch_is_polled_in_turn(self) -> None:
+        for signature in SOL_SIGNATURES:
+            self._pending("SOL", signature)
+        still_waiting = [{"confirmations": 1, "err": None}] * 2
+        self.responses = {"getSignatureStatuses": httpx.Response(200, json={"result": {"value": still_waiting}})}
+
+        with patch.object(get_settings(), "wallet_deposit_poll_batch_size", 2):
+            self.assertEqual(self._poll(), {"pending": 2})
+            self.assertEqual(self._poll(), {"pending": 2})
+
+        polled = [json.loads(request.content)["params"][0] for request in self.requests]
+        self.assertEqual(polled[0], SOL_SIGNATURES[:2])
+        self.assertEqual(polled[1][0], SOL_SIGNATURES[2])
+
+    def test_unconfirmed_deposit_is_recorded_without_credit(self) -> None:
+        self.responses = {
+            "eth_getTransactionReceipt": httpx.Response(200, json={"result": {"status": "0x1", "blockNumber": "0x10"}}),
+            "eth_blockNumber": httpx.Response(200, json={"result": "0x12"}),
+        }
+        with self.session_factory() as db:
+            db.add(WalletLink(user_id="u1", chain="ETH", wallet_address="0x" + "1" * 40))
+            db.commit()
+            user = db.get(User, "u1")
+            payload = DepositVerifyRequest(chain="ETH", asset="ETH", tx_hash=ETH_HASHES[0], crypto_amount=0.01)
+            transaction, credited, verification = wallet_service.verify_and_credit_deposit(db, user, payload)
+
+            self.assertEqual(transaction.status, wallet_service.PENDING_CONFIRMATION_STATUS)
+            self.assertEqual(credited, 0.0)
+            self.assertEqual(verification["confirmations"], 3)
+            db.refresh(user)
+            self.assertEqual(user.balance, 0.0)
+
+            # Re-submitting re-checks the deposit even while the poller is enabled.
+            self.responses["eth_getTransactionReceipt"] = httpx.Response(
+                200, json={"result": {"status": "0x1", "blockNumber": "0x1"}}
+            )
+            transaction, credited, _ = wallet_service.verify_and_credit_deposit(db, user, payload)
+
+            self.assertEqual(transaction.status, "completed")
+            self.assertEqual(credited, transaction.token_amount)
+            db.refresh(user)
+            self.assertEqual(user.balance, credited)
+
+
+if __name__ == "__main__":
+    unittest.main()
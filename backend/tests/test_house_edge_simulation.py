@@ -0,0 +1,37 @@
+import unittest
+from dataclasses import replace
+
+import numpy as np
+
+from app.simulation.house_edge import BASE_RULES, play_batch, simulate
+
+# Rank codes: 0..8 are 2..10, 9..11 are J/Q/K, 12 is an ace.
+TWO, SIX, SEVEN, NINE, TEN, KING, ACE = 0, 4, 5, 7, 8, 11, 12
+
+
+def _shoe(draw_order: list[int]) -> np.ndarray:
+    return np.array([draw_order + [TWO] * (52 - len(draw_order))], dtype=np.int8)
+
+
+class HouseEdgeSimulationTests(unittest.TestCase):
+    def test_natural_pays_configured_blackjack_payout(self) -> None:
+        shoe = _shoe([ACE, NINE, KING, SEVEN])
+        self.assertEqual(play_batch(shoe, BASE_RULES).tolist(), [1.5])
+        self.assertEqual(play_batch(shoe, replace(BASE_RULES, blackjack_payout=1.2)).tolist(), [1.2])
+
+    def test_hard_16_vs_ten_uses_late_surrender_only_when_offered(self) -> None:
+        shoe = _shoe([TEN, KING, SIX, NINE])
+        self.assertEqual(play_batch(shoe, BASE_RULES).tolist(), [-0.5])
+        self.assertEqual(play_batch(shoe, replace(BASE_RULES, surrender=False)).tolist(), [-1.0])
+
+    def test_results_are_reproducible_from_seed_regardless_of_workers(self) -> None:
+        configs = (BASE_RULES, replace(BASE_RULES, name="no_split", max_hands=1))
+        first = simulate(hands=6_000, seed=7, configs=configs, workers=1, chunk_hands=2_000, batch_hands=1_000)
+        second = simulate(hands=6_000, seed=7, configs=configs, workers=2, chunk_hands=2_000, batch_hands=1_000)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["hands"], 6_000)
+        self.assertEqual(first[0]["delta_ev"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from app.db.ids import deterministic_id, id_timestamp, new_id
+
+
+class TimeOrderedIdTests(unittest.TestCase):
+    def test_ids_are_valid_uuid7_and_strictly_increasing(self) -> None:
+        ids = [new_id() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        parsed = UUID(hex=ids[0])
+        self.assertEqual(parsed.version, 7)
+        self.assertEqual(len(ids[0]), 32)
+
+    def test_timestamp_is_recoverable_and_legacy_ids_are_ignored(self) -> None:
+        before = datetime.now(timezone.utc)
+        stamp = id_timestamp(new_id())
+        self.assertLessEqual(abs((stamp - before).total_seconds()), 1.0)
+        self.assertIsNone(id_timestamp(uuid4().hex))
+
+    def test_deterministic_ids_repeat_for_same_input_and_sort_by_time(self) -> None:
+        early = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        late = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        self.assertEqual(deterministic_id(early, "r1:0"), deterministic_id(early, "r1:0"))
+        self.assertNotEqual(deterministic_id(early, "r1:0"), deterministic_id(early, "r1:1"))
+        self.assertLess(deterministic_id(early, "r9:0"), deterministic_id(late, "r1:0"))
+        self.assertEqual(id_timestamp(deterministic_id(early, "r1:0")), early)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import unittest
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.api.routes import lobby as lobby_routes
+from app.realtime import socket_server as ws
+from app.schemas.lobby import TableCreateRequest
+from app.services.lobby_service import LOBBY_TABLES_KEY, LobbyService
+
+
+def _request(name: str, is_private: bool = False, max_players: int = 4, **stakes: float) -> TableCreateRequest:
+    return TableCreateRequest(name=name, is_private=is_private, max_players=max_players, **stakes)
+
+
+class LobbyServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lobby = LobbyService()
+        self.lobby._redis = None  # type: ignore[attr-defined]
+
+    def test_user_index_follows_moves_and_drops_empty_tables(self) -> None:
+        first = self.lobby.create_table("u1", _request("First"))
+        second = self.lobby.create_table("u2", _request("Second"))
+        self.lobby.join_table(first.id, "u3")
+
+        self.assertEqual(self.lobby.join_table(second.id, "u1").to_dict()["players"], ["u2", "u1"])
+        self.assertEqual(self.lobby.table_ids_for_user("u1"), [second.id])
+        self.assertEqual(list(first.players), ["u3"])
+
+        self.assertIsNone(self.lobby.leave_table(first.id, "u3"))
+        self.assertIsNone(self.lobby.get_table(first.id))
+        self.assertEqual(self.lobby.table_ids_for_user("u3"), [])
+
+        self.lobby.leave_table(second.id, "u2")
+        self.assertEqual(second.owner_id, "u1")
+
+    def test_invite_codes_resolve_until_the_table_closes(self) -> None:
+        private = self.lobby.create_table("u1", _request("Private", is_private=True, max_players=2))
+        code = private.invite_code.lower()
+
+        self.assertIs(self.lobby.get_table_by_invite_code(code), private)
+        self.assertIs(self.lobby.join_table_by_invite_code(code, "u2"), private)
+        self.assertIsNone(self.lobby.join_table_by_invite_code(code, "u3"))
+
+        self.assertTrue(self.lobby.close_table(private.id))
+        self.assertIsNone(self.lobby.get_table_by_invite_code(code))
+        self.assertEqual(self.lobby.table_ids_for_user("u2"), [])
+
+    def test_visible_tables_are_public_tables_plus_the_users_private_one(self) -> None:
+        public = self.lobby.create_table("u1", _request("Public"))
+        private = self.lobby.create_table("u2", _request("Private", is_private=True))
+        version = self.lobby.version
+
+        self.assertEqual([table.id for table in self.lobby.visible_tables_for_user("u3")], [public.id])
+        self.assertEqual([table.id for table in self.lobby.visible_tables_for_user("u2")], [public.id, private.id])
+        self.assertEqual(self.lobby.version, version)
+
+        self.lobby.join_table(public.id, "u3")
+        self.assertGreater(self.lobby.version, version)
+        self.assertEqual(self.lobby.private_table_for_user("u2"), private)
+        self.assertIsNone(self.lobby.private_table_for_user("u3"))
+
+
+class LobbyListingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lobby = LobbyService()
+        self.lobby._redis = None  # type: ignore[attr-defined]
+
+    def test_visibility_version_ignores_other_users_private_tables(self) -> None:
+        public = self.lobby.create_table("u1", _request("Public"))
+        self.lobby.create_table("u2", _request("Private", is_private=True))
+        seen = self.lobby.visibility_version("u3")
+
+        self.lobby.create_table("u4", _request("Another private", is_private=True))
+        self.assertEqual(self.lobby.visibility_version("u3"), seen)
+        owner_version = self.lobby.visibility_version("u4")
+
+        self.lobby.join_table(public.id, "u5")
+        self.assertNotEqual(self.lobby.visibility_version("u3"), seen)
+        self.assertNotEqual(self.lobby.visibility_version("u4"), owner_version)
+
+    def test_filters_and_cursor_pages(self) -> None:
+        low = self.lobby.create_table("u1", _request("Low", max_players=2, min_stake=1, max_stake=10))
+        high = self.lobby.create_table("u2", _request("High", max_players=4, min_stake=50, max_stake=200))
+        open_table = self.lobby.create_table("u3", _request("Open"))
+        private = self.lobby.create_table("u4", _request("Private", is_private=True))
+        self.lobby.join_table(low.id, "u5")
+
+        def ids(**filters) -> list[str]:
+            return [table.id for table in self.lobby.list_visible_tables("u4", **filters)[0]]
+
+        self.assertEqual(ids(), [low.id, high.id, open_table.id, private.id])
+        self.assertEqual(ids(stake=100), [high.id, open_table.id, private.id])
+        self.assertEqual(ids(min_open_seats=1, is_private=False), [high.id, open_table.id])
+        self.assertEqual(ids(is_private=True), [private.id])
+
+        first_page, _, cursor = self.lobby.list_visible_tables("u4", limit=2)
+        second_page, _, last_cursor = self.lobby.list_visible_tables("u4", limit=2, after=cursor)
+        self.assertEqual([table.id for table in first_page + second_page], ids())
+        self.assertIsNone(last_cursor)
+
+    def test_long_poll_returns_when_a_visible_table_changes(self) -> None:
+        async def scenario() -> tuple[str, str, str]:
+            table = self.lobby.create_table("u1", _request("Public"))
+            since = self.lobby.visibility_version("u2")
+            idle = await self.lobby.wait_for_change("u2", since, timeout=0.05)
+            waiter = asyncio.create_task(self.lobby.wait_for_change("u2", since, timeout=5))
+            await asyncio.sleep(0.01)
+            await asyncio.to_thread(self.lobby.join_table, table.id, "u3")
+            return since, idle, await asyncio.wait_for(waiter, 1)
+
+        since, idle, changed = asyncio.run(scenario())
+        self.assertEqual(idle, since)
+        self.assertNotEqual(changed, since)
+        self.assertEqual(self.lobby._change_waiters, {})  # type: ignore[attr-defined]
+
+    def _fetch(self, lobby: LobbyService, if_none_match: str = "") -> Response:
+        async def fetch() -> Response:
+            headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+            response = Response()
+            result = await lobby_routes.list_tables(
+                request=Request({"type": "http", "headers": headers}),
+                response=response,
+                limit=100,
+                cursor=None,
+                stake=None,
+                min_open_seats=0,
+                is_private=None,
+                since=None,
+                wait=0,
+                current_user=SimpleNamespace(id="u2"),
+            )
+            return result if isinstance(result, Response) else response
+
+        with patch.object(lobby_routes, "lobby_service", lobby):
+            return asyncio.run(fetch())
+
+    def test_route_answers_a_matching_etag_with_304(self) -> None:
+        self.lobby.create_table("u1", _request("Public"))
+
+        etag = self._fetch(self.lobby).headers["ETag"]
+        self.assertEqual(self._fetch(self.lobby, etag).status_code, 304)
+        self.lobby.create_table("u3", _request("Second"))
+        self.assertEqual(self._fetch(self.lobby, etag).status_code, 200)
+
+    def test_restarted_lobby_never_validates_an_earlier_etag(self) -> None:
+        self.lobby.create_table("u1", _request("Public"))
+        etag = self._fetch(self.lobby).headers["ETag"]
+
+        restarted = LobbyService()
+        restarted._redis = None  # type: ignore[attr-defined]
+        restarted.create_table("u1", _request("Other"))
+
+        self.assertEqual(restarted.version, self.lobby.version)
+        self.assertEqual(self._fetch(restarted, etag).status_code, 200)
+
+
+class _HashRedis:
+    """Just enough of a Redis client for one hash, counting pipeline round trips."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.commands: list[tuple] = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> "_HashPipeline":
+        return _HashPipeline(self)
+
+    def apply(self, command: tuple) -> None:
+        bucket = self.hashes.setdefault(command[1], {})
+        if command[0] == "hset":
+            bucket[command[2]] = command[3]
+        else:
+            for field in command[2:]:
+                bucket.pop(field, None)
+        self.commands.append(command)
+
+    def hdel(self, key: str, *fields: str) -> None:
+        self.round_trips += 1
+        self.apply(("hdel", key, *fields))
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+
+class _HashPipeline:
+    def __init__(self, redis: _HashRedis) -> None:
+        self._redis = redis
+        self._queued: list[tuple] = []
+
+    def hset(self, key: str, field: str, value: str) -> None:
+        self._queued.append(("hset", key, field, value))
+
+    def hdel(self, key: str, *fields: str) -> None:
+        self._queued.append(("hdel", key, *fields))
+
+    def execute(self) -> None:
+        self._redis.round_trips += 1
+        for command in self._queued:
+            self._redis.apply(command)
+
+
+class LobbyPersistenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.redis = _HashRedis()
+        self.lobby = LobbyService()
+        self.lobby._redis = self.redis  # type: ignore[attr-defined]
+
+    def _restarted(self) -> LobbyService:
+        lobby = LobbyService()
+        lobby._redis = self.redis  # type: ignore[attr-defined]
+        return lobby
+
+    def test_mutations_write_only_the_changed_table(self) -> None:
+        first = self.lobby.create_table("u1", _request("First"))
+        second = self.lobby.create_table("u2", _request("Second"))
+        self.redis.commands.clear()
+
+        self.lobby.join_table(first.id, "u3")
+        self.assertEqual([command[:3] for command in self.redis.commands], [("hset", LOBBY_TABLES_KEY, first.id)])
+        self.assertEqual(json.loads(self.redis.hashes[LOBBY_TABLES_KEY][first.id])["players"], ["u1", "u3"])
+
+        self.redis.commands.clear()
+        self.lobby.leave_table(second.id, "u2")
+        self.assertEqual(self.redis.commands, [("hdel", LOBBY_TABLES_KEY, second.id)])
+        self.assertEqual(set(self.redis.hashes[LOBBY_TABLES_KEY]), {first.id})
+
+    def test_writer_thread_batches_changes_and_flushes_on_stop(self) -> None:
+        self.lobby.start_persistence()
+        try:
+            table = self.lobby.create_table("u1", _request("Table", is_private=True))
+            for user_id in ("u2", "u3"):
+                self.lobby.join_table(table.id, user_id)
+        finally:
+            self.lobby.stop_persistence()
+
+        self.assertFalse(self.lobby.persistence_running)
+        self.assertLessEqual(self.redis.round_trips, 3)
+        self.assertEqual(json.loads(self.redis.hashes[LOBBY_TABLES_KEY][table.id])["players"], ["u1", "u2", "u3"])
+
+    def test_restart_restores_tables_and_indexes(self) -> None:
+        public = self.lobby.create_table("u1", _request("Public"))
+        private = self.lobby.create_table("u2", _request("Private", is_private=True))
+        self.lobby.join_table(public.id, "u3")
+        self.redis.hashes[LOBBY_TABLES_KEY]["legacy"] = "{'id': 'legacy', 'players': []}"
+
+        restored = self._restarted()
+        self.assertEqual(restored.restore(), 2)
+
+        self.assertEqual(restored.table_ids_for_user("u3"), [public.id])
+        self.assertEqual(restored.get_table_by_invite_code(private.invite_code).to_dict(), private.to_dict())
+        self.assertEqual([table.id for table in restored.public_tables()], [public.id])
+        self.assertNotIn("legacy", self.redis.hashes[LOBBY_TABLES_KEY])
+
+        restored.leave_table(public.id, "u1")
+        self.assertEqual(json.loads(self.redis.hashes[LOBBY_TABLES_KEY][public.id])["owner_id"], "u3")
+
+
+class RestoredLobbyGraceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.redis = _HashRedis()
+        writer = LobbyService()
+        writer._redis = self.redis  # type: ignore[attr-defined]
+        table = writer.create_table("u1", _request("Before restart"))
+        writer.join_table(table.id, "u2")
+
+        self.lobby = LobbyService()
+        self.lobby._redis = self.redis  # type: ignore[attr-defined]
+
+        async def fake_emit(_event, _payload=None, room=None):
+            return None
+
+        self.patches = [
+            patch.object(ws, "lobby_service", self.lobby),
+            patch.object(ws.sio, "emit", new=fake_emit),
+            patch.object(ws, "_ensure_turn_timer_task"),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+        ws._user_to_sids.clear()
+        ws._reconnect_deadlines.clear()
+
+    async def asyncTearDown(self) -> None:
+        for patcher in reversed(self.patches):
+            patcher.stop()
+        ws._reconnect_deadlines.clear()
+
+    async def test_tables_restored_without_a_snapshot_are_evicted_after_the_grace(self) -> None:
+        self.assertEqual(self.lobby.restore(), 1)
+
+        self.assertEqual(ws.grant_restored_players_grace(), 2)
+        await ws._process_reconnect_deadlines()
+        self.assertEqual(len(self.lobby.list_tables()), 1)
+
+        for user_id in ("u1", "u2"):
+            ws._reconnect_deadlines[user_id] = ws._utc_now() - timedelta(seconds=1)
+        await ws._process_reconnect_deadlines()
+        self.assertEqual(self.lobby.list_tables(), [])
+        self.assertNotIn(LOBBY_TABLES_KEY, {key for key, fields in self.redis.hashes.items() if fields})
+
+
+if __name__ == "__main__":
+    unittest.main()
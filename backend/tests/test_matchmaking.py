@@ -0,0 +1,140 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from app.realtime import socket_server as ws
+from app.realtime.matchmaking import MatchmakingQueue, QueueKey
+from app.services.lobby_service import lobby_service
+
+
+class MatchmakingQueueTests(unittest.TestCase):
+    def test_stakes_and_sizes_pick_separate_queues(self) -> None:
+        queue = MatchmakingQueue()
+        self.assertEqual(queue.enqueue("u1", 5.0, 4).key, QueueKey(0, 4))
+        self.assertEqual(queue.enqueue("u2", 25.0, 4).key, QueueKey(1, 4))
+        self.assertEqual(queue.enqueue("u3", 5000.0, 12).key, QueueKey(3, 8))
+        self.assertEqual(queue.stake_range(QueueKey(1, 4)), (10.0, 50.0))
+
+        self.assertEqual(queue.assign(lambda key: []), [])
+        self.assertEqual(len(queue), 3)
+
+    def test_open_seats_fill_first_then_new_tables(self) -> None:
+        queue = MatchmakingQueue()
+        for index in range(7):
+            queue.enqueue(f"u{index}", 10.0, 3)
+        queue.cancel("u6")
+
+        assignments = queue.assign(lambda key: [("t1", 2)])
+
+        self.assertEqual(
+            [(assignment.table_id, [ticket.user_id for ticket in assignment.tickets]) for assignment in assignments],
+            [("t1", ["u0", "u1"]), (None, ["u2", "u3", "u4"])],
+        )
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.ticket("u5").key, QueueKey(0, 3))
+
+    def test_thousands_of_players_are_seated_in_one_tick(self) -> None:
+        queue = MatchmakingQueue()
+        for index in range(20000):
+            queue.enqueue(f"u{index}", float(1 + index % 900), 2 + index % 7)
+
+        started = time.perf_counter()
+        assignments = queue.assign(lambda key: [])
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(sum(len(assignment.tickets) for assignment in assignments) + len(queue), 20000)
+        self.assertLessEqual(len(queue), 28)
+        self.assertLess(elapsed, 1.0)
+
+
+class MatchmakingSocketTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self._clear_runtime_state()
+        self.emitted: list[tuple[str, object, str | None]] = []
+        self.sessions: dict[str, dict] = {}
+
+        async def fake_emit(event, payload=None, room=None):
+            self.emitted.append((event, payload, room))
+
+        async def fake_get_session(sid):
+            return self.sessions[sid]
+
+        async def fake_save_session(sid, session):
+            self.sessions[sid] = session
+
+        async def fake_room(_sid, _room):
+            return None
+
+        self.patches = [
+            patch.object(ws.sio, "emit", new=fake_emit),
+            patch.object(ws.sio, "get_session", new=fake_get_session),
+            patch.object(ws.sio, "save_session", new=fake_save_session),
+            patch.object(ws.sio, "enter_room", new=fake_room),
+            patch.object(ws.sio, "leave_room", new=fake_room),
+            patch.object(ws, "_ensure_turn_timer_task"),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    async def asyncTearDown(self) -> None:
+        for patcher in reversed(self.patches):
+            patcher.stop()
+        self._clear_runtime_state()
+
+    def _clear_runtime_state(self) -> None:
+        ws._sid_to_identity.clear()
+        ws._user_to_sids.clear()
+        ws._table_ready.clear()
+        ws._table_turn_states.clear()
+        ws._sid_spectator_table.clear()
+        ws._table_spectators.clear()
+        ws._table_chat_banned.clear()
+        ws._locked_tables.clear()
+        ws._matchmaking = MatchmakingQueue()
+        ws._matchmade_tables.clear()
+        lobby_service._tables.clear()  # type: ignore[attr-defined]
+
+    def _connect(self, user_id: str) -> str:
+        sid = f"sid-{user_id}"
+        ws._register_presence(sid, ws.ConnectionIdentity(user_id, user_id, "player"))
+        self.sessions[sid] = {"user_id": user_id, "table_id": None, "spectator_table_id": None}
+        return sid
+
+    def _events(self, name: str) -> list[tuple[object, str | None]]:
+        return [(payload, room) for event, payload, room in self.emitted if event == name]
+
+    async def test_queued_players_are_seated_together_with_one_lobby_broadcast(self) -> None:
+        sids = [self._connect(f"u{index}") for index in range(3)]
+        for sid in sids:
+            response = await ws.join_matchmaking(sid, {"stake": 20, "table_size": 3})
+            self.assertTrue(response["ok"])
+        self.assertEqual(response["queue"]["stake_range"], [10.0, 50.0])
+
+        await ws._process_matchmaking()
+
+        tables = lobby_service.list_tables()
+        self.assertEqual([list(table.players) for table in tables], [["u0", "u1", "u2"]])
+        self.assertEqual(tables[0].name, "Quick Seat 10-50")
+        self.assertEqual({self.sessions[sid]["table_id"] for sid in sids}, {tables[0].id})
+        self.assertEqual(sorted(room for _, room in self._events("matchmaking_matched")), ["user:u0", "user:u1", "user:u2"])
+        self.assertEqual(len(self._events("lobby_snapshot")), len(sids))
+
+    async def test_later_players_fill_the_quick_seat_table(self) -> None:
+        for user_id in ("u0", "u1"):
+            await ws.join_matchmaking(self._connect(user_id), {"stake": 5, "table_size": 4})
+        await ws._process_matchmaking()
+        table = lobby_service.list_tables()[0]
+
+        await ws.join_matchmaking(self._connect("u2"), {"stake": 8, "table_size": 4})
+        await ws.join_matchmaking(self._connect("u3"), {"stake": 80, "table_size": 4})
+        await ws._process_matchmaking()
+
+        self.assertEqual(list(lobby_service.get_table(table.id).players), ["u0", "u1", "u2"])
+        self.assertEqual(ws._matchmaking.ticket("u3").key, QueueKey(2, 4))
+
+        await ws.leave_matchmaking("sid-u3")
+        self.assertEqual(len(ws._matchmaking), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from sqlalchemy import event, inspect, text
+
+from app.db.models import Base
+from app.db.migrations import HOT_PATH_INDEXES, LATEST_VERSION, run_migrations
+
+from tests.helpers import memory_engine
+
+
+def _index_names(engine, table: str) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+class MigrationTests(unittest.TestCase):
+    def test_fresh_database_is_built_and_stamped(self) -> None:
+        engine = memory_engine(create_schema=False)
+        self.assertEqual(run_migrations(engine), list(range(1, LATEST_VERSION + 1)))
+        for name, table, _ in HOT_PATH_INDEXES:
+            self.assertIn(name, _index_names(engine, table))
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar(), LATEST_VERSION)
+
+    def test_current_database_skips_introspection(self) -> None:
+        engine = memory_engine(create_schema=False)
+        run_migrations(engine)
+        statements: list[str] = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        self.assertEqual(run_migrations(engine), [])
+        self.assertEqual(len(statements), 2)
+        self.assertFalse(any("sqlite_master" in statement or "PRAGMA" in statement for statement in statements))
+
+    def test_legacy_database_gets_columns_and_indexes(self) -> None:
+        engine = memory_engine(create_schema=False)
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE users (id VARCHAR(32) PRIMARY KEY, email VARCHAR(255), username VARCHAR(40), "
+                    "hashed_password VARCHAR(255), display_name VARCHAR(80), avatar_url VARCHAR(500), "
+                    "bio VARCHAR(280), created_at DATETIME)"
+                )
+            )
+        run_migrations(engine)
+
+        user_columns = {column["name"] for column in inspect(engine).get_columns("users")}
+        self.assertTrue({"balance", "role", "referral_code", "two_factor_enabled"} <= user_columns)
+        self.assertIn("ix_round_logs_user_ended", _index_names(engine, "round_logs"))
+
+    def test_model_indexes_match_the_migration(self) -> None:
+        declared = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+        self.assertTrue({name for name, _, _ in HOT_PATH_INDEXES} <= declared)
+
+
+if __name__ == "__main__":
+    unittest.main()
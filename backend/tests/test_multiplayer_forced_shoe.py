@@ -5,49 +5,14 @@ from app.realtime import socket_server as ws
 from app.schemas.lobby import TableCreateRequest
 from app.services.lobby_service import lobby_service
 
-
-class _FakeUser:
-    def __init__(self, user_id: str, balance: float) -> None:
-        self.id = user_id
-        self.balance = balance
-
-
-class _FakeScalars:
-    def __init__(self, users):
-        self._users = users
-
-    def all(self):
-        return self._users
-
-
-class _FakeDbSession:
-    def __init__(self, users_by_id):
-        self._users_by_id = users_by_id
-
-    def scalars(self, _stmt):
-        return _FakeScalars(list(self._users_by_id.values()))
-
-    def add(self, _item):
-        return None
-
-    def commit(self):
-        return None
-
-    def rollback(self):
-        return None
-
-    def close(self):
-        return None
+from tests.helpers import memory_session_factory
 
 
 class MultiplayerForcedShoeTests(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self) -> None:
         self._clear_runtime_state()
         self.sessions: dict[str, dict] = {}
-        self.users_by_id = {
-            "u1": _FakeUser("u1", 1000.0),
-            "u2": _FakeUser("u2", 1000.0),
-        }
+        self.session_factory = memory_session_factory({"u1": 1000.0, "u2": 1000.0})
         self.patches = []
 
         async def fake_emit(_event, _payload=None, room=None):
@@ -71,9 +36,7 @@ class MultiplayerForcedShoeTests(unittest.IsolatedAsyncioTestCase):
         self.patches.append(patch.object(ws.sio, "save_session", new=fake_save_session))
         self.patches.append(patch.object(ws.sio, "enter_room", new=fake_enter_room))
         self.patches.append(patch.object(ws.sio, "leave_room", new=fake_leave_room))
-        self.patches.append(
-            patch.object(ws, "SessionLocal", new=lambda: _FakeDbSession(self.users_by_id))
-        )
+        self.patches.append(patch.object(ws, "SessionLocal", new=self.session_factory))
         self.patches.append(patch.object(ws, "_is_socket_event_allowed", return_value=True))
         for patcher in self.patches:
             patcher.start()
@@ -5,46 +5,12 @@ from unittest.mock import patch
 from app.realtime.socket_server import TableHandState, TablePlayerState, TableTurnState
 from app.realtime.socket_server import _settle_table_round
 
-
-class _FakeScalars:
-    def __init__(self, rows):
-        self._rows = rows
-
-    def all(self):
-        return self._rows
-
-
-class _FakeSession:
-    def __init__(self, users):
-        self._users = users
-        self.added = []
-
-    def scalars(self, _stmt):
-        return _FakeScalars(self._users)
-
-    def add(self, item):
-        self.added.append(item)
-
-    def commit(self):
-        return None
-
-    def rollback(self):
-        return None
-
-    def close(self):
-        return None
-
-
-class _FakeUser:
-    def __init__(self, user_id: str, balance: float):
-        self.id = user_id
-        self.balance = balance
+from tests.helpers import memory_session_factory, user_balance
 
 
 class MultiplayerSettlementTests(unittest.TestCase):
     def test_insurance_offsets_main_loss_when_dealer_blackjack(self) -> None:
-        user = _FakeUser("u1", 1000.0)
-        session = _FakeSession([user])
+        factory = memory_session_factory({"u1": 1000.0})
         state = TableTurnState(
             table_id="t1",
             players=["u1"],
@@ -66,7 +32,7 @@ class MultiplayerSettlementTests(unittest.TestCase):
             },
         )
 
-        with patch("app.realtime.socket_server.SessionLocal", return_value=session):
+        with patch("app.realtime.socket_server.SessionLocal", new=factory):
             _settle_table_round(state, completion_reason="test")
 
         player = state.player_states["u1"]
@@ -75,11 +41,10 @@ class MultiplayerSettlementTests(unittest.TestCase):
         self.assertEqual(hand.payout, -10.0)
         self.assertEqual(player.insurance_payout, 10.0)
         self.assertEqual(player.total_payout, 0.0)
-        self.assertEqual(user.balance, 1000.0)
+        self.assertEqual(user_balance(factory, "u1"), 1000.0)
 
     def test_surrender_stays_half_loss_on_settlement(self) -> None:
-        user = _FakeUser("u1", 1000.0)
-        session = _FakeSession([user])
+        factory = memory_session_factory({"u1": 1000.0})
         state = TableTurnState(
             table_id="t2",
             players=["u1"],
@@ -108,7 +73,7 @@ class MultiplayerSettlementTests(unittest.TestCase):
             },
         )
 
-        with patch("app.realtime.socket_server.SessionLocal", return_value=session):
+        with patch("app.realtime.socket_server.SessionLocal", new=factory):
             _settle_table_round(state, completion_reason="test")
 
         player = state.player_states["u1"]
@@ -116,7 +81,7 @@ class MultiplayerSettlementTests(unittest.TestCase):
         self.assertEqual(hand.result, "surrender")
         self.assertEqual(hand.payout, -5.0)
         self.assertEqual(player.total_payout, -5.0)
-        self.assertEqual(user.balance, 995.0)
+        self.assertEqual(user_balance(factory, "u1"), 995.0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import RoundLog, WalletTransaction
+from app.services.blackjack_service import BlackjackService
+from app.services.export_service import stream_export
+from app.services.pagination import decode_cursor, encode_cursor, next_cursor
+from app.services.round_log_codec import encode_actions, encode_cards
+from app.services.wallet_service import list_user_transactions
+
+from tests.helpers import memory_session_factory
+
+
+class KeysetPaginationAndExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session_factory = memory_session_factory()
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        with self.session_factory() as db:
+            for index in range(7):
+                # Pairs of rows share a timestamp so the id tie-breaker is exercised.
+                at = base + timedelta(minutes=index // 2)
+                db.add(
+                    RoundLog(
+                        id=f"log{index}",
+                        user_id="u1",
+                        bet=10.0,
+                        result="win",
+                        payout=10.0,
+                        player_score=20,
+                        dealer_score=18,
+                        player_cards=encode_cards(["10H", "QC"]),
+                        dealer_cards=encode_cards(["10S", "8D"]),
+                        actions=encode_actions(["start_round", "player_stand"]),
+                        created_at=at,
+                        ended_at=at,
+                    )
+                )
+                db.add(
+                    WalletTransaction(
+                        id=f"tx{index}",
+                        user_id="u1",
+                        tx_type="deposit",
+                        status="completed",
+                        chain="BTC",
+                        asset="BTC",
+                        wallet_address="bc1qexample",
+                        created_at=at,
+                    )
+                )
+            db.commit()
+
+    def test_cursor_round_trip_and_rejects_garbage(self) -> None:
+        at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(at, "abc")), (at, "abc"))
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_history_pages_cover_every_row_once_newest_first(self) -> None:
+        service = BlackjackService()
+        seen: list[str] = []
+        cursor = None
+        with self.session_factory() as db:
+            while True:
+                page = service.history(db, "u1", limit=3, cursor=cursor)
+                seen.extend(item.id for item in page)
+                cursor = next_cursor(page, 3, time_attr="ended_at")
+                if cursor is None:
+                    break
+        self.assertEqual(seen, ["log6", "log5", "log4", "log3", "log2", "log1", "log0"])
+
+    def test_transaction_pages_follow_created_at_then_id(self) -> None:
+        with self.session_factory() as db:
+            first = list_user_transactions(db, "u1", limit=4)
+            second = list_user_transactions(db, "u1", limit=4, cursor=next_cursor(first, 4))
+        self.assertEqual([row.id for row in first + second], [f"tx{index}" for index in range(6, -1, -1)])
+        self.assertIsNone(next_cursor(second, 4))
+
+    def test_ndjson_export_streams_in_chunks_oldest_first(self) -> None:
+        chunks = list(stream_export(self.session_factory, "round-logs", "ndjson", chunk_rows=3))
+        self.assertEqual(len(chunks), 3)
+        records = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual([record["id"] for record in records], [f"log{index}" for index in range(7)])
+        self.assertEqual(records[0]["player_cards"], ["10H", "QC"])
+        self.assertEqual(records[0]["actions"], ["start_round", "player_stand"])
+
+    def test_csv_export_has_header_and_filters_by_user(self) -> None:
+        body = "".join(stream_export(self.session_factory, "wallet-transactions", "csv", user_id="u1", chunk_rows=2))
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0][:3], ["id", "user_id", "wallet_link_id"])
+        self.assertEqual(len(rows), 8)
+        self.assertEqual("".join(stream_export(self.session_factory, "wallet-transactions", user_id="nobody")), "")
+        with self.assertRaises(ValueError):
+            list(stream_export(self.session_factory, "users"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+from app.core.config import get_settings
+from app.services.read_routing_service import ReadRoutingService
+
+
+def _service(engine) -> ReadRoutingService:
+    service = ReadRoutingService(engine)
+    service._redis = None
+    return service
+
+
+class ReadRoutingTests(unittest.TestCase):
+    def test_without_replica_reads_never_need_the_primary(self) -> None:
+        service = _service(None)
+        service.mark_write("u1")
+        self.assertFalse(service.prefer_primary("u1"))
+
+    def test_writer_sticks_to_primary_for_the_window(self) -> None:
+        service = _service(create_engine("sqlite://"))
+        with patch.object(get_settings(), "database_read_your_writes_seconds", 0.05):
+            service.mark_write("u1")
+            self.assertTrue(service.prefer_primary("u1"))
+            self.assertFalse(service.prefer_primary("u2"))
+            time.sleep(0.06)
+            self.assertFalse(service.prefer_primary("u1"))
+
+    def test_unreachable_replica_falls_back_to_primary_and_is_probed_once_per_interval(self) -> None:
+        service = _service(create_engine("sqlite:////nonexistent-dir/replica.db"))
+        with patch.object(service, "_probe_lag", wraps=service._probe_lag) as probe:
+            self.assertTrue(service.prefer_primary(None))
+            self.assertTrue(service.prefer_primary("u1"))
+        self.assertIsNone(service.replica_lag_seconds())
+        self.assertEqual(probe.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
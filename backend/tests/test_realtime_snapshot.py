@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.realtime import socket_server as ws
+from app.realtime.state_snapshot import SnapshotStore, encode_snapshot, turn_state_to_record
+from app.realtime.table_engine import apply_action, start_round
+from app.schemas.lobby import TableCreateRequest
+from app.services.lobby_service import lobby_service
+
+# Dealt via pop(): u1 8D/6S, u2 5H/7D, dealer 10C/10H.
+FIXED_SHOE = ["9C"] * 40 + ["10H", "7D", "6S", "10C", "5H", "8D"]
+
+
+class RealtimeSnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._clear_runtime_state()
+        self.scratch = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.scratch.name, "snapshot.bin"))
+        self.timer = patch.object(ws, "_ensure_turn_timer_task")
+        self.timer.start()
+
+    def tearDown(self) -> None:
+        self.timer.stop()
+        self.scratch.cleanup()
+        self._clear_runtime_state()
+
+    def _clear_runtime_state(self) -> None:
+        ws._user_to_sids.clear()
+        ws._table_ready.clear()
+        ws._table_pending_bets.clear()
+        ws._clear_forced_shoe()
+        ws._table_turn_states.clear()
+        ws._reconnect_deadlines.clear()
+        ws._table_chat_messages.clear()
+        ws._table_chat_muted_until.clear()
+        ws._table_chat_banned.clear()
+        ws._locked_tables.clear()
+        lobby_service._tables.clear()  # type: ignore[attr-defined]
+
+    def _table_in_round(self):
+        table = lobby_service.create_table("u1", TableCreateRequest(name="Snapshot", max_players=3, is_private=False))
+        lobby_service.join_table(table.id, "u2")
+        state = start_round(table.id, ["u1", "u2"], {"u1": 10.0, "u2": 25.0}, {}, turn_seconds=8, shoe=FIXED_SHOE).state
+        state.turn_deadline = ws._utc_now() + timedelta(seconds=6)
+        ws._table_turn_states[table.id] = state
+        return table, state
+
+    def test_round_chat_and_moderation_survive_a_restart(self) -> None:
+        table, state = self._table_in_round()
+        ws._append_chat_message(
+            ws.ChatMessage("m1", table.id, "u1", "u1", "good luck", False, ws._utc_now())
+        )
+        ws._table_chat_muted_until[table.id] = {"u2": ws._utc_now() + timedelta(seconds=120)}
+        ws._table_chat_banned[table.id] = {"u3"}
+        ws._locked_tables.add(table.id)
+        before = turn_state_to_record(state, ws._utc_now())
+
+        self.assertTrue(ws.save_state_snapshot(self.store))
+        self._clear_runtime_state()
+        self.assertEqual(ws.load_state_snapshot(self.store), 1)
+
+        restored = ws._table_turn_states[table.id]
+        after = turn_state_to_record(restored, ws._utc_now())
+        self.assertAlmostEqual(after.pop("turn_deadline"), before.pop("turn_deadline"), delta=1.0)
+        self.assertEqual(after, before)
+        self.assertEqual(lobby_service.table_ids_for_user("u2"), [table.id])
+        self.assertEqual([entry.message for entry in ws._table_chat_messages[table.id]], ["good luck"])
+        self.assertEqual(ws._is_user_muted(table.id, "u2")[0], True)
+        self.assertTrue(ws._is_user_banned(table.id, "u3"))
+        self.assertIn(table.id, ws._locked_tables)
+        self.assertEqual(set(ws._reconnect_deadlines), {"u1", "u2"})
+
+        # The resumed round plays on from the saved shoe.
+        self.assertIsNone(apply_action(restored, "u1", "hit").error)
+        self.assertEqual(restored.player_states["u1"].hands[0].cards, ["8D", "6S", "9C"])
+
+    def test_remaining_reconnect_grace_is_kept_for_offline_players(self) -> None:
+        table, _ = self._table_in_round()
+        ws._reconnect_deadlines["u2"] = ws._utc_now() + timedelta(seconds=4)
+
+        ws.save_state_snapshot(self.store)
+        self._clear_runtime_state()
+        ws.load_state_snapshot(self.store)
+
+        left = (ws._reconnect_deadlines["u2"] - ws._utc_now()).total_seconds()
+        self.assertLess(left, 5)
+        self.assertGreater((ws._reconnect_deadlines["u1"] - ws._utc_now()).total_seconds(), 5)
+
+    def test_stale_or_unreadable_snapshots_are_ignored(self) -> None:
+        self._table_in_round()
+        snapshot = ws.capture_realtime_state()
+        snapshot["taken_at"] = (ws._utc_now() - timedelta(hours=1)).isoformat()
+        self.store.save(encode_snapshot(snapshot))
+        self._clear_runtime_state()
+
+        self.assertIsNone(ws.load_state_snapshot(self.store))
+        self.assertEqual(ws._table_turn_states, {})
+
+        self.store.save(b"not a snapshot")
+        self.assertIsNone(ws.load_state_snapshot(self.store))
+
+
+if __name__ == "__main__":
+    unittest.main()
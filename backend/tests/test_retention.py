@@ -0,0 +1,88 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.db.models import ArchiveSegment, RoundLog, RoundLogMonthlyStat, SecurityEvent, User
+from app.services.retention_service import archive_cutoff, iter_archive_lines, list_archive_segments, run_retention
+from app.services.round_log_codec import encode_actions, encode_cards
+from app.services.stats_service import get_user_stats_bundle
+
+from tests.helpers import memory_session_factory
+
+NOW = datetime(2024, 6, 15, tzinfo=timezone.utc)
+
+
+def _round_log(user_id: str, result: str, at: datetime) -> RoundLog:
+    return RoundLog(
+        user_id=user_id,
+        bet=10.0,
+        result=result,
+        payout=10.0 if result == "win" else -10.0,
+        player_score=20,
+        dealer_score=18,
+        player_cards=encode_cards(["10H", "QC"]),
+        dealer_cards=encode_cards(["10S", "8D"]),
+        actions=encode_actions(["start_round", "player_stand"]),
+        created_at=at,
+        ended_at=at,
+    )
+
+
+class RetentionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session_factory = memory_session_factory()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with self.session_factory() as db:
+            for user_id in ("u1", "u2"):
+                db.add(User(id=user_id, email=f"{user_id}@example.com", username=user_id, hashed_password="x"))
+            db.add(_round_log("u1", "win", datetime(2024, 1, 10, tzinfo=timezone.utc)))
+            db.add(_round_log("u1", "lose", datetime(2024, 1, 20, tzinfo=timezone.utc)))
+            db.add(_round_log("u2", "win", datetime(2024, 2, 5, tzinfo=timezone.utc)))
+            db.add(_round_log("u1", "win", datetime(2024, 6, 1, tzinfo=timezone.utc)))
+            db.add(SecurityEvent(user_id="u2", event_type="login", created_at=datetime(2024, 2, 1, tzinfo=timezone.utc)))
+            db.commit()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_cutoff_is_a_month_boundary_behind_the_horizon(self) -> None:
+        self.assertEqual(archive_cutoff(60, NOW), datetime(2024, 4, 1, tzinfo=timezone.utc))
+        self.assertEqual(archive_cutoff(1, NOW), datetime(2024, 5, 1, tzinfo=timezone.utc))
+
+    def test_old_months_move_to_archives_and_stats_keep_their_totals(self) -> None:
+        with self.session_factory() as db:
+            before = get_user_stats_bundle(db, db.get(User, "u1"))["all_time"]
+
+        results = run_retention(self.session_factory, horizon_days=60, archive_dir=self.tmpdir.name, now=NOW)
+        archived = {(result.table_name, result.month): result.rows for result in results if result.rows}
+        self.assertEqual(
+            archived,
+            {("round_logs", "2024-01"): 2, ("round_logs", "2024-02"): 1, ("security_events", "2024-02"): 1},
+        )
+
+        with self.session_factory() as db:
+            self.assertEqual(db.scalar(select(func.count()).select_from(RoundLog)), 1)
+            self.assertEqual(db.scalar(select(func.count()).select_from(SecurityEvent)), 0)
+            january = db.scalar(select(RoundLogMonthlyStat).where(RoundLogMonthlyStat.month == "2024-01"))
+            self.assertEqual((january.user_id, january.total_games, january.wins, january.losses), ("u1", 2, 1, 1))
+            after = get_user_stats_bundle(db, db.get(User, "u1"))["all_time"]
+
+            segments = list_archive_segments(db, table_name="round_logs", user_id="u1")
+            self.assertEqual([segment.month for segment in segments], ["2024-01"])
+            lines = [json.loads(line) for line in iter_archive_lines(segments[0], user_id="u1")]
+
+        self.assertEqual(after, before)
+        self.assertEqual([line["result"] for line in lines], ["win", "lose"])
+        self.assertEqual(lines[0]["player_cards"], ["10H", "QC"])
+
+        rerun = run_retention(self.session_factory, horizon_days=60, archive_dir=self.tmpdir.name, now=NOW)
+        self.assertEqual(sum(result.rows for result in rerun), 0)
+        with self.session_factory() as db:
+            self.assertEqual(db.scalar(select(func.count()).select_from(ArchiveSegment)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import unittest
+from datetime import datetime, timezone
+
+from sqlalchemy import select, text
+
+from app.db.migrations import compact_legacy_round_logs
+from app.db.models import RoundLog
+from app.realtime.settlement_journal import persist_settlements
+from app.realtime.table_engine import HandSettlement, RoundSettlement
+from app.services.blackjack_service import BlackjackService
+from app.services.round_log_codec import (
+    CARD_NAMES,
+    decode_actions,
+    decode_cards,
+    decode_cards_many,
+    decode_round_actions,
+    encode_actions,
+    encode_cards,
+    encode_round_actions,
+    round_marker,
+)
+
+from tests.helpers import memory_engine, memory_session_factory
+
+
+class RoundLogCodecTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = memory_engine()
+        self.session_factory = memory_session_factory(engine=self.engine)
+
+    def test_cards_round_trip_through_one_byte_each(self) -> None:
+        blob = encode_cards(CARD_NAMES)
+        self.assertEqual(len(blob), 52)
+        self.assertEqual(decode_cards(blob), list(CARD_NAMES))
+        self.assertEqual(decode_cards_many([encode_cards(["10H", "AS"]), b"", encode_cards(["KD"])]), [["10H", "AS"], [], ["KD"]])
+        with self.assertRaises(ValueError):
+            encode_cards(["1X"])
+
+    def test_actions_round_trip_including_marker_and_unknown_names(self) -> None:
+        actions = ["hit", "double_down", "custom_action", round_marker("r1"), "turn_timeout_auto_stand"]
+        blob = encode_actions(actions, "r1")
+        self.assertEqual(decode_actions(blob, "r1"), actions)
+        self.assertEqual(decode_actions(encode_actions(["start_round", "player_hit", "player_stand"])), [
+            "start_round",
+            "player_hit",
+            "player_stand",
+        ])
+
+        by_user = {"u1": ["insurance", "stand", round_marker("r1")], "u2": ["hit", "hit", round_marker("r1")]}
+        self.assertEqual(decode_round_actions(encode_round_actions(by_user, "r1"), "r1"), by_user)
+
+    def test_long_literal_actions_are_cut_on_a_character_boundary(self) -> None:
+        self.assertEqual(decode_actions(encode_actions(["é" * 200, "stand"])), ["é" * 127, "stand"])
+        self.assertEqual(decode_actions(encode_actions(["x" * 300])), ["x" * 255])
+
+    def test_compact_row_is_several_times_smaller_than_json(self) -> None:
+        round_id = "8f2c8c3f4b5d4a6e9a1b2c3d4e5f6a7b"
+        cards, dealer, actions = ["10H", "6C", "5D"], ["9S", "7D", "2C"], ["hit", "stand", round_marker(round_id)]
+        json_size = len(json.dumps(cards)) + len(json.dumps(dealer)) + len(json.dumps(actions))
+        compact_size = len(encode_cards(cards)) + len(encode_cards(dealer)) + len(encode_actions(actions, round_id))
+        self.assertGreaterEqual(json_size / compact_size, 5)
+
+    def test_table_rounds_share_one_action_blob_and_history_decodes_it(self) -> None:
+        now = datetime.now(timezone.utc)
+        settlement = RoundSettlement(
+            round_id="r42",
+            table_id="t1",
+            dealer_cards=["10S", "7D"],
+            dealer_score=17,
+            payout_by_user={"u1": 0.0},
+            hands=[
+                HandSettlement(user_id="u1", bet=10.0, result="win", payout=10.0, player_score=19, player_cards=["8H", "8C", "3D"]),
+                HandSettlement(user_id="u1", bet=10.0, result="lose", payout=-10.0, player_score=16, player_cards=["8S", "8D"]),
+            ],
+            actions_by_user={"u1": ["split", "hit", "stand", "stand", round_marker("r42")]},
+            started_at=now,
+            ended_at=now,
+        )
+        with self.session_factory() as db:
+            persist_settlements(db, [settlement])
+            db.commit()
+            history = BlackjackService().history(db, "u1")
+
+        self.assertEqual(len(history), 2)
+        self.assertEqual({tuple(item.player_cards) for item in history}, {("8H", "8C", "3D"), ("8S", "8D")})
+        for item in history:
+            self.assertEqual(item.round_id, "r42")
+            self.assertEqual(item.dealer_cards, ["10S", "7D"])
+            self.assertEqual(item.actions, settlement.actions_by_user["u1"])
+
+    def test_legacy_json_rows_are_compacted_in_place(self) -> None:
+        with self.engine.begin() as connection:
+            for row_id, cards in (("a1", ["10H", "9C"]), ("a2", ["??"])):
+                connection.execute(
+                    text(
+                        "INSERT INTO round_logs (id, user_id, bet, result, payout, player_score, dealer_score, "
+                        "player_cards_json, dealer_cards_json, actions_json, created_at, ended_at) VALUES "
+                        "(:id, 'u1', 10, 'win', 10, 19, 18, :cards, :dealer, :actions, :now, :now)"
+                    ),
+                    {
+                        "id": row_id,
+                        "cards": json.dumps(cards),
+                        "dealer": json.dumps(["10S", "8D"]),
+                        "actions": json.dumps(["stand", "table_round:r7"]),
+                        "now": datetime.now(timezone.utc),
+                    },
+                )
+
+        self.assertEqual(compact_legacy_round_logs(self.engine, batch_size=1), 1)
+        self.assertEqual(compact_legacy_round_logs(self.engine), 0)
+
+        with self.session_factory() as db:
+            compacted = db.get(RoundLog, "a1")
+            self.assertEqual((compacted.round_id, compacted.player_cards_json), ("r7", ""))
+            self.assertIsNone(db.scalar(select(RoundLog.player_cards).where(RoundLog.id == "a2")))
+            history = {item.id: item for item in BlackjackService().history(db, "u1")}
+
+        self.assertEqual(history["a1"].player_cards, ["10H", "9C"])
+        self.assertEqual(history["a1"].actions, ["stand", "table_round:r7"])
+        self.assertEqual(history["a2"].player_cards, ["??"])
+
+
+if __name__ == "__main__":
+    unittest.main()
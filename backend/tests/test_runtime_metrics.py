@@ -0,0 +1,45 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user
+from app.api.routes.health import runtime_health
+from app.main import api_app
+import app.realtime.socket_server as ws
+
+
+class RuntimeMetricsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        ws._event_loop_lag_ms.update({"last": 0.0, "max": 0.0, "samples": 0})
+
+    def test_event_loop_lag_tracks_last_and_peak(self) -> None:
+        ws._record_event_loop_lag(0.120)
+        ws._record_event_loop_lag(0.004)
+        metrics = ws.get_runtime_metrics(reset_peak=True)
+        self.assertEqual(metrics["event_loop_lag_ms"], 4.0)
+        self.assertEqual(metrics["event_loop_lag_max_ms"], 120.0)
+        self.assertEqual(metrics["event_loop_lag_samples"], 2)
+        self.assertEqual(ws.get_runtime_metrics()["event_loop_lag_max_ms"], 4.0)
+
+    def test_runtime_health_reports_memory(self) -> None:
+        payload = asyncio.run(runtime_health())
+        self.assertEqual(payload["status"], "ok")
+        self.assertGreater(payload["peak_rss_bytes"], 0)
+        self.assertIn("connections", payload)
+
+    def test_runtime_health_is_admin_only(self) -> None:
+        client = TestClient(api_app)
+        self.assertEqual(client.get("/api/v1/health/runtime").status_code, 401)
+        try:
+            for role, expected in (("player", 403), ("admin", 200)):
+                api_app.dependency_overrides[get_current_user] = lambda role=role: SimpleNamespace(role=role)
+                response = client.get("/api/v1/health/runtime", params={"reset_peak": "true"})
+                self.assertEqual(response.status_code, expected)
+        finally:
+            api_app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+
+from app.db.models import BalanceLedgerEntry, RoundLog, User
+from app.realtime import socket_server as ws
+from app.realtime.settlement_journal import (
+    SettlementJournal,
+    persist_settlements,
+    settlement_from_record,
+    settlement_to_record,
+)
+from app.realtime.table_engine import HandSettlement, RoundSettlement
+
+from tests.helpers import memory_engine, memory_session_factory
+
+
+def _settlement(round_id: str, payout: float) -> RoundSettlement:
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    return RoundSettlement(
+        round_id=round_id,
+        table_id="t1",
+        dealer_cards=["10S", "7D"],
+        dealer_score=17,
+        payout_by_user={"u1": payout, "u2": 0.0},
+        hands=[
+            HandSettlement(user_id="u1", bet=10.0, result="win", payout=payout, player_score=20, player_cards=["10H", "QC"]),
+            HandSettlement(user_id="u2", bet=10.0, result="push", payout=0.0, player_score=17, player_cards=["9H", "8C"]),
+        ],
+        actions_by_user={"u1": ["stand"], "u2": ["hit", "stand"]},
+        started_at=now,
+        ended_at=now,
+    )
+
+
+class SettlementJournalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session_factory = memory_session_factory({"u1": 1000.0, "u2": 1000.0})
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "journal.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _state(self) -> tuple[float, int, int]:
+        with self.session_factory() as db:
+            return (
+                db.scalar(select(User.balance).where(User.id == "u1")),
+                db.scalar(select(func.count()).select_from(RoundLog)),
+                db.scalar(select(func.count()).select_from(BalanceLedgerEntry)),
+            )
+
+    def test_record_round_trip(self) -> None:
+        settlement = _settlement("r1", 10.0)
+        restored = settlement_from_record(json.loads(json.dumps(settlement_to_record(settlement))))
+        self.assertEqual(restored, settlement)
+
+    def test_persisting_the_same_round_twice_is_a_no_op(self) -> None:
+        for _ in range(2):
+            with self.session_factory() as db:
+                persist_settlements(db, [_settlement("r1", 10.0)])
+                db.commit()
+        self.assertEqual(self._state(), (1010.0, 2, 1))
+
+    def test_writer_group_commits_and_truncates_journal(self) -> None:
+        journal = SettlementJournal(self.path, self.session_factory, max_batch=50, group_commit_seconds=0.02)
+        journal.start()
+        try:
+            for index in range(20):
+                journal.submit(_settlement(f"r{index}", 5.0))
+            self.assertTrue(journal.flush(timeout=5.0))
+        finally:
+            journal.stop()
+
+        self.assertEqual(self._state(), (1100.0, 40, 20))
+        self.assertEqual(journal.stats["committed"], 20)
+        self.assertLess(journal.stats["batches"], 20)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_startup_replays_uncommitted_entries_once(self) -> None:
+        with self.session_factory() as db:
+            persist_settlements(db, [_settlement("r1", 10.0)])
+            db.commit()
+        with open(self.path, "w", encoding="utf-8") as handle:
+            for settlement in (_settlement("r1", 10.0), _settlement("r2", 7.5)):
+                handle.write(json.dumps(settlement_to_record(settlement)) + "\n")
+            handle.write('{"round_id": "torn"')
+
+        journal = SettlementJournal(self.path, self.session_factory, group_commit_seconds=0.0)
+        replayed = journal.start()
+        try:
+            self.assertTrue(journal.flush(timeout=5.0))
+        finally:
+            journal.stop()
+
+        self.assertEqual(replayed, 2)
+        self.assertEqual(self._state(), (1017.5, 4, 2))
+
+    def test_committed_prefix_is_compacted_while_rounds_are_still_queued(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as handle:
+            for index in range(20):
+                handle.write(json.dumps(settlement_to_record(_settlement(f"r{index}", 1.0))) + "\n")
+        sessions = 0
+        third_batch_started = threading.Event()
+        release = threading.Event()
+
+        def gated_factory():
+            nonlocal sessions
+            sessions += 1
+            if sessions == 3:
+                third_batch_started.set()
+                release.wait(5.0)
+            return self.session_factory()
+
+        journal = SettlementJournal(
+            self.path, gated_factory, max_batch=5, group_commit_seconds=0.0, compact_after_bytes=1
+        )
+        journal.start()
+        try:
+            self.assertTrue(third_batch_started.wait(5.0))
+            with open(self.path, encoding="utf-8") as handle:
+                kept = [json.loads(line)["round_id"] for line in handle]
+            self.assertEqual(kept, [f"r{index}" for index in range(10, 20)])
+            self.assertEqual(journal.stats["compactions"], 2)
+
+            journal.submit(_settlement("r20", 1.0))
+            release.set()
+            self.assertTrue(journal.flush(timeout=5.0))
+        finally:
+            release.set()
+            journal.stop()
+
+        self.assertEqual(self._state(), (1021.0, 42, 21))
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_inline_fallback_keeps_rounds_it_cannot_persist(self) -> None:
+        schemaless = memory_session_factory(engine=memory_engine(create_schema=False))
+        with (
+            patch.object(ws, "_settlement_journal", None),
+            patch.object(ws, "SessionLocal", new=schemaless),
+            patch.object(ws.settings, "multiplayer_settlement_journal_path", self.path),
+            self.assertLogs("app.realtime.socket_server", level="ERROR"),
+        ):
+            ws._persist_round_settlement(_settlement("r1", 10.0))
+
+        with open(f"{self.path}.failed", encoding="utf-8") as failed:
+            kept = [settlement_from_record(json.loads(line)) for line in failed]
+        self.assertEqual(kept, [_settlement("r1", 10.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+
+from app.db.models import BalanceLedgerEntry, RoundLog, User
+from app.services.blackjack_service import BlackjackService
+
+from tests.helpers import memory_session_factory
+
+
+def _deck(draw_order: list[str]) -> list[str]:
+    return list(reversed(draw_order))
+
+
+class SinglePlayerMultiHandTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = BlackjackService()
+        self.db = memory_session_factory()()
+        self.db.add(User(id="u1", email="u1@example.com", username="u1", hashed_password="x", balance=1000.0))
+        self.db.commit()
+        self.user = self.db.get(User, "u1")
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _count(self, model) -> int:
+        return self.db.scalar(select(func.count()).select_from(model))
+
+    def test_multi_hand_round_settles_each_hand_against_one_dealer(self) -> None:
+        # Deal order: hand0, hand1, dealer up, hand0, hand1, dealer hole, then draws.
+        draw_order = ["10H", "9C", "6S", "8D", "9D", "10S", "5C", "KD"]
+        with patch("app.services.blackjack_service.build_deck", return_value=_deck(draw_order)):
+            view = self.service.start_multi_hand_round(self.db, "u1", 10.0, 2)
+
+        self.assertEqual(view.status, "player_turn")
+        self.assertEqual(view.total_bet, 20.0)
+        self.assertEqual(view.dealer_cards, ["6S", "??"])
+
+        view = self.service.act_on_hand(self.db, "u1", view.round_id, 1, "stand")
+        self.assertEqual(view.hands[1].status, "stood")
+        self.assertEqual(view.status, "player_turn")
+
+        view = self.service.act_on_hand(self.db, "u1", view.round_id, 0, "stand")
+        self.assertEqual(view.status, "completed")
+        self.assertEqual(view.dealer_score, 21)
+        self.assertEqual([hand.result for hand in view.hands], ["lose", "lose"])
+        self.assertEqual(view.payout, -20.0)
+        self.assertEqual(self.user.balance, 980.0)
+        self.assertEqual(self._count(RoundLog), 2)
+        self.assertEqual(self._count(BalanceLedgerEntry), 1)
+
+    def test_timeout_forfeits_only_hands_still_in_play(self) -> None:
+        # hand0 AH+KD (blackjack), hand1 10H+9C (stood), hand2 5C+6D (left open), dealer 9S+8D.
+        draw_order = ["AH", "10H", "5C", "9S", "KD", "9C", "6D", "8D"]
+        with patch("app.services.blackjack_service.build_deck", return_value=_deck(draw_order)):
+            view = self.service.start_multi_hand_round(self.db, "u1", 10.0, 3)
+        self.assertEqual(view.hands[0].status, "blackjack")
+        view = self.service.act_on_hand(self.db, "u1", view.round_id, 1, "stand")
+
+        multi_round = self.service._multi_rounds[view.round_id]
+        multi_round.action_deadline = self.service._now() - timedelta(seconds=1)
+        view = self.service.get_multi_hand_round(self.db, "u1", view.round_id)
+
+        self.assertEqual(view.status, "completed")
+        self.assertEqual([hand.result for hand in view.hands], ["blackjack", "win", "timeout"])
+        self.assertEqual([hand.payout for hand in view.hands], [15.0, 10.0, -10.0])
+        self.assertEqual(self.user.balance, 1015.0)
+
+    def test_multi_hand_round_blocks_a_second_active_round(self) -> None:
+        draw_order = ["10H", "9C", "6S", "8D", "9D", "10S", "5C", "KD"]
+        with patch("app.services.blackjack_service.build_deck", return_value=_deck(draw_order)):
+            self.service.start_multi_hand_round(self.db, "u1", 10.0, 2)
+        with self.assertRaises(ValueError):
+            self.service.start_round(self.db, "u1", 10.0)
+
+    def test_finished_hand_rejects_further_actions(self) -> None:
+        draw_order = ["10H", "9C", "6S", "8D", "9D", "10S", "5C", "KD"]
+        with patch("app.services.blackjack_service.build_deck", return_value=_deck(draw_order)):
+            view = self.service.start_multi_hand_round(self.db, "u1", 10.0, 2)
+        self.service.act_on_hand(self.db, "u1", view.round_id, 0, "stand")
+        with self.assertRaises(ValueError):
+            self.service.act_on_hand(self.db, "u1", view.round_id, 0, "hit")
+
+    def test_auto_play_summarizes_rounds_and_writes_one_log_per_hand(self) -> None:
+        result = self.service.auto_play(self.db, "u1", 5.0, 40, hands_per_round=3)
+
+        self.assertEqual(result.rounds_played, 40)
+        self.assertIsNone(result.stopped_reason)
+        self.assertEqual(result.wins + result.losses + result.pushes + result.blackjacks, 120)
+        self.assertEqual(result.total_wagered, 600.0)
+        self.assertAlmostEqual(result.net_payout, sum(result.round_payouts), places=2)
+        self.assertAlmostEqual(result.ending_balance, 1000.0 + result.net_payout, places=2)
+        self.assertEqual(self.user.balance, result.ending_balance)
+        self.assertEqual(self._count(RoundLog), 120)
+
+    def test_auto_play_follows_basic_strategy(self) -> None:
+        draw_order = ["10H", "AS", "9S", "2D", "7C", "10D", "5C", "2C"]
+        with patch("app.services.blackjack_service.build_deck", return_value=_deck(draw_order)):
+            result = self.service.auto_play(self.db, "u1", 10.0, 1, hands_per_round=2)
+
+        logs = self.db.scalars(select(RoundLog).order_by(RoundLog.player_score)).all()
+        self.assertEqual([log.player_score for log in logs], [17, 20])
+        self.assertEqual((result.losses, result.wins), (1, 1))
+        self.assertEqual(result.round_payouts, [0.0])
+
+    def test_auto_play_stops_when_balance_runs_out(self) -> None:
+        self.user.balance = 10.0
+        self.db.commit()
+        result = self.service.auto_play(self.db, "u1", 10.0, 500)
+        self.assertLessEqual(result.rounds_played, 500)
+        if result.rounds_played < 500:
+            self.assertEqual(result.stopped_reason, "insufficient_balance")
+        self.assertGreaterEqual(self.user.balance, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
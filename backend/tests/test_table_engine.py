@@ -0,0 +1,65 @@
+import unittest
+
+from app.realtime.table_engine import apply_action, available_actions, current_turn_user_id, start_round
+from app.simulation.bot_tables import simulate
+
+
+def _shoe(draw_order: list[str]) -> list[str]:
+    return list(reversed(draw_order))
+
+
+class TableEngineTests(unittest.TestCase):
+    def test_round_plays_to_settlement_without_io(self) -> None:
+        # Deal order: u1, u2, dealer up, u1, u2, dealer hole, then draws.
+        result = start_round(
+            table_id="t1",
+            players=["u1", "u2"],
+            bets={"u1": 10.0, "u2": 20.0},
+            balances={"u1": 100.0, "u2": 100.0},
+            turn_seconds=8,
+            shoe=_shoe(["10H", "9C", "6S", "8D", "9D", "10S", "5C"]),
+        )
+        state = result.state
+        self.assertFalse(result.round_completed)
+        self.assertEqual(result.events[0].kind, "table_game_started")
+        self.assertEqual(current_turn_user_id(state), "u1")
+        self.assertIn("double_down", available_actions(state))
+
+        result = apply_action(state, "u2", "stand")
+        self.assertEqual(result.error, "not your turn")
+
+        result = apply_action(state, "u1", "stand")
+        self.assertIsNone(result.error)
+        self.assertIsNone(result.settlement)
+        self.assertEqual(current_turn_user_id(state), "u2")
+
+        result = apply_action(state, "u2", "stand")
+        self.assertTrue(result.round_completed)
+        self.assertEqual([event.kind for event in result.events], ["stand", "dealer_hit", "round_settled"])
+        settlement = result.settlement
+        self.assertEqual(settlement.dealer_score, 21)
+        self.assertEqual(settlement.payout_by_user, {"u1": -10.0, "u2": -20.0})
+        self.assertEqual([hand.result for hand in settlement.hands], ["lose", "lose"])
+        self.assertEqual(settlement.actions_by_user["u1"][-1], f"table_round:{state.round_id}")
+
+    def test_round_with_no_playable_hands_settles_immediately(self) -> None:
+        result = start_round(
+            table_id="t1",
+            players=["u1", "u2"],
+            bets={"u1": 10.0, "u2": 10.0},
+            balances={"u1": 100.0, "u2": 100.0},
+            turn_seconds=8,
+            shoe=_shoe(["AH", "AC", "9S", "KD", "QD", "8S"]),
+        )
+        self.assertTrue(result.round_completed)
+        self.assertEqual(result.settlement.payout_by_user, {"u1": 15.0, "u2": 15.0})
+
+    def test_bot_tables_are_reproducible_from_seed(self) -> None:
+        first = simulate(tables=2, players=3, rounds=40, seed=11)
+        second = simulate(tables=2, players=3, rounds=40, seed=11)
+        self.assertEqual(first.rounds, 80)
+        self.assertEqual((first.hands, first.actions, first.net_payout), (second.hands, second.actions, second.net_payout))
+
+
+if __name__ == "__main__":
+    unittest.main()
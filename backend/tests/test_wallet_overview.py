@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from app.db.models import User, WalletLink, WalletTransaction
+from app.schemas.wallet import WalletOverviewRead, WithdrawalRequest
+from app.services import wallet_service
+
+from tests.helpers import memory_engine, memory_session_factory
+
+ETH_ADDRESS = "0x" + "1" * 40
+
+
+def _transaction(tx_type: str, status: str, token_amount: float) -> WalletTransaction:
+    return WalletTransaction(
+        user_id="u1",
+        tx_type=tx_type,
+        status=status,
+        chain="ETH",
+        asset="ETH",
+        wallet_address=ETH_ADDRESS,
+        crypto_amount=0.01,
+        usd_rate=3000.0,
+        usd_amount=30.0,
+        token_amount=token_amount,
+    )
+
+
+class WalletOverviewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = memory_engine()
+        self.session_factory = memory_session_factory(engine=self.engine)
+        with self.session_factory() as db:
+            db.add(User(id="u1", email="u1@example.com", username="u1", hashed_password="x", balance=500.0))
+            db.add(WalletLink(user_id="u1", chain="ETH", wallet_address=ETH_ADDRESS))
+            db.add(_transaction("deposit", "completed", 300.0))
+            db.add(_transaction("deposit", "completed", 200.0))
+            db.add(_transaction("deposit", wallet_service.PENDING_CONFIRMATION_STATUS, 50.0))
+            db.add(_transaction("withdrawal", "pending_approval", 40.0))
+            db.commit()
+
+        self.statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", self._count_statement)
+        cache = wallet_service.WalletOverviewCache(redis_enabled=False)
+        cache_patch = patch.object(wallet_service, "wallet_overview_cache", cache)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def _count_statement(self, connection, cursor, statement, *args) -> None:
+        self.statements.append(statement)
+
+    def _overview(self) -> WalletOverviewRead:
+        with self.session_factory() as db:
+            return WalletOverviewRead.model_validate(wallet_service.get_wallet_overview(db, db.get(User, "u1")))
+
+    def test_summary_comes_from_one_grouped_query_and_repeat_polls_hit_the_cache(self) -> None:
+        first = self._overview()
+        self.assertEqual(
+            first.transaction_counts,
+            {"deposit": {"completed": 2, "pending_confirmation": 1}, "withdrawal": {"pending_approval": 1}},
+        )
+        self.assertEqual((first.pending_withdrawals, first.pending_withdrawal_tokens), (1, 40.0))
+        self.assertEqual((first.pending_deposits, first.pending_deposit_tokens), (1, 50.0))
+        self.assertEqual(len(first.recent_transactions), 4)
+        self.assertEqual(sum("GROUP BY" in statement for statement in self.statements), 1)
+
+        self.statements.clear()
+        second = self._overview()
+        # Only the user lookup done by the test itself; the overview is a cache hit.
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(second.model_dump(), first.model_dump())
+
+    def test_wallet_writes_invalidate_the_cached_overview(self) -> None:
+        self._overview()
+        with self.session_factory() as db:
+            payload = WithdrawalRequest(chain="ETH", asset="ETH", destination_address=ETH_ADDRESS, token_amount=25.0)
+            wallet_service.request_withdrawal(db, db.get(User, "u1"), payload)
+
+        refreshed = self._overview()
+        self.assertEqual((refreshed.pending_withdrawals, refreshed.pending_withdrawal_tokens), (2, 65.0))
+        self.assertEqual(len(refreshed.recent_transactions), 5)
+
+    def test_overview_computed_before_a_write_is_not_cached_after_it(self) -> None:
+        cache = wallet_service.wallet_overview_cache
+        _, version = cache.get("u1")
+        cache.invalidate("u1")
+        cache.put("u1", version, {"stale": True})
+        self.assertIsNone(cache.get("u1")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.api.routes import wallet as wallet_routes
+from app.db.models import BalanceLedgerEntry, User, WalletTransaction
+from app.schemas.wallet import WithdrawalBulkDecisionItem, WithdrawalBulkDecisionRequest
+from app.services import wallet_service
+from app.services.pagination import next_cursor
+
+from tests.helpers import memory_session_factory
+
+START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _withdrawal(transaction_id: str, user_id: str, token_amount: float, minutes: int) -> WalletTransaction:
+    return WalletTransaction(
+        id=transaction_id,
+        user_id=user_id,
+        tx_type="withdrawal",
+        status="pending_approval",
+        chain="ETH",
+        asset="ETH",
+        wallet_address="0x" + "1" * 40,
+        destination_address="0x" + "2" * 40,
+        crypto_amount=0.01,
+        usd_rate=3000.0,
+        usd_amount=token_amount,
+        token_amount=token_amount,
+        approval_required=True,
+        created_at=START + timedelta(minutes=minutes),
+        updated_at=START + timedelta(minutes=minutes),
+    )
+
+
+class WithdrawalDecisionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session_factory = memory_session_factory()
+        with self.session_factory() as db:
+            db.add(User(id="admin", email="a@example.com", username="admin", hashed_password="x", role="admin"))
+            db.add(User(id="u1", email="u1@example.com", username="u1", hashed_password="x", balance=100.0))
+            db.add(User(id="u2", email="u2@example.com", username="u2", hashed_password="x", balance=30.0))
+            db.add(_withdrawal("w1", "u1", 60.0, 1))
+            db.add(_withdrawal("w2", "u1", 50.0, 2))
+            db.add(_withdrawal("w3", "u2", 20.0, 3))
+            db.add(_withdrawal("w4", "u2", 10.0, 4))
+            db.commit()
+        cache_patch = patch.object(
+            wallet_service, "wallet_overview_cache", wallet_service.WalletOverviewCache(redis_enabled=False)
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def test_bulk_decisions_apply_in_one_transaction_and_report_skips(self) -> None:
+        decisions = [
+            WithdrawalBulkDecisionItem(transaction_id="w1", approve=True, chain_tx_hash="0x" + "a" * 64),
+            WithdrawalBulkDecisionItem(transaction_id="w2", approve=True),
+            WithdrawalBulkDecisionItem(transaction_id="w3", approve=False, reason="sanctions check"),
+            WithdrawalBulkDecisionItem(transaction_id="w4", approve=True, chain_tx_hash="not-a-valid-hash-at-all"),
+            WithdrawalBulkDecisionItem(transaction_id="w3", approve=True),
+            WithdrawalBulkDecisionItem(transaction_id="missing", approve=True),
+        ]
+        with self.session_factory() as db:
+            decided, skipped, balances = wallet_service.decide_withdrawals(db, db.get(User, "admin"), decisions)
+            outcome = {entry.id: (entry.status, entry.failure_reason) for entry in decided}
+
+        self.assertEqual(
+            outcome,
+            {
+                "w1": ("completed", None),
+                "w2": ("rejected", "Insufficient balance at approval time"),
+                "w3": ("rejected", "sanctions check"),
+            },
+        )
+        self.assertEqual({entry["transaction_id"] for entry in skipped}, {"w3", "w4", "missing"})
+        self.assertEqual(balances, {"u1": 40.0})
+        with self.session_factory() as db:
+            self.assertEqual(db.get(User, "u1").balance, 40.0)
+            self.assertEqual(db.get(WalletTransaction, "w1").tx_hash, "0x" + "a" * 64)
+            self.assertEqual(db.get(WalletTransaction, "w4").status, "pending_approval")
+            self.assertEqual(db.query(BalanceLedgerEntry).count(), 1)
+
+        # Already-decided rows are skipped on a second pass.
+        with self.session_factory() as db:
+            decided, skipped, _ = wallet_service.decide_withdrawals(db, db.get(User, "admin"), decisions[:1])
+        self.assertEqual((decided, [entry["transaction_id"] for entry in skipped]), ([], ["w1"]))
+
+    def test_bulk_decision_route_runs_the_batch_off_the_event_loop(self) -> None:
+        payload = WithdrawalBulkDecisionRequest(decisions=[WithdrawalBulkDecisionItem(transaction_id="w3", approve=False)])
+        threads: list[threading.Thread] = []
+
+        def decide(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return wallet_service.decide_withdrawals(*args, **kwargs)
+
+        async def call_route():
+            with self.session_factory() as db:
+                result = await wallet_routes.decide_withdrawal_requests(payload, db.get(User, "admin"), db)
+            return result, threading.current_thread()
+
+        with patch.object(wallet_routes, "decide_withdrawals", new=decide):
+            result, loop_thread = asyncio.run(call_route())
+
+        self.assertEqual([entry.id for entry in result.decided], ["w3"])
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], loop_thread)
+
+    def test_pending_withdrawals_page_with_a_cursor(self) -> None:
+        with self.session_factory() as db:
+            first = wallet_service.list_pending_withdrawals(db, limit=3)
+            second = wallet_service.list_pending_withdrawals(db, limit=3, cursor=next_cursor(first, 3))
+
+        self.assertEqual([entry.id for entry in first], ["w4", "w3", "w2"])
+        self.assertEqual([entry.id for entry in second], ["w1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import SecurityEvent, User
+from app.db.session import apply_sqlite_pragmas
+from app.db.write_queue import WriteQueue
+
+
+class WriteQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "queue.db")
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=self.engine)
+        self.session_factory = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _count(self, model) -> int:
+        with self.session_factory() as db:
+            return db.scalar(select(func.count()).select_from(model))
+
+    def test_pragmas_enable_wal_and_read_only_connections_refuse_writes(self) -> None:
+        connection = sqlite3.connect(self.path)
+        try:
+            apply_sqlite_pragmas(connection, read_only=True)
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("DELETE FROM users")
+        finally:
+            connection.close()
+
+    def test_concurrent_writers_are_batched_and_failures_stay_isolated(self) -> None:
+        queue = WriteQueue(self.session_factory, max_batch=50)
+        queue.start()
+        try:
+            def _record(index: int):
+                return queue.submit(lambda db: db.add(SecurityEvent(event_type=f"event-{index}")))
+
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                futures = list(pool.map(_record, range(200)))
+            duplicate = queue.submit(lambda db: db.add(User(id="dup", email="a@x", username="a", hashed_password="x")))
+            clash = queue.submit(lambda db: db.add(User(id="dup", email="b@x", username="b", hashed_password="x")))
+            for future in futures + [duplicate]:
+                future.result(timeout=5.0)
+            with self.assertRaises(IntegrityError):
+                clash.result(timeout=5.0)
+
+            # The failed flush must not take the writer thread down with it.
+            self.assertTrue(queue.running)
+            later = queue.submit(lambda db: db.add(SecurityEvent(event_type="after-failure")))
+            later.result(timeout=5.0)
+        finally:
+            queue.stop()
+
+        self.assertEqual(self._count(SecurityEvent), 201)
+        self.assertEqual(self._count(User), 1)
+        self.assertLess(queue.stats["batches"], 200)
+        self.assertEqual(queue.stats["failed"], 1)
+
+    def test_stopped_queue_writes_inline(self) -> None:
+        queue = WriteQueue(self.session_factory)
+        queue.run(lambda db: db.add(SecurityEvent(event_type="inline")))
+        self.assertEqual(self._count(SecurityEvent), 1)
+        self.assertEqual(queue.stats["batches"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db.ids import new_id  # noqa: E402
+
+GENERATORS = {
+    "uuid4": lambda: uuid4().hex,
+    "uuid7": new_id,
+}
+
+
+def _create_table(connection, table: str) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {table} (id VARCHAR(32) PRIMARY KEY, user_id VARCHAR(32) NOT NULL, "
+            "payout FLOAT NOT NULL, created_at TIMESTAMP NOT NULL)"
+        )
+    )
+    connection.execute(text(f"CREATE INDEX ix_{table}_created_at ON {table}(created_at)"))
+
+
+def _index_bytes(connection, dialect: str, table: str) -> int | None:
+    if dialect == "postgresql":
+        return connection.execute(text(f"SELECT pg_relation_size('{table}_pkey')")).scalar()
+    try:
+        return connection.execute(
+            text("SELECT SUM(pgsize) FROM dbstat WHERE name = :name"),
+            {"name": f"sqlite_autoindex_{table}_1"},
+        ).scalar()
+    except Exception:
+        # dbstat is an optional SQLite build flag.
+        return None
+
+
+def run(url: str, generator: str, rows: int, batch: int) -> dict:
+    engine = create_engine(url)
+    table = f"id_bench_{generator}"
+    make_id = GENERATORS[generator]
+    with engine.begin() as connection:
+        _create_table(connection, table)
+
+    insert = text(f"INSERT INTO {table} (id, user_id, payout, created_at) VALUES (:id, :user_id, :payout, CURRENT_TIMESTAMP)")
+    started = time.perf_counter()
+    batch_latencies: list[float] = []
+    inserted = 0
+    while inserted < rows:
+        size = min(batch, rows - inserted)
+        params = [{"id": make_id(), "user_id": "bench", "payout": 1.0} for _ in range(size)]
+        batch_started = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(insert, params)
+        batch_latencies.append(time.perf_counter() - batch_started)
+        inserted += size
+    elapsed = time.perf_counter() - started
+
+    with engine.begin() as connection:
+        index_bytes = _index_bytes(connection, engine.dialect.name, table)
+        connection.execute(text(f"DROP TABLE {table}"))
+    engine.dispose()
+
+    batch_latencies.sort()
+    return {
+        "dialect": engine.dialect.name,
+        "generator": generator,
+        "rows": rows,
+        "rows_per_second": round(rows / elapsed, 1),
+        "batch_p95_ms": round(batch_latencies[int(len(batch_latencies) * 0.95) - 1] * 1000.0, 2),
+        "pk_index_bytes": index_bytes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare uuid4 and time-ordered (UUIDv7) primary key inserts")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--sqlite-path", default="", help="SQLite file to use (default: a temp file)")
+    parser.add_argument("--postgres-url", default="", help="e.g. postgresql+psycopg://maca:pw@127.0.0.1:5432/maca")
+    args = parser.parse_args()
+
+    urls: list[str] = []
+    with tempfile.TemporaryDirectory() as scratch:
+        urls.append(f"sqlite:///{args.sqlite_path or os.path.join(scratch, 'id_bench.db')}")
+        if args.postgres_url:
+            urls.append(args.postgres_url)
+
+        print("Primary Key Insert Benchmark")
+        for url in urls:
+            for generator in GENERATORS:
+                result = run(url, generator, max(1, args.rows), max(1, args.batch))
+                print(" ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+import argparse
+import asyncio
+from collections import defaultdict
+import random
+import time
+from uuid import uuid4
+
+import aiohttp
+import socketio
+
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.latencies_ms: dict[str, list[float]] = defaultdict(list)
+        self.failures: dict[str, int] = defaultdict(int)
+        self.emits_received: dict[str, int] = defaultdict(int)
+        self.server_samples: list[dict] = []
+        self.rounds_completed = 0
+        self.stalled_rounds = 0
+        self.started_at = time.perf_counter()
+
+    def record(self, event: str, elapsed_ms: float, ok: bool) -> None:
+        self.latencies_ms[event].append(elapsed_ms)
+        if not ok:
+            self.failures[event] += 1
+
+
+class LoadClient:
+    def __init__(self, index: int, email: str, token: str, metrics: Metrics) -> None:
+        self.index = index
+        self.email = email
+        self.token = token
+        self.user_id: str | None = None
+        self.metrics = metrics
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.table_id: str | None = None
+        self.latest_state: dict | None = None
+        self.state_version = 0
+        self.state_changed = asyncio.Event()
+        self._register_handlers()
+
+    def _register_handlers(self) -> None:
+        @self.sio.on("*")
+        async def _any_event(event: str, data=None) -> None:
+            self.metrics.emits_received[event] += 1
+            if event == "system" and isinstance(data, dict) and data.get("user_id"):
+                self.user_id = data["user_id"]
+            if event in {"table_game_state", "table_game_started", "table_round_resolved"} and isinstance(data, dict):
+                if self.table_id and data.get("table_id") not in {None, self.table_id}:
+                    return
+                self.latest_state = data
+                self.state_version += 1
+                self.state_changed.set()
+
+    async def connect(self, url: str, event: str = "connect") -> bool:
+        started = time.perf_counter()
+        try:
+            await self.sio.connect(url, auth={"token": self.token}, transports=["websocket"], wait_timeout=15)
+            ok = True
+        except Exception:
+            ok = False
+        self.metrics.record(event, (time.perf_counter() - started) * 1000.0, ok)
+        return ok
+
+    async def call(self, event: str, data: dict | None = None, timeout: float = 15.0) -> dict:
+        started = time.perf_counter()
+        try:
+            response = await self.sio.call(event, data or {}, timeout=timeout)
+        except Exception as exc:
+            response = {"ok": False, "error": str(exc) or exc.__class__.__name__}
+        ok = isinstance(response, dict) and bool(response.get("ok"))
+        self.metrics.record(event, (time.perf_counter() - started) * 1000.0, ok)
+        return response if isinstance(response, dict) else {"ok": False}
+
+
+async def _authenticate(
+    http: aiohttp.ClientSession,
+    api_url: str,
+    email: str,
+    username: str,
+    password: str,
+    metrics: Metrics,
+) -> str | None:
+    login_payload = {"email": email, "password": password}
+    started = time.perf_counter()
+    async with http.post(f"{api_url}/auth/login", json=login_payload) as response:
+        if response.status == 200:
+            metrics.record("http_login", (time.perf_counter() - started) * 1000.0, True)
+            return (await response.json())["access_token"]
+
+    started = time.perf_counter()
+    async with http.post(
+        f"{api_url}/auth/register",
+        json={"email": email, "username": username, "password": password},
+    ) as response:
+        metrics.record("http_register", (time.perf_counter() - started) * 1000.0, response.status in {201, 409})
+
+    started = time.perf_counter()
+    async with http.post(f"{api_url}/auth/login", json=login_payload) as response:
+        ok = response.status == 200
+        metrics.record("http_login", (time.perf_counter() - started) * 1000.0, ok)
+        return (await response.json())["access_token"] if ok else None
+
+
+async def _create_clients(args, count: int, prefix: str, metrics: Metrics) -> list[LoadClient]:
+    api_url = f"{args.base_url}{args.api_prefix}"
+    semaphore = asyncio.Semaphore(max(1, args.auth_concurrency))
+    clients: list[LoadClient] = []
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as http:
+
+        async def create(index: int) -> None:
+            username = f"{args.user_prefix}_{prefix}_{index}"
+            email = f"{username}@loadtest.example.com"
+            async with semaphore:
+                token = await _authenticate(http, api_url, email, username, args.password, metrics)
+            if not token:
+                return
+            client = LoadClient(index, email, token, metrics)
+            if await client.connect(args.base_url):
+                clients.append(client)
+
+        await asyncio.gather(*(create(index) for index in range(count)))
+    clients.sort(key=lambda client: client.index)
+    return clients
+
+
+async def _next_state(client: LoadClient, seen_version: int, timeout: float) -> tuple[dict | None, int]:
+    deadline = time.perf_counter() + timeout
+    while client.state_version <= seen_version:
+        client.state_changed.clear()
+        if client.state_version > seen_version:
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None, seen_version
+        try:
+            await asyncio.wait_for(client.state_changed.wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            return None, seen_version
+    return client.latest_state, client.state_version
+
+
+async def _play_seat(client: LoadClient, rounds: int, bet: float, metrics: Metrics, turn_timeout: float) -> None:
+    settled_round_ids: set[str] = set()
+    acted_on: set[tuple] = set()
+    version = client.state_version
+    state = client.latest_state
+    while len(settled_round_ids) < rounds:
+        if not state or state.get("status") != "active":
+            ready = await client.call("set_ready", {"ready": True, "bet": bet})
+            if not ready.get("ok") and ready.get("error") != "table game already active":
+                await asyncio.sleep(0.2)
+
+        state, version = await _next_state(client, version, turn_timeout)
+        if state is None:
+            metrics.stalled_rounds += 1
+            await client.call("sync_state", {"preferred_table_id": client.table_id})
+            state = client.latest_state
+            continue
+
+        round_id = state.get("round_id")
+        if state.get("status") == "active":
+            turn_key = (round_id, state.get("action_count"))
+            if state.get("current_turn_user_id") == client.user_id and turn_key not in acted_on:
+                acted_on.add(turn_key)
+                action = state.get("recommended_action") or "stand"
+                await client.call("take_turn_action", {"action": action, "action_id": uuid4().hex[:24]})
+        elif state.get("status") == "ended" and round_id and round_id not in settled_round_ids:
+            settled_round_ids.add(round_id)
+            if state.get("players", [None])[0] == client.user_id:
+                metrics.rounds_completed += 1
+
+
+async def _seat_tables(players: list[LoadClient], seats_per_table: int) -> list[list[LoadClient]]:
+    tables: list[list[LoadClient]] = []
+    for offset in range(0, len(players) - seats_per_table + 1, seats_per_table):
+        group = players[offset : offset + seats_per_table]
+        owner = group[0]
+        created = await owner.call(
+            "create_table",
+            {"name": f"load-{uuid4().hex[:8]}", "max_players": max(2, seats_per_table), "is_private": False},
+        )
+        if not created.get("ok"):
+            continue
+        table_id = created["table"]["id"]
+        owner.table_id = table_id
+        for seat in group[1:]:
+            joined = await seat.call("join_table", {"table_id": table_id})
+            if joined.get("ok"):
+                seat.table_id = table_id
+        tables.append([seat for seat in group if seat.table_id == table_id])
+    return [group for group in tables if len(group) >= 2]
+
+
+async def _reconnect_storm(clients: list[LoadClient], url: str, size: int, delay: float) -> None:
+    await asyncio.sleep(delay)
+    victims = random.sample(clients, min(size, len(clients)))
+    await asyncio.gather(*(client.sio.disconnect() for client in victims), return_exceptions=True)
+    for client in victims:
+        client.sio = socketio.AsyncClient(reconnection=False)
+        client._register_handlers()
+
+    async def reconnect(client: LoadClient) -> None:
+        if await client.connect(url, event="reconnect"):
+            await client.call("sync_state", {"preferred_table_id": client.table_id})
+
+    await asyncio.gather(*(reconnect(client) for client in victims))
+
+
+async def _poll_server(args, metrics: Metrics, stop: asyncio.Event) -> None:
+    url = f"{args.base_url}{args.api_prefix}/health/runtime"
+    headers = {"Authorization": f"Bearer {args.admin_token}"}
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5), headers=headers) as http:
+        while not stop.is_set():
+            try:
+                async with http.get(url, params={"reset_peak": "true"}) as response:
+                    if response.status == 200:
+                        metrics.server_samples.append(await response.json())
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=args.metrics_interval)
+            except asyncio.TimeoutError:
+                continue
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(percent / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _histogram(values: list[float]) -> str:
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in values:
+        for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    return " ".join(f"{label}:{count}" for label, count in zip(labels, counts) if count)
+
+
+def _print_report(metrics: Metrics, elapsed: float) -> None:
+    total_emits = sum(metrics.emits_received.values())
+    print("Socket Load Test Result")
+    print(f"duration_seconds={elapsed:.2f}")
+    print(f"rounds_completed={metrics.rounds_completed}")
+    print(f"stalled_waits={metrics.stalled_rounds}")
+    print(f"emits_received_total={total_emits}")
+    print(f"emits_received_per_second={total_emits / max(1e-9, elapsed):.1f}")
+    for event, count in sorted(metrics.emits_received.items(), key=lambda item: -item[1]):
+        print(f"emits[{event}]={count} ({count / max(1e-9, elapsed):.1f}/s)")
+
+    print("ack_latency_ms (count p50 p95 p99 max failures)")
+    for event, values in sorted(metrics.latencies_ms.items()):
+        ordered = sorted(values)
+        print(
+            f"{event}: n={len(ordered)} p50={_percentile(ordered, 50):.1f} p95={_percentile(ordered, 95):.1f} "
+            f"p99={_percentile(ordered, 99):.1f} max={ordered[-1]:.1f} failures={metrics.failures.get(event, 0)}"
+        )
+        print(f"  histogram {_histogram(ordered)}")
+
+    samples = metrics.server_samples
+    if samples:
+        rss = [sample["rss_bytes"] for sample in samples if sample.get("rss_bytes")]
+        lag = sorted(sample.get("event_loop_lag_max_ms", 0.0) for sample in samples)
+        print(f"server_samples={len(samples)}")
+        if rss:
+            print(f"server_rss_mb_max={max(rss) / 1_048_576:.1f}")
+            print(f"server_rss_mb_last={rss[-1] / 1_048_576:.1f}")
+        print(f"server_peak_rss_mb={samples[-1].get('peak_rss_bytes', 0) / 1_048_576:.1f}")
+        print(f"server_event_loop_lag_ms p50={_percentile(lag, 50):.1f} p95={_percentile(lag, 95):.1f} max={lag[-1]:.1f}")
+        print(f"server_connections_max={max(sample.get('connections', 0) for sample in samples)}")
+    else:
+        print("server_samples=0 (GET /health/runtime unavailable; it needs --admin-token)")
+
+
+async def run(args) -> None:
+    metrics = Metrics()
+    stop_polling = asyncio.Event()
+    poller = asyncio.create_task(_poll_server(args, metrics, stop_polling)) if args.admin_token else None
+
+    players = await _create_clients(args, args.users, "p", metrics)
+    spectators = await _create_clients(args, args.spectators, "s", metrics) if args.spectators > 0 else []
+    tables = await _seat_tables(players, max(2, args.players_per_table))
+    print(f"connected_players={len(players)} connected_spectators={len(spectators)} tables={len(tables)}")
+
+    for index, spectator in enumerate(spectators):
+        if tables:
+            table_id = tables[index % len(tables)][0].table_id
+            await spectator.call("spectate_table", {"table_id": table_id})
+
+    seated = [client for group in tables for client in group]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_play_seat(client, args.rounds, args.bet, metrics, args.turn_timeout))
+        for client in seated
+    ]
+    if args.reconnect_storm > 0 and seated:
+        tasks.append(asyncio.create_task(_reconnect_storm(seated, args.base_url, args.reconnect_storm, args.storm_delay)))
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=args.max_seconds)
+    except asyncio.TimeoutError:
+        print("warning=max_seconds reached before all rounds finished")
+    elapsed = time.perf_counter() - started
+
+    stop_polling.set()
+    if poller is not None:
+        await poller
+    await asyncio.gather(*(client.sio.disconnect() for client in players + spectators), return_exceptions=True)
+    _print_report(metrics, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Socket.IO multiplayer load test for Project MACA backend")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--players-per-table", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--bet", type=float, default=1.0)
+    parser.add_argument("--spectators", type=int, default=10)
+    parser.add_argument("--reconnect-storm", type=int, default=0, help="Players to drop and reconnect at once")
+    parser.add_argument("--storm-delay", type=float, default=5.0)
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--max-seconds", type=float, default=600.0)
+    parser.add_argument("--metrics-interval", type=float, default=1.0)
+    parser.add_argument("--auth-concurrency", type=int, default=10)
+    parser.add_argument("--user-prefix", default="loadbot")
+    parser.add_argument("--password", default="LoadTestPass123!")
+    parser.add_argument("--admin-token", default="", help="Admin access token for sampling GET /health/runtime")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()